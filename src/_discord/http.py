@@ -31,7 +31,7 @@ import asyncio
 import logging
 import sys
 import weakref
-from typing import TYPE_CHECKING, Any, Coroutine, Iterable, Sequence, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Coroutine, Iterable, Sequence, TypeVar
 from urllib.parse import quote as _uriquote
 
 import aiohttp
@@ -120,6 +120,9 @@ class UserLimit:
 
 
 class Route:
+    # API base URL, can be replaced to make requests to a different (e.g., local testing) server
+    BASE: ClassVar[str] = f"https://discord.com/api/v{API_VERSION}"
+
     def __init__(self, method: str, path: str, **parameters: Any) -> None:
         self.path: str = path
         self.method: str = method
@@ -141,7 +144,7 @@ class Route:
 
     @property
     def base(self) -> str:
-        return f"https://discord.com/api/v{API_VERSION}"
+        return Route.BASE
 
     @property
     def bucket(self) -> str:
@@ -200,6 +203,8 @@ class HTTPClient:
         self.proxy: str | None = proxy
         self.proxy_auth: aiohttp.BasicAuth | None = proxy_auth
         self.use_clock: bool = not unsync_clock
+        self.rate_limit_sleeps: int = 0  # Number of sleeps because of 429 responses
+        self.rate_limit_sleep_time: float = 0  # Total seconds slept because of 429 responses
 
         user_agent = (
             "DiscordBot (https://pycord.dev, {0}) Python/{1[0]}.{1[1]} aiohttp/{2}"
@@ -383,6 +388,8 @@ class HTTPClient:
                                 )
                                 self._global_over.clear()
 
+                            self.rate_limit_sleeps += 1
+                            self.rate_limit_sleep_time += retry_after
                             await asyncio.sleep(retry_after)
                             _log.debug("Done sleeping for the rate limit. Retrying...")
 
@@ -15,6 +15,13 @@ from .logging import *
 from .web import *
 from .convert import *
 from .remote import *
+from .metrics import *
+from .watchdog import *
+from .spans import *
+from .profiler import *
+from .recorder import *
+from .planner import *
+from .timeline import *
 from .responder import *
 from .messagedata import *
 
@@ -10,7 +10,7 @@ from . import responder
 from . import guild
 from . import web
 
-from .misc import async_util, instance_track, doc, attributes
+from .misc import async_util, instance_track, doc, attributes, task_registry
 from .logging.tracing import TraceLEVELS, trace
 from .events import *
 
@@ -449,7 +449,7 @@ class ACCOUNT:
         ws_task = None
         try:
             await self._client.login(self._token, not self.is_user)
-            ws_task = asyncio.create_task(self._client.connect())
+            ws_task = task_registry.create_task(self._client.connect(), self, "Discord connection")
             self._ws_task = ws_task
             await self._client.wait_for("ready", timeout=LOGIN_TIMEOUT_S)
             trace(f"Logged in as {self._client.user.display_name}")
@@ -510,7 +510,7 @@ class ACCOUNT:
         await server._close()
         self._removed_servers.append(server)
         if len(self._removed_servers) > self.removal_buffer_length:
-            trace(f"Removing oldest record of removed servers {self._removed_servers[0]}", TraceLEVELS.DEBUG)
+            trace(lambda: f"Removing oldest record of removed servers {self._removed_servers[0]}", TraceLEVELS.DEBUG)
             del self._removed_servers[0]
 
         trace(f"Server {server} has been removed from account {self}", TraceLEVELS.NORMAL)
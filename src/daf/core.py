@@ -12,7 +12,7 @@ from typeguard import typechecked
 
 from .logging.tracing import TraceLEVELS, trace
 from .logging import _logging as logging, tracing
-from .misc import doc, instance_track as it
+from .misc import doc, instance_track as it, task_registry
 from .events import *
 from . import guild
 from . import client
@@ -20,6 +20,10 @@ from . import message
 from . import convert
 from . import remote
 from . import events
+from . import metrics
+from . import watchdog
+from . import profiler
+from . import recorder
 
 import asyncio
 import shutil
@@ -36,7 +40,9 @@ __all__ = (
     "add_object",
     "remove_object",
     "get_accounts",
-    "initialize"
+    "initialize",
+    "get_tasks",
+    "check_task_leaks",
 )
 
 
@@ -44,6 +50,7 @@ __all__ = (
 CORE_TASK_SLEEP_SEC = 0.1
 ACCOUNT_CLEANUP_DELAY = 10
 SCHEMA_BACKUP_DELAY = 120
+TASK_LEAK_CHECK_DELAY = 600
 DAF_PATH = Path.home().joinpath("daf")
 SHILL_LIST_BACKUP_PATH = DAF_PATH.joinpath("objects.sbf")  # sbf -> Schema Backup File
 # ---------------------------------------
@@ -60,6 +67,7 @@ class GLOBALS:
     remote_client: remote.RemoteAccessCLIENT = None
 
     schema_backup_event = asyncio.Event()
+    task_leak_check_event = asyncio.Event()
 
 
 # -----------------------------------------------------------------------
@@ -120,6 +128,86 @@ async def http_remove_account(account_id: int):
     return remote.create_json_response(message=f"Removed account {name}")
 
 
+@remote.register("/tasks", "GET")
+@doc.doc_category("Tasks", api_type="HTTP")
+async def http_get_tasks():
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the framework's running tasks, grouped by the object owning them.
+    See :func:`daf.core.get_tasks`.
+
+    Returns
+    ---------
+    List[dict]
+        The task groups.
+    """
+    return remote.create_json_response(tasks=convert.convert_object_to_semi_dict(get_tasks()))
+
+
+# -----------------------------------------------------------------------
+# Metrics
+# These are collected when requested and need access to the accounts
+# -----------------------------------------------------------------------
+def _get_account_label(account: client.ACCOUNT) -> dict:
+    user = account.client.user if account.client is not None else None
+    return {"account": user.name if user is not None else str(it.get_object_id(account))}
+
+
+def _collect_account_tasks():
+    for account in GLOBALS.accounts:
+        tasks = [account._ws_task]
+        for server in account.servers:
+            for guild_ in server.guilds if isinstance(server, guild.AutoGUILD) else [server]:
+                for message_ in guild_.messages:
+                    tasks.extend((message_._timer_handle, message_._removal_timer))
+
+        yield _get_account_label(account), sum(task is not None and not task.done() for task in tasks)
+
+
+def _collect_event_queue_depth():
+    controllers = [("global", get_global_event_ctrl())]
+    controllers.extend((_get_account_label(account)["account"], account._event_ctrl) for account in GLOBALS.accounts)
+    for name, controller in controllers:
+        queues = controller._priority_queues.values()
+        yield {"controller": name}, sum(queue.qsize() for queue in queues)
+
+
+def _collect_rate_limit(attribute: str):
+    for account in GLOBALS.accounts:
+        if account.client is not None:
+            yield _get_account_label(account), getattr(account.client.http, attribute)
+
+
+def _collect_logger_queue_size():
+    logger = logging.get_logger()
+    if logger is not None:
+        mutex = logger._mutex
+        yield {}, int(mutex.locked()) + len(mutex._waiters or ())
+
+
+metrics.CollectedMETRIC(
+    "daf_account_tasks", "Number of pending tasks (connection and message timers) of each account.",
+    "gauge", _collect_account_tasks
+)
+metrics.CollectedMETRIC(
+    "daf_event_queue_depth", "Number of events waiting to be processed by each event controller.",
+    "gauge", _collect_event_queue_depth
+)
+metrics.CollectedMETRIC(
+    "daf_rate_limit_sleeps_total", "Number of sleeps caused by rate limits (429) of each account.",
+    "counter", lambda: _collect_rate_limit("rate_limit_sleeps")
+)
+metrics.CollectedMETRIC(
+    "daf_rate_limit_sleep_seconds_total", "Seconds slept because of rate limits (429) by each account.",
+    "counter", lambda: _collect_rate_limit("rate_limit_sleep_time")
+)
+metrics.CollectedMETRIC(
+    "daf_logger_queue_size", "Number of logs (and other logger operations) being processed or waiting for the logger.",
+    "gauge", _collect_logger_queue_size
+)
+
+
 # @get_global_event_ctrl().listen(EventID.g_account_expired)
 async def cleanup_account(account: client.ACCOUNT):
     if GLOBALS.save_to_file:
@@ -160,6 +248,65 @@ async def schema_backup_task():
             trace("Unable to save objects to file.", TraceLEVELS.ERROR, exc)
 
 
+def _get_shilling_list_ids() -> set:
+    "Returns the ids (id()) of all the objects in the shilling list."
+    ids = set()
+    for account in GLOBALS.accounts:
+        ids.add(id(account))
+        for server in account.servers:
+            ids.add(id(server))
+            ids.update(map(id, server.messages))
+            if isinstance(server, guild.AutoGUILD):
+                for guild_ in server.guilds:
+                    ids.add(id(guild_))
+                    ids.update(map(id, guild_.messages))
+
+    return ids
+
+
+def _is_task_orphaned(info: task_registry.TaskINFO, shilling_list_ids: set) -> bool:
+    if not info.has_owner:
+        return False
+
+    owner = info.owner
+    if owner is None:  # Owner was deleted, but the task is still running
+        return True
+
+    return (
+        isinstance(owner, (client.ACCOUNT, guild.BaseGUILD, guild.AutoGUILD, message.BaseMESSAGE)) and
+        id(owner) not in shilling_list_ids
+    )
+
+
+async def task_leak_check_task():
+    """
+    Task for periodically checking for tasks whose owner is no longer in the shilling list.
+    """
+    event = GLOBALS.task_leak_check_event
+    event.clear()
+    reported = set()
+    while GLOBALS.running:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), TASK_LEAK_CHECK_DELAY)
+
+        if not GLOBALS.running:
+            break
+
+        ids = _get_shilling_list_ids()
+        orphaned = {
+            task: info for task, info in task_registry.get_registered_tasks()
+            if _is_task_orphaned(info, ids)
+        }
+        new = [info for task, info in orphaned.items() if task not in reported]
+        reported = set(orphaned)
+        if new:
+            trace(
+                lambda: f"Found {len(new)} new task(s) whose owner is no longer in the shilling list: " +
+                ", ".join(f"{info.purpose} ({info.owner_type})" for info in new),
+                TraceLEVELS.WARNING
+            )
+
+
 async def schema_load_from_file() -> None:
     """
     Restores the saved shilling list from file.
@@ -234,7 +381,6 @@ async def initialize(user_callback: Optional[Union[Callable, Coroutine]] = None,
     Any: Any
         Parameters are the same as in :func:`daf.core.run`.
     """
-    loop = asyncio.get_event_loop()
     if accounts is None:
         accounts = []
 
@@ -252,6 +398,7 @@ async def initialize(user_callback: Optional[Union[Callable, Coroutine]] = None,
         debug = TraceLEVELS.NORMAL
 
     tracing.initialize(debug)  # Print trace messages to the console for debugging purposes
+    watchdog.initialize()  # Detect code blocking the event loop
     # ------------------------------------------------------------
     # Initialize logging
     # ------------------------------------------------------------
@@ -289,10 +436,12 @@ async def initialize(user_callback: Optional[Union[Callable, Coroutine]] = None,
         trace("Starting user callback function", TraceLEVELS.NORMAL)
         user_callback = user_callback()
         if isinstance(user_callback, Coroutine):
-            GLOBALS.tasks.append(loop.create_task(user_callback))
+            GLOBALS.tasks.append(task_registry.create_task(user_callback, purpose="user callback"))
 
     if save_to_file:  # Backup shilling list to pickle file
-        GLOBALS.tasks.append(loop.create_task(schema_backup_task()))
+        GLOBALS.tasks.append(task_registry.create_task(schema_backup_task(), purpose="shilling list backup"))
+
+    GLOBALS.tasks.append(task_registry.create_task(task_leak_check_task(), purpose="task leak check"))
 
     GLOBALS.running = True
     GLOBALS.save_to_file = save_to_file
@@ -476,6 +625,68 @@ def get_accounts() -> List[client.ACCOUNT]:
     return GLOBALS.accounts.copy()
 
 
+@doc.doc_category("Tasks")
+def get_tasks() -> List[dict]:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the framework's running tasks (message timers, connections, ...), grouped by the object owning them.
+
+    Returns
+    ---------
+    List[dict]
+        .. code-block:: python
+
+            {
+                "owner_type": str | None,  # None for tasks without an owner
+                "owner_id": int | None,  # The owner's ID (see :func:`daf.misc.instance_track.get_object_id`)
+                "owner_deleted": bool,  # The owner object no longer exists
+                # The owner is no longer in the shilling list (or was deleted), but the tasks are still running
+                "orphaned": bool,
+                "tasks": [
+                    {"name": str, "purpose": str, "created": datetime},
+                    ...
+                ]
+            }
+    """
+    ids = _get_shilling_list_ids()
+    groups = {}
+    for task, info in task_registry.get_registered_tasks():
+        owner = info.owner
+        key = id(owner) if owner is not None else (info.has_owner, info.owner_type)
+        group = groups.get(key)
+        if group is None:
+            owner_id = getattr(owner, "_daf_id", -1)
+            group = groups[key] = {
+                "owner_type": info.owner_type,
+                "owner_id": owner_id if owner_id != -1 else None,
+                "owner_deleted": info.has_owner and owner is None,
+                "orphaned": _is_task_orphaned(info, ids),
+                "tasks": []
+            }
+
+        group["tasks"].append({"name": task.get_name(), "purpose": info.purpose, "created": info.created})
+
+    return list(groups.values())
+
+
+@doc.doc_category("Tasks")
+def check_task_leaks() -> List[dict]:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the tasks whose owner is no longer in the shilling list (or was deleted).
+    The check is also periodically (every 10 minutes) made by the framework, which traces
+    a warning when such tasks are found.
+
+    Returns
+    ---------
+    List[dict]
+        Groups of orphaned tasks, in the same format as :func:`get_tasks`.
+    """
+    return [group for group in get_tasks() if group["orphaned"]]
+
+
 @typechecked
 @doc.doc_category("DAF control reference")
 async def shutdown() -> None:
@@ -488,6 +699,7 @@ async def shutdown() -> None:
     await evt.emit(EventID.g_daf_shutdown)
     # Signal events for tasks to raise out of sleep
     GLOBALS.schema_backup_event.set()  # This also saves one last time, so manually saving is not needed
+    GLOBALS.task_leak_check_event.set()
     for task in GLOBALS.tasks:  # Wait for core tasks to finish
         await task
 
@@ -496,12 +708,17 @@ async def shutdown() -> None:
 
     GLOBALS.accounts.clear()
     evt.remove_listener(EventID.g_account_expired, cleanup_account)
+    await logging.shutdown()
 
     trace("Shutdown complete.", TraceLEVELS.NORMAL)
 
     if remote.GLOBALS.remote_client is not None:
         await remote.GLOBALS.remote_client._close()
 
+    watchdog.shutdown()
+    profiler.stop_profiler()
+    recorder.stop_recording()
+    tracing.shutdown()
     await evt.stop()
 
 
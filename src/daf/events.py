@@ -2,20 +2,145 @@
 Module used to support listening and emitting events.
 It also contains the event loop definitions.
 """
-from asyncio_event_hub import EventController
+from typing import Any, Callable, Coroutine, Deque, Dict, Optional, Tuple
+from asyncio_event_hub import EventController as EventControllerBASE
+from asyncio_event_hub.controller import EventListener
+from collections import deque
 from enum import Enum, auto
+from time import perf_counter
 
+from .misc import doc
 
 
 __all__ = (
     "EventID",
     "EventController",
     "get_global_event_ctrl",
+    "set_listener_profiling",
+    "get_listener_profile",
+    "reset_listener_profile",
 )
 
 
+# Constants
+# ---------------------#
+C_PROFILE_SAMPLES = 1000  # Number of the last durations of each listener, kept for percentiles
+
+
+class ListenerSTATS:
+    """
+    Profiling statistics of a listener (all listeners with the same function name and event).
+    """
+    __slots__ = ("calls", "predicate_calls", "rejections", "predicate_time", "total_time", "samples")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.predicate_calls = 0
+        self.rejections = 0
+        self.predicate_time = 0
+        self.total_time = 0
+        self.samples: Deque[float] = deque(maxlen=C_PROFILE_SAMPLES)
+
+    def add(self, duration: float):
+        self.calls += 1
+        self.total_time += duration
+        self.samples.append(duration)
+
+    def to_dict(self) -> dict:
+        samples = sorted(self.samples)
+
+        def percentile(p: float) -> Optional[float]:
+            return samples[min(int(len(samples) * p), len(samples) - 1)] if samples else None
+
+        return {
+            "calls": self.calls,
+            "predicate_calls": self.predicate_calls,
+            "rejections": self.rejections,
+            "rejection_rate": self.rejections / self.predicate_calls if self.predicate_calls else 0,
+            "predicate_time": self.predicate_time,
+            "total_time": self.total_time,
+            "mean": self.total_time / self.calls if self.calls else None,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+
+class ProfiledLISTENER(EventListener):
+    """
+    Event listener, which records its statistics when profiling is enabled
+    (:func:`set_listener_profiling`).
+    """
+    def __init__(self, event: Any, fnc: Callable, predicate: Optional[Callable] = None) -> None:
+        super().__init__(fnc, predicate)
+        self.key = (
+            event.name if isinstance(event, Enum) else str(event),
+            getattr(fnc, "__qualname__", repr(fnc))
+        )
+
+    @property
+    def predicate(self):
+        if GLOBAL.profiling and self._predicate is not None:
+            return self._profiled_predicate
+
+        return self._predicate
+
+    @predicate.setter
+    def predicate(self, value: Optional[Callable]):
+        self._predicate = value
+
+    def _get_stats(self) -> ListenerSTATS:
+        stats = GLOBAL.profile.get(self.key)
+        if stats is None:
+            stats = GLOBAL.profile[self.key] = ListenerSTATS()
+
+        return stats
+
+    def _profiled_predicate(self, *args, **kwargs):
+        start = perf_counter()
+        result = self._predicate(*args, **kwargs)
+        stats = self._get_stats()
+        stats.predicate_time += perf_counter() - start
+        stats.predicate_calls += 1
+        if not result:
+            stats.rejections += 1
+
+        return result
+
+    def __call__(self, *args: Any, **kwds: Any) -> Any:
+        if not GLOBAL.profiling:
+            return self.fnc(*args, **kwds)
+
+        start = perf_counter()
+        result = self.fnc(*args, **kwds)
+        if isinstance(result, Coroutine):
+            return self._profile_coroutine(result, start)
+
+        self._get_stats().add(perf_counter() - start)
+        return result
+
+    async def _profile_coroutine(self, coro: Coroutine, start: float):
+        try:
+            return await coro
+        finally:
+            self._get_stats().add(perf_counter() - start)
+
+
+class EventController(EventControllerBASE):
+    """
+    Responsible for controlling the event loop, listening and emitting events.
+
+    .. versionchanged:: 4.3.0
+        Listeners can be profiled (:func:`set_listener_profiling`).
+    """
+    def add_listener(self, event: Any, fnc: Callable, predicate: Optional[Callable] = None):
+        self._listeners.setdefault(event, []).append(ProfiledLISTENER(event, fnc, predicate))
+
+
 class GLOBAL:
     g_controller = EventController()
+    profiling = False
+    profile: Dict[Tuple[str, str], ListenerSTATS] = {}  # (event, listener name): statistics
 
 
 def initialize():
@@ -75,3 +200,87 @@ class EventID(Enum):
 
     # Events for use externally (not within daf)
     _ws_disconnect = auto()
+
+
+@doc.doc_category("Event reference")
+def set_listener_profiling(enabled: bool, reset: bool = False):
+    """
+    .. versionadded:: 4.3.0
+
+    Enables or disables profiling of the event listeners (of all the event controllers).
+    While enabled, the number of calls, predicate rejections and call durations of each listener are recorded.
+    The durations include the time spent awaiting inside the listener, during which the event controller
+    does not process other events.
+
+    Parameters
+    ------------
+    enabled: bool
+        Enable profiling.
+    reset: bool
+        Remove the already recorded statistics.
+    """
+    GLOBAL.profiling = enabled
+    if reset:
+        reset_listener_profile()
+
+
+@doc.doc_category("Event reference")
+def reset_listener_profile():
+    """
+    .. versionadded:: 4.3.0
+
+    Removes the recorded listener statistics.
+    """
+    GLOBAL.profile.clear()
+
+
+@doc.doc_category("Event reference")
+def get_listener_profile() -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the recorded listener statistics (see :func:`set_listener_profiling`).
+    Listeners with the same function (e. g., ``GUILD._advertise`` of all guilds) and event are combined.
+
+    Returns
+    ---------
+    dict
+        .. code-block:: python
+
+            {
+                "enabled": bool,
+                # Sorted by total_time, descending
+                "listeners": [
+                    {
+                        "event": str, "listener": str,
+                        "calls": int,  # Listener calls
+                        "predicate_calls": int, "rejections": int, "rejection_rate": float,
+                        "predicate_time": float,  # Seconds spent in the predicate
+                        "total_time": float, "mean": float,  # Seconds spent in the listener
+                        "p50": float, "p95": float, "p99": float  # Of the last 1000 calls
+                    },
+                    ...
+                ],
+                # Sums of the listeners of each event, sorted by total_time, descending
+                "events": [
+                    {"event": str, "calls": int, "predicate_calls": int, "rejections": int, "total_time": float},
+                    ...
+                ]
+            }
+    """
+    listeners = []
+    events = {}
+    for (event, listener), stats in list(GLOBAL.profile.items()):
+        listeners.append({"event": event, "listener": listener, **stats.to_dict()})
+        event_stats = events.setdefault(
+            event, {"event": event, "calls": 0, "predicate_calls": 0, "rejections": 0, "total_time": 0}
+        )
+        for key in ("calls", "predicate_calls", "rejections", "total_time"):
+            event_stats[key] += getattr(stats, key)
+
+    key = lambda item: item["total_time"]
+    return {
+        "enabled": GLOBAL.profiling,
+        "listeners": sorted(listeners, key=key, reverse=True),
+        "events": sorted(events.values(), key=key, reverse=True),
+    }
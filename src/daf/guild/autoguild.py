@@ -8,7 +8,7 @@ from typeguard import typechecked
 from contextlib import suppress
 from copy import deepcopy
 
-from ..misc import async_util, instance_track, doc, attributes
+from ..misc import async_util, instance_track, doc, attributes, task_registry, clock
 from ..logging.tracing import TraceLEVELS, trace
 from ..message import BaseChannelMessage
 from ..logic import BaseLogic
@@ -305,11 +305,14 @@ class AutoGUILD:
     # Non public methods
     def _reset_auto_join_timer(self):
         "Resets the periodic auto guild join timer."
-        self._guild_join_timer_handle = async_util.call_at(
-            self._event_ctrl.emit,
-            GUILD_JOIN_INTERVAL,
-            EventID._trigger_auto_guild_start_join,
-            self
+        self._guild_join_timer_handle = task_registry.register_task(
+            async_util.call_at(
+                self._event_ctrl.emit,
+                GUILD_JOIN_INTERVAL,
+                EventID._trigger_auto_guild_start_join,
+                self
+            ),
+            self, "guild join timer"
         )
 
     @async_util.except_return
@@ -327,17 +330,18 @@ class AutoGUILD:
 
         if self._remove_after is not None:
             if isinstance(self._remove_after, timedelta):
-                self._remove_after = datetime.now().astimezone() + self._remove_after
+                self._remove_after = clock.now() + self._remove_after
             else:
                 self._remove_after = self._remove_after.astimezone()
 
-            self._removal_timer_handle = (
+            self._removal_timer_handle = task_registry.register_task(
                 async_util.call_at(
                     event_ctrl.emit,
                     self._remove_after,
                     EventID._trigger_server_remove,
                     self
-                )
+                ),
+                self, "removal timer"
             )
 
         if len(self._invite_join_count):  # Skip invite query from Discord
@@ -538,8 +542,9 @@ class AutoGUILD:
         for id_, last_uses in counts.items():
             uses = invites[id_]
             if last_uses != uses:
-                trace(f"User {member.name} joined to {member.guild.name} with invite {id_}", TraceLEVELS.DEBUG)
+                trace(lambda: f"User {member.name} joined to {member.guild.name} with invite {id_}", TraceLEVELS.DEBUG)
                 counts[id_] = uses
+                logging.counters.count_invite(self.parent, self)
                 invite_ctx = self._generate_invite_log_context(member, id_)
                 await logging.save_log(self._generate_guild_log_context(member.guild), None, None, invite_ctx)
                 return
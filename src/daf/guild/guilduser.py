@@ -4,7 +4,7 @@
     BaseGUILD class.
 """
 from typing import Any, Coroutine, Union, List, Optional, Dict, Callable
-from ..misc import async_util, instance_track, doc, attributes
+from ..misc import async_util, instance_track, doc, attributes, task_registry, clock
 from ..logging.tracing import TraceLEVELS, trace
 from datetime import timedelta, datetime
 from contextlib import suppress
@@ -15,9 +15,12 @@ from typeguard import typechecked
 from ..message import *
 from ..events import *
 from .. import logging
+from .. import metrics
+from .. import spans
 
 import _discord as discord
 import asyncio
+import time
 
 
 __all__ = (
@@ -280,17 +283,18 @@ class BaseGUILD(ABC):
         self._apiobject = _apiobject
         if self._remove_after is not None:
             if isinstance(self._remove_after, timedelta):
-                self._remove_after = datetime.now().astimezone() + self._remove_after
+                self._remove_after = clock.now() + self._remove_after
             else:
                 self._remove_after = self._remove_after.astimezone()
 
-            self._removal_timer_handle = (
+            self._removal_timer_handle = task_registry.register_task(
                 async_util.call_at(
                     event_ctrl.emit,
                     self._remove_after,
                     EventID._trigger_server_remove,
                     self
-                )
+                ),
+                self, "removal timer"
             )
 
         event_ctrl.add_listener(EventID._trigger_message_ready, self._advertise, lambda server, m: server is self)
@@ -343,13 +347,27 @@ class BaseGUILD(ABC):
 
         This is an event handler.
         """
-        guild_ctx = self.generate_log_context()
-        author_ctx = self.parent.generate_log_context()
-
-        if (message_context := await message._send()) and self.logging:
-            await logging.save_log(guild_ctx, message_context, author_ctx)
+        with spans.span("advertise", message=type(message).__name__, guild=self.snowflake):
+            guild_ctx = self.generate_log_context()
+            author_ctx = self.parent.generate_log_context()
+
+            start = time.perf_counter()
+            metrics.SCHEDULE_LAG.observe((clock.now() - message.period.get()).total_seconds())
+            # The account's events (sends) are processed one at a time, so the difference belongs to this send
+            http = self.parent.client.http
+            rate_limit_sleeps = http.rate_limit_sleeps
+            message_context = await message._send()
+            metrics.SEND_DURATION.observe(time.perf_counter() - start)
+            if message_context:
+                logging.counters.count_message(
+                    self.parent, self, message, message_context, http.rate_limit_sleeps - rate_limit_sleeps
+                )
+                if self.logging:
+                    with spans.span("save_log"):
+                        await logging.save_log(guild_ctx, message_context, author_ctx)
 
-        message._reset_timer()    
+            with spans.span("reset_timer"):  # Calculates the next period
+                message._reset_timer()
 
     @async_util.with_semaphore("update_semaphore")
     async def _close(self):
@@ -588,8 +606,9 @@ class GUILD(BaseGUILD):
         for id_, last_uses in counts.items():
             uses = invites[id_]
             if last_uses != uses:
-                trace(f"User {member.name} joined to {member.guild.name} with invite {id_}", TraceLEVELS.DEBUG)
+                trace(lambda: f"User {member.name} joined to {member.guild.name} with invite {id_}", TraceLEVELS.DEBUG)
                 counts[id_] = uses
+                logging.counters.count_invite(self.parent, self)
                 invite_ctx = self.generate_invite_log_context(member, id_)
                 await logging.save_log(self.generate_log_context(), None, None, invite_ctx)
                 return
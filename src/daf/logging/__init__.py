@@ -2,3 +2,6 @@
 from .sql import *
 from .tracing import *
 from ._logging import *
+from .retention import *
+from .migration import *
+from .counters import *
@@ -10,11 +10,13 @@ from typing import Optional
 
 from ..tracing import trace, TraceLEVELS
 from ...misc import doc
+from ... import metrics
 
 
 class GLOBAL:
     "Singleton for global variables"
     logger = None
+    initialized_logger = None  # The logger is temporarily replaced with the fallback on errors
 
 
 __all__ = (
@@ -47,6 +49,16 @@ async def initialize(logger: LoggerBASE) -> None:
               TraceLEVELS.ERROR)
 
     GLOBAL.logger = logger
+    GLOBAL.initialized_logger = logger
+
+
+async def shutdown() -> None:
+    """
+    Stops the background tasks of the logger (and its fallbacks).
+    """
+    if GLOBAL.initialized_logger is not None:
+        await GLOBAL.initialized_logger.shutdown()
+        GLOBAL.initialized_logger = None
 
 
 @doc.doc_category("Logging reference", path="logging")
@@ -104,6 +116,7 @@ async def save_log(
             await mgr._save_log(guild_context, message_context, author_context, invite_context)
             break
         except Exception as exc:
+            metrics.LOG_FAILURES.inc()
             trace(
                 f"{type(mgr).__name__} failed, falling to {type(mgr.fallback).__name__}",
                 TraceLEVELS.WARNING,
@@ -0,0 +1,169 @@
+"""
+In-memory counters of recent activity (sends, failures, rate limits, invite joins),
+kept at minute resolution for each account, guild and message.
+Unlike the logs, they are not persistent, but can be read without querying the logger.
+"""
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+
+from ..misc import doc, instance_track
+
+import weakref
+import time
+
+
+__all__ = (
+    "get_counters",
+)
+
+
+# Constants
+# ---------------------#
+C_COUNTER_MINUTES = 60  # Number of minutes kept in the ring buffers
+C_COUNTER_KINDS = ("sends", "failed", "rate_limited", "invites")
+
+
+class GLOBALS:
+    counters: Dict[int, "CounterRING"] = {}  # Object's DAF ID: counters
+
+
+class CounterRING:
+    """
+    Fixed-size ring buffer of per-minute counters.
+    Each slot holds the counts of one minute and is reused once the minute is older than
+    ``C_COUNTER_MINUTES``, so the memory use and the update cost are constant.
+    """
+    __slots__ = ("minutes", "counts")
+
+    def __init__(self) -> None:
+        self.minutes: List[Optional[int]] = [None] * C_COUNTER_MINUTES  # Minute (since epoch) of each slot
+        self.counts = [[0] * len(C_COUNTER_KINDS) for _ in range(C_COUNTER_MINUTES)]
+
+    def add(self, minute: int, deltas: Dict[str, int]):
+        """
+        Adds the ``deltas`` (kind: value) to the counters of ``minute``.
+        """
+        slot = minute % C_COUNTER_MINUTES
+        counts = self.counts[slot]
+        if self.minutes[slot] != minute:  # Slot contains an expired minute
+            self.minutes[slot] = minute
+            counts[:] = [0] * len(C_COUNTER_KINDS)
+
+        for kind, value in deltas.items():
+            counts[C_COUNTER_KINDS.index(kind)] += value
+
+    def get(self, minute: int) -> dict:
+        """
+        Returns the counters of the last ``C_COUNTER_MINUTES`` minutes, ending with ``minute``.
+        """
+        series = {kind: [0] * C_COUNTER_MINUTES for kind in C_COUNTER_KINDS}
+        first = minute - C_COUNTER_MINUTES + 1
+        for slot_minute, counts in zip(self.minutes, self.counts):
+            if slot_minute is not None and first <= slot_minute <= minute:
+                for kind, value in zip(C_COUNTER_KINDS, counts):
+                    series[kind][slot_minute - first] = value
+
+        return {
+            "start": datetime.fromtimestamp(first * 60),
+            "totals": {kind: sum(values) for kind, values in series.items()},
+            "series": series,
+        }
+
+
+def _get_minute() -> int:
+    return int(time.time() // 60)
+
+
+def _get_ring(obj: Any) -> CounterRING:
+    id_ = instance_track.get_object_id(obj)
+    ring = GLOBALS.counters.get(id_)
+    if ring is None:
+        ring = GLOBALS.counters[id_] = CounterRING()
+        weakref.finalize(obj, GLOBALS.counters.pop, id_, None)  # IDs can be reused after the object is deleted
+
+    return ring
+
+
+def _add(objects: List[Any], deltas: Dict[str, int]):
+    minute = _get_minute()
+    for obj in objects:
+        if obj is not None:
+            _get_ring(obj).add(minute, deltas)
+
+
+def count_message(account: Any, guild: Any, message: Any, message_context: dict, rate_limits: int = 0):
+    """
+    Updates the counters of the ``account``, ``guild`` and ``message`` with the result of a send attempt.
+
+    Parameters
+    -------------
+    message_context: dict
+        The log context returned by the message's send method.
+    rate_limits: int
+        Number of rate limit (429) responses, which the account's HTTP client retried during the send.
+    """
+    channels = message_context.get("channels")
+    # Rate limits that were not retried (e. g., the retry would take too long) fail the send
+    if channels is not None:
+        failed = channels["failed"]
+        deltas = {
+            "sends": len(channels["successful"]),
+            "failed": len(failed),
+            "rate_limited": rate_limits + sum(channel["reason"].startswith("429") for channel in failed),
+        }
+    else:
+        success_info = message_context["success_info"]
+        success = success_info["success"]
+        deltas = {
+            "sends": int(success),
+            "failed": int(not success),
+            "rate_limited": rate_limits + int(not success and success_info["reason"].startswith("429")),
+        }
+
+    _add([account, guild, message], deltas)
+
+
+def count_invite(account: Any, guild: Any):
+    """
+    Updates the counters of the ``account`` and the ``guild`` with a new member join (through a tracked invite).
+    """
+    _add([account, guild], {"invites": 1})
+
+
+@doc.doc_category("Logging reference", path="logging")
+def get_counters(obj: Any) -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the counters of the last hour (minute resolution) of an account, guild or message.
+
+    The counters are kept in memory and are updated by each send attempt and each member join
+    (through a tracked invite link), regardless of the logging settings.
+    Reading them doesn't query the logger.
+
+    Parameters
+    --------------
+    obj: ACCOUNT | GUILD | USER | AutoGUILD | TextMESSAGE | VoiceMESSAGE | DirectMESSAGE
+        The object to return the counters of.
+
+    Returns
+    ----------
+    dict
+        .. code-block:: python
+
+            {
+                "start": datetime,  # Start of the first minute
+                "totals": {"sends": int, "failed": int, "rate_limited": int, "invites": int},
+                # Counts for each minute, oldest first
+                "series": {"sends": [int, ...], "failed": [int, ...], "rate_limited": [int, ...], "invites": [int, ...]}
+            }
+
+        ``sends`` and ``failed`` are the numbers of channels (or direct messages) the message was
+        successfully / unsuccessfully sent to. ``rate_limited`` is the number of rate limit (429) responses
+        received while sending, including the ones after which the request was retried (and possibly succeeded).
+    """
+    ring = GLOBALS.counters.get(instance_track.get_object_id(obj))
+    if ring is None:
+        ring = CounterRING()
+
+    return ring.get(_get_minute())
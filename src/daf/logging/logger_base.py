@@ -3,12 +3,13 @@ This module is responsible for the logging in daf.
 It contains all the logging classes.
 """
 from datetime import datetime, date
-from typing import Optional, Literal, Union, Tuple, List, Any
+from typing import Optional, Literal, Union, Tuple, List, Any, AsyncIterator
 
 from abc import ABC, abstractmethod
 
 from .tracing import trace, TraceLEVELS
-from ..misc import doc, async_util
+from .retention import RetentionPolicy
+from ..misc import doc, async_util, task_registry
 from ..misc import write_non_exist
 import asyncio
 
@@ -20,6 +21,11 @@ __all__ = (
 # ---------------------#
 C_FILE_NAME_FORBIDDEN_CHAR = ('<', '>', '"', '/', '\\', '|', '?', '*', ":")
 C_FILE_MAX_SIZE = 100000
+C_RETENTION_START_DELAY = 60  # Seconds after initialization, when the retention policy is applied for the first time
+C_RETENTION_BATCH_DELAY = 0.1  # Seconds between removal batches, giving other tasks a chance to log
+
+# (timestamp, guild_context, message_context, author_context, invite_context)
+LogRecord = Tuple[datetime, dict, Optional[dict], Optional[dict], Optional[dict]]
 
 
 @doc.doc_category("Logging reference", path="logging")
@@ -30,6 +36,9 @@ class LoggerBASE(ABC):
 
     .. versionadded:: v2.2
 
+    .. versionchanged:: 4.3.0
+        Parameter ``retention``.
+
     The base class for making loggers.
     This can be used to implement your custom logger as well.
     This does absolutely nothing, and is here just for demonstration.
@@ -38,16 +47,25 @@ class LoggerBASE(ABC):
     ----------------
     fallback: Optional[LoggerBASE]
         The manager to use, in case saving using this manager fails.
+    retention: Optional[RetentionPolicy]
+        Policy for removing old logs, which is periodically applied in the background.
+        Custom loggers that support it need to implement :py:meth:`~LoggerBASE._retention_batches`.
     """
 
     _mutex: asyncio.Lock
 
-    def __init__(self, fallback = None) -> None:
+    def __init__(self, fallback = None, retention: Optional[RetentionPolicy] = None) -> None:
         self.fallback = fallback
+        self.retention = retention
         write_non_exist(self, "_mutex", asyncio.Lock())
+        write_non_exist(self, "_retention_task", None)
 
     async def initialize(self) -> None:
         "Initializes self and the fallback"
+        await self._stop_retention()  # Reinitialized (updated)
+        if self.retention is not None:
+            self._retention_task = task_registry.create_task(self._retention_loop(), self, "log retention")
+
         if self.fallback is not None:
             try:
                 await self.fallback.initialize()
@@ -56,6 +74,27 @@ class LoggerBASE(ABC):
                       TraceLEVELS.WARNING, exc)
                 self.fallback = None
 
+    async def shutdown(self) -> None:
+        """
+        .. versionadded:: 4.3.0
+
+        Stops the background tasks of self and the fallback.
+
+        .. note::
+            This is automatically called when the framework is shut down.
+        """
+        await self._stop_retention()
+        if self.fallback is not None:
+            await self.fallback.shutdown()
+
+    async def _stop_retention(self):
+        "Cancels the retention task and waits for it to stop."
+        task = self._retention_task
+        if task is not None:
+            self._retention_task = None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
     @abstractmethod
     async def _save_log(
         self,
@@ -181,6 +220,117 @@ class LoggerBASE(ABC):
     ) -> list:
         raise NotImplementedError
 
+    async def analytic_iter_message_log(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        cursor: Optional[Tuple[datetime, int]] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[list]:
+        """
+        .. versionadded:: 4.3.0
+
+        Iterates over message logs, without a limit, in chunks (lists) of at most ``chunk_size`` logs.
+        The logs are ordered by their timestamp and index (keyset pagination),
+        which means only one chunk is kept in memory at a time.
+
+        Parameters
+        ---------------
+        cursor: Optional[Tuple[datetime, int]]
+            Keyset cursor - the (timestamp, index / id) of the last log already received.
+            Iteration continues after this log. Obtain it with :py:meth:`get_log_cursor`.
+        chunk_size: int
+            Maximum number of logs in each chunk.
+
+        For the other parameters, see :py:meth:`analytic_get_message_log`.
+        """
+        raise NotImplementedError
+        yield
+
+    async def analytic_iter_invite_log(
+        self,
+        guild: Union[int, None] = None,
+        invite: Union[str, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        cursor: Optional[Tuple[datetime, int]] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[list]:
+        """
+        .. versionadded:: 4.3.0
+
+        Iterates over invite logs, without a limit, in chunks (lists) of at most ``chunk_size`` logs.
+        See :py:meth:`analytic_iter_message_log` for the cursor and chunk parameters
+        and :py:meth:`analytic_get_invite_log` for the rest.
+        """
+        raise NotImplementedError
+        yield
+
+    def get_log_cursor(self, log: Any) -> Tuple[datetime, int]:
+        """
+        .. versionadded:: 4.3.0
+
+        Returns the keyset cursor of a log, returned by
+        :py:meth:`analytic_iter_message_log` or :py:meth:`analytic_iter_invite_log`.
+
+        Parameters
+        -------------
+        log: Any
+            The log to get the cursor of.
+        """
+        return log["timestamp"], int(log["index"])
+
+    def _get_log_record(self, log: Any) -> LogRecord:
+        """
+        Converts a log returned by :py:meth:`analytic_iter_message_log` or :py:meth:`analytic_iter_invite_log`
+        back into the timestamp and the contexts it was saved with.
+        Used for migrating logs into a different logger.
+
+        Parameters
+        -------------
+        log: Any
+            The log to convert.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support migration of logs.")
+
+    async def _save_logs(self, records: List[LogRecord], checkpoint: Optional[Tuple[str, dict]] = None):
+        """
+        Saves multiple logs with their original timestamps.
+        Used for migrating logs from a different logger.
+
+        Parameters
+        -------------
+        records: List[LogRecord]
+            The logs to save, see :py:meth:`_get_log_record`.
+        checkpoint: Optional[Tuple[str, dict]]
+            The (name, state) of the migration, saved atomically with the logs.
+            Only given to loggers that support it, see :py:meth:`_get_migration_checkpoint`.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support migration of logs.")
+
+    async def _get_migration_checkpoint(self, name: str) -> Optional[dict]:
+        """
+        Returns the migration state saved by :py:meth:`_save_logs` (None if nothing was saved yet).
+
+        Parameters
+        -------------
+        name: str
+            Name of the migration.
+
+        Raises
+        ----------
+        NotImplementedError
+            The logger can't save the migration state atomically with the logs.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def delete_logs(self, table: Any, logs: List[Any]):
         """
@@ -195,6 +345,68 @@ class LoggerBASE(ABC):
         """
         raise NotImplementedError
 
+    async def apply_retention(self, policy: Optional[RetentionPolicy] = None) -> int:
+        """
+        .. versionadded:: 4.3.0
+
+        Removes logs according to the retention ``policy``.
+        This is also done periodically in the background, if the logger was given the ``retention`` parameter.
+
+        Parameters
+        -------------
+        policy: Optional[RetentionPolicy]
+            The policy to apply. Defaults to the logger's ``retention`` parameter.
+
+        Returns
+        ----------
+        int
+            The number of removed logs.
+
+        Raises
+        ----------
+        ValueError
+            No policy was given.
+        NotImplementedError
+            The logger does not support retention.
+        """
+        if policy is None:
+            policy = self.retention
+
+        if policy is None:
+            raise ValueError("No retention policy given.")
+
+        removed = 0
+        async for count in self._retention_batches(policy):
+            removed += count
+            await asyncio.sleep(C_RETENTION_BATCH_DELAY)
+
+        if removed:
+            trace(f"{type(self).__name__} removed {removed} logs by the retention policy.", TraceLEVELS.NORMAL)
+
+        return removed
+
+    async def _retention_batches(self, policy: RetentionPolicy) -> AsyncIterator[int]:
+        """
+        Removes logs according to ``policy`` in batches.
+        Each batch must only lock the logger (``_mutex``) while it's being removed
+        and yield the number of logs removed in it.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support retention policies.")
+        yield
+
+    async def _retention_loop(self):
+        """
+        Background task, which periodically applies the retention policy.
+        """
+        await asyncio.sleep(C_RETENTION_START_DELAY)
+        while True:
+            try:
+                await self.apply_retention()
+            except Exception as exc:
+                trace(f"Could not apply the retention policy of {type(self).__name__}.", TraceLEVELS.ERROR, exc)
+
+            await asyncio.sleep(self.retention.interval.total_seconds())
+
     @async_util.with_semaphore("_mutex")
     async def update(self, **kwargs):
         """
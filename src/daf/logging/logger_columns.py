@@ -0,0 +1,301 @@
+"""
+Columnar side store of the file-based loggers.
+
+Each day folder contains a ``.columns`` folder, with one binary file per column.
+Each message log is a single row (a value appended to each column file),
+so the analytics can be calculated without parsing the log files.
+Rows of log files removed by the retention policy are moved into the ``archive`` folder
+(of the same format), so they are still included in the counts.
+The columns are loaded with NumPy (if installed) and filtered / aggregated
+with vectorized operations. Without NumPy, the columns are loaded with the
+:mod:`array` module and processed in pure Python.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from datetime import datetime
+from array import array
+
+import json
+import os
+
+try:
+    import numpy as np
+    NUMPY_INSTALLED = True
+except ImportError:
+    NUMPY_INSTALLED = False
+
+
+# Constants
+# ---------------------#
+C_COLUMNS_DIR = ".columns"
+C_ARCHIVE_DIR = "archive"  # Inside C_COLUMNS_DIR
+C_NAMES_FILE = "names"  # JSON content, but without the extension of log files
+C_EPOCH = datetime(1970, 1, 1)  # Naive timestamps are stored as seconds since this (also naive) moment
+# Column name: array typecode
+C_COLUMNS = {
+    "timestamp": "q",
+    "guild": "q",
+    "author": "q",
+    "guild_type": "b",
+    "message_type": "b",
+    "success_rate": "f",
+}
+# Codes of the type columns (index inside the tuple)
+C_GUILD_TYPES = ("GUILD", "USER")
+C_MESSAGE_TYPES = ("TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE")
+C_DENSE_GROUPS_MAX = 1_000_000  # Max. number of (guild, author) combinations counted without sorting
+
+
+Columns = Dict[str, Union[array, "np.ndarray"]]
+Counts = Dict[Tuple[int, int], List[int]]
+
+
+def get_columns_path(day_path: str, archive: bool = False) -> str:
+    "Returns the path of the columns folder (or of the archived columns if ``archive`` is True) of a day folder."
+    path = os.path.join(day_path, C_COLUMNS_DIR)
+    if archive:
+        path = os.path.join(path, C_ARCHIVE_DIR)
+
+    return path
+
+
+def to_seconds(timestamp: datetime) -> int:
+    "Converts a naive ``timestamp`` into the value of the timestamp column."
+    return int((timestamp - C_EPOCH).total_seconds())
+
+
+def append_row(
+    day_path: str,
+    timestamp: datetime,
+    guild_context: dict,
+    author_context: dict,
+    message_type: str,
+    success_rate: float
+):
+    """
+    Appends a message log to the columns of a day folder.
+    """
+    path = get_columns_path(day_path)
+    os.makedirs(path, exist_ok=True)
+    row = (
+        to_seconds(timestamp),
+        guild_context["id"],
+        author_context["id"],
+        C_GUILD_TYPES.index(guild_context["type"]),
+        C_MESSAGE_TYPES.index(message_type),
+        success_rate
+    )
+    for (name, typecode), value in zip(C_COLUMNS.items(), row):
+        with open(os.path.join(path, name), "ab") as file:
+            array(typecode, (value,)).tofile(file)
+
+    names = read_names(day_path)
+    changed = False
+    for key, context in (("guilds", guild_context), ("authors", author_context)):
+        id_ = str(context["id"])
+        if names[key].get(id_) != context["name"]:
+            names[key][id_] = context["name"]
+            changed = True
+
+    if changed:
+        write_names(day_path, names)
+
+
+def write_rows(day_path: str, logs: Iterable[dict], archive: bool = False):
+    """
+    Replaces the columns of a day folder with the message ``logs``
+    (dictionaries returned by the file loggers' analytic methods).
+    If ``archive`` is True, the ``logs`` are appended to the archived columns instead.
+    """
+    path = get_columns_path(day_path, archive)
+    os.makedirs(path, exist_ok=True)
+    columns = {name: array(typecode) for name, typecode in C_COLUMNS.items()}
+    names = read_names(day_path)
+    for log in logs:
+        guild, author = log["guild"], log["author"]
+        columns["timestamp"].append(to_seconds(log["timestamp"]))
+        columns["guild"].append(guild["id"])
+        columns["author"].append(author["id"])
+        columns["guild_type"].append(C_GUILD_TYPES.index(guild["type"]))
+        columns["message_type"].append(C_MESSAGE_TYPES.index(log["type"]))
+        columns["success_rate"].append(log["success_rate"])
+        names["guilds"][str(guild["id"])] = guild["name"]
+        names["authors"][str(author["id"])] = author["name"]
+
+    for name, column in columns.items():
+        filename = os.path.join(path, name)
+        if archive:
+            with open(filename, "ab") as file:
+                column.tofile(file)
+        else:
+            with open(filename + ".tmp", "wb") as file:
+                column.tofile(file)
+
+            os.replace(filename + ".tmp", filename)
+
+    write_names(day_path, names)
+
+
+def read_names(day_path: str) -> Dict[str, Dict[str, str]]:
+    """
+    Reads the guild and author names (``{"guilds": {id: name}, "authors": {id: name}}``) of a day folder.
+    """
+    try:
+        with open(os.path.join(day_path, C_COLUMNS_DIR, C_NAMES_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {"guilds": {}, "authors": {}}
+
+
+def write_names(day_path: str, names: Dict[str, Dict[str, str]]):
+    path = os.path.join(day_path, C_COLUMNS_DIR, C_NAMES_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(names, file, ensure_ascii=False)
+
+    os.replace(path + ".tmp", path)
+
+
+def read_columns(day_path: str, archive: bool = False) -> Optional[Columns]:
+    """
+    Reads the columns (or the archived columns if ``archive`` is True) of a day folder.
+    Returns None if the columns don't exist or are incomplete.
+    """
+    path = get_columns_path(day_path, archive)
+    columns = {}
+    try:
+        for name, typecode in C_COLUMNS.items():
+            filename = os.path.join(path, name)
+            if NUMPY_INSTALLED:
+                columns[name] = np.fromfile(filename, dtype=np.dtype(typecode))
+            else:
+                column = columns[name] = array(typecode)
+                with open(filename, "rb") as file:
+                    column.frombytes(file.read())
+    except (OSError, ValueError):  # ValueError: partially written row
+        return None
+
+    if len(set(map(len, columns.values()))) != 1:  # Interrupted while appending a row
+        return None
+
+    return columns
+
+
+def count_messages(
+    columns: Columns,
+    after: datetime,
+    before: datetime,
+    guild: Optional[int] = None,
+    author: Optional[int] = None,
+    guild_type: Optional[str] = None,
+    message_type: Optional[str] = None,
+    success_rate: Tuple[float, float] = (0, 100)
+) -> Counts:
+    """
+    Counts the successful (success rate of 100 %) and failed messages of the rows, which match the parameters.
+
+    Returns
+    ----------
+    Dict[Tuple[int, int], List[int]]
+        Mapping of (guild id, author id) to [successful, failed].
+    """
+    if NUMPY_INSTALLED:
+        return _count_messages_numpy(
+            columns, after, before, guild, author, guild_type, message_type, success_rate
+        )
+
+    return _count_messages_python(columns, after, before, guild, author, guild_type, message_type, success_rate)
+
+
+def _count_messages_numpy(
+    columns: Columns,
+    after: datetime,
+    before: datetime,
+    guild: Optional[int],
+    author: Optional[int],
+    guild_type: Optional[str],
+    message_type: Optional[str],
+    success_rate: Tuple[float, float]
+) -> Counts:
+    timestamps = columns["timestamp"]
+    rates = columns["success_rate"]
+    mask = (timestamps >= to_seconds(after)) & (timestamps <= to_seconds(before))
+    if success_rate[0] > 0:
+        mask &= rates >= success_rate[0]
+
+    if success_rate[1] < 100:
+        mask &= rates <= success_rate[1]
+
+    for name, value in (
+        ("guild", guild),
+        ("author", author),
+        ("guild_type", None if guild_type is None else C_GUILD_TYPES.index(guild_type)),
+        ("message_type", None if message_type is None else C_MESSAGE_TYPES.index(message_type)),
+    ):
+        if value is not None:
+            mask &= columns[name] == value
+
+    guilds = columns["guild"][mask]
+    if not guilds.size:
+        return {}
+
+    authors = columns["author"][mask]
+    successful = rates[mask] == 100
+
+    # Factorize each of the id columns and group by the combined (guild, author) code
+    guild_ids, guild_codes = np.unique(guilds, return_inverse=True)
+    author_ids, author_codes = np.unique(authors, return_inverse=True)
+    codes = guild_codes.reshape(-1).astype(np.int64) * author_ids.size + author_codes.reshape(-1)
+    num_groups = guild_ids.size * author_ids.size
+    if num_groups <= C_DENSE_GROUPS_MAX:  # Count directly by code, without sorting the codes
+        totals = np.bincount(codes, minlength=num_groups)
+        num_successful = np.bincount(codes, weights=successful, minlength=num_groups)
+        groups = np.flatnonzero(totals)
+        totals, num_successful = totals[groups], num_successful[groups]
+    else:
+        groups, group_codes = np.unique(codes, return_inverse=True)
+        group_codes = group_codes.reshape(-1)
+        totals = np.bincount(group_codes, minlength=groups.size)
+        num_successful = np.bincount(group_codes, weights=successful, minlength=groups.size)
+
+    num_successful = num_successful.astype(np.int64)
+    return {
+        (int(guild_ids[group // author_ids.size]), int(author_ids[group % author_ids.size])): [
+            int(succ), int(total - succ)
+        ]
+        for group, succ, total in zip(groups.tolist(), num_successful.tolist(), totals.tolist())
+    }
+
+
+def _count_messages_python(
+    columns: Columns,
+    after: datetime,
+    before: datetime,
+    guild: Optional[int],
+    author: Optional[int],
+    guild_type: Optional[str],
+    message_type: Optional[str],
+    success_rate: Tuple[float, float]
+) -> Counts:
+    after, before = to_seconds(after), to_seconds(before)
+    guild_type = None if guild_type is None else C_GUILD_TYPES.index(guild_type)
+    message_type = None if message_type is None else C_MESSAGE_TYPES.index(message_type)
+    counts = {}
+    for timestamp, guild_r, author_r, guild_type_r, message_type_r, rate in zip(
+        *(columns[name] for name in C_COLUMNS)
+    ):
+        if (
+            not after <= timestamp <= before or
+            not success_rate[0] <= rate <= success_rate[1] or
+            guild is not None and guild_r != guild or
+            author is not None and author_r != author or
+            guild_type is not None and guild_type_r != guild_type or
+            message_type is not None and message_type_r != message_type
+        ):
+            continue
+
+        group = counts.get((guild_r, author_r))
+        if group is None:
+            group = counts[(guild_r, author_r)] = [0, 0]
+
+        group[0 if rate == 100 else 1] += 1
+
+    return counts
@@ -7,6 +7,7 @@ from ..misc.instance_track import track_id
 
 from .logger_base import LoggerBASE, C_FILE_NAME_FORBIDDEN_CHAR
 from .logger_file import LoggerFileBASE
+from .retention import RetentionPolicy
 
 import json
 import csv
@@ -44,6 +45,10 @@ class LoggerCSV(LoggerFileBASE):
         The delimiter between columns to use. Defaults to ';'
     fallback: Optional[LoggerBASE]
         The manager to use, in case saving using this manager fails.
+    retention: Optional[RetentionPolicy]
+        Policy for removing old logs, which is periodically applied in the background.
+
+        .. versionadded:: 4.3.0
 
     Raises
     ----------
@@ -57,10 +62,11 @@ class LoggerCSV(LoggerFileBASE):
         self,
         path: str = str(pathlib.Path.home().joinpath("daf/History")),
         delimiter: str = ';',
-        fallback: Optional[LoggerBASE] = None
+        fallback: Optional[LoggerBASE] = None,
+        retention: Optional[RetentionPolicy] = None
     ) -> None:
         self.delimiter = delimiter
-        super().__init__(path, fallback)
+        super().__init__(path, fallback, retention)
 
     async def delete_logs(self, table: Any, logs: List[Any]):
         """
@@ -81,11 +87,20 @@ class LoggerCSV(LoggerFileBASE):
         message_context: Optional[dict] = None,
         author_context: Optional[dict] = None,
         invite_context: Optional[dict] = None
+    ):
+        self._write_log(datetime.now(), guild_context, message_context, author_context, invite_context)
+
+    def _write_log(
+        self,
+        timestruct: datetime,
+        guild_context: dict,
+        message_context: Optional[dict] = None,
+        author_context: Optional[dict] = None,
+        invite_context: Optional[dict] = None
     ):
         if invite_context is not None:  # Not implemented on CSV
             raise NotImplementedError("Invite tracking not available when using LoggerCSV")
 
-        timestruct = datetime.now()
         timestamp = "{:02d}.{:02d}.{:04d} {:02d}:{:02d}:{:02d}".format(timestruct.day, timestruct.month, timestruct.year,
                                                                     timestruct.hour, timestruct.minute, timestruct.second)
 
@@ -127,6 +142,17 @@ class LoggerCSV(LoggerFileBASE):
             except Exception as exc:
                 raise OSError(*exc.args) from exc  # Raise OSError for any type of exceptions
 
+        self._update_columns(
+            logging_output, timestruct.replace(microsecond=0), guild_context, author_context, message_context
+        )
+        self._update_manifest(
+            logging_output,
+            guild_context,
+            timestruct.replace(microsecond=0),
+            author_context["id"],
+            message_context["type"]
+        )
+
     def _get_msg_log_process_file(
         self,
         guild,
@@ -179,13 +205,7 @@ class LoggerCSV(LoggerFileBASE):
                 guild_ctx = {"type": guild_type_r, "name": guild_name, "id": guild_id}
                 author_ctx = {"name": author_name, "id": author_id}
 
-                if dm_success is not None:
-                    calc_success_rate = 0.0 if not dm_success["success"] else 1.0
-                else:
-                    calc_success_rate = (
-                        100.0 * len(channels["successful"]) /
-                        (len(channels["successful"]) + len(channels["failed"]))
-                    )
+                calc_success_rate = self._calc_success_rate({"channels": channels, "success_info": dm_success})
 
                 if calc_success_rate < success_rate[0] or calc_success_rate > success_rate[1]: 
                     continue
@@ -195,6 +215,7 @@ class LoggerCSV(LoggerFileBASE):
                     "timestamp": stamp,
                     "sent_data": sent_data,
                     "channels": channels,
+                    "success_info": dm_success,
                     "type": message_type_r,
                     "mode": send_mode,
                     "author": author_ctx,
@@ -204,6 +225,15 @@ class LoggerCSV(LoggerFileBASE):
 
         return logs
     
+    def _get_manifest_records(self, filename: str):
+        with open(filename, encoding="utf-8") as file:
+            for index, stamp, guild_type, _, guild_id, _, author_id, message_type, *_ in csv.reader(
+                file, delimiter=self.delimiter
+            ):
+                date, time_d = stamp.split(' ')
+                stamp = datetime(*map(int, reversed(date.split('.'))), *map(int, time_d.split(':')))
+                yield {"id": int(guild_id), "type": guild_type}, stamp, int(author_id), message_type, None
+
     async def analytic_get_invite_log(self, *arg, **kwargs):
         raise NotImplementedError
     
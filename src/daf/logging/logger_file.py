@@ -1,29 +1,53 @@
 """
 Implements common functionality of file-based loggers.
 """
-from typing import Union, Tuple, Literal, Optional, Iterator, get_args
+from typing import Union, Tuple, Literal, Optional, Iterator, AsyncIterator, Callable, Dict, List, get_args
+from contextlib import suppress
 from pathlib import Path
 from time import time
-from datetime import datetime
+from datetime import datetime, date
 from abc import abstractmethod
 
-from .logger_base import LoggerBASE
-from ..logging.tracing import trace
+from .logger_base import LoggerBASE, LogRecord
+from .retention import RetentionPolicy
+from . import logger_columns
+from ..logging.tracing import trace, TraceLEVELS
+from ..misc import async_util
 
+import asyncio
+import shutil
+import json
 import os
 
 
+# Constants
+# ---------------------#
+C_MANIFEST_NAME = ".manifest"  # JSON content, but named so it never matches log files
+
+
 class LoggerFileBASE(LoggerBASE):
+    """
+    .. versionchanged:: 4.3.0
+
+        Each day folder contains a manifest file (.manifest), which summarizes the log files in the folder.
+        It is updated on each log and used by the analytic methods to skip files that can't match the query.
+        The manifest of existing log folders can be created with :py:meth:`rebuild_manifest`.
+
+        Each day folder also contains a columnar store (.columns folder) of the message logs,
+        from which :py:meth:`analytic_get_num_messages` calculates the counts.
+        The counts are calculated with NumPy if it is installed (``pip install discord-advert-framework[analytics]``).
+    """
     EXTENSION = NotImplemented
 
     def __init__(
         self,
         path: str = str(Path.home().joinpath("daf/History")),
-        fallback: Optional[LoggerBASE] = None
+        fallback: Optional[LoggerBASE] = None,
+        retention: Optional[RetentionPolicy] = None
     ) -> None:
         self.path = path
         self._sequence_number = 0
-        super().__init__(fallback)
+        super().__init__(fallback, retention)
 
     def initialize(self):
         trace(f"{type(self).__name__} logs will be saved to {self.path}")
@@ -52,6 +76,546 @@ class LoggerFileBASE(LoggerBASE):
                 if filename.endswith(filetype):
                     yield os.path.join(path, filename)
 
+    def _get_log_files(
+        self,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Optional[Tuple[float, float]] = None,
+        **filters
+    ) -> Iterator[str]:
+        """
+        Yields paths of log files that can contain logs matching the parameters.
+        Day folders outside of the [after, before] range are skipped
+        and the files inside day folders are filtered with the folder's manifest.
+
+        Parameters
+        ------------
+        success_rate: Optional[Tuple[float, float]]
+            Range of the message success rate. See :py:meth:`~LoggerFileBASE._get_day_files`.
+        filters
+            Filters (guild, author, guild_type, message_type, invite).
+            See :py:meth:`~LoggerFileBASE._manifest_match`.
+        """
+        after = after or datetime.min
+        before = before or datetime.max
+        for _, day_path in self._get_day_dirs(after, before):
+            yield from self._get_day_files(day_path, after, before, success_rate, **filters)
+
+    def _get_day_files(
+        self,
+        day_path: str,
+        after: datetime,
+        before: datetime,
+        success_rate: Optional[Tuple[float, float]] = None,
+        **filters
+    ) -> Iterator[str]:
+        """
+        Yields paths of log files inside a day folder, that can contain logs matching the parameters.
+        If ``success_rate`` is given, the entire folder is skipped when none of the rows
+        in the folder's columnar store match.
+        """
+        if success_rate is not None and tuple(success_rate) != (0, 100):
+            columns = self._read_day_columns(day_path)
+            if columns is not None and not logger_columns.count_messages(
+                columns, after, before, success_rate=success_rate, **filters
+            ):
+                return
+
+        manifest = self._read_manifest(day_path)
+        for filename in os.listdir(day_path):
+            if not filename.endswith(self.EXTENSION):
+                continue
+
+            path = os.path.join(day_path, filename)
+            entry = manifest.get(filename)
+            # Files without an (up-to-date) entry can't be skipped
+            if (
+                entry is not None and
+                entry["size"] == os.path.getsize(path) and
+                not self._manifest_match(entry, after, before, **filters)
+            ):
+                continue
+
+            yield path
+
+    @staticmethod
+    def _manifest_match(
+        entry: dict,
+        after: datetime,
+        before: datetime,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        invite: Union[str, None] = None
+    ) -> bool:
+        """
+        Returns True if the file described by the manifest ``entry`` can contain logs matching the parameters.
+        """
+        if entry["min_timestamp"] is None:  # No logs
+            return False
+
+        return not (
+            guild is not None and entry["guild_id"] != guild or
+            guild_type is not None and entry["guild_type"] != guild_type or
+            author is not None and author not in entry["authors"] or
+            message_type is not None and message_type not in entry["message_types"] or
+            invite is not None and invite not in entry["invites"] or
+            datetime.fromisoformat(entry["max_timestamp"]) < after or
+            datetime.fromisoformat(entry["min_timestamp"]) > before
+        )
+
+    @staticmethod
+    def _read_manifest(day_path: Union[str, Path]) -> Dict[str, dict]:
+        """
+        Reads the manifest of a day folder. Returns an empty manifest if it does not exist or is invalid.
+        """
+        try:
+            with open(os.path.join(day_path, C_MANIFEST_NAME), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_manifest(day_path: Union[str, Path], manifest: Dict[str, dict]):
+        """
+        Writes the manifest of a day folder. The file is replaced atomically.
+        """
+        path = os.path.join(day_path, C_MANIFEST_NAME)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def _new_manifest_entry(guild_context: dict) -> dict:
+        """
+        Creates a manifest entry of a file without any logs.
+        """
+        return {
+            "guild_id": guild_context["id"],
+            "guild_type": guild_context["type"],
+            "authors": [],
+            "message_types": [],
+            "invites": [],
+            "min_timestamp": None,
+            "max_timestamp": None,
+            "count": 0,
+            "messages": 0,
+            "size": 0
+        }
+
+    @classmethod
+    def _manifest_add(
+        cls,
+        entry: Optional[dict],
+        guild_context: dict,
+        timestamp: datetime,
+        author_id: Optional[int] = None,
+        message_type: Optional[str] = None,
+        invite_id: Optional[str] = None
+    ) -> dict:
+        """
+        Adds a record (log) to the manifest ``entry`` of a file. A new entry is created if ``entry`` is None.
+        """
+        if entry is None:
+            entry = cls._new_manifest_entry(guild_context)
+
+        for key, value in (("authors", author_id), ("message_types", message_type), ("invites", invite_id)):
+            if value is not None and value not in entry[key]:
+                entry[key].append(value)
+
+        stamp = timestamp.isoformat()
+        if entry["min_timestamp"] is None or timestamp < datetime.fromisoformat(entry["min_timestamp"]):
+            entry["min_timestamp"] = stamp
+
+        if entry["max_timestamp"] is None or timestamp > datetime.fromisoformat(entry["max_timestamp"]):
+            entry["max_timestamp"] = stamp
+
+        entry["count"] += 1
+        if message_type is not None:
+            entry["messages"] += 1
+
+        return entry
+
+    def _update_manifest(
+        self,
+        path: Path,
+        guild_context: dict,
+        timestamp: datetime,
+        author_id: Optional[int] = None,
+        message_type: Optional[str] = None,
+        invite_id: Optional[str] = None
+    ):
+        """
+        Updates the manifest after a log was written into file ``path``.
+        Errors are only traced as the manifest is not needed for the logs to be valid.
+        """
+        try:
+            manifest = self._read_manifest(path.parent)
+            entry = self._manifest_add(
+                manifest.get(path.name), guild_context, timestamp, author_id, message_type, invite_id
+            )
+            entry["size"] = path.stat().st_size
+            manifest[path.name] = entry
+            self._write_manifest(path.parent, manifest)
+        except Exception as exc:
+            trace(f"Could not update the log manifest of {path}.", TraceLEVELS.WARNING, exc)
+
+    def _move_manifest_entry(self, day_path: Path, old_name: str, new_name: str):
+        """
+        Moves the manifest entry of a renamed log file.
+        """
+        manifest = self._read_manifest(day_path)
+        if old_name in manifest:
+            manifest[new_name] = manifest.pop(old_name)
+            self._write_manifest(day_path, manifest)
+
+    def _build_manifest_entry(self, filename: str) -> dict:
+        """
+        Creates a manifest entry of a log file from its content.
+        """
+        entry = None
+        for guild_context, timestamp, author_id, message_type, invite_id in self._get_manifest_records(filename):
+            entry = self._manifest_add(entry, guild_context, timestamp, author_id, message_type, invite_id)
+
+        if entry is None:  # Empty file
+            entry = self._new_manifest_entry({"id": None, "type": None})
+
+        entry["size"] = os.path.getsize(filename)
+        return entry
+
+    def _rebuild_day_manifest(self, day_path: str):
+        """
+        Rebuilds the manifest of a single day folder.
+        """
+        manifest = {}
+        for filename in os.listdir(day_path):
+            if filename.endswith(self.EXTENSION):
+                manifest[filename] = self._build_manifest_entry(os.path.join(day_path, filename))
+
+        self._write_manifest(day_path, manifest)
+
+    def _update_columns(
+        self,
+        path: Path,
+        timestamp: datetime,
+        guild_context: dict,
+        author_context: dict,
+        message_context: dict
+    ):
+        """
+        Appends a message log to the columnar store, after it was written into file ``path``.
+        Errors are only traced as the columns are not needed for the logs to be valid.
+        """
+        try:
+            logger_columns.append_row(
+                str(path.parent),
+                timestamp,
+                guild_context,
+                author_context,
+                message_context["type"],
+                self._calc_success_rate(message_context)
+            )
+        except Exception as exc:
+            trace(f"Could not update the log columns of {path.parent}.", TraceLEVELS.WARNING, exc)
+
+    def _rebuild_day_columns(self, day_path: str):
+        """
+        Rebuilds the columnar store of a single day folder.
+        """
+        logs = []
+        for filename in os.listdir(day_path):
+            if filename.endswith(self.EXTENSION):
+                logs.extend(
+                    self._get_msg_log_process_file(
+                        None, None, datetime.min, datetime.max, (0, 100), None, None, [],
+                        os.path.join(day_path, filename)
+                    )
+                )
+
+        logger_columns.write_rows(day_path, logs)
+
+    def _read_day_columns(self, day_path: str) -> Optional[logger_columns.Columns]:
+        """
+        Reads the columnar store of a day folder.
+        Returns None if the columns don't match the log files (according to the manifest),
+        in which case the log files need to be read instead.
+        """
+        manifest = self._read_manifest(day_path)
+        num_messages = 0
+        for filename in os.listdir(day_path):
+            if not filename.endswith(self.EXTENSION):
+                continue
+
+            entry = manifest.get(filename)
+            if (
+                entry is None or "messages" not in entry or
+                entry["size"] != os.path.getsize(os.path.join(day_path, filename))
+            ):
+                return None
+
+            num_messages += entry["messages"]
+
+        columns = logger_columns.read_columns(day_path)
+        if columns is None or len(columns["timestamp"]) != num_messages:
+            return None
+
+        return columns
+
+    @async_util.with_semaphore("_mutex")
+    async def rebuild_manifest(self):
+        """
+        .. versionadded:: 4.3.0
+
+        (Re)builds the manifest and the columnar store of every day folder, from the log files.
+        Use this for logs created with older versions or after modifying the log files manually.
+
+        Raises
+        ----------
+        OSError
+            Could not read the logs or write the manifest.
+        """
+        count = 0
+        for _, day_path in self._get_day_dirs(datetime.min, datetime.max):
+            self._rebuild_day_manifest(day_path)
+            self._rebuild_day_columns(day_path)
+            count += 1
+            await asyncio.sleep(0)
+
+        trace(f"Rebuilt manifest of {count} day folders in {self.path}.")
+
+    def _get_fresh_manifest(self, day_path: str) -> Dict[str, dict]:
+        """
+        Returns the manifest of a day folder, with the outdated and missing entries rebuilt.
+        """
+        manifest = self._read_manifest(day_path)
+        filenames = [filename for filename in os.listdir(day_path) if filename.endswith(self.EXTENSION)]
+        changed = False
+        for filename in filenames:
+            path = os.path.join(day_path, filename)
+            entry = manifest.get(filename)
+            if entry is None or entry["size"] != os.path.getsize(path):
+                manifest[filename] = self._build_manifest_entry(path)
+                changed = True
+
+        for filename in set(manifest).difference(filenames):
+            del manifest[filename]
+            changed = True
+
+        if changed:
+            self._write_manifest(day_path, manifest)
+
+        return manifest
+
+    async def _retention_batches(self, policy: RetentionPolicy) -> AsyncIterator[int]:
+        """
+        Removes day folders and log files according to ``policy``, a single day folder at a time.
+        The folders are processed from the newest to the oldest, so the newest files of each guild are kept.
+        The (blocking) file operations are run in an executor, so the event loop is not blocked.
+        """
+        now = datetime.now()
+        max_age = (now - policy.max_age).date() if policy.max_age is not None else None
+        aggregates_only = (
+            (now - policy.aggregates_only_after).date() if policy.aggregates_only_after is not None else None
+        )
+        guild_logs: Dict[int, int] = {}  # Number of kept logs per guild
+        guild_bytes: Dict[int, int] = {}  # Size of kept files per guild
+        loop = asyncio.get_running_loop()
+        days = await loop.run_in_executor(None, list, self._get_day_dirs(datetime.min, datetime.max, reverse=True))
+        for day, day_path in days:
+            async with self._mutex:
+                if max_age is not None and day < max_age:
+                    removed = await loop.run_in_executor(None, self._remove_day, day_path)
+                else:
+                    removed = await loop.run_in_executor(
+                        None, self._compact_day,
+                        policy, day_path, aggregates_only is not None and day < aggregates_only,
+                        guild_logs, guild_bytes
+                    )
+
+            yield removed
+
+    def _remove_day(self, day_path: str) -> int:
+        """
+        Removes a day folder (and the month and year folders, if left empty).
+
+        Returns
+        ----------
+        int
+            Number of removed logs.
+        """
+        removed = sum(entry["count"] for entry in self._get_fresh_manifest(day_path).values())
+        shutil.rmtree(day_path)
+        with suppress(OSError):  # Remove month and year folders if they are empty
+            os.rmdir(os.path.dirname(day_path))
+            os.rmdir(os.path.dirname(os.path.dirname(day_path)))
+
+        return removed
+
+    def _compact_day(
+        self,
+        policy: RetentionPolicy,
+        day_path: str,
+        remove_all: bool,
+        guild_logs: Dict[int, int],
+        guild_bytes: Dict[int, int]
+    ) -> int:
+        """
+        Removes log files of a day folder, which are over the per-guild limits of ``policy``
+        (or all of them if ``remove_all`` is True).
+        The message logs of removed files are moved to the archived columns, so they are still counted.
+
+        Parameters
+        ------------
+        guild_logs: Dict[int, int]
+            Number of logs kept (in newer files) for each guild. Updated with the kept files.
+        guild_bytes: Dict[int, int]
+            Size of files kept (newer files) for each guild. Updated with the kept files.
+
+        Returns
+        ----------
+        int
+            Number of removed logs.
+        """
+        manifest = self._get_fresh_manifest(day_path)
+        to_remove = []
+        # Newest files first
+        for filename, entry in sorted(manifest.items(), key=lambda item: item[1]["max_timestamp"] or "", reverse=True):
+            guild_id = entry["guild_id"]
+            num_logs = guild_logs.get(guild_id, 0)
+            num_bytes = guild_bytes.get(guild_id, 0)
+            if (
+                remove_all or
+                policy.max_logs_per_guild is not None and num_logs >= policy.max_logs_per_guild or
+                policy.max_bytes_per_guild is not None and num_bytes >= policy.max_bytes_per_guild
+            ):
+                to_remove.append(filename)
+            else:
+                guild_logs[guild_id] = num_logs + entry["count"]
+                guild_bytes[guild_id] = num_bytes + entry["size"]
+
+        if not to_remove:
+            return 0
+
+        logs = []
+        for filename in to_remove:
+            logs.extend(
+                self._get_msg_log_process_file(
+                    None, None, datetime.min, datetime.max, (0, 100), None, None, [],
+                    os.path.join(day_path, filename)
+                )
+            )
+
+        logger_columns.write_rows(day_path, logs, archive=True)
+        removed = 0
+        for filename in to_remove:
+            os.remove(os.path.join(day_path, filename))
+            removed += manifest.pop(filename)["count"]
+
+        self._write_manifest(day_path, manifest)
+        self._rebuild_day_columns(day_path)
+        return removed
+
+    @abstractmethod
+    def _get_manifest_records(
+        self,
+        filename: str
+    ) -> Iterator[Tuple[dict, datetime, Optional[int], Optional[str], Optional[str]]]:
+        """
+        Yields (guild context, timestamp, author id, message type, invite id) of each log inside a file.
+        """
+        raise NotImplementedError
+
+    def _get_day_dirs(self, after: datetime, before: datetime, reverse: bool = False) -> Iterator[Tuple[date, str]]:
+        """
+        Yields the (date, path) pairs of ``Year/Month/Day`` log folders,
+        which are inside the [after, before] range, ordered by date.
+        Folders outside the range are not traversed.
+        """
+        def get_sorted_dirs(path: str):
+            dirs = []
+            with suppress(FileNotFoundError):
+                for entry in os.scandir(path):
+                    if entry.is_dir() and entry.name.isnumeric():
+                        dirs.append((int(entry.name), entry.path))
+
+            return sorted(dirs, reverse=reverse)
+
+        after, before = after.date(), before.date()
+        for year, year_path in get_sorted_dirs(self.path):
+            if not after.year <= year <= before.year:
+                continue
+
+            for month, month_path in get_sorted_dirs(year_path):
+                if not (after.year, after.month) <= (year, month) <= (before.year, before.month):
+                    continue
+
+                for day, day_path in get_sorted_dirs(month_path):
+                    with suppress(ValueError):  # Not a valid date
+                        day = date(year, month, day)
+                        if after <= day <= before:
+                            yield day, day_path
+
+    async def _iter_logs(
+        self,
+        process_file: Callable[[str], list],
+        after: Union[datetime, None],
+        before: Union[datetime, None],
+        sort_by_direction: Literal["asc", "desc"],
+        cursor: Optional[Tuple[datetime, int]],
+        chunk_size: int,
+        **filters
+    ) -> AsyncIterator[list]:
+        """
+        Iterates logs in chunks, ordered by their cursor (timestamp, index).
+        The log files are read one day at a time, so only logs of a single day are kept in memory.
+
+        Parameters
+        -------------
+        process_file: Callable[[str], list]
+            Function that returns the (filtered) logs of a file.
+        filters
+            Filters used for skipping files with the manifest. See :py:meth:`~LoggerFileBASE._manifest_match`.
+        """
+        if after is None:
+            after = datetime.min
+
+        if before is None:
+            before = datetime.max
+
+        reverse = sort_by_direction == "desc"
+        if cursor is not None:
+            cursor = tuple(cursor)
+            # Days before (after if reversed) the cursor can be skipped entirely
+            if reverse:
+                before = min(before, cursor[0])
+            else:
+                after = max(after, cursor[0])
+
+        chunk = []
+        for _, day_path in self._get_day_dirs(after, before, reverse):
+            logs = []
+            for filename in self._get_day_files(day_path, after, before, **filters):
+                logs.extend(process_file(filename))
+
+            logs.sort(key=self.get_log_cursor, reverse=reverse)
+            for log in logs:
+                if cursor is not None:
+                    key = self.get_log_cursor(log)
+                    if key >= cursor if reverse else key <= cursor:
+                        continue
+
+                chunk.append(log)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+
+            await asyncio.sleep(0)  # Don't block other tasks while processing a large tree
+
+        if chunk:
+            yield chunk
+
     async def analytic_get_message_log(
         self,
         guild: Union[int, None] = None,
@@ -72,7 +636,9 @@ class LoggerFileBASE(LoggerBASE):
             before = datetime.max
 
         logs = []
-        for filename in self._get_files(self.EXTENSION):
+        for filename in self._get_log_files(
+            after, before, success_rate, guild=guild, author=author, guild_type=guild_type, message_type=message_type
+        ):
             logs.extend(
                 self._get_msg_log_process_file(
                     guild,
@@ -93,6 +659,38 @@ class LoggerFileBASE(LoggerBASE):
 
         return sorted_
 
+    async def analytic_iter_message_log(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        cursor: Optional[Tuple[datetime, int]] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[list]:
+        def process_file(filename: str):
+            return self._get_msg_log_process_file(
+                guild,
+                author,
+                after or datetime.min,
+                before or datetime.max,
+                success_rate,
+                guild_type,
+                message_type,
+                [],
+                filename
+            )
+
+        async for chunk in self._iter_logs(
+            process_file, after, before, sort_by_direction, cursor, chunk_size, success_rate=success_rate,
+            guild=guild, author=author, guild_type=guild_type, message_type=message_type
+        ):
+            yield chunk
+
     async def analytic_get_num_messages(
         self,
         guild: Union[int, None] = None,
@@ -106,18 +704,11 @@ class LoggerFileBASE(LoggerBASE):
         limit: int = 500,
         group_by: Literal["year", "month", "day"] = "day"
     ) -> list:
-        logs = await self.analytic_get_message_log(
-            guild,
-            author,
-            after,
-            before,
-            guild_type=guild_type,
-            message_type=message_type,
-            limit=None
-        )
-        cuts = {}
-        if not len(logs):
-            return []
+        if after is None:
+            after = datetime.min
+
+        if before is None:
+            before = datetime.max
 
         regions = ["day", "month", "year"]
         regions_left = list(reversed(regions[regions.index(group_by):]))
@@ -127,28 +718,48 @@ class LoggerFileBASE(LoggerBASE):
         def get_region_text(stamp):
             return '-'.join(f"{getattr(stamp, region):02d}" for region in regions_left)
 
-        for log in logs:
-            time_group = get_region_text(log["timestamp"])
-            guild = log["guild"]
-            author = log["author"]
-            group_value = time_group, guild["id"], author["id"]
-            if group_value not in cuts:
-                cut_group = cuts[group_value] = [
-                    time_group,
-                    0,
-                    0,
-                    guild["id"],
-                    guild["name"],
-                    author["id"],
-                    author["name"]
-                ]
+        cuts = {}
+        filters = dict(guild=guild, author=author, guild_type=guild_type, message_type=message_type)
+        # Days are counted separately (from the columnar store when possible) and then merged into groups
+        for day, day_path in self._get_day_dirs(after, before):
+            columns = self._read_day_columns(day_path)
+            if columns is not None:
+                counts = logger_columns.count_messages(columns, after, before, **filters)
+                names = logger_columns.read_names(day_path)
             else:
-                cut_group = cuts[group_value]
+                counts, names = self._count_day_messages(day_path, after, before, **filters)
 
-            if log["success_rate"] == 100:
-                cut_group[1] += 1
-            else:
-                cut_group[2] += 1
+            sources = [(counts, names)]
+            # Logs removed by the retention policy, whose counts are kept
+            archive = logger_columns.read_columns(day_path, archive=True)
+            if archive is not None:
+                sources.append(
+                    (
+                        logger_columns.count_messages(archive, after, before, **filters),
+                        logger_columns.read_names(day_path)
+                    )
+                )
+
+            time_group = get_region_text(day)
+            for counts, names in sources:
+                for (guild_id, author_id), (successful, failed) in counts.items():
+                    group_value = time_group, guild_id, author_id
+                    if group_value not in cuts:
+                        cuts[group_value] = [
+                            time_group,
+                            0,
+                            0,
+                            guild_id,
+                            names["guilds"].get(str(guild_id)),
+                            author_id,
+                            names["authors"].get(str(author_id))
+                        ]
+
+                    cut_group = cuts[group_value]
+                    cut_group[1] += successful
+                    cut_group[2] += failed
+
+            await asyncio.sleep(0)
 
         # key: first index is timestamp group, so offset by one and then calculate index by annotation position
         return sorted(
@@ -157,6 +768,90 @@ class LoggerFileBASE(LoggerBASE):
             reverse=sort_by_direction == "desc"
         )[:limit]
 
+    def _count_day_messages(
+        self,
+        day_path: str,
+        after: datetime,
+        before: datetime,
+        **filters
+    ) -> Tuple[logger_columns.Counts, Dict[str, Dict[str, str]]]:
+        """
+        Counts the successful and failed messages of a day folder by reading its log files.
+        Used when the folder's columnar store is missing or outdated.
+
+        Returns
+        ----------
+        Tuple[Dict[Tuple[int, int], List[int]], Dict[str, Dict[str, str]]]
+            Counts in the format of :func:`~daf.logging.logger_columns.count_messages`
+            and the names in the format of :func:`~daf.logging.logger_columns.read_names`.
+        """
+        counts = {}
+        names = {"guilds": {}, "authors": {}}
+        for filename in self._get_day_files(day_path, after, before, **filters):
+            for log in self._get_msg_log_process_file(
+                filters["guild"], filters["author"], after, before, (0, 100),
+                filters["guild_type"], filters["message_type"], [], filename
+            ):
+                guild, author = log["guild"], log["author"]
+                group = counts.get((guild["id"], author["id"]))
+                if group is None:
+                    group = counts[(guild["id"], author["id"])] = [0, 0]
+                    names["guilds"].setdefault(str(guild["id"]), guild["name"])
+                    names["authors"].setdefault(str(author["id"]), author["name"])
+
+                group[0 if log["success_rate"] == 100 else 1] += 1
+
+        return counts, names
+
+    @staticmethod
+    def _calc_success_rate(message: dict) -> float:
+        """
+        Calculates the success rate (in percents) of a message log.
+        """
+        channel_ctx = message.get("channels")
+        if channel_ctx is not None:
+            len_s = len(channel_ctx["successful"])
+            len_total = len(channel_ctx["failed"]) + len_s
+            calc_success_rate = 100.00 * len_s / len_total if len_total else 0.0
+        else:
+            calc_success_rate = 100.00 if message["success_info"]["success"] else 0.0
+
+        return calc_success_rate
+
     @abstractmethod
     def _get_msg_log_process_file(self):
         raise NotImplementedError
+
+    @abstractmethod
+    def _write_log(
+        self,
+        timestruct: datetime,
+        guild_context: dict,
+        message_context: Optional[dict] = None,
+        author_context: Optional[dict] = None,
+        invite_context: Optional[dict] = None
+    ):
+        """
+        Writes a log with the timestamp ``timestruct`` into the log file.
+        """
+        raise NotImplementedError
+
+    def _get_log_record(self, log: dict) -> LogRecord:
+        log = log.copy()
+        timestamp = log.pop("timestamp")
+        guild_context = log.pop("guild").copy()  # Contexts get modified when written and can be shared by logs
+        if "member" in log:  # Invite log
+            invite_context = {"id": log["invite"].rsplit("/", 1)[-1], "member": log["member"].copy()}
+            return timestamp, guild_context, None, None, invite_context
+
+        author_context = log.pop("author").copy()
+        for key in ("index", "success_rate"):
+            del log[key]
+
+        message_context = {key: value for key, value in log.items() if value is not None and value != ""}
+        return timestamp, guild_context, message_context, author_context, None
+
+    @async_util.with_semaphore("_mutex")
+    async def _save_logs(self, records: List[LogRecord], checkpoint: Optional[Tuple[str, dict]] = None):
+        for record in records:
+            self._write_log(*record)
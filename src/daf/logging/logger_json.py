@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Literal, List, Set, get_args, Iterator
+from typing import Optional, Literal, List, Set, Tuple, AsyncIterator, get_args, Iterator
 
 from .tracing import trace
 from ..misc import doc, async_util
@@ -7,6 +7,7 @@ from ..misc.instance_track import track_id
 
 from .logger_base import C_FILE_NAME_FORBIDDEN_CHAR, C_FILE_MAX_SIZE, LoggerBASE
 from .logger_file import LoggerFileBASE
+from .retention import RetentionPolicy
 
 import json
 import pathlib
@@ -41,6 +42,10 @@ class LoggerJSON(LoggerFileBASE):
         Path to the folder where logs will be saved. Defaults to /<user-home>/daf/History
     fallback: Optional[LoggerBASE]
         The manager to use, in case saving using this manager fails.
+    retention: Optional[RetentionPolicy]
+        Policy for removing old logs, which is periodically applied in the background.
+
+        .. versionadded:: 4.3.0
 
     Raises
     ----------
@@ -54,9 +59,10 @@ class LoggerJSON(LoggerFileBASE):
     def __init__(
         self,
         path: str = str(pathlib.Path.home().joinpath("daf/History")),
-        fallback: Optional[LoggerBASE] = None
+        fallback: Optional[LoggerBASE] = None,
+        retention: Optional[RetentionPolicy] = None
     ) -> None:
-        super().__init__(path, fallback)
+        super().__init__(path, fallback, retention)
 
     @async_util.with_semaphore("_mutex")
     async def _save_log(
@@ -65,6 +71,16 @@ class LoggerJSON(LoggerFileBASE):
         message_context: Optional[dict] = None,
         author_context: Optional[dict] = None,
         invite_context: Optional[dict] = None
+    ):
+        self._write_log(datetime.now(), guild_context, message_context, author_context, invite_context)
+
+    def _write_log(
+        self,
+        timestruct: datetime,
+        guild_context: dict,
+        message_context: Optional[dict] = None,
+        author_context: Optional[dict] = None,
+        invite_context: Optional[dict] = None
     ):
         def replace_strings(name: str):
             return "".join(
@@ -73,7 +89,6 @@ class LoggerJSON(LoggerFileBASE):
                 else "#" for char in name
             )
 
-        timestruct = datetime.now()
         timestamp = "{:02d}.{:02d}.{:04d} {:02d}:{:02d}:{:02d}".format(timestruct.day, timestruct.month, timestruct.year,
                                                                     timestruct.hour, timestruct.minute, timestruct.second)
 
@@ -98,6 +113,7 @@ class LoggerJSON(LoggerFileBASE):
             logging_output.rename(
                 logging_dir.joinpath(logging_filename + new_index + ".json")
             )
+            self._move_manifest_entry(logging_dir, logging_output.name, logging_filename + new_index + ".json")
             file_exists = False
             logging_output.touch()
 
@@ -156,6 +172,20 @@ class LoggerJSON(LoggerFileBASE):
             json.dump(json_data, f_writer, indent=4, ensure_ascii=False)
             f_writer.truncate()  # Remove any old data
 
+        if message_context is not None:
+            self._update_columns(
+                logging_output, timestruct.replace(microsecond=0), guild_context, author_context, message_context
+            )
+
+        self._update_manifest(
+            logging_output,
+            guild_context,
+            timestruct.replace(microsecond=0),
+            author_context["id"] if message_context is not None else None,
+            message_context["type"] if message_context is not None else None,
+            invite_context["id"] if invite_context is not None else None
+        )
+
     def _get_msg_log_process_file(self, guild, author, after, before, success_rate, guild_type, message_type, logs, filename):
         logs = []
         with open(filename, 'r', encoding="utf-8") as reader:
@@ -210,36 +240,69 @@ class LoggerJSON(LoggerFileBASE):
             before = datetime.max
 
         logs = []
-        for filename in self._get_files(".json"):
-            with open(filename, 'r', encoding="utf-8") as reader:
-                data = json.load(reader)
+        for filename in self._get_log_files(after, before, guild=guild, invite=invite):
+            logs.extend(self._get_invite_log_process_file(guild, invite, after, before, filename))
 
-            if guild is not None and data["id"] != guild:
-                continue
+        sorted_ = sorted(logs, key=lambda log: log[sort_by], reverse=sort_by_direction == "desc")
+        if limit is not None:
+            sorted_ = sorted_[:limit]
 
-            guild_dict = {"name": data["name"], "id": data["id"], "type": data["type"]}
+        return sorted_
 
-            for invite_id, invite_logs in data["invite_tracking"].items():
-                if invite is not None and invite_id != invite:
-                    continue
+    async def analytic_iter_invite_log(
+        self,
+        guild: Optional[int] = None,
+        invite: Optional[str] = None,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        sort_by_direction: Literal['asc', 'desc'] = "desc",
+        cursor: Optional[Tuple[datetime, int]] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[list]:
+        def process_file(filename: str):
+            return self._get_invite_log_process_file(
+                guild, invite, after or datetime.min, before or datetime.max, filename
+            )
+
+        async for chunk in self._iter_logs(
+            process_file, after, before, sort_by_direction, cursor, chunk_size, guild=guild, invite=invite
+        ):
+            yield chunk
+
+    def _get_invite_log_process_file(
+        self,
+        guild: Optional[int],
+        invite: Optional[str],
+        after: datetime,
+        before: datetime,
+        filename: str
+    ) -> List[dict]:
+        logs = []
+        with open(filename, 'r', encoding="utf-8") as reader:
+            data = json.load(reader)
 
-                for log in invite_logs:
-                    log["guild"] = guild_dict
-                    log["invite"] = f"https://discord.gg/{invite_id}"
+        if guild is not None and data["id"] != guild:
+            return logs
 
-                    stamp = self._datetime_from_stamp(log["timestamp"])
-                    if stamp < after or stamp > before:
-                        continue
+        guild_dict = {"name": data["name"], "id": data["id"], "type": data["type"]}
 
-                    del log["timestamp"]
-                    log = {"timestamp": stamp, **log}
-                    logs.append(log)
-        
-        sorted_ = sorted(logs, key=lambda log: log[sort_by], reverse=sort_by_direction == "desc")
-        if limit is not None:
-            sorted_ = sorted_[:limit]
+        for invite_id, invite_logs in data["invite_tracking"].items():
+            if invite is not None and invite_id != invite:
+                continue
 
-        return sorted_
+            for log in invite_logs:
+                log["guild"] = guild_dict
+                log["invite"] = f"https://discord.gg/{invite_id}"
+
+                stamp = self._datetime_from_stamp(log["timestamp"])
+                if stamp < after or stamp > before:
+                    continue
+
+                del log["timestamp"]
+                log = {"timestamp": stamp, **log}
+                logs.append(log)
+
+        return logs
 
     async def analytic_get_num_invites(
         self,
@@ -303,15 +366,28 @@ class LoggerJSON(LoggerFileBASE):
 
         indexes = set(x["index"] for x in logs)
         for path, dirs, files in os.walk(self.path):
+            manifest = self._read_manifest(path)
+            removed = False
             for filename in files:
                 if filename.endswith(".json"):
-                    with open(os.path.join(path, filename), 'r+', encoding="utf-8") as f_log:
+                    filepath = os.path.join(path, filename)
+                    with open(filepath, 'r+', encoding="utf-8") as f_log:
                         data = json.load(f_log)
-                        filterer(data, indexes)
+                        if not filterer(data, indexes):
+                            continue
+
                         f_log.seek(0)
                         f_log.truncate()
                         json.dump(data, f_log, indent=4)
 
+                    removed = True
+                    if filename in manifest:
+                        manifest[filename] = self._build_manifest_entry(filepath)
+                        self._write_manifest(path, manifest)
+
+            if removed and filterer == self._remove_message_logs:
+                self._rebuild_day_columns(path)
+
     def _datetime_from_stamp(self, timestamp: str):
         date_, time_ = timestamp.split(' ')
         day, month, year = map(int, date_.split('.'))
@@ -319,28 +395,42 @@ class LoggerJSON(LoggerFileBASE):
         stamp = datetime(year, month, day, hour, minute, second)
         return stamp
 
-    def _remove_message_logs(self, data: dict, indexes: Set[int]):
+    def _remove_message_logs(self, data: dict, indexes: Set[int]) -> bool:
+        removed = False
         for author_ctx in data["message_tracking"].values():
             for message in author_ctx["messages"].copy():
                 if message["index"] not in indexes:
                     continue
 
                 author_ctx["messages"].remove(message)
+                removed = True
+
+        return removed
 
-    def _remove_invite_logs(self, data: dict, indexes: Set[int]):
+    def _remove_invite_logs(self, data: dict, indexes: Set[int]) -> bool:
+        removed = False
         for logs in data["invite_tracking"].values():
             for log in logs.copy():
                 if log["index"] not in indexes:
                     continue
 
                 logs.remove(log)
+                removed = True
+
+        return removed
 
-    def _calc_success_rate(self, message: dict) -> float:
-        channel_ctx = message.get("channels")
-        if channel_ctx is not None:
-            len_s = len(channel_ctx["successful"])
-            calc_success_rate = 100.00 * len_s / (len(channel_ctx["failed"]) + len_s)
-        else:
-            calc_success_rate = 100.00 if message["success_info"]["success"] else 0.0
+    def _get_manifest_records(self, filename: str):
+        with open(filename, 'r', encoding="utf-8") as reader:
+            data = json.load(reader)
+
+        guild_context = {"id": data["id"], "type": data["type"]}
+        for author_ctx in data["message_tracking"].values():
+            for message in author_ctx["messages"]:
+                yield (
+                    guild_context, self._datetime_from_stamp(message["timestamp"]), author_ctx["id"],
+                    message["type"], None
+                )
 
-        return calc_success_rate
+        for invite_id, invite_logs in data["invite_tracking"].items():
+            for log in invite_logs:
+                yield guild_context, self._datetime_from_stamp(log["timestamp"]), None, None, invite_id
@@ -0,0 +1,206 @@
+"""
+Streaming migration of logs from one logger into another.
+
+The migration can also be run from the command line (``python -m daf.logging``).
+"""
+from datetime import datetime
+from typing import Dict, Literal, Optional
+
+from .logger_base import LoggerBASE
+from .tracing import TraceLEVELS, trace
+from ..misc import doc
+
+import json
+import copy
+import os
+
+
+__all__ = (
+    "migrate_logs",
+)
+
+
+@doc.doc_category("Logging reference", path="logging")
+async def migrate_logs(
+    source: LoggerBASE,
+    target: LoggerBASE,
+    checkpoint: Optional[str] = None,
+    chunk_size: int = 500,
+    invites: bool = True
+) -> Dict[str, int]:
+    """
+    .. versionadded:: 4.3.0
+
+    Copies all the logs of the ``source`` logger into the ``target`` logger, keeping their original timestamps.
+    Both loggers must already be initialized.
+
+    The logs are read (oldest first) in chunks of ``chunk_size`` logs and each chunk is saved
+    into the ``target`` at once (in a single transaction with :class:`~daf.logging.sql.LoggerSQL`),
+    so the memory use doesn't depend on the size of the history.
+
+    If ``checkpoint`` is given, the progress is saved into that file after each chunk.
+    When the migration is interrupted, calling it again with the same checkpoint file
+    continues after the last saved chunk. The file is not removed at the end,
+    meaning another call with the same file does nothing.
+    :class:`~daf.logging.sql.LoggerSQL` targets also save the progress in the same transaction as the logs.
+    For other targets, the chunk being saved is recorded in the file before saving it, and the logs
+    of the chunk that were already saved are skipped when continuing.
+
+    At the end, the number of logs in the ``target`` is verified to have grown by the number of logs
+    in the ``source``.
+
+    Parameters
+    --------------
+    source: LoggerBASE
+        The logger to read the logs from.
+    target: LoggerBASE
+        The logger to save the logs into.
+    checkpoint: Optional[str]
+        Path to the checkpoint file.
+    chunk_size: int
+        Number of logs read and saved at once.
+    invites: bool
+        Also migrate invite logs. Invite logs are skipped if the ``source`` does not support them.
+
+    Returns
+    ----------
+    Dict[str, int]
+        Number of migrated logs of each type (``message``, ``invite``).
+
+    Raises
+    ----------
+    NotImplementedError
+        One of the loggers does not support migration.
+    RuntimeError
+        The number of logs in the ``target`` does not match the ``source``.
+    """
+    state = _read_checkpoint(checkpoint)
+    name = os.path.abspath(checkpoint) if checkpoint is not None else None
+    atomic = False  # Progress saved atomically with the logs
+    if name is not None:
+        try:
+            state = await target._get_migration_checkpoint(name) or state
+            atomic = True
+        except NotImplementedError:
+            pass
+
+    if "target_count" not in state:  # Counts before any log was migrated
+        log_types = ["message"]
+        if invites:
+            if await _supports(source, "invite"):
+                log_types.append("invite")
+            else:
+                trace(f"{type(source).__name__} does not support invite logs, skipping them.", TraceLEVELS.WARNING)
+
+        state["target_count"] = {log_type: await _count_logs(target, log_type) for log_type in log_types}
+        _write_checkpoint(checkpoint, state)
+
+    for log_type in state["target_count"]:
+        progress = state.setdefault(log_type, {"cursor": None, "migrated": 0, "done": False})
+        if progress["done"]:
+            continue
+
+        cursor = progress["cursor"]
+        if cursor is not None:
+            cursor = (datetime.fromisoformat(cursor[0]), cursor[1])
+
+        skip = 0  # Number of logs (after the cursor) that are already in the target
+        pending = progress.pop("pending", None)
+        if pending is not None:  # Interrupted while saving a chunk
+            skip = max(await _count_logs(target, log_type) - pending["target_count"], 0)
+            trace(f"Skipping {skip} {log_type} logs, saved before the interruption.", TraceLEVELS.DEBUG)
+
+        async for chunk in _iter_logs(source, log_type, cursor, chunk_size):
+            records = [source._get_log_record(log) for log in chunk[skip:]]
+            skip = max(skip - len(chunk), 0)
+            timestamp, index = source.get_log_cursor(chunk[-1])
+            if atomic:
+                progress["cursor"] = [timestamp.isoformat(), index]
+                progress["migrated"] += len(chunk)
+                if records:
+                    await target._save_logs(records, (name, copy.deepcopy(state)))
+            else:
+                progress["pending"] = {
+                    "cursor": [timestamp.isoformat(), index],
+                    "target_count": state["target_count"][log_type] + progress["migrated"]
+                }
+                _write_checkpoint(checkpoint, state)
+                if records:
+                    await target._save_logs(records)
+
+                progress["cursor"] = progress.pop("pending")["cursor"]
+                progress["migrated"] += len(chunk)
+
+            _write_checkpoint(checkpoint, state)
+            trace(lambda: f"Migrated {progress['migrated']} {log_type} logs.", TraceLEVELS.DEBUG)
+
+        progress["done"] = True
+        _write_checkpoint(checkpoint, state)
+
+    # Verify
+    migrated = {}
+    for log_type, count_before in state["target_count"].items():
+        expected = await _count_logs(source, log_type)
+        added = await _count_logs(target, log_type) - count_before
+        if added != expected:
+            raise RuntimeError(
+                f"Migration of {log_type} logs failed verification: {expected} source logs, but {added} were added."
+            )
+
+        migrated[log_type] = added
+
+    trace(f"Migrated logs from {type(source).__name__} to {type(target).__name__}: {migrated}.", TraceLEVELS.NORMAL)
+    return migrated
+
+
+def _iter_logs(logger: LoggerBASE, log_type: Literal["message", "invite"], cursor, chunk_size: int):
+    if log_type == "message":
+        iterator = logger.analytic_iter_message_log
+    else:
+        iterator = logger.analytic_iter_invite_log
+
+    return iterator(sort_by_direction="asc", cursor=cursor, chunk_size=chunk_size)
+
+
+async def _supports(logger: LoggerBASE, log_type: Literal["message", "invite"]) -> bool:
+    "Returns True if the logger supports iterating ``log_type`` logs."
+    iterator = _iter_logs(logger, log_type, None, 1)
+    try:
+        async for _ in iterator:
+            break
+    except NotImplementedError:
+        return False
+    finally:
+        await iterator.aclose()
+
+    return True
+
+
+async def _count_logs(logger: LoggerBASE, log_type: Literal["message", "invite"]) -> int:
+    "Counts the logs by iterating them (memory use doesn't depend on the number of logs)."
+    count = 0
+    try:
+        async for chunk in _iter_logs(logger, log_type, None, 1000):
+            count += len(chunk)
+    except NotImplementedError:  # Logger does not support the log type (has none)
+        pass
+
+    return count
+
+
+def _read_checkpoint(path: Optional[str]) -> dict:
+    if path is None or not os.path.exists(path):
+        return {}
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_checkpoint(path: Optional[str], state: dict):
+    if path is None:
+        return
+
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(state, file)
+
+    os.replace(path + ".tmp", path)
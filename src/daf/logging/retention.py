@@ -0,0 +1,97 @@
+"""
+Contains the definition of the log retention policy.
+"""
+from datetime import timedelta
+from typing import Optional
+
+from typeguard import typechecked
+
+from ..misc import doc
+
+
+__all__ = (
+    "RetentionPolicy",
+)
+
+
+@doc.doc_category("Logging reference", path="logging")
+class RetentionPolicy:
+    """
+    .. versionadded:: 4.3.0
+
+    Describes which logs are removed by the logger.
+    The policy is applied periodically by a background task of the logger (see the ``retention`` parameter of
+    the loggers) or manually with :py:meth:`~daf.logging.LoggerBASE.apply_retention`.
+
+    Logs are removed in batches (``batch_size`` logs for SQL, a single day folder for file loggers).
+    The logger is only locked while a single batch is being removed, so new logs are not delayed.
+
+    Logs removed because of ``aggregates_only_after``, ``max_logs_per_guild`` or ``max_bytes_per_guild``
+    keep their aggregated counts (SQL rollup tables, columnar store of file loggers),
+    meaning they are still included in the message counts.
+    Logs removed because of ``max_age`` are removed along with their aggregated counts.
+
+    ``max_age`` removes entire days (days before the day of ``now - max_age``), so the logs
+    and their aggregated counts (which are per-day) are removed together.
+
+    File loggers remove entire days (days older than the ``max_age`` / ``aggregates_only_after``)
+    and entire log files (``max_logs_per_guild``, ``max_bytes_per_guild``), so the number of kept logs
+    can be slightly larger than configured.
+
+    Parameters
+    --------------
+    max_age: Optional[timedelta]
+        Logs older than this are deleted (including the aggregated counts).
+    aggregates_only_after: Optional[timedelta]
+        Logs older than this are deleted, but their aggregated counts are kept.
+    max_logs_per_guild: Optional[int]
+        Maximum number of message logs (and invite logs) per guild / user.
+        The oldest logs above the limit are deleted, but their aggregated counts are kept.
+    max_bytes_per_guild: Optional[int]
+        File loggers only. Maximum size of all log files of a guild / user.
+        The oldest log files above the limit are deleted, but their aggregated counts are kept.
+    interval: timedelta
+        Period of applying the policy. Defaults to 1 hour.
+    batch_size: int
+        Number of logs removed at once by the SQL logger. Defaults to 1000.
+        File loggers ignore this and remove a single day folder at a time.
+
+    Raises
+    ----------
+    ValueError
+        ``interval`` or ``batch_size`` is not positive, or no limit was given.
+    """
+    @typechecked
+    def __init__(
+        self,
+        max_age: Optional[timedelta] = None,
+        aggregates_only_after: Optional[timedelta] = None,
+        max_logs_per_guild: Optional[int] = None,
+        max_bytes_per_guild: Optional[int] = None,
+        interval: timedelta = timedelta(hours=1),
+        batch_size: int = 1000
+    ) -> None:
+        if (
+            max_age is None and aggregates_only_after is None and
+            max_logs_per_guild is None and max_bytes_per_guild is None
+        ):
+            raise ValueError("At least one of the limits must be given.")
+
+        if interval <= timedelta(0):
+            raise ValueError("'interval' must be positive.")
+
+        if batch_size < 1:
+            raise ValueError("'batch_size' must be positive.")
+
+        self.max_age = max_age
+        self.aggregates_only_after = aggregates_only_after
+        self.max_logs_per_guild = max_logs_per_guild
+        self.max_bytes_per_guild = max_bytes_per_guild
+        self.interval = interval
+        self.batch_size = batch_size
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(max_age={self.max_age}, aggregates_only_after={self.aggregates_only_after}, "
+            f"max_logs_per_guild={self.max_logs_per_guild}, max_bytes_per_guild={self.max_bytes_per_guild})"
+        )
@@ -5,18 +5,23 @@
         Added Discord invite link tracking.
 """
 from datetime import datetime, date
-from typing import Callable, Dict, List, Literal, Any, Union, Optional, Tuple, get_args
-from contextlib import suppress
+from typing import AsyncIterator, Callable, Dict, List, Literal, Any, Union, Optional, Tuple, get_args
+from collections import OrderedDict
 from pathlib import Path
 from typeguard import typechecked
 
 from ..tracing import TraceLEVELS, trace
 from .. import _logging as logging
-from ...misc import doc, instance_track, async_util
+from ..logger_base import LogRecord
+from ..retention import RetentionPolicy
+from .spill import SpillFILE
+from ...misc import doc, instance_track, async_util, task_registry
 
 import json
 import copy
 import asyncio
+import time
+import re
 
 
 class GLOBALS:
@@ -32,6 +37,22 @@ SQL_RECOVERY_TIME = 1
 SQL_RECONNECT_TIME = 5 * 60
 SQL_ENABLE_DEBUG = False
 SQL_TABLE_CACHE_SIZE = 1000
+SQL_TABLE_CACHE_TTL = None  # Seconds after which cached rows expire (None = never)
+SQL_CACHE_WARMUP_LOGS = 1000  # Latest message logs, whose guilds, channels and data are cached at initialization
+SQL_ROLLUP_BACKFILL_CHUNK = 10000  # Number of logs read at once when (re)building the rollup tables
+SQL_SQLITE_TUNED = True  # SQLite: single writer connection, read-only analytics connections and SQL_SQLITE_PRAGMAS
+SQL_SQLITE_PRAGMAS = {  # Applied to each SQLite connection if SQL_SQLITE_TUNED is True
+    "journal_mode": "WAL",  # Readers don't block the writer (and the other way around)
+    # No sync on each commit in WAL mode (only at checkpoints), still consistent.
+    # Committed logs survive an application crash, but the latest ones can be lost on power loss or an OS crash
+    # ("FULL" makes each commit durable).
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # Negative value means KiB
+    "busy_timeout": 5000,  # Milliseconds
+}
+SQL_SPILL_ENABLED = True  # Save logs into the spill file (instead of the fallback) while the database is unavailable
+SQL_SPILL_REPLAY_BATCH = 500  # Number of spilled logs inserted per transaction when replaying
 # Dictionary mapping the database dialect to it's connector
 DIALECT_CONN_MAP = {
     "sqlite": "aiosqlite",
@@ -44,7 +65,7 @@ try:
     from .tables import *
 
     from sqlalchemy import (
-        select, text, case, delete, func,
+        select, text, case, delete, update, func, and_, or_,
         Integer, String, event,
     )
     from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -53,6 +74,7 @@ try:
     from sqlalchemy.orm import (
         sessionmaker,
         Session,
+        aliased,
     )
     import sqlalchemy as sqa
     import aiosqlite
@@ -115,20 +137,30 @@ def register_type(lookuptable: Literal["GuildTYPE", "MessageTYPE", "MessageMODE"
 class TableCache:
     """
     Used for caching table values to IDs for faster access.
-    When maximum cache is exceeded, 1/4 of the first added elements is purged
+    When maximum cache is exceeded, the least recently used element is purged
     from cache.
 
+    .. versionchanged:: 4.3.0
+        Least recently used elements are purged (instead of 1/4 of the first added elements).
+        Added the ``ttl`` parameter and hit / miss counters.
+
     Parameters
     -------------
     table: ORMBase
         The table this cache is for.
     limit: int
         Max elements to hold.
+    ttl: Optional[float]
+        Time in seconds after which a cached element expires. None means the elements don't expire.
     """
-    def __init__(self, table: ORMBase, limit: int):
+    def __init__(self, table: ORMBase, limit: int, ttl: Optional[float] = None):
         self.table = table
         self.limit = limit
-        self.data = {}
+        self.ttl = ttl
+        self.data: OrderedDict[Any, Tuple[Any, float]] = OrderedDict()  # key: (value, insertion time)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def insert(self, key: Any, value: Any) -> None:
         """
@@ -141,27 +173,36 @@ class TableCache:
         value: Any
             What to insert.
         """
-        if len(self.data) == self.limit:
-            # Remove 1/4 of the cache
-            for i in range(int(len(self.data) / 4)):
-                self.remove()
-
         if key in self.data:
             # Remove the value if it already exists
             del self.data[key]
+        elif len(self.data) >= self.limit:
+            self.remove()
+            self.evictions += 1
 
         # Add item to cache
-        self.data[key] = value
+        self.data[key] = (value, time.monotonic())
 
     def get(self, key: Any) -> Any:
         """
-        Returns the cached value.
+        Returns the cached value (or None if not cached) and marks it as recently used.
 
         Parameters
         key: Any
             The key at which cached value is located.
         """
-        return self.data.get(key)
+        item = self.data.get(key)
+        if item is not None and self.ttl is not None and time.monotonic() - item[1] > self.ttl:
+            del self.data[key]
+            item = None
+
+        if item is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.data.move_to_end(key)
+        return item[0]
 
     def remove(self, key: Optional[Any] = None) -> None:
         """
@@ -171,7 +212,7 @@ class TableCache:
         ------------
         key: Optional[Any]
             The key at which to remove the cached object.
-            If not passed, removes first element in cache.
+            If not passed, removes the least recently used element in cache.
 
         Raises
         ---------
@@ -199,6 +240,7 @@ class TableCache:
     def exists(self, key: Any) -> bool:
         """
         Returns True if the key is cached.
+        This doesn't affect the hit / miss counters or the order of elements.
 
         Parameters
         -----------
@@ -207,6 +249,21 @@ class TableCache:
         """
         return key in self.data
 
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Returns the cache statistics: ``size``, ``limit``, ``hits``, ``misses``, ``evictions``
+        and ``hit_rate`` (hits / lookups, 0 if there were no lookups).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "limit": self.limit,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
 
 @instance_track.track_id
 @doc.doc_category("Logging reference", path="logging.sql")
@@ -236,6 +293,11 @@ class LoggerSQL(logging.LoggerBASE):
     fallback: Optional[LoggerBASE]
         The fallback manager to use in case SQL logging fails.
         (Default: :class:`~daf.logging.LoggerJSON` ("History"))
+    retention: Optional[RetentionPolicy]
+        Policy for removing old logs, which is periodically applied in the background.
+        Logs are deleted in batches of ``batch_size`` rows.
+
+        .. versionadded:: 4.3.0
 
     Raises
     ----------
@@ -253,7 +315,8 @@ class LoggerSQL(logging.LoggerBASE):
                  port: Optional[int] = None,
                  database: Optional[str] = None,
                  dialect: Literal["sqlite", "mssql", "postgresql", "mysql"] = None,
-                 fallback: Optional[logging.LoggerBASE] = ...):
+                 fallback: Optional[logging.LoggerBASE] = ...,
+                 retention: Optional[RetentionPolicy] = None):
 
         if not SQL_INSTALLED:
             raise ModuleNotFoundError("Need to install extra requirements: pip install discord-advert-framework[sql]")
@@ -282,25 +345,34 @@ class LoggerSQL(logging.LoggerBASE):
         if self.dialect == "sqlite":
             self.database += ".db"
             Path(self.database).parent.mkdir(parents=True, exist_ok=True)
+            spill_path = self.database + ".spill"
+        else:
+            spill_name = re.sub(r"[^\w.-]", "_", f"sql_spill_{dialect}_{server}_{database}")
+            spill_path = str(Path.home().joinpath("daf", spill_name + ".spill"))
+
+        # Logs saved while the database is unavailable
+        self.spill = SpillFILE(spill_path)
 
         # Set in ._begin_engine
         self.engine: sqa.engine.Engine = None
         self.session_maker: sessionmaker = None
+        self.read_engine: sqa.engine.Engine = None  # Read-only connections for analytics (tuned SQLite)
+        self.read_session_maker: sessionmaker = None
         self.reconnecting = False  # Flag that is True while reconnecting, used for emergency exit of other tasks
 
         # Caching (to avoid unnecessary queries)
         # Lookup table caching
-        self.message_mode_cache = TableCache(MessageMODE, SQL_TABLE_CACHE_SIZE)
-        self.message_type_cache = TableCache(MessageTYPE, SQL_TABLE_CACHE_SIZE)
-        self.guild_type_cache = TableCache(GuildTYPE, SQL_TABLE_CACHE_SIZE)
+        self.message_mode_cache = TableCache(MessageMODE, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
+        self.message_type_cache = TableCache(MessageTYPE, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
+        self.guild_type_cache = TableCache(GuildTYPE, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
 
         # Other object caching
-        self.guild_user_cache = TableCache(GuildUSER, SQL_TABLE_CACHE_SIZE)
-        self.channel_cache = TableCache(CHANNEL, SQL_TABLE_CACHE_SIZE)
-        self.data_history_cache = TableCache(DataHISTORY, SQL_TABLE_CACHE_SIZE)
-        self.invites_cache = TableCache(Invite, SQL_TABLE_CACHE_SIZE)
+        self.guild_user_cache = TableCache(GuildUSER, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
+        self.channel_cache = TableCache(CHANNEL, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
+        self.data_history_cache = TableCache(DataHISTORY, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
+        self.invites_cache = TableCache(Invite, SQL_TABLE_CACHE_SIZE, SQL_TABLE_CACHE_TTL)
 
-        super().__init__(fallback)
+        super().__init__(fallback, retention)
 
     async def _run_async(self, method: Callable, *args, **kwargs):
         """
@@ -368,18 +440,27 @@ class LoggerSQL(logging.LoggerBASE):
                 trace(f"Retrying to connect in {wait} seconds.")
                 await asyncio.sleep(wait)
                 trace(f"Reconnecting to database {self.database}.")
-                with suppress(SQLAlchemyError, ConnectionError):
+                try:
                     async with self.session_maker() as session:
                         await self._run_async(session.execute, select(text("1")))  # Test with SELECT 1;
 
+                    async with self._mutex:
+                        # Replay under the lock, so new logs are saved after the spilled ones
+                        await self._replay_spill()
+                        self.reconnecting = False
+
                     trace(f"Reconnected to the database {self.database}.")
-                    self.reconnecting = False
                     logging._set_logger(self)
                     return
+                except (SQLAlchemyError, ConnectionError):
+                    pass
+                except Exception as exc:  # E. g., the spill file can't be read, the logs remain spilled until replayed
+                    trace(f"Could not replay the spilled logs into {self.database}.", TraceLEVELS.ERROR, exc)
 
         self.reconnecting = True
-        logging._set_logger(self.fallback)
-        asyncio.create_task(_reconnector())
+        if not SQL_SPILL_ENABLED:
+            logging._set_logger(self.fallback)
+        task_registry.create_task(_reconnector(), self, "database reconnect")
 
     async def _generate_lookup_values(self) -> None:
         """
@@ -424,14 +505,26 @@ class LoggerSQL(logging.LoggerBASE):
             trace("Creating tables...", TraceLEVELS.NORMAL)
             if self.is_async:
                 async with self.engine.begin() as tran:
-                    await tran.run_sync(ORMBase.metadata.create_all)
+                    await tran.run_sync(self.__create_all)
             else:
                 with self.engine.connect() as tran:
-                    tran.run_callable(ORMBase.metadata.create_all)
+                    tran.run_callable(self.__create_all)
 
         except Exception as ex:
             raise RuntimeError("Unable to create all the tables.") from ex
 
+    @staticmethod
+    def __create_all(connection):
+        """
+        Creates the missing tables and indexes.
+        Indexes are created separately as ``create_all`` only creates indexes of new tables,
+        meaning databases created with older versions would miss them.
+        """
+        ORMBase.metadata.create_all(connection)
+        for table in ORMBase.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
     def _begin_engine(self) -> None:
         """
         Creates the sqlalchemy engine.
@@ -468,14 +561,39 @@ class LoggerSQL(logging.LoggerBASE):
                 self.database
             )
 
-            self.engine = create_engine_(sqlurl, echo=SQL_ENABLE_DEBUG)
+            tuned = dialect == "sqlite" and SQL_SQLITE_TUNED
+            if tuned:
+                # SQLite allows a single writer, so additional write connections would only wait for locks
+                self.engine = create_engine_(sqlurl, echo=SQL_ENABLE_DEBUG, pool_size=1, max_overflow=0)
+                self.read_engine = create_engine_(
+                    SQLURL.create(
+                        f"{dialect}+{DIALECT_CONN_MAP[dialect]}",
+                        database=Path(self.database).absolute().as_uri(),
+                        query={"mode": "ro", "uri": "true"}
+                    ),
+                    echo=SQL_ENABLE_DEBUG
+                )
+            else:
+                self.engine = self.read_engine = create_engine_(sqlurl, echo=SQL_ENABLE_DEBUG)
 
             if dialect == "sqlite":  # Enable foreign keys for SQLite to allow cascades
                 def on_connect(dbapi_conn, conn_record):
                     cursor = dbapi_conn.cursor()
                     cursor.execute("PRAGMA foreign_keys=ON")
+                    if tuned:
+                        for name, value in SQL_SQLITE_PRAGMAS.items():
+                            cursor.execute(f"PRAGMA {name}={value}")
+
+                def on_connect_read(dbapi_conn, conn_record):
+                    cursor = dbapi_conn.cursor()
+                    cursor.execute("PRAGMA query_only=ON")
+                    for name, value in SQL_SQLITE_PRAGMAS.items():
+                        if name != "journal_mode":  # Can only be changed by the writer
+                            cursor.execute(f"PRAGMA {name}={value}")
 
                 event.listen(self.engine.sync_engine if self.is_async else self.engine, "connect", on_connect)
+                if tuned:
+                    event.listen(self.read_engine.sync_engine, "connect", on_connect_read)
 
             self._run_async = _run_async
 
@@ -498,6 +616,9 @@ class LoggerSQL(logging.LoggerBASE):
                         return self_.__exit__(*args)
 
             self.session_maker = sessionmaker(bind=self.engine, class_=SessionWrapper, expire_on_commit=False)
+            self.read_session_maker = sessionmaker(
+                bind=self.read_engine, class_=SessionWrapper, expire_on_commit=False
+            )
         except Exception as ex:
             raise RuntimeError(f"Unable to start engine.\nError: {ex}")
 
@@ -523,8 +644,97 @@ class LoggerSQL(logging.LoggerBASE):
         await self._create_tables()
         # Insert the lookuptable values
         await self._generate_lookup_values()
+        # Cache the rows, which will most likely be used by the next logs
+        await self._warmup_caches()
+        # Fill the rollup tables in case the database was created by an older version
+        await self._check_rollups()
+        # Save logs that were spilled while the database was unavailable (on the previous run)
+        await self._replay_spill()
         await super().initialize()
 
+    async def shutdown(self) -> None:
+        "Writes the buffered logs of the spill file and stops the background tasks."
+        try:
+            await self.spill.flush()
+        except OSError as exc:
+            trace(f"Could not write the spilled logs into {self.spill.path}.", TraceLEVELS.ERROR, exc)
+
+        await super().shutdown()
+
+    async def _warmup_caches(self):
+        """
+        Pre-loads the guild / user, channel and data caches with the rows referenced by the latest
+        ``SQL_CACHE_WARMUP_LOGS`` message logs, which most likely belong to the objects that are currently
+        in the shilling list.
+        """
+        if not SQL_CACHE_WARMUP_LOGS:
+            return
+
+        session: Union[AsyncSession, Session]
+        async with self.session_maker() as session:
+            # Id of the oldest log to include (no subquery with LIMIT, which is not supported by all dialects)
+            first_id = (
+                await self._run_async(
+                    session.execute,
+                    select(MessageLOG.id).order_by(MessageLOG.id.desc()).offset(SQL_CACHE_WARMUP_LOGS - 1).limit(1)
+                )
+            ).scalar()
+            latest = select(MessageLOG.guild_id, MessageLOG.author_id, MessageLOG.sent_data_id)
+            if first_id is not None:
+                latest = latest.where(MessageLOG.id >= first_id)
+
+            rows = (await self._run_async(session.execute, latest)).all()
+            if not rows:
+                return
+
+            guild_ids = {guild_id for guild_id, _, _ in rows} | {author_id for _, author_id, _ in rows}
+            data_ids = {data_id for _, _, data_id in rows}
+            guilds = (
+                await self._run_async(session.execute, select(GuildUSER).where(GuildUSER.id.in_(guild_ids)))
+            ).scalars().all()
+            channels = (
+                await self._run_async(
+                    session.execute,
+                    select(CHANNEL).where(CHANNEL.guild_id.in_(guild_ids))
+                )
+            ).unique().scalars().all()
+            data = (
+                await self._run_async(session.execute, select(DataHISTORY).where(DataHISTORY.id.in_(data_ids)))
+            ).scalars().all()
+
+        for guild in guilds[:SQL_TABLE_CACHE_SIZE]:
+            self.guild_user_cache.insert(guild.snowflake_id, guild)
+
+        for channel in channels[:SQL_TABLE_CACHE_SIZE]:
+            self.channel_cache.insert(channel.snowflake_id, channel)
+
+        for data_obj in data[:SQL_TABLE_CACHE_SIZE]:
+            content = data_obj.content
+            self.data_history_cache.insert(content if isinstance(content, str) else json.dumps(content), data_obj)
+
+        trace(
+            f"Cached {len(guilds)} guilds / users, {len(channels)} channels and {len(data)} data rows.",
+            TraceLEVELS.DEBUG
+        )
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        .. versionadded:: 4.3.0
+
+        Returns the statistics of the internal caches (used to avoid queries for existing rows),
+        which can be used for sizing ``daf.logging.sql.mgr.SQL_TABLE_CACHE_SIZE``.
+
+        Returns
+        ----------
+        Dict[str, Dict[str, int | float]]
+            Mapping of the cached table name to the statistics:
+            ``size``, ``limit``, ``hits``, ``misses``, ``evictions`` and ``hit_rate`` (0 - 1).
+        """
+        return {
+            cache.get_table().__tablename__: cache.get_stats()
+            for cache in vars(self).values() if isinstance(cache, TableCache)
+        }
+
     async def __get_insert_base(
         self,
         key: Any,
@@ -535,8 +745,8 @@ class LoggerSQL(logging.LoggerBASE):
         *args,
         **kwargs
     ):
-        result = None
-        if not cache_object.exists(key):
+        result = cache_object.get(key)
+        if result is None:
             result = await self._run_async(
                 session.execute,
                 select(type_).where(compare_key)
@@ -552,8 +762,6 @@ class LoggerSQL(logging.LoggerBASE):
                 result = result
 
             cache_object.insert(key, result)
-        else:
-            result = cache_object.get(key)
 
         return result
 
@@ -635,7 +843,8 @@ class LoggerSQL(logging.LoggerBASE):
 
         # Put into cache if it is not already
         # Get snowflakes that are not cached
-        not_cached = [{"id": x["id"], "name": x["name"]} for x in channels if not self.channel_cache.exists(x["id"])]
+        cached = {x["id"]: self.channel_cache.get(x["id"]) for x in channels}
+        not_cached = [{"id": x["id"], "name": x["name"]} for x in channels if cached[x["id"]] is None]
         not_cached_snow = [x["id"] for x in not_cached]
         if len(not_cached):
             # Search the database for non cached channels
@@ -646,11 +855,12 @@ class LoggerSQL(logging.LoggerBASE):
             result = result.all()
             for (channel,) in result:
                 self.channel_cache.insert(channel.snowflake_id, channel)
+                cached[channel.snowflake_id] = channel
 
             # Add the channels that are not in the database
             to_add = [
                 CHANNEL(x["id"], x["name"], guild)
-                for x in not_cached if not self.channel_cache.exists(x["id"])
+                for x in not_cached if cached[x["id"]] is None
             ]
             if len(to_add):
                 session.add_all(to_add)
@@ -658,9 +868,9 @@ class LoggerSQL(logging.LoggerBASE):
                 await self._run_async(session.begin)
                 for channel in to_add:
                     self.channel_cache.insert(channel.snowflake_id, channel)
+                    cached[channel.snowflake_id] = channel
 
-        # Get from cache
-        ret = [(self.channel_cache.get(d["id"]), d.get("reason", None)) for d in channels]
+        ret = [(cached[d["id"]], d.get("reason", None)) for d in channels]
         return ret
 
     def _get_insert_data(self, data: dict, session: Union[AsyncSession, Session]) -> int:
@@ -695,6 +905,8 @@ class LoggerSQL(logging.LoggerBASE):
         Closes the engine and the cursor.
         """
         await self._run_async(self.engine.dispose)
+        if self.read_engine is not self.engine:
+            await self._run_async(self.read_engine.dispose)
 
     async def _handle_error(self,
                             exc: SQLAlchemyError) -> bool:
@@ -736,7 +948,8 @@ class LoggerSQL(logging.LoggerBASE):
         self,
         session: Union[AsyncSession, Session],
         guild_context: dict,
-        invite_context: dict
+        invite_context: dict,
+        timestamp: Optional[datetime] = None
     ):
         # Parse the data
         guild_snowflake: int = guild_context.get("id")
@@ -760,7 +973,16 @@ class LoggerSQL(logging.LoggerBASE):
             invite_obj,
             member_obj
         )
+        if timestamp is not None:  # Replayed from the spill file
+            invite_log_obj.timestamp = timestamp
+
         session.add(invite_log_obj)
+        await self._rollup_update(
+            session,
+            InviteRollupDAY,
+            {"day": invite_log_obj.timestamp.date(), "invite_id": invite_obj.id},
+            count=1
+        )
 
     async def _save_log_message(
         self,
@@ -768,6 +990,7 @@ class LoggerSQL(logging.LoggerBASE):
         guild_context: dict,
         message_context: Optional[dict] = None,
         author_context: Optional[dict] = None,
+        timestamp: Optional[datetime] = None
     ):
         # Parse the data
         author_name: str = author_context.get("name")
@@ -818,8 +1041,163 @@ class LoggerSQL(logging.LoggerBASE):
                 for channel, reason in _channels
             ],
         )
+        if timestamp is not None:  # Replayed from the spill file
+            message_log_obj.timestamp = timestamp
+
         session.add(message_log_obj)
 
+        if channels is not None:
+            if not _channels:  # Success rate is undefined without channels
+                return
+
+            successful = any(reason is None for _, reason in _channels)
+        else:
+            successful = dm_success_info_reason is None
+
+        await self._rollup_update(
+            session,
+            MessageRollupDAY,
+            {
+                "day": message_log_obj.timestamp.date(),
+                "guild_id": guild_obj.id,
+                "author_id": author_obj.id,
+                "message_type_id": message_type_obj.id
+            },
+            successful=int(successful),
+            failed=int(not successful)
+        )
+
+    async def _rollup_update(
+        self,
+        session: Union[AsyncSession, Session],
+        table: Union["MessageRollupDAY", "InviteRollupDAY"],
+        keys: Dict[str, Any],
+        **deltas: int
+    ):
+        """
+        Adds ``deltas`` to the counters of a rollup table row, identified by ``keys``.
+        If the row does not exist, it is created (unless ``deltas`` are negative).
+
+        Parameters
+        ------------
+        session: Union[AsyncSession, Session]
+            The session to use as transaction.
+        table: MessageRollupDAY | InviteRollupDAY
+            The rollup table to update.
+        keys: Dict[str, Any]
+            Mapping of primary key column names to their values.
+        deltas: int
+            Mapping of counter column names to the value to add.
+        """
+        result = await self._run_async(
+            session.execute,
+            update(table)
+            .where(*(getattr(table, k) == v for k, v in keys.items()))
+            .values({getattr(table, k): getattr(table, k) + v for k, v in deltas.items()})
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount and min(deltas.values()) >= 0:
+            session.add(table(**keys, **deltas))
+
+    async def _check_rollups(self):
+        """
+        Builds the rollup tables from existing logs in case the rollup tables are empty,
+        but logs exist (database was created with an older version).
+        """
+        session: Union[AsyncSession, Session]
+        async with self.session_maker() as session:
+            for log_table, rollup_table in ((MessageLOG, MessageRollupDAY), (InviteLOG, InviteRollupDAY)):
+                log = (await self._run_async(session.execute, select(log_table.id).limit(1))).first()
+                rollup = (await self._run_async(session.execute, select(rollup_table.day).limit(1))).first()
+                if log is not None and rollup is None:
+                    break
+            else:
+                return
+
+        await self._rebuild_rollups()
+
+    @async_util.with_semaphore("_mutex")
+    async def rebuild_rollups(self):
+        """
+        Rebuilds the pre-aggregated (day-level) rollup tables from the existing
+        message and invite logs.
+
+        The rollups are automatically updated on each new log, so this only needs to be called
+        if the logs were modified outside of DAF.
+        The logs are read in chunks of ``SQL_ROLLUP_BACKFILL_CHUNK`` rows.
+
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        await self._rebuild_rollups()
+
+    async def _rebuild_rollups(self):
+        trace("Building rollup tables...", TraceLEVELS.NORMAL)
+        session: Union[AsyncSession, Session]
+        async with self.session_maker() as session:
+            await self._run_async(session.execute, delete(MessageRollupDAY))
+            await self._run_async(session.execute, delete(InviteRollupDAY))
+
+            message_counts: Dict[tuple, List[int]] = {}
+            async for timestamp, guild_id, author_id, type_id, success_rate in self.__iter_rows_chunked(
+                session,
+                MessageLOG,
+                [
+                    MessageLOG.timestamp, MessageLOG.guild_id, MessageLOG.author_id,
+                    MessageLOG.message_type_id, MessageLOG.success_rate
+                ]
+            ):
+                if success_rate is None:
+                    continue
+
+                counts = message_counts.setdefault((timestamp.date(), guild_id, author_id, type_id), [0, 0])
+                counts[success_rate == 0] += 1  # [successful, failed]
+
+            invite_counts: Dict[tuple, int] = {}
+            async for timestamp, invite_id in self.__iter_rows_chunked(
+                session,
+                InviteLOG,
+                [InviteLOG.timestamp, InviteLOG.invite_id]
+            ):
+                key = (timestamp.date(), invite_id)
+                invite_counts[key] = invite_counts.get(key, 0) + 1
+
+            session.add_all([MessageRollupDAY(*key, *counts) for key, counts in message_counts.items()])
+            session.add_all([InviteRollupDAY(*key, count) for key, count in invite_counts.items()])
+            await self._run_async(session.commit)
+
+        trace(
+            f"Built rollup tables ({len(message_counts)} message rows, {len(invite_counts)} invite rows).",
+            TraceLEVELS.NORMAL
+        )
+
+    async def __iter_rows_chunked(
+        self,
+        session: Union[AsyncSession, Session],
+        table: Union["MessageLOG", "InviteLOG"],
+        columns: List[Any]
+    ):
+        """
+        Iterates over all rows of a log table in chunks of ``SQL_ROLLUP_BACKFILL_CHUNK`` rows,
+        keeping the memory use bounded.
+        """
+        last_id = None
+        while True:
+            select_stm = select(table.id, *columns).order_by(table.id).limit(SQL_ROLLUP_BACKFILL_CHUNK)
+            if last_id is not None:
+                select_stm = select_stm.where(table.id > last_id)
+
+            rows = (await self._run_async(session.execute, select_stm)).all()
+            if not rows:
+                break
+
+            for row in rows:
+                yield tuple(row[1:])
+
+            last_id = rows[-1][0]
+
     # with_semaphore prevents multiple tasks from attempting to do operations on the database at the same time.
     @async_util.with_semaphore("_mutex")
     async def _save_log(
@@ -849,7 +1227,10 @@ class LoggerSQL(logging.LoggerBASE):
 
         if self.reconnecting:
             # The SQL logger is in the middle of reconnection process
-            return await logging.save_log(guild_context, message_context)
+            if SQL_SPILL_ENABLED:
+                return self._spill_log(guild_context, message_context, author_context, invite_context)
+
+            return await logging.save_log(guild_context, message_context, author_context, invite_context)
 
         for _ in range(SQL_MAX_SAVE_ATTEMPTS):
             try:
@@ -864,10 +1245,128 @@ class LoggerSQL(logging.LoggerBASE):
                 return
             except SQLAlchemyError as exc:
                 if not await self._handle_error(exc):
+                    if self.reconnecting and SQL_SPILL_ENABLED:  # Connection lost
+                        return self._spill_log(guild_context, message_context, author_context, invite_context)
+
                     raise RuntimeError("Unable to handle SQL error") from exc
 
         raise RuntimeError(f"Unable to save invite log within {SQL_MAX_SAVE_ATTEMPTS} tries")
 
+    def _spill_log(
+        self,
+        guild_context: dict,
+        message_context: Optional[dict] = None,
+        author_context: Optional[dict] = None,
+        invite_context: Optional[dict] = None
+    ):
+        """
+        Appends the log into the spill file, from which it is replayed
+        into the database after reconnecting.
+        """
+        self.spill.append({
+            "timestamp": datetime.now().isoformat(),
+            "guild": guild_context,
+            "message": message_context,
+            "author": author_context,
+            "invite": invite_context
+        })
+
+    async def _replay_spill(self):
+        """
+        Saves the logs from the spill file into the database (in transactions of ``SQL_SPILL_REPLAY_BATCH`` logs)
+        and then clears the spill file.
+        IDs of replayed records are saved into the SpillRECORD table, in the same transaction as the logs,
+        so no log is inserted twice if the replay is interrupted and repeated.
+        Records that can't be read or saved (for any reason other than a lost connection)
+        are moved into the spill file's quarantine, and the replay continues with the next record.
+
+        Raises
+        ------------
+        SQLAlchemyError
+            The connection to the database was lost.
+        OSError
+            There was a problem with the spill file.
+        """
+        await self.spill.flush()
+        if self.spill.is_empty():
+            return
+
+        trace(f"Replaying logs from the spill file {self.spill.path}.", TraceLEVELS.NORMAL)
+        replayed = 0
+        session: Union[AsyncSession, Session]
+        for records in self.spill.read_chunked(SQL_SPILL_REPLAY_BATCH):
+            while records:
+                # The batch is repeated without the invalid record, in a new session, as the (partial) logs
+                # of the failed session are not committed.
+                invalid = error = None
+                async with self.session_maker() as session:
+                    done = set(
+                        (
+                            await self._run_async(
+                                session.execute,
+                                select(SpillRECORD.record_id).where(
+                                    SpillRECORD.record_id.in_([record.get("id") for record in records])
+                                )
+                            )
+                        ).scalars()
+                    )
+                    records = [record for record in records if record.get("id") not in done]
+                    for record in records:
+                        try:
+                            await self._replay_spill_record(session, record)
+                        except Exception as exc:
+                            if self._is_connection_error(exc):
+                                raise
+
+                            trace(
+                                f"Moving an invalid log into the quarantine {self.spill.quarantine_path}.",
+                                TraceLEVELS.WARNING,
+                                exc
+                            )
+                            invalid, error = record, exc
+                            break
+
+                    if invalid is None:
+                        await self._run_async(session.commit)
+                        replayed += len(records)
+                        break
+
+                self.spill.quarantine(invalid)
+                records = [record for record in records if record is not invalid]
+                if isinstance(error, SQLAlchemyError):
+                    # The failed session was rolled back, which expired the cached rows used by it
+                    self._clear_caches()
+                    await self._generate_lookup_values()
+
+        async with self.session_maker() as session:
+            self.spill.clear()
+            await self._run_async(session.execute, delete(SpillRECORD))
+            await self._run_async(session.commit)
+
+        trace(f"Replayed {replayed} logs from the spill file.", TraceLEVELS.NORMAL)
+
+    @staticmethod
+    def _is_connection_error(exc: Exception) -> bool:
+        "Returns True if the ``exc`` is caused by the database (connection) and not by the saved data."
+        return getattr(exc, "connection_invalidated", False) or isinstance(
+            exc,
+            (sqa.exc.OperationalError, sqa.exc.InterfaceError, sqa.exc.DisconnectionError, sqa.exc.TimeoutError)
+        )
+
+    async def _replay_spill_record(self, session: Union[AsyncSession, Session], record: dict):
+        """
+        Adds the spilled log ``record`` into the ``session``.
+        The session is flushed, so that errors caused by the record are raised here.
+        """
+        timestamp = datetime.fromisoformat(record["timestamp"])
+        if record["message"] is not None:
+            await self._save_log_message(session, record["guild"], record["message"], record["author"], timestamp)
+        else:
+            await self._save_log_invite(session, record["guild"], record["invite"], timestamp)
+
+        session.add(SpillRECORD(record["id"]))
+        await self._run_async(session.flush)
+
     async def _get_guild(self, id_: int, session: Union[AsyncSession, Session]):
         guilduser: GuildUSER = self.guild_user_cache.get(id_)
         if guilduser is not None:
@@ -920,7 +1419,13 @@ class LoggerSQL(logging.LoggerBASE):
         limit: int = 500
             Limit of the rows to return. Defaults to 500.
         group_by: Literal["year", "month", "day"]
-            Results returned are grouped by ``group_by``
+            Results returned are grouped by ``group_by``.
+
+            .. versionchanged:: 4.3.0
+
+                When grouping by "month" or "year", the counts are read from the
+                pre-aggregated day-level rollup table, meaning ``after`` and ``before``
+                are applied with day resolution.
 
         Returns
         --------
@@ -946,24 +1451,26 @@ class LoggerSQL(logging.LoggerBASE):
         if sort_by not in args:
             raise ValueError(f"sort_by expected any of {args}. Got '{sort_by}'")
 
-        async with self.session_maker() as session:
-            conditions = [MessageLOG.timestamp.between(after, before)]
-            if guild is not None:
-                conditions.append(MessageLOG.guild.has(GuildUSER.snowflake_id == guild))
-
-            if author is not None:
-                conditions.append(MessageLOG.author.has(GuildUSER.snowflake_id == author))
-
-            if guild_type is not None:
-                conditions.append(MessageLOG.guild.has(GuildUSER.guild_type.has(GuildTYPE.name == guild_type)))
-
-            if message_type is not None:
-                conditions.append(MessageLOG.message_type.has(MessageTYPE.name == message_type))
+        if group_by != "day":
+            return await self.__analytic_get_num_messages_rollup(
+                guild, author, after, before, guild_type, message_type,
+                sort_by, sort_by_direction, limit, group_by
+            )
 
+        guild_user = aliased(GuildUSER)
+        author_user = aliased(GuildUSER)
+        conditions, joins = self.__message_log_filters(
+            MessageLOG, guild_user, author_user, guild, author, guild_type, message_type
+        )
+        conditions.append(MessageLOG.timestamp.between(after, before))
+        async with self.read_session_maker() as session:
             return await self.__analytic_get_counts(
                 session,
                 group_by,
-                [MessageLOG.guild_id, MessageLOG.author_id],
+                [
+                    guild_user.id, guild_user.snowflake_id, guild_user.name,
+                    author_user.id, author_user.snowflake_id, author_user.name
+                ],
                 conditions,
                 limit,
                 sort_by,
@@ -971,15 +1478,115 @@ class LoggerSQL(logging.LoggerBASE):
                 [
                     func.sum(case((MessageLOG.success_rate > 0, 1), else_=0)).label("successful"),
                     func.sum(case((MessageLOG.success_rate == 0, 1), else_=0)).label("failed"),
-                    select(GuildUSER.snowflake_id).where(GuildUSER.id == MessageLOG.guild_id).scalar_subquery().label("guild_snow"),
-                    select(GuildUSER.name).where(GuildUSER.id == MessageLOG.guild_id).scalar_subquery().label("guild_name"),
-                    select(GuildUSER.snowflake_id).where(GuildUSER.id == MessageLOG.author_id).scalar_subquery().label("author_snow"),
-                    select(GuildUSER.name).where(GuildUSER.id == MessageLOG.author_id).scalar_subquery().label("author_name")
+                    guild_user.snowflake_id.label("guild_snow"),
+                    guild_user.name.label("guild_name"),
+                    author_user.snowflake_id.label("author_snow"),
+                    author_user.name.label("author_name")
+                ],
+                joins,
+                MessageLOG,
+                MessageLOG.timestamp
+            )
+
+    async def __analytic_get_num_messages_rollup(
+        self,
+        guild: Union[int, None],
+        author: Union[int, None],
+        after: datetime,
+        before: datetime,
+        guild_type: Union[Literal["USER", "GUILD"], None],
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None],
+        sort_by: str,
+        sort_by_direction: Literal["asc", "desc"],
+        limit: int,
+        group_by: Literal["year", "month", "day"]
+    ):
+        """
+        Same as :py:meth:`~daf.logging.sql.LoggerSQL.analytic_get_num_messages`, but reads the counts
+        from the day-level rollup table (:class:`MessageRollupDAY`).
+        """
+        guild_user = aliased(GuildUSER)
+        author_user = aliased(GuildUSER)
+        conditions, joins = self.__message_log_filters(
+            MessageRollupDAY, guild_user, author_user, guild, author, guild_type, message_type
+        )
+        conditions.append(MessageRollupDAY.day.between(after.date(), before.date()))
+        async with self.read_session_maker() as session:
+            return await self.__analytic_get_counts(
+                session,
+                group_by,
+                [
+                    guild_user.id, guild_user.snowflake_id, guild_user.name,
+                    author_user.id, author_user.snowflake_id, author_user.name
                 ],
-                [],
-                MessageLOG
+                conditions,
+                limit,
+                sort_by,
+                sort_by_direction,
+                [
+                    func.sum(MessageRollupDAY.successful).label("successful"),
+                    func.sum(MessageRollupDAY.failed).label("failed"),
+                    guild_user.snowflake_id.label("guild_snow"),
+                    guild_user.name.label("guild_name"),
+                    author_user.snowflake_id.label("author_snow"),
+                    author_user.name.label("author_name")
+                ],
+                joins,
+                MessageRollupDAY,
+                MessageRollupDAY.day
             )
 
+    def __message_log_filters(
+        self,
+        select_from: Union["MessageLOG", "MessageRollupDAY"],
+        guild_user: "GuildUSER",
+        author_user: "GuildUSER",
+        guild: Union[int, None],
+        author: Union[int, None],
+        guild_type: Union[Literal["USER", "GUILD"], None],
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None],
+    ) -> Tuple[list, List[Tuple[Any, Any]]]:
+        """
+        Creates the filter conditions and (explicit) joins, shared by the message analytics.
+
+        Parameters
+        ------------
+        select_from: MessageLOG | MessageRollupDAY
+            The table being filtered.
+        guild_user: GuildUSER
+            Alias of :class:`GuildUSER`, joined as the guild.
+        author_user: GuildUSER
+            Alias of :class:`GuildUSER`, joined as the author.
+
+        Returns
+        ----------
+        Tuple[list, List[Tuple[Any, Any]]]
+            The conditions and list of (table, ON clause) joins.
+        """
+        conditions = []
+        joins = [
+            (guild_user, select_from.guild_id == guild_user.id),
+            (author_user, select_from.author_id == author_user.id)
+        ]
+        if guild is not None:
+            conditions.append(guild_user.snowflake_id == guild)
+
+        if author is not None:
+            conditions.append(author_user.snowflake_id == author)
+
+        # Aliases prevent auto-correlation of subqueries (MessageLOG.success_rate) to the joined tables
+        if guild_type is not None:
+            guild_type_ = aliased(GuildTYPE)
+            joins.append((guild_type_, guild_user.guild_type_id == guild_type_.id))
+            conditions.append(guild_type_.name == guild_type)
+
+        if message_type is not None:
+            message_type_ = aliased(MessageTYPE)
+            joins.append((message_type_, select_from.message_type_id == message_type_.id))
+            conditions.append(message_type_.name == message_type)
+
+        return conditions, joins
+
     def analytic_get_message_log(
         self,
         guild: Union[int, None] = None,
@@ -1029,30 +1636,164 @@ class LoggerSQL(logging.LoggerBASE):
         ---------
         list[MessageLOG]
             List of the message logs.
+
+        .. seealso::
+
+            :py:meth:`~daf.logging.sql.LoggerSQL.analytic_get_message_rows`, which is
+            more efficient for listing logs.
         """
-        conditions = [
-            MessageLOG.timestamp.between(after, before),
-            MessageLOG.success_rate.between(*success_rate)
-        ]
+        conditions, joins = self.__message_log_filters(
+            MessageLOG, aliased(GuildUSER), aliased(GuildUSER), guild, author, guild_type, message_type
+        )
+        conditions.append(MessageLOG.timestamp.between(after, before))
+        conditions.append(MessageLOG.success_rate.between(*success_rate))
+        return self.__analytic_get_log(
+            select(MessageLOG),
+            conditions,
+            joins,
+            [getattr(getattr(MessageLOG, sort_by), sort_by_direction)()],
+            limit
+        )
 
-        if guild is not None:
-            conditions.append(MessageLOG.guild.has(GuildUSER.snowflake_id == guild))
+    async def analytic_iter_message_log(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        cursor: Optional[Tuple[datetime, int]] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[List["MessageLOG"]]:
+        """
+        .. versionadded:: 4.3.0
 
-        if author is not None:
-            conditions.append(MessageLOG.author.has(GuildUSER.snowflake_id == author))
+        Iterates over :ref:`MessageLOG` objects, without a limit, in chunks (lists) of at most ``chunk_size`` logs.
+        The logs are ordered by their timestamp and id. Each chunk is obtained with a separate query,
+        which continues after the last log of the previous chunk (keyset pagination).
 
-        if guild_type is not None:
-            conditions.append(MessageLOG.guild.has(GuildUSER.guild_type.has(GuildTYPE.name == guild_type)))
+        Parameters
+        ---------------
+        cursor: Optional[Tuple[datetime, int]]
+            Keyset cursor - the (timestamp, id) of the last log already received.
+            Iteration continues after this log. Obtain it with :py:meth:`get_log_cursor`.
+        chunk_size: int
+            Maximum number of logs in each chunk.
 
-        if message_type is not None:
-            conditions.append(MessageLOG.message_type.has(MessageTYPE.name == message_type))
+        For the other parameters, see :py:meth:`analytic_get_message_log`.
 
-        return self.__analytic_get_log(
-            MessageLOG,
-            conditions,
-            getattr(getattr(MessageLOG, sort_by), sort_by_direction)(),
-            limit
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        conditions, joins = self.__message_log_filters(
+            MessageLOG, aliased(GuildUSER), aliased(GuildUSER), guild, author, guild_type, message_type
         )
+        conditions.append(MessageLOG.timestamp.between(after or datetime.min, before or datetime.max))
+        conditions.append(MessageLOG.success_rate.between(*success_rate))
+        async for chunk in self.__analytic_iter_log(
+            MessageLOG, conditions, joins, sort_by_direction, cursor, chunk_size
+        ):
+            yield chunk
+
+    async def analytic_get_message_rows(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: datetime = datetime.min,
+        before: datetime = datetime.max,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by: Literal["timestamp", "success_rate"] = "timestamp",
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        limit: int = 500,
+    ) -> List[Tuple[int, datetime, str, float, int, str, int, str]]:
+        """
+        .. versionadded:: 4.3.0
+
+        Same as :py:meth:`~daf.logging.sql.LoggerSQL.analytic_get_message_log`,
+        but instead of :ref:`MessageLOG` objects, it only returns the columns needed to list the logs.
+        Use :py:meth:`~daf.logging.sql.LoggerSQL.analytic_get_message_log_detail` to obtain the
+        entire log (including channels).
+
+        Returns
+        --------
+        List[Tuple[int, datetime, str, float, int, str, int, str]]
+            List of tuples.
+
+            Each tuple contains:
+
+            - Log ID
+            - Timestamp
+            - Message type
+            - Success rate
+            - Guild snowflake id
+            - Guild name
+            - Author snowflake id
+            - Author name
+
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        guild_user = aliased(GuildUSER)
+        author_user = aliased(GuildUSER)
+        type_ = aliased(MessageTYPE)
+        conditions, joins = self.__message_log_filters(
+            MessageLOG, guild_user, author_user, guild, author, guild_type, message_type
+        )
+        conditions.append(MessageLOG.timestamp.between(after, before))
+        conditions.append(MessageLOG.success_rate.between(*success_rate))
+        joins.append((type_, MessageLOG.message_type_id == type_.id))
+        select_stm = select(
+            MessageLOG.id, MessageLOG.timestamp, type_.name, MessageLOG.success_rate,
+            guild_user.snowflake_id, guild_user.name, author_user.snowflake_id, author_user.name
+        ).select_from(MessageLOG)
+        for join_table, condition in joins:
+            select_stm = select_stm.join(join_table, condition)
+
+        select_stm = (
+            select_stm.where(*conditions)
+            .order_by(getattr(getattr(MessageLOG, sort_by), sort_by_direction)())
+            .limit(limit)
+        )
+        async with self.read_session_maker() as session:
+            rows = await self._run_async(session.execute, select_stm)
+            return [tuple(row) for row in rows.all()]
+
+    async def analytic_get_message_log_detail(self, log_id: int) -> Optional["MessageLOG"]:
+        """
+        .. versionadded:: 4.3.0
+
+        Returns a single :ref:`MessageLOG` object, including the channels it was sent into.
+
+        Parameters
+        ------------
+        log_id: int
+            The internal (primary key) ID of the log.
+
+        Returns
+        ---------
+        MessageLOG | None
+            The message log or None if it doesn't exist.
+
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        async with self.read_session_maker() as session:
+            result = await self._run_async(
+                session.execute,
+                select(MessageLOG).where(MessageLOG.id == log_id)
+            )
+            return result.unique().scalars().first()
 
     async def analytic_get_num_invites(
         self,
@@ -1084,7 +1825,13 @@ class LoggerSQL(logging.LoggerBASE):
         limit: int = 500
             Limit of the rows to return. Defaults to 500.
         group_by: Literal["year", "month", "day"]
-            Results returned are grouped by ``group_by``
+            Results returned are grouped by ``group_by``.
+
+            .. versionchanged:: 4.3.0
+
+                When grouping by "month" or "year", the counts are read from the
+                pre-aggregated day-level rollup table, meaning ``after`` and ``before``
+                are applied with day resolution.
 
         Returns
         --------
@@ -1106,12 +1853,19 @@ class LoggerSQL(logging.LoggerBASE):
         if sort_by not in args:
             raise ValueError(f"sort_by expected any of {args}. Got '{sort_by}'")
 
-        async with self.session_maker() as session:
-            conditions = [InviteLOG.timestamp.between(after, before)]
+        rollup = group_by != "day"
+        async with self.read_session_maker() as session:
+            if rollup:
+                select_from = InviteRollupDAY
+                conditions = [InviteRollupDAY.day.between(after.date(), before.date())]
+                count = func.sum(InviteRollupDAY.count)
+            else:
+                select_from = InviteLOG
+                conditions = [InviteLOG.timestamp.between(after, before)]
+                count = func.count()
+
             if guild is not None:
-                conditions.append(
-                    InviteLOG.invite.has(Invite.guild.has(GuildUSER.snowflake_id == guild))
-                )
+                conditions.append(GuildUSER.snowflake_id == guild)
 
             return await self.__analytic_get_counts(
                 session,
@@ -1126,16 +1880,17 @@ class LoggerSQL(logging.LoggerBASE):
                 sort_by,
                 sort_by_direction,
                 [
-                    func.count().label("count"),
+                    count.label("count"),
                     GuildUSER.snowflake_id.label("guild_snow"),
                     GuildUSER.name.label("guild_name"),
                     Invite.discord_id,
                 ],
                 [
-                    (Invite, InviteLOG.invite_id == Invite.id),
+                    (Invite, select_from.invite_id == Invite.id),
                     (GuildUSER, Invite.guild_id == GuildUSER.id)
                 ],
-                InviteLOG
+                select_from,
+                select_from.day if rollup else select_from.timestamp
             )
 
     async def __analytic_get_counts(
@@ -1149,7 +1904,8 @@ class LoggerSQL(logging.LoggerBASE):
         sort_by_direction: Literal["asc", "desc"],
         select_items: List[Any],
         joins: List[Tuple[Any, Any]],
-        select_from: Any
+        select_from: Any,
+        timestamp: Any
     ):
         args = get_args(self.__analytic_get_counts.__annotations__["sort_by_direction"])
         if sort_by_direction not in args:
@@ -1158,8 +1914,6 @@ class LoggerSQL(logging.LoggerBASE):
         regions = ["day", "month", "year"]
         regions = reversed(regions[regions.index(group_by):])
         extract_stms = []
-
-        timestamp = getattr(select_from, "timestamp")
         for region_ in regions:
             extract_stms.append(func.extract(region_, timestamp).cast(Integer))
 
@@ -1220,40 +1974,211 @@ class LoggerSQL(logging.LoggerBASE):
         list[InviteLOG]
             List of the message logs.
         """
+        invite_ = aliased(Invite)
+        guild_user = aliased(GuildUSER)
         conditions = [InviteLOG.timestamp.between(after, before)]
+        joins = []
+        if guild is not None or invite is not None:
+            joins.append((invite_, InviteLOG.invite_id == invite_.id))
+
         if guild is not None:
-            conditions.append(InviteLOG.invite.has(Invite.guild.has(GuildUSER.snowflake_id == guild)))
+            joins.append((guild_user, invite_.guild_id == guild_user.id))
+            conditions.append(guild_user.snowflake_id == guild)
+
         if invite is not None:
-            conditions.append(InviteLOG.invite.has(Invite.discord_id == invite))
+            conditions.append(invite_.discord_id == invite)
 
         return self.__analytic_get_log(
-            InviteLOG,
+            select(InviteLOG),
             conditions,
-            getattr(getattr(InviteLOG, sort_by), sort_by_direction)(),
+            joins,
+            [getattr(getattr(InviteLOG, sort_by), sort_by_direction)()],
             limit
         )
 
+    async def analytic_iter_invite_log(
+        self,
+        guild: Union[int, None] = None,
+        invite: Union[str, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        cursor: Optional[Tuple[datetime, int]] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[List["InviteLOG"]]:
+        """
+        .. versionadded:: 4.3.0
+
+        Iterates over :ref:`InviteLOG` objects, without a limit, in chunks (lists) of at most ``chunk_size`` logs.
+        See :py:meth:`analytic_iter_message_log` for the cursor and chunk parameters
+        and :py:meth:`analytic_get_invite_log` for the rest.
+
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        invite_ = aliased(Invite)
+        guild_user = aliased(GuildUSER)
+        conditions = [InviteLOG.timestamp.between(after or datetime.min, before or datetime.max)]
+        joins = []
+        if guild is not None or invite is not None:
+            joins.append((invite_, InviteLOG.invite_id == invite_.id))
+
+        if guild is not None:
+            joins.append((guild_user, invite_.guild_id == guild_user.id))
+            conditions.append(guild_user.snowflake_id == guild)
+
+        if invite is not None:
+            conditions.append(invite_.discord_id == invite)
+
+        async for chunk in self.__analytic_iter_log(
+            InviteLOG, conditions, joins, sort_by_direction, cursor, chunk_size
+        ):
+            yield chunk
+
+    async def __analytic_iter_log(
+        self,
+        table: Union["MessageLOG", "InviteLOG"],
+        conditions: list,
+        joins: List[Tuple[Any, Any]],
+        sort_by_direction: Literal["asc", "desc"],
+        cursor: Optional[Tuple[datetime, int]],
+        chunk_size: int
+    ):
+        """
+        Common helper method for keyset-paginated iteration of logs.
+        """
+        args = get_args(self.__analytic_iter_log.__annotations__["sort_by_direction"])
+        if sort_by_direction not in args:
+            raise ValueError(f"sort_by_direction expected any of {args}. Got '{sort_by_direction}'")
+
+        order_by = [getattr(table.timestamp, sort_by_direction)(), getattr(table.id, sort_by_direction)()]
+        while True:
+            chunk_conditions = conditions.copy()
+            if cursor is not None:
+                timestamp, id_ = cursor
+                if sort_by_direction == "desc":
+                    after_cursor = or_(table.timestamp < timestamp, and_(table.timestamp == timestamp, table.id < id_))
+                else:
+                    after_cursor = or_(table.timestamp > timestamp, and_(table.timestamp == timestamp, table.id > id_))
+
+                chunk_conditions.append(after_cursor)
+
+            chunk = await self.__analytic_get_log(select(table), chunk_conditions, joins, order_by, chunk_size)
+            if chunk:
+                yield chunk
+
+            if len(chunk) < chunk_size:
+                break
+
+            cursor = self.get_log_cursor(chunk[-1])
+
+    def get_log_cursor(self, log: Union["MessageLOG", "InviteLOG"]) -> Tuple[datetime, int]:
+        return log.timestamp, log.id
+
+    def _get_log_record(self, log: Union["MessageLOG", "InviteLOG"]) -> LogRecord:
+        if isinstance(log, InviteLOG):
+            guild = log.invite.guild
+            invite_context = {
+                "id": log.invite.discord_id,
+                "member": {"id": log.member.snowflake_id, "name": log.member.name}
+            }
+            return log.timestamp, self.__get_guild_context(guild), None, None, invite_context
+
+        content = log.sent_data.content
+        message_context = {
+            "sent_data": json.loads(content) if isinstance(content, str) else content,
+            "type": log.message_type.name,
+        }
+        if log.message_mode is not None:
+            message_context["mode"] = log.message_mode.name
+
+        if log.message_type.name == "DirectMESSAGE":
+            message_context["success_info"] = {"success": log.dm_reason is None}
+            if log.dm_reason is not None:
+                message_context["success_info"]["reason"] = log.dm_reason
+        else:
+            channels = {"successful": [], "failed": []}
+            for channel_log in log.channels:
+                channel = {"name": channel_log.channel.name, "id": channel_log.channel.snowflake_id}
+                if channel_log.reason is None:
+                    channels["successful"].append(channel)
+                else:
+                    channels["failed"].append({**channel, "reason": channel_log.reason})
+
+            message_context["channels"] = channels
+
+        author_context = {"name": log.author.name, "id": log.author.snowflake_id}
+        return log.timestamp, self.__get_guild_context(log.guild), message_context, author_context, None
+
+    @staticmethod
+    def __get_guild_context(guild: "GuildUSER") -> dict:
+        return {"name": guild.name, "id": guild.snowflake_id, "type": guild.guild_type.name}
+
+    @async_util.with_semaphore("_mutex")
+    async def _save_logs(self, records: List[LogRecord], checkpoint: Optional[Tuple[str, dict]] = None):
+        """
+        Saves multiple logs with their original timestamps, in a single transaction.
+        The migration ``checkpoint`` is saved into the MigrationCHECKPOINT table in the same transaction.
+
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        session: Union[AsyncSession, Session]
+        async with self.session_maker() as session:
+            for timestamp, guild_context, message_context, author_context, invite_context in records:
+                if message_context is not None:
+                    await self._save_log_message(session, guild_context, message_context, author_context, timestamp)
+                else:
+                    await self._save_log_invite(session, guild_context, invite_context, timestamp)
+
+            if checkpoint is not None:
+                await self._run_async(session.merge, MigrationCHECKPOINT(*checkpoint))
+
+            await self._run_async(session.commit)
+
+    async def _get_migration_checkpoint(self, name: str) -> Optional[dict]:
+        session: Union[AsyncSession, Session]
+        async with self.session_maker() as session:
+            return (
+                await self._run_async(session.execute, select(MigrationCHECKPOINT.state).where(
+                    MigrationCHECKPOINT.name == name
+                ))
+            ).scalar()
+
     async def __analytic_get_log(
         self,
-        select_items: Any,
+        select_stm: Any,
         conditions: list,
-        order_by: Any,
+        joins: List[Tuple[Any, Any]],
+        order_by: List[Any],
         limit: int
     ):
         """
         Common helper method universal for multiple log types.
         """
-        async with self.session_maker() as session:
+        for join_table, condition in joins:
+            select_stm = select_stm.join(join_table, condition)
+
+        async with self.read_session_maker() as session:
             logs = await self._run_async(
                 session.execute,
-                select(select_items).where(*conditions).order_by(order_by).limit(limit)
+                select_stm.where(*conditions).order_by(*order_by).limit(limit)
             )
             return list(*zip(*logs.unique().all()))
 
+    @async_util.with_semaphore("_mutex")
     async def delete_logs(self, table: Union[MessageLOG, InviteLOG], primary_keys: List[int]):
         """
         Method used to delete log objects objects.
 
+        .. versionchanged:: 4.3.0
+
+            The rollup tables are updated to exclude the deleted logs.
+
         Parameters
         ------------
         table: MessageLOG | InviteLOG
@@ -1263,9 +2188,138 @@ class LoggerSQL(logging.LoggerBASE):
         """
         session: Union[AsyncSession, Session]
         async with self.session_maker() as session:
-            await self._run_async(session.execute, delete(table).where(table.id.in_(primary_keys)))
+            condition = table.id.in_(primary_keys)
+            if table is MessageLOG:
+                rows = await self._run_async(
+                    session.execute,
+                    select(
+                        MessageLOG.timestamp, MessageLOG.guild_id, MessageLOG.author_id,
+                        MessageLOG.message_type_id, MessageLOG.success_rate
+                    ).where(condition)
+                )
+                for timestamp, guild_id, author_id, type_id, success_rate in rows.all():
+                    if success_rate is None:
+                        continue
+
+                    await self._rollup_update(
+                        session,
+                        MessageRollupDAY,
+                        {
+                            "day": timestamp.date(),
+                            "guild_id": guild_id,
+                            "author_id": author_id,
+                            "message_type_id": type_id
+                        },
+                        successful=-int(success_rate > 0),
+                        failed=-int(success_rate == 0)
+                    )
+            else:
+                rows = await self._run_async(
+                    session.execute,
+                    select(InviteLOG.timestamp, InviteLOG.invite_id).where(condition)
+                )
+                for timestamp, invite_id in rows.all():
+                    await self._rollup_update(
+                        session,
+                        InviteRollupDAY,
+                        {"day": timestamp.date(), "invite_id": invite_id},
+                        count=-1
+                    )
+
+            await self._run_async(session.execute, delete(table).where(condition))
             await self._run_async(session.commit)
 
+    async def _retention_batches(self, policy: RetentionPolicy) -> AsyncIterator[int]:
+        """
+        Deletes logs according to ``policy`` in batches of ``policy.batch_size`` rows.
+        The rollup tables are not updated, except for ``max_age``, which also deletes the old rollup rows.
+        ``max_age`` deletes entire days, so the deleted logs match the deleted (per-day) rollup rows.
+        """
+        now = datetime.now()
+        batch_size = policy.batch_size
+        removed = 0
+        max_age_cutoff = (
+            datetime.combine((now - policy.max_age).date(), datetime.min.time())
+            if policy.max_age is not None else None
+        )
+        for cutoff in (
+            max_age_cutoff,
+            now - policy.aggregates_only_after if policy.aggregates_only_after is not None else None
+        ):
+            if cutoff is None:
+                continue
+
+            for table in (MessageLOG, InviteLOG):
+                select_logs = select(table.id).where(table.timestamp < cutoff)
+                async for count in self.__delete_batched(select_logs, table, batch_size):
+                    removed += count
+                    yield count
+
+        if max_age_cutoff is not None:
+            async with self._mutex:
+                session: Union[AsyncSession, Session]
+                async with self.session_maker() as session:
+                    for table in (MessageRollupDAY, InviteRollupDAY):
+                        await self._run_async(
+                            session.execute, delete(table).where(table.day < max_age_cutoff.date())
+                        )
+
+                    await self._run_async(session.commit)
+
+        if policy.max_logs_per_guild is not None:
+            limit = policy.max_logs_per_guild
+            for table, guild_column, join in (
+                (MessageLOG, MessageLOG.guild_id, None),
+                (InviteLOG, Invite.guild_id, (Invite, InviteLOG.invite_id == Invite.id)),
+            ):
+                select_guilds = (
+                    select(guild_column).select_from(table).group_by(guild_column).having(func.count() > limit)
+                )
+                if join is not None:
+                    select_guilds = select_guilds.join(*join)
+
+                async with self._mutex:
+                    async with self.session_maker() as session:
+                        guilds = (await self._run_async(session.execute, select_guilds)).scalars().all()
+
+                for guild_id in guilds:
+                    select_stm = select(table.id).where(guild_column == guild_id)
+                    if join is not None:
+                        select_stm = select_stm.join(*join)
+
+                    select_stm = select_stm.order_by(table.timestamp.desc(), table.id.desc()).offset(limit)
+                    async for count in self.__delete_batched(select_stm, table, batch_size):
+                        removed += count
+                        yield count
+
+        if removed:
+            # Sent data, no longer used by any of the logs
+            select_stm = select(DataHISTORY.id).where(
+                ~select(MessageLOG.id).where(MessageLOG.sent_data_id == DataHISTORY.id).exists()
+            )
+            async for _ in self.__delete_batched(select_stm, DataHISTORY, batch_size):
+                pass
+
+    async def __delete_batched(self, select_stm, table: ORMBase, batch_size: int) -> AsyncIterator[int]:
+        """
+        Deletes the rows (of ``table``), whose ids are selected by ``select_stm``, in batches.
+        The lock is only held while deleting a single batch.
+        """
+        while True:
+            async with self._mutex:
+                session: Union[AsyncSession, Session]
+                async with self.session_maker() as session:
+                    ids = (await self._run_async(session.execute, select_stm.limit(batch_size))).scalars().all()
+                    if not ids:
+                        return
+
+                    await self._run_async(session.execute, delete(table).where(table.id.in_(ids)))
+                    await self._run_async(session.commit)
+                    if table is DataHISTORY:  # Cached rows could have been deleted
+                        self._clear_caches("data_history_cache")
+
+            yield len(ids)
+
     @async_util.with_semaphore("_mutex")
     async def update(self, **kwargs):
         """
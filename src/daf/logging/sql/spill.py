@@ -0,0 +1,192 @@
+"""
+Implements the spill file, used by :class:`~daf.logging.sql.LoggerSQL` to store logs
+while the database is unavailable.
+"""
+from typing import Iterator, List, Optional, Union
+from pathlib import Path
+from uuid import uuid4
+
+from ..tracing import TraceLEVELS, trace
+from ...misc import task_registry
+
+import asyncio
+import struct
+import mmap
+import zlib
+import json
+import os
+
+
+# Constants
+# ---------------------#
+C_RECORD_HEADER = struct.Struct("<II")  # Payload length, CRC32 of the payload
+
+
+class SpillFILE:
+    """
+    Append-only file of records (dictionaries).
+    Each record is stored as a header (length of the payload and its CRC32 checksum)
+    followed by the JSON encoded payload.
+
+    Appended records are buffered and written by a background task in an executor,
+    all the records buffered in the meantime with a single flush to disk.
+
+    Records that can't be read or replayed are moved into the quarantine file (``<path>.quarantine``),
+    which has the same format. Corrupted data is quarantined as a single (raw) payload.
+
+    Parameters
+    -------------
+    path: str
+        Path to the file.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.quarantine_path = path + ".quarantine"
+        self._buffer: List[bytes] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task = None
+
+    @staticmethod
+    def _encode(payload: bytes) -> bytes:
+        return C_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def append(self, record: dict) -> str:
+        """
+        Appends a record into the file.
+        The record is written in the background, use :py:meth:`flush` to wait for it.
+
+        Parameters
+        -------------
+        record: dict
+            JSON serializable record.
+
+        Returns
+        ----------
+        str
+            Unique ID, which was given to the record (``record["id"]``).
+        """
+        record_id = record["id"] = uuid4().hex
+        self._buffer.append(self._encode(json.dumps(record, ensure_ascii=False).encode("utf-8")))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = task_registry.create_task(self._flush_buffered(), self, "spill file flush")
+
+        return record_id
+
+    async def flush(self):
+        """
+        Writes the buffered records into the file.
+
+        Raises
+        ----------
+        OSError
+            Could not write into the file. The records remain buffered.
+        """
+        async with self._lock:
+            while self._buffer:  # Records appended while writing are written in the next batch
+                records, self._buffer = self._buffer, []
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self._write, self.path, b"".join(records))
+                except OSError:
+                    self._buffer[:0] = records
+                    raise
+
+    async def _flush_buffered(self):
+        try:
+            await self.flush()
+        except OSError as exc:
+            trace(
+                f"Could not write into the spill file {self.path}, retrying with the next record.",
+                TraceLEVELS.ERROR,
+                exc
+            )
+
+    def quarantine(self, record: Union[dict, bytes]):
+        """
+        Writes the ``record`` (dictionary or its raw payload) into the quarantine file.
+        """
+        if isinstance(record, dict):
+            record = json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+        self._write(self.quarantine_path, self._encode(record))
+
+    @staticmethod
+    def _read_payload(data: mmap.mmap, offset: int) -> Optional[bytes]:
+        "Returns the payload of the record at ``offset`` or None if there is no valid record."
+        end = offset + C_RECORD_HEADER.size
+        if end > len(data):
+            return None
+
+        length, checksum = C_RECORD_HEADER.unpack(data[offset:end])
+        if end + length > len(data):
+            return None
+
+        payload = data[end:end + length]
+        return payload if zlib.crc32(payload) == checksum else None
+
+    def read(self) -> Iterator[dict]:
+        """
+        Yields the records of the file.
+        Records that are not valid JSON are quarantined.
+        Corrupted or incomplete data (e. g., the process was killed while writing) is quarantined
+        and reading continues at the next valid record.
+        """
+        if self.is_empty():
+            return
+
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = 0
+            while offset < len(data):
+                payload = self._read_payload(data, offset)
+                if payload is None:  # Resynchronize at the next valid record
+                    start = offset
+                    offset += 1
+                    while offset < len(data) and self._read_payload(data, offset) is None:
+                        offset += 1
+
+                    trace(
+                        f"Moving {offset - start} corrupted bytes of spill file {self.path} into quarantine.",
+                        TraceLEVELS.WARNING
+                    )
+                    self.quarantine(data[start:offset])
+                    continue
+
+                offset += C_RECORD_HEADER.size + len(payload)
+                try:
+                    record = json.loads(payload)
+                except ValueError as exc:
+                    trace(f"Moving invalid record of spill file {self.path} into quarantine.", TraceLEVELS.WARNING, exc)
+                    self.quarantine(payload)
+                    continue
+
+                yield record
+
+    def read_chunked(self, chunk_size: int) -> Iterator[List[dict]]:
+        """
+        Yields the records of the file in lists of at most ``chunk_size`` records.
+        """
+        chunk = []
+        for record in self.read():
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def is_empty(self) -> bool:
+        "Returns True if the file doesn't contain any records."
+        return not os.path.exists(self.path) or not os.path.getsize(self.path)
+
+    def clear(self):
+        "Removes all the records."
+        if os.path.exists(self.path):
+            os.remove(self.path)
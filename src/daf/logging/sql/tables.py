@@ -1,10 +1,10 @@
-from datetime import datetime
+from datetime import datetime, date
 from typing import List
 
 
 from sqlalchemy import (
-    SmallInteger, Integer, BigInteger, DateTime,
-    Sequence, String, JSON, select, ForeignKey, func, case
+    SmallInteger, Integer, BigInteger, DateTime, Date,
+    Sequence, String, JSON, select, ForeignKey, func, case, Index
 )
 from sqlalchemy.orm import (
     mapped_column,
@@ -271,6 +271,9 @@ class MessageLOG(ORMBase):
     """
 
     __tablename__ = "MessageLOG"
+    __table_args__ = (
+        Index("ix_MessageLOG_timestamp_guild_author", "timestamp", "guild_id", "author_id"),
+    )
 
     id = mapped_column(
         Integer,
@@ -358,6 +361,9 @@ class Invite(ORMBase):
 
 class InviteLOG(ORMBase):
     __tablename__ = "InviteLOG"
+    __table_args__ = (
+        Index("ix_InviteLOG_timestamp_invite", "timestamp", "invite_id"),
+    )
 
     id = mapped_column(
         Integer,
@@ -382,3 +388,118 @@ class InviteLOG(ORMBase):
 
     def __hash__(self):
         return self.id
+
+
+class MessageRollupDAY(ORMBase):
+    """
+    Table containing pre-aggregated (day-level) message counts.
+    A row is updated each time a new :class:`MessageLOG` is inserted (or deleted),
+    so that monthly and yearly analytics don't need to scan the entire :class:`MessageLOG` table.
+
+    Parameters
+    ------------
+    day: date
+        The day the messages were sent on.
+    guild_id: int
+        Foreign key pointing to GuildUSER.id (the guild / user messages were sent into).
+    author_id: int
+        Foreign key pointing to GuildUSER.id (the author of the messages).
+    message_type_id: int
+        Foreign key pointing to MessageTYPE.id.
+    successful: int
+        Number of (at least partially) successful send attempts.
+    failed: int
+        Number of failed send attempts.
+    """
+    __tablename__ = "MessageRollupDAY"
+
+    day = mapped_column(Date, primary_key=True)
+    guild_id: Mapped[int] = mapped_column(ForeignKey("GuildUSER.id"), primary_key=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("GuildUSER.id"), primary_key=True)
+    message_type_id: Mapped[int] = mapped_column(ForeignKey("MessageTYPE.id"), primary_key=True)
+    successful = mapped_column(Integer, default=0)
+    failed = mapped_column(Integer, default=0)
+
+    def __init__(
+        self,
+        day: date,
+        guild_id: int,
+        author_id: int,
+        message_type_id: int,
+        successful: int = 0,
+        failed: int = 0
+    ):
+        self.day = day
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.message_type_id = message_type_id
+        self.successful = successful
+        self.failed = failed
+
+
+class InviteRollupDAY(ORMBase):
+    """
+    Table containing pre-aggregated (day-level) invite link join counts.
+    A row is updated each time a new :class:`InviteLOG` is inserted (or deleted).
+
+    Parameters
+    ------------
+    day: date
+        The day the members joined on.
+    invite_id: int
+        Foreign key pointing to Invite.id.
+    count: int
+        Number of member joins.
+    """
+    __tablename__ = "InviteRollupDAY"
+
+    day = mapped_column(Date, primary_key=True)
+    invite_id: Mapped[int] = mapped_column(ForeignKey("Invite.id"), primary_key=True)
+    count = mapped_column(Integer, default=0)
+
+    def __init__(self, day: date, invite_id: int, count: int = 0):
+        self.day = day
+        self.invite_id = invite_id
+        self.count = count
+
+
+class SpillRECORD(ORMBase):
+    """
+    Table containing the IDs of spill file records (logs saved while the database was unavailable),
+    that were already replayed into the database. It makes the replay idempotent.
+    The rows are deleted once the spill file is cleared.
+
+    Parameters
+    ------------
+    record_id: str
+        Unique ID of the spill file record.
+    """
+    __tablename__ = "SpillRECORD"
+
+    record_id = mapped_column(String(32), primary_key=True)
+
+    def __init__(self, record_id: str):
+        self.record_id = record_id
+
+
+class MigrationCHECKPOINT(ORMBase):
+    """
+    Table containing the progress of log migrations into the database (:func:`daf.logging.migrate_logs`).
+    The progress is saved in the same transaction as the migrated logs, so an interrupted migration
+    does not insert any log twice.
+
+    Parameters
+    ------------
+    name: str
+        Name of the migration (absolute path to its checkpoint file).
+    state: dict
+        The migration progress.
+    """
+    __tablename__ = "MigrationCHECKPOINT"
+
+    name = mapped_column(String(255), primary_key=True)
+    state = mapped_column(JSON())
+
+    def __init__(self, name: str, state: dict):
+        self.name = name
+        self.state = state
@@ -2,13 +2,14 @@
     This modules contains functions and classes
     related to the console debug long or trace.
 """
-from typing import Union, Optional
+from typing import Callable, Deque, List, Union, Optional
+from collections import deque
 from enum import Enum, auto
 from threading import current_thread, Thread
 from datetime import datetime
 from sys import _getframe
 
-from ..misc import doc
+from ..misc import doc, task_registry
 from ..events import get_global_event_ctrl, EventID
 
 try:
@@ -22,11 +23,16 @@ import asyncio
 
 __all__ = (
     "TraceLEVELS",
-    "trace"
+    "trace",
+    "get_traces",
 )
 
 
 C_TRACE_FORMAT = "[{date}] ({level}) | {module}: {message} ({reason})"
+C_TRACE_REPEAT_FORMAT = "Previous message repeated x{count}"
+C_TRACE_BUFFER_SIZE = 1000  # Maximum number of traces kept in memory (repeated traces are kept as one)
+C_TRACE_PUBLISH_PERIOD = 0.25  # Seconds between publishing batches of traces to the g_trace event listeners
+C_TRACE_PUBLISH_MAX = 500  # Maximum number of traces waiting to be published, the oldest are dropped
 
 
 @document_enum
@@ -75,15 +81,40 @@ TRACE_COLOR_MAP = {
 }
 
 
+class TraceRECORD:
+    """
+    A trace stored in the trace buffer.
+    Consecutive identical traces are stored as one record with a repeat count.
+    """
+    __slots__ = ("timestamp", "last_timestamp", "level", "module", "message", "reason", "count")
+
+    def __init__(self, timestamp: datetime, level: TraceLEVELS, module: str, message: str, reason: str) -> None:
+        self.timestamp = timestamp
+        self.last_timestamp = timestamp
+        self.level = level
+        self.module = module
+        self.message = message
+        self.reason = reason
+        self.count = 1
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
 class GLOBALS:
     """Storage class used for storing global variables of the module."""
     set_level = TraceLEVELS.DEPRECATED
     loop_thread: Thread = None
     loop: asyncio.AbstractEventLoop = None
+    buffer: Deque[TraceRECORD] = deque(maxlen=C_TRACE_BUFFER_SIZE)
+    pending: Deque[tuple] = deque(maxlen=C_TRACE_PUBLISH_MAX)  # (level, message) waiting to be published
+    dropped = 0  # Number of traces dropped from pending
+    publish_event: asyncio.Event = None
+    publish_task: asyncio.Task = None
 
 
 @doc.doc_category("Logging reference")
-def trace(message: str,
+def trace(message: Union[str, Callable[[], str]],
           level: Union[TraceLEVELS, int] = TraceLEVELS.NORMAL,
           reason: Optional[Exception] = None,
           exception_cls: Optional[Exception] = None):
@@ -91,6 +122,9 @@ def trace(message: str,
     Prints a trace to the console.
     This is thread safe.
 
+    Consecutive identical traces are printed once, followed by a
+    "Previous message repeated xN" trace when a different trace is made.
+
     .. versionchanged:: v2.3
 
         .. card::
@@ -103,11 +137,15 @@ def trace(message: str,
             or :class:`~daf.logging.tracing.TraceLEVELS.ERROR`,
             else nothing will be printed.
 
+    .. versionchanged:: 4.3.0
+        The message can be a function, which is only called if the trace is printed.
+        Traces are published to the :attr:`~daf.events.EventID.g_trace` event in batches, by a separate task.
 
     Parameters
     --------------
-    message: str
-        Trace message.
+    message: str | Callable[[], str]
+        Trace message or a function returning the message (e. g., ``lambda: f"Joined {guild.name}"``),
+        which avoids building the message when the level is not printed.
     level: TraceLEVELS | int
         Level of the trace. Defaults to TraceLEVELS.NORMAL.
     reason: Optional[Exception]
@@ -116,27 +154,110 @@ def trace(message: str,
         An exception to raise after tracing.
     """
     if GLOBALS.set_level >= level:
-        frame = _getframe(1)
-        module = frame.f_globals["__name__"]
-        msg = C_TRACE_FORMAT.format(
-                date=datetime.now().isoformat(sep=' '),
-                level=level.name,
-                reason=reason,
-                module=module,
-                message=message
-        )
+        if callable(message):
+            message = message()
 
+        module = _getframe(1).f_globals["__name__"]
         if current_thread() is GLOBALS.loop_thread:  # Thread-safe
-            evt = get_global_event_ctrl()
-            evt.emit(EventID.g_trace, level, message)
-            print(TRACE_COLOR_MAP[level] + msg + "\033[0m")
+            _record(level, module, message, reason)
         elif GLOBALS.loop is not None:
-            GLOBALS.loop.call_soon_threadsafe(trace, message, level, reason)
+            GLOBALS.loop.call_soon_threadsafe(_record, level, module, message, reason)
 
         if exception_cls is not None:
             raise exception_cls(message) from reason
 
 
+@doc.doc_category("Logging reference")
+def get_traces() -> List[dict]:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the last traces (up to 1000), oldest first.
+    Consecutive identical traces are returned as one trace.
+
+    Returns
+    ---------
+    List[dict]
+        .. code-block:: python
+
+            {
+                "timestamp": datetime,  # Time of the first trace
+                "last_timestamp": datetime,  # Time of the last repetition
+                "level": TraceLEVELS,
+                "module": str,
+                "message": str,
+                "reason": str,
+                "count": int  # Number of repetitions
+            }
+    """
+    return [record.to_dict() for record in GLOBALS.buffer]
+
+
+def _record(level: TraceLEVELS, module: str, message: str, reason: Optional[Exception]):
+    "Stores the trace into the buffer, prints it and queues it for publishing."
+    now = datetime.now()
+    reason = str(reason)
+    buffer = GLOBALS.buffer
+    last = buffer[-1] if buffer else None
+    if (
+        last is not None and last.message == message and last.level is level and
+        last.module == module and last.reason == reason
+    ):
+        last.count += 1
+        last.last_timestamp = now
+        return
+
+    if last is not None and last.count > 1:
+        _output(last.last_timestamp, last.level, last.module, C_TRACE_REPEAT_FORMAT.format(count=last.count), None)
+
+    buffer.append(TraceRECORD(now, level, module, message, reason))
+    _output(now, level, module, message, reason)
+
+
+def _output(timestamp: datetime, level: TraceLEVELS, module: str, message: str, reason: Optional[str]):
+    msg = C_TRACE_FORMAT.format(
+            date=timestamp.isoformat(sep=' '),
+            level=level.name,
+            reason=reason,
+            module=module,
+            message=message
+    )
+    print(TRACE_COLOR_MAP[level] + msg + "\033[0m")
+    pending = GLOBALS.pending
+    if len(pending) == pending.maxlen:
+        GLOBALS.dropped += 1
+
+    pending.append((level, message))
+    if GLOBALS.publish_event is not None:
+        GLOBALS.publish_event.set()
+
+
+def _publish_pending():
+    evt = get_global_event_ctrl()
+    pending = GLOBALS.pending
+    if GLOBALS.dropped:
+        evt.emit(
+            EventID.g_trace, TraceLEVELS.WARNING, f"{GLOBALS.dropped} traces were not published (too many traces)."
+        )
+        GLOBALS.dropped = 0
+
+    while pending:
+        evt.emit(EventID.g_trace, *pending.popleft())
+
+
+async def _publish_task():
+    """
+    Publishes the traces to the g_trace event listeners (e. g., remote subscribers) in batches,
+    so that many traces in a short time (e. g., rate limits) don't slow down the rest of the framework.
+    """
+    event = GLOBALS.publish_event
+    while True:
+        await event.wait()
+        await asyncio.sleep(C_TRACE_PUBLISH_PERIOD)
+        event.clear()
+        _publish_pending()
+
+
 def initialize(level: Union[TraceLEVELS, int, str] = TraceLEVELS.NORMAL):
     """
     Initializes the tracing module
@@ -162,3 +283,21 @@ def initialize(level: Union[TraceLEVELS, int, str] = TraceLEVELS.NORMAL):
     GLOBALS.loop_thread = current_thread()
     GLOBALS.set_level = level
     GLOBALS.loop = asyncio.get_running_loop()
+    if GLOBALS.publish_task is not None:
+        GLOBALS.publish_task.cancel()
+
+    GLOBALS.pending.clear()  # Not published after the previous shutdown
+    GLOBALS.publish_event = asyncio.Event()
+    GLOBALS.publish_task = task_registry.create_task(_publish_task(), purpose="trace publishing")
+
+
+def shutdown():
+    """
+    Publishes the remaining traces and stops the publishing task.
+    """
+    if GLOBALS.publish_task is not None:
+        GLOBALS.publish_task.cancel()
+        GLOBALS.publish_task = None
+        GLOBALS.publish_event = None
+
+    _publish_pending()
@@ -9,12 +9,13 @@ from functools import partial
 from enum import Enum, auto
 
 from ..logging.tracing import trace, TraceLEVELS
-from ..misc import doc, attributes, async_util
+from ..misc import doc, attributes, async_util, task_registry, clock
 from ..messagedata import BaseMessageData
 from .autochannel import AutoCHANNEL
 from .messageperiod import *
 from ..dtypes import *
 from ..events import *
+from .. import timeline
 
 import _discord as discord
 import asyncio
@@ -298,11 +299,20 @@ class BaseMESSAGE(ABC):
     def _reset_timer(self) -> None:
         """
         Resets internal timer.
+        The replaced timer is cancelled, in case it did not yet trigger (e.g., the message was sent manually).
         """
-        self._timer_handle = async_util.call_at(
-            self._event_ctrl.emit,
-            self.period.calculate(),
-            EventID._trigger_message_ready, self.parent, self
+        if self._timer_handle is not None and not self._timer_handle.done():
+            self._timer_handle.cancel()
+
+        send_time = self.period.calculate()
+        timeline._update(self, send_time)
+        self._timer_handle = task_registry.register_task(
+            async_util.call_at(
+                self._event_ctrl.emit,
+                send_time,
+                EventID._trigger_message_ready, self.parent, self
+            ),
+            self, "send timer"
         )
 
     @abstractmethod
@@ -353,10 +363,14 @@ class BaseMESSAGE(ABC):
         api objects and checks for the correct channel input context.
         """
         self._event_ctrl = event_ctrl
-        self._timer_handle = async_util.call_at(
-            event_ctrl.emit,
-            self.period.get(),
-            EventID._trigger_message_ready, self.parent, self
+        timeline._update(self, self.period.get())
+        self._timer_handle = task_registry.register_task(
+            async_util.call_at(
+                event_ctrl.emit,
+                self.period.get(),
+                EventID._trigger_message_ready, self.parent, self
+            ),
+            self, "send timer"
         )
         self._event_ctrl.add_listener(
             EventID._trigger_message_update,
@@ -367,14 +381,17 @@ class BaseMESSAGE(ABC):
         # Calculate actual datetime of when the message is going to be removed,
         # so that the time can be viewed instead of just constantly returning the same timedelta object.
         if isinstance(self._remove_after, timedelta):
-            self._remove_after = datetime.now().astimezone() + self._remove_after
+            self._remove_after = clock.now() + self._remove_after
 
         # Setup remove_after schedule (in case it is datetime)
         if isinstance(self._remove_after, datetime):
-            self._removal_timer = async_util.call_at(
-                event_ctrl.emit,
-                self._remove_after,
-                EventID._trigger_message_remove, self.parent, self
+            self._removal_timer = task_registry.register_task(
+                async_util.call_at(
+                    event_ctrl.emit,
+                    self._remove_after,
+                    EventID._trigger_message_remove, self.parent, self
+                ),
+                self, "removal timer"
             )
 
     @abstractmethod
@@ -389,6 +406,7 @@ class BaseMESSAGE(ABC):
         if self._event_ctrl is None:  # Message not initialized / already closed
             return
 
+        timeline._remove(self)
         if self._timer_handle is not None and not self._timer_handle.cancelled():
             self._timer_handle.cancel()
             await asyncio.gather(self._timer_handle, return_exceptions=True)
@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from random import randrange
 
 from ..misc.doc import doc_category
+from ..misc import clock
 
 
 __all__ = (
@@ -27,9 +28,9 @@ class BaseMessagePeriod(ABC):
     """
     def __init__(self, next_send_time: Union[datetime, timedelta]) -> None:
         if next_send_time is None:
-            next_send_time = datetime.now()
+            next_send_time = clock.now()
         elif isinstance(next_send_time, timedelta):
-            next_send_time = datetime.now() + next_send_time
+            next_send_time = clock.now() + next_send_time
 
         next_send_time = next_send_time.astimezone()
         self.next_send_time: datetime = next_send_time
@@ -74,7 +75,7 @@ class DurationPeriod(BaseMessagePeriod):
             self.calculate()
 
     def calculate(self):
-        current_stamp = datetime.now().astimezone()
+        current_stamp = clock.now()
         duration = self._get_period()
         while self.next_send_time < current_stamp:
             self.next_send_time += duration
@@ -206,7 +207,7 @@ class DaysOfWeekPeriod(EveryXPeriod):
     def calculate(self):
         # In case of deferral, the next_send_time will be greater,
         # thus next send time should be relative to that instead of now.
-        now = max(datetime.now().astimezone(), self.next_send_time)
+        now = max(clock.now(), self.next_send_time)
         now_time = now.timetz()
         self_time = self.time
 
@@ -329,7 +330,7 @@ class NamedDayOfYearPeriod(EveryXPeriod):
     def calculate(self) -> datetime:
         # In case of deferral, the next_send_time will be greater,
         # thus next send time should be relative to that instead of now.
-        now = max(datetime.now().astimezone(), self.next_send_time)
+        now = max(clock.now(), self.next_send_time)
         self_time = self.time
         next = now.replace(
             month=self.month,
@@ -405,7 +406,7 @@ class NamedDayOfMonthPeriod(EveryXPeriod):
         super().__init__(next_send_time)
 
     def calculate(self) -> datetime:
-        now = max(datetime.now().astimezone(), self.next_send_time)
+        now = max(clock.now(), self.next_send_time)
         self_time = self.time
         next = now.replace(
             hour=self_time.hour,
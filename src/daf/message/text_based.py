@@ -13,9 +13,10 @@ from .autochannel import *
 from ..dtypes import *
 from .base import *
 
-from ..misc import doc, instance_track, async_util
+from ..misc import doc, instance_track, async_util, clock
 from ..logging import sql
 from ..events import *
+from .. import spans
 
 import _discord as discord
 import asyncio
@@ -316,10 +317,13 @@ class TextMESSAGE(BaseChannelMessage):
             elif ex.status == 429:  # Rate limit
                 if ex.code == 20016:    # Slow Mode
                     self.period.defer(
-                        datetime.now().astimezone() +
+                        clock.now() +
                         timedelta(seconds=int(ex.response.headers["Retry-After"]) + 5)
                     )
-                    trace(f"{channel.name} is in slow mode. Retrying on {self.period.get()}", TraceLEVELS.WARNING)
+                    trace(
+                        lambda: f"{channel.name} is in slow mode. Retrying on {self.period.get()}",
+                        TraceLEVELS.WARNING
+                    )
                     self._check_period()  # Fix the period
 
             elif ex.status == 404:      # Unknown object
@@ -341,19 +345,24 @@ class TextMESSAGE(BaseChannelMessage):
         Sends the data into the channels.
         """
         # Acquire mutex to prevent update method from writing while sending
-        data_to_send = await self._data.to_dict()
+        with spans.span("get_data"):
+            data_to_send = await self._data.to_dict()
+
         if self._verify_data(data_to_send):  # There is data to be send
             errored_channels = []
             succeeded_channels = []
 
-            channels = self.channels
-            for constraint in self.constraints:
-                channels = constraint.check(channels)
+            with spans.span("constraints"):
+                channels = self.channels
+                for constraint in self.constraints:
+                    channels = constraint.check(channels)
 
             # Send to channels
             for channel in channels:
                 # Clear previous messages sent to channel if mode is MODE_DELETE_SEND
-                context = await self._send_channel(channel, **data_to_send)
+                with spans.span("send_channel", channel=channel.id):
+                    context = await self._send_channel(channel, **data_to_send)
+
                 if context["success"]:
                     succeeded_channels.append(channel)
                 else:
@@ -404,56 +413,63 @@ class TextMESSAGE(BaseChannelMessage):
         for tries in range(3):  # Maximum 3 tries (if rate limit)
             try:
                 # Check if we have permissions
-                client_: discord.Client = self.parent.parent.client
-                member = channel.guild.get_member(client_.user.id)
-                if member is None:
-                    raise self._generate_exception(
-                        404, -1, "Client user could not be found in guild members", discord.NotFound
-                    )
-
-                if channel.guild.me.pending:
-                    raise self._generate_exception(
-                        403, 50009,
-                        "Channel verification level is too high for you to gain access",
-                        discord.Forbidden
-                    )
-
-                ch_perms = channel.permissions_for(member)
-                if ch_perms.send_messages is False:
-                    raise self._generate_exception(
-                        403, 50013, "You lack permissions to perform that action", discord.Forbidden
-                    )
-
-                # Check if channel still exists in cache (has not been deleted)
-                if client_.get_channel(channel.id) is None:
-                    raise self._generate_exception(404, 10003, "Channel was deleted", discord.NotFound)
+                with spans.span("permission_check"):
+                    client_: discord.Client = self.parent.parent.client
+                    member = channel.guild.get_member(client_.user.id)
+                    if member is None:
+                        raise self._generate_exception(
+                            404, -1, "Client user could not be found in guild members", discord.NotFound
+                        )
+
+                    if channel.guild.me.pending:
+                        raise self._generate_exception(
+                            403, 50009,
+                            "Channel verification level is too high for you to gain access",
+                            discord.Forbidden
+                        )
+
+                    ch_perms = channel.permissions_for(member)
+                    if ch_perms.send_messages is False:
+                        raise self._generate_exception(
+                            403, 50013, "You lack permissions to perform that action", discord.Forbidden
+                        )
+
+                    # Check if channel still exists in cache (has not been deleted)
+                    if client_.get_channel(channel.id) is None:
+                        raise self._generate_exception(404, 10003, "Channel was deleted", discord.NotFound)
 
                 # Delete previous message if clear-send mode is chosen and message exists
                 if self.mode == "clear-send" and self.sent_messages.get(channel.id, None) is not None:
-                    await self.sent_messages[channel.id].delete()
-                    self.sent_messages[channel.id] = None
+                    with spans.span("delete_previous"):
+                        await self.sent_messages[channel.id].delete()
+                        self.sent_messages[channel.id] = None
 
                 # Send/Edit message
                 if (
                     self.mode in {"send", "clear-send"} or
                     self.mode == "edit" and self.sent_messages.get(channel.id, None) is None
                 ):
-                    message = await channel.send(
-                        content,
-                        embed=embed,
-                        files=[discord.File(file.stream, file.filename) for file in files]
-                    )
+                    with spans.span("build_files", files=len(files)):
+                        discord_files = [discord.File(file.stream, file.filename) for file in files]
+
+                    # Includes waiting for the rate limit bucket and retries of the HTTP client
+                    with spans.span("discord_send", attempt=tries):
+                        message = await channel.send(content, embed=embed, files=discord_files)
+
                     self.sent_messages[channel.id] = message
                     await self._publish_message(message)
 
                 # Mode is edit and message was already send to this channel
                 elif self.mode == "edit":
-                    await self.sent_messages[channel.id].edit(content, embed=embed)
+                    with spans.span("discord_edit", attempt=tries):
+                        await self.sent_messages[channel.id].edit(content, embed=embed)
 
                 return {"success": True}
 
             except Exception as ex:
-                handled, action = await self._handle_error(channel, ex)
+                with spans.span("handle_error", error=type(ex).__name__):
+                    handled, action = await self._handle_error(channel, ex)
+
                 if not handled:
                     return {"success": False, "reason": ex, "action": action}
 
@@ -688,28 +704,34 @@ class DirectMESSAGE(BaseMESSAGE):
             try:
                 # Deletes previous message if it exists and mode is "clear-send"
                 if self.mode == "clear-send" and self.previous_message is not None:
-                    await self.previous_message.delete()
-                    self.previous_message = None
+                    with spans.span("delete_previous"):
+                        await self.previous_message.delete()
+                        self.previous_message = None
 
                 # Sends a new message
                 if (
                     self.mode in {"send", "clear-send"} or
                     self.mode == "edit" and self.previous_message is None
                 ):
-                    self.previous_message = await self.dm_channel.send(
-                        content,
-                        embed=embed,
-                        files=[discord.File(fwFILE.stream, fwFILE.filename) for fwFILE in files]
-                    )
+                    with spans.span("build_files", files=len(files)):
+                        discord_files = [discord.File(fwFILE.stream, fwFILE.filename) for fwFILE in files]
+
+                    # Includes waiting for the rate limit bucket and retries of the HTTP client
+                    with spans.span("discord_send", attempt=tries):
+                        self.previous_message = await self.dm_channel.send(content, embed=embed, files=discord_files)
 
                 # Mode is edit and message was already send to this channel
                 elif self.mode == "edit":
-                    await self.previous_message.edit(content, embed=embed)
+                    with spans.span("discord_edit", attempt=tries):
+                        await self.previous_message.edit(content, embed=embed)
 
                 return {"success": True}
 
             except Exception as ex:
-                if await self._handle_error(ex) is False or tries == 2:
+                with spans.span("handle_error", error=type(ex).__name__):
+                    handled = await self._handle_error(ex)
+
+                if handled is False or tries == 2:
                     return {"success": False, "reason": ex}
 
     @async_util.with_semaphore("update_semaphore")
@@ -718,9 +740,13 @@ class DirectMESSAGE(BaseMESSAGE):
         Sends the data into the channels
         """
         # Parse data from the data parameter
-        data_to_send = await self._data.to_dict()
+        with spans.span("get_data"):
+            data_to_send = await self._data.to_dict()
+
         if self._verify_data(data_to_send):
-            channel_ctx = await self._send_channel(**data_to_send)
+            with spans.span("send_channel"):
+                channel_ctx = await self._send_channel(**data_to_send)
+
             self._update_state()
             if channel_ctx["success"] is False:
                 reason = channel_ctx["reason"]
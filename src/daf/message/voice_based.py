@@ -18,6 +18,7 @@ from .autochannel import *
 from ..dtypes import *
 from ..events import *
 from .base import *
+from .. import spans
 
 import importlib.util as import_util
 import _discord as discord
@@ -237,7 +238,9 @@ class VoiceMESSAGE(BaseChannelMessage):
         Sends the data into the channels.
         """
         # Acquire mutex to prevent update method from writing while sending
-        data_to_send = await self._data.to_dict()
+        with spans.span("get_data"):
+            data_to_send = await self._data.to_dict()
+
         if self._verify_data(data_to_send):  # There is data to be send
             errored_channels = []
             succeeded_channels = []
@@ -245,7 +248,9 @@ class VoiceMESSAGE(BaseChannelMessage):
             # Send to channels
             for channel in self.channels:
                 # Clear previous messages sent to channel if mode is MODE_DELETE_SEND
-                context = await self._send_channel(channel, **data_to_send)
+                with spans.span("send_channel", channel=channel.id):
+                    context = await self._send_channel(channel, **data_to_send)
+
                 if context["success"]:
                     succeeded_channels.append(channel)
                 else:
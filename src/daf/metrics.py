@@ -0,0 +1,177 @@
+"""
+Module contains the metrics of the framework, exposed in the Prometheus text exposition format.
+Counters and histograms are updated inside the framework, other metrics are collected
+when the metrics are requested.
+"""
+from typing import Callable, Dict, Iterable, List, Literal, Tuple
+from bisect import bisect_left
+
+from .misc import doc
+
+
+__all__ = (
+    "get_metrics",
+)
+
+
+# Constants
+# ---------------------#
+C_SEND_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+C_SCHEDULE_LAG_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 5, 10, 60, 300)
+
+
+class GLOBALS:
+    metrics: List["MetricBASE"] = []
+
+
+class MetricBASE:
+    """
+    Base for all the metrics. Creating a metric registers it.
+
+    Parameters
+    -------------
+    name: str
+        Name of the metric.
+    help: str
+        Description of the metric.
+    """
+    TYPE: str
+    __slots__ = ("name", "help")
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        GLOBALS.metrics.append(self)
+
+    def generate(self) -> Iterable[str]:
+        "Yields the exposition lines of the metric (without HELP and TYPE)."
+        raise NotImplementedError
+
+
+class CounterMETRIC(MetricBASE):
+    """
+    A value that only increases.
+    """
+    TYPE = "counter"
+    __slots__ = ("value",)
+
+    def __init__(self, name: str, help: str) -> None:
+        super().__init__(name, help)
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def generate(self):
+        yield f"{self.name} {self.value}"
+
+
+class HistogramMETRIC(MetricBASE):
+    """
+    Counts observed values into buckets (cumulative when generated).
+
+    Parameters
+    -------------
+    buckets: Tuple[float, ...]
+        Sorted upper bounds of the buckets. The ``+Inf`` bucket is added automatically.
+    """
+    TYPE = "histogram"
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...]) -> None:
+        super().__init__(name, help)
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def generate(self):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{le="{bound}"}} {cumulative}'
+
+        yield f"{self.name}_sum {self.sum}"
+        yield f"{self.name}_count {self.count}"
+
+
+class CollectedMETRIC(MetricBASE):
+    """
+    Metric, which is only calculated when the metrics are requested.
+
+    Parameters
+    -------------
+    type: Literal["counter", "gauge"]
+        The metric type.
+    collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]
+        Function returning (labels, value) pairs.
+    """
+    __slots__ = ("TYPE", "collect")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        type: Literal["counter", "gauge"],
+        collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]
+    ) -> None:
+        super().__init__(name, help)
+        self.TYPE = type
+        self.collect = collect
+
+    def generate(self):
+        for labels, value in self.collect():
+            if labels:
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                yield f"{self.name}{{{labels}}} {value}"
+            else:
+                yield f"{self.name} {value}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Metrics updated by the framework
+SEND_DURATION = HistogramMETRIC(
+    "daf_send_duration_seconds",
+    "Duration of a message's send attempt (all channels).",
+    C_SEND_DURATION_BUCKETS
+)
+SCHEDULE_LAG = HistogramMETRIC(
+    "daf_schedule_lag_seconds",
+    "Time between the planned and the actual start of a send attempt.",
+    C_SCHEDULE_LAG_BUCKETS
+)
+LOG_FAILURES = CounterMETRIC(
+    "daf_log_failures_total",
+    "Number of failed attempts to save a log (into the logger or one of its fallbacks)."
+)
+
+
+@doc.doc_category("Metrics")
+def get_metrics() -> str:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the metrics of the framework in the Prometheus text exposition format.
+    Also available through the remote server's ``/metrics`` route.
+
+    Returns
+    ---------
+    str
+        The metrics.
+    """
+    lines = []
+    for metric in GLOBALS.metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+        lines.extend(metric.generate())
+
+    lines.append("")
+    return "\n".join(lines)
@@ -6,5 +6,7 @@ Contains miscellaneous utilities.
 from .async_util import *
 from .attributes import *
 from .cache import *
+from .clock import *
 from .doc import *
 from .instance_track import *
+from .task_registry import *
@@ -10,6 +10,7 @@ from contextlib import suppress
 from datetime import datetime, timedelta
 
 from .attributes import get_all_slots
+from . import clock
 
 import asyncio
 
@@ -168,7 +169,7 @@ def call_at(fnc: Callable, when: Union[datetime, timedelta], *args, **kwargs) ->
     Calls ``fnc`` at specific datetime with args and kwargs.
     """
     async def waiter():
-        delay = when if isinstance(when, timedelta) else max((when.astimezone() - datetime.now().astimezone()), timedelta(0))
+        delay = when if isinstance(when, timedelta) else max((when.astimezone() - clock.now()), timedelta(0))
         delay = delay.total_seconds()
         while delay > 0:
             to_sleep = min(delay, 600)  # Maximum sleep of one day for precision purposes
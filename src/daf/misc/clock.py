@@ -0,0 +1,227 @@
+"""
+Clock used for scheduling (message periods, timers and slow mode deferrals).
+
+By default the system clock is used. For simulations and tests, the :class:`VirtualCLOCK`
+together with the :class:`VirtualClockEventLoop` allows long schedules (e.g., days) to run in seconds,
+as the time jumps to the next timer whenever the event loop is idle.
+"""
+from typing import Any, Callable, Optional
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+from contextvars import ContextVar
+
+from .doc import doc_category
+
+import selectors
+import asyncio
+import time
+
+
+__all__ = (
+    "BaseCLOCK",
+    "SystemCLOCK",
+    "VirtualCLOCK",
+    "VirtualClockEventLoop",
+    "VirtualClockEventLoopPolicy",
+    "get_clock",
+    "set_clock",
+)
+
+
+class BaseCLOCK(ABC):
+    """
+    .. versionadded:: 4.3.0
+
+    Base for implementing clocks.
+    """
+    @abstractmethod
+    def now(self) -> datetime:
+        "Returns the current (timezone aware) local datetime."
+        pass
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        "Returns the value (in seconds) of a monotonic clock, used by the event loop."
+        pass
+
+
+@doc_category("Clock", path="misc.clock")
+class SystemCLOCK(BaseCLOCK):
+    """
+    .. versionadded:: 4.3.0
+
+    The system's clock (default).
+    """
+    def now(self) -> datetime:
+        return datetime.now().astimezone()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+@doc_category("Clock", path="misc.clock")
+class VirtualCLOCK(BaseCLOCK):
+    """
+    .. versionadded:: 4.3.0
+
+    A clock that follows the system's clock, but can be moved forward.
+
+    Parameters
+    ------------
+    start: Optional[datetime]
+        The virtual datetime at creation. Defaults to now.
+    """
+    def __init__(self, start: Optional[datetime] = None) -> None:
+        self._start = (start or datetime.now()).astimezone()
+        self._start_monotonic = time.monotonic()
+        self.offset = 0.0
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self.monotonic() - self._start_monotonic)
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self.offset
+
+    def advance(self, seconds: float):
+        "Moves the clock ``seconds`` forward."
+        self.offset += seconds
+
+
+class _VirtualSELECTOR(selectors.BaseSelector):
+    """
+    Selector that moves the clock to the next timer instead of waiting for it,
+    if no I/O is ready.
+    """
+    def __init__(self, loop: "VirtualClockEventLoop") -> None:
+        self._selector = selectors.DefaultSelector()
+        self._loop = loop
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._selector.modify(fileobj, events, data)
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def close(self):
+        self._selector.close()
+
+    def select(self, timeout: Optional[float] = None):
+        # Nothing is scheduled or work is being done in other threads (e.g., DNS lookups), wait for real.
+        if timeout is None or self._loop._executor_jobs:
+            return self._selector.select(timeout)
+
+        ready = self._selector.select(0)
+        if not ready and timeout > 0:
+            self._loop.clock.advance(timeout)
+
+        return ready
+
+
+@doc_category("Clock", path="misc.clock")
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    .. versionadded:: 4.3.0
+
+    Event loop, which (when no I/O is ready) moves the :class:`VirtualCLOCK` to the next timer, instead of waiting.
+    The clock is also set as the framework's clock (:func:`set_clock`), so message periods follow the virtual time.
+
+    While functions run in an executor (other threads), the loop waits for real.
+
+    Parameters
+    ------------
+    clock: Optional[VirtualCLOCK]
+        The virtual clock. Defaults to a new clock starting now.
+
+    Example
+    ----------
+    .. code-block:: python
+
+        # Sends of a 24-hour schedule happen in seconds
+        loop = VirtualClockEventLoop()
+        loop.run_until_complete(simulation())
+    """
+    def __init__(self, clock: Optional[VirtualCLOCK] = None) -> None:
+        self.clock = clock or VirtualCLOCK()
+        self._executor_jobs = 0
+        super().__init__(_VirtualSELECTOR(self))
+        set_clock(self.clock)
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+    def run_in_executor(self, executor: Any, func: Callable, *args: Any) -> asyncio.Future:
+        future = super().run_in_executor(executor, func, *args)
+        self._executor_jobs += 1
+
+        def done(_):
+            self._executor_jobs -= 1
+
+        future.add_done_callback(done)
+        return future
+
+    def close(self):
+        super().close()
+        if GLOBALS.clock is self.clock:
+            set_clock(SystemCLOCK())
+
+
+@doc_category("Clock", path="misc.clock")
+class VirtualClockEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """
+    .. versionadded:: 4.3.0
+
+    Event loop policy creating :class:`VirtualClockEventLoop` loops.
+    Can be used to run the entire framework on virtual time.
+
+    .. code-block:: python
+
+        asyncio.set_event_loop_policy(VirtualClockEventLoopPolicy())
+        daf.run(...)
+    """
+    def new_event_loop(self) -> VirtualClockEventLoop:
+        return VirtualClockEventLoop()
+
+
+class GLOBALS:
+    """Storage class used for storing global variables of the module."""
+    clock: BaseCLOCK = SystemCLOCK()
+    context_clock: ContextVar[Optional[BaseCLOCK]] = ContextVar("context_clock", default=None)
+
+
+@doc_category("Clock", path="misc.clock")
+def get_clock() -> BaseCLOCK:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the clock used for scheduling.
+    A clock set for the current context (e.g., the capacity planner's simulation) takes precedence.
+    """
+    return GLOBALS.context_clock.get() or GLOBALS.clock
+
+
+@doc_category("Clock", path="misc.clock")
+def set_clock(clock: BaseCLOCK):
+    """
+    .. versionadded:: 4.3.0
+
+    Sets the clock used for scheduling.
+    This should be done before any objects are created, as their times are calculated when created.
+
+    Parameters
+    ------------
+    clock: BaseCLOCK
+        The clock.
+    """
+    GLOBALS.clock = clock
+
+
+def now() -> datetime:
+    "Returns the current (timezone aware) datetime of the scheduling clock."
+    return get_clock().now()
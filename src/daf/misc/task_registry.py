@@ -0,0 +1,101 @@
+"""
+Registry of the framework's long-lived asyncio tasks.
+Each task is tagged with the object owning it and its purpose,
+which allows tasks that outlived their owner to be found.
+"""
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+from datetime import datetime
+
+import asyncio
+import weakref
+
+
+__all__ = (
+    "TaskINFO",
+    "register_task",
+    "create_task",
+    "get_registered_tasks",
+)
+
+
+class TaskINFO:
+    """
+    Information about a registered task.
+
+    Parameters
+    ------------
+    owner: Optional[Any]
+        The object owning the task. Only a weak reference is kept, if the object supports it.
+    purpose: str
+        Description of what the task does.
+    """
+    __slots__ = ("_owner", "owner_type", "purpose", "created")
+
+    def __init__(self, owner: Optional[Any], purpose: str) -> None:
+        self._owner: Optional[Callable[[], Any]] = None
+        if owner is not None:
+            try:
+                self._owner = weakref.ref(owner)
+            except TypeError:
+                self._owner = lambda: owner
+
+        self.owner_type = type(owner).__name__ if owner is not None else None
+        self.purpose = purpose
+        self.created = datetime.now()
+
+    @property
+    def has_owner(self) -> bool:
+        "Returns True if the task was registered with an owner."
+        return self._owner is not None
+
+    @property
+    def owner(self) -> Optional[Any]:
+        "Returns the owner or None if the task has no owner or the owner was deleted."
+        return self._owner() if self._owner is not None else None
+
+
+class GLOBALS:
+    tasks: Dict[asyncio.Task, TaskINFO] = {}
+
+
+def _unregister(task: asyncio.Task):
+    GLOBALS.tasks.pop(task, None)
+
+
+def register_task(task: asyncio.Task, owner: Optional[Any] = None, purpose: Optional[str] = None) -> asyncio.Task:
+    """
+    Registers the ``task`` into the registry. The task is removed from the registry after it's done.
+
+    Parameters
+    ------------
+    task: asyncio.Task
+        The task to register.
+    owner: Optional[Any]
+        The object owning the task.
+    purpose: Optional[str]
+        Description of what the task does. Defaults to the task's name.
+
+    Returns
+    ----------
+    asyncio.Task
+        The ``task`` parameter.
+    """
+    if not task.done():
+        GLOBALS.tasks[task] = TaskINFO(owner, purpose if purpose is not None else task.get_name())
+        task.add_done_callback(_unregister)
+
+    return task
+
+
+def create_task(coro: Coroutine, owner: Optional[Any] = None, purpose: Optional[str] = None) -> asyncio.Task:
+    """
+    Creates a task from ``coro`` and registers it (:func:`register_task`).
+    """
+    return register_task(asyncio.create_task(coro), owner, purpose)
+
+
+def get_registered_tasks() -> List[Tuple[asyncio.Task, TaskINFO]]:
+    """
+    Returns the registered tasks, that are not yet done.
+    """
+    return list(GLOBALS.tasks.items())
@@ -0,0 +1,471 @@
+"""
+Module contains the capacity planner, an offline discrete-event simulation of sending a shilling list.
+The simulation follows each message's period, channels and the channels' slow mode,
+and sends the messages through a model of Discord's rate limits.
+It predicts how often the rate limits will be hit, how late the messages will be sent (schedule lag)
+and how much of each account's rate limit is used.
+"""
+from typing import Deque, Dict, List, Optional, Tuple, Union
+from collections import deque
+from datetime import datetime, timedelta
+from copy import deepcopy
+
+from .message import BaseMESSAGE, TextMESSAGE, DirectMESSAGE
+from .guild import GUILD, USER, AutoGUILD
+from .misc import doc, clock
+from . import client
+
+import asyncio
+import heapq
+
+
+__all__ = (
+    "RateLimitMODEL",
+    "plan_capacity",
+    "plan_capacity_async",
+)
+
+
+# Constants
+# ---------------------#
+C_SLOWMODE_DEFER = 5  # Seconds added to the slow mode's retry after, when deferring the period
+C_SLOWMODE_ADJUST = 10  # Seconds added to the slow mode when adjusting the period
+C_LAG_PERCENTILES = (50, 90, 99)
+
+
+@doc.doc_category("Capacity planner")
+class RateLimitMODEL:
+    """
+    .. versionadded:: 4.3.0
+
+    Model of Discord's rate limits used by :func:`plan_capacity`.
+    Rate limits are modeled as fixed windows, which start at the first request.
+
+    Parameters
+    ------------
+    global_limit: int
+        Number of requests each account can make in ``global_window``. Defaults to 50.
+    global_window: float
+        Seconds of the global window. Defaults to 1.
+    route_limit: int
+        Number of requests each account can make to the same route (method and channel)
+        in ``route_window``. Defaults to 5.
+    route_window: float
+        Seconds of the route window. Defaults to 5.
+    latency: float
+        Seconds each request takes. Defaults to 0.3.
+    """
+    def __init__(
+        self,
+        global_limit: int = 50,
+        global_window: float = 1,
+        route_limit: int = 5,
+        route_window: float = 5,
+        latency: float = 0.3
+    ) -> None:
+        self.global_limit = global_limit
+        self.global_window = global_window
+        self.route_limit = route_limit
+        self.route_window = route_window
+        self.latency = latency
+
+
+class _SimulatedCLOCK(clock.BaseCLOCK):
+    "Clock of the simulation, used by the message periods."
+    def __init__(self, start: datetime) -> None:
+        self.current = start
+
+    def now(self) -> datetime:
+        return self.current
+
+    def monotonic(self) -> float:
+        return self.current.timestamp()
+
+
+class _BUCKET:
+    "Fixed window rate limit."
+    __slots__ = ("limit", "window", "remaining", "reset")
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset = 0.0
+
+    def wait(self, now: float) -> float:
+        "Returns the seconds until a request can be made."
+        if now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.window
+
+        return self.reset - now if self.remaining == 0 else 0
+
+    def take(self):
+        self.remaining -= 1
+
+
+class _AccountSTATE:
+    __slots__ = (
+        "index", "name", "bucket", "routes", "last_sends", "requests", "sends", "rate_limit_waits", "slowmode_limits"
+    )
+
+    def __init__(self, index: int, name: Optional[str], model: RateLimitMODEL) -> None:
+        self.index = index
+        self.name = name
+        self.bucket = _BUCKET(model.global_limit, model.global_window)
+        self.routes: Dict[tuple, _BUCKET] = {}
+        self.last_sends: Dict[int, float] = {}  # Last send into each channel (slow mode)
+        self.requests = 0
+        self.sends = 0
+        self.rate_limit_waits = 0
+        self.slowmode_limits = 0
+
+
+class _MessageSTATE:
+    __slots__ = ("account", "worker", "period", "mode", "channels", "sent")
+
+    def __init__(
+        self,
+        account: _AccountSTATE,
+        worker: "_WORKER",
+        period,
+        mode: str,
+        channels: List[Tuple[int, int]]
+    ) -> None:
+        self.account = account
+        self.worker = worker
+        self.period = period
+        self.mode = mode
+        self.channels = channels  # (channel id, slow mode)
+        self.sent = set()  # Channels with a previously sent message (edit and clear-send modes)
+
+
+class _WORKER:
+    "Messages of a guild are sent one after another (the guild's semaphore)."
+    __slots__ = ("queue", "requests", "message", "scheduled")
+
+    def __init__(self) -> None:
+        self.queue: Deque[Tuple[_MessageSTATE, float]] = deque()
+        self.requests: Deque[Tuple[str, int, int]] = deque()  # (method, channel id, slow mode)
+        self.message: Optional[_MessageSTATE] = None
+        self.scheduled: Optional[float] = None  # Scheduled time of the send, until the first request is made
+
+
+def _message_channels(
+    message: BaseMESSAGE,
+    guild: Union[GUILD, USER],
+    slowmode: Dict[int, int]
+) -> List[Tuple[int, int]]:
+    if isinstance(message, DirectMESSAGE):
+        return [(guild.snowflake, 0)]  # The DM channel, identified by the user
+
+    channels = []
+    for channel in message.channels:
+        if isinstance(channel, int):
+            channels.append((channel, slowmode.get(channel, 0)))
+        else:
+            channels.append((channel.id, getattr(channel, "slowmode_delay", 0) or slowmode.get(channel.id, 0)))
+
+    return channels
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0
+
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+def _snapshot(
+    accounts: Optional[List[client.ACCOUNT]],
+    duration: timedelta,
+    slowmode: Optional[Dict[int, int]]
+) -> Tuple[datetime, list]:
+    """
+    Returns the simulation's start and copies of the simulated inputs (account names, and each guild's
+    message periods, modes and channels), so the simulation does not access the objects.
+    """
+    if duration <= timedelta(0):
+        raise ValueError("'duration' must be positive.")
+
+    if accounts is None:
+        from .core import get_accounts
+        accounts = get_accounts()
+
+    if slowmode is None:
+        slowmode = {}
+
+    snapshot = []
+    for account in accounts:
+        account_client = account.client if account.running else None
+        guilds = []
+        for server in account.servers:
+            guilds.extend(server.guilds if isinstance(server, AutoGUILD) else [server])
+
+        guild_messages = []
+        for guild in guilds:
+            messages = []
+            for message in guild.messages:
+                if not isinstance(message, (TextMESSAGE, DirectMESSAGE)):
+                    continue
+
+                channels = _message_channels(message, guild, slowmode)
+                messages.append((deepcopy(message.period), message.mode, channels))
+
+            guild_messages.append(messages)
+
+        snapshot.append((account_client.user.name if account_client else None, guild_messages))
+
+    return clock.now(), snapshot
+
+
+def _simulate(start: datetime, snapshot: list, duration: timedelta, model: Optional[RateLimitMODEL]) -> dict:
+    "Runs the simulation of :func:`plan_capacity` on copies of the inputs (:func:`_snapshot`)."
+    if model is None:
+        model = RateLimitMODEL()
+
+    # The periods calculate the next send from the (simulated) clock, which is set only for this context
+    sim_clock = _SimulatedCLOCK(start)
+    end = duration.total_seconds()
+    events = []  # (time, sequence, handler, arguments)
+    sequence = 0
+    lags = []
+    rate_limit_delay = 0.0
+
+    def schedule(when: float, handler, *args):
+        nonlocal sequence
+        heapq.heappush(events, (when, sequence, handler, args))
+        sequence += 1
+
+    def schedule_period(message: _MessageSTATE):
+        when = max((message.period.get() - start).total_seconds(), 0)
+        if when < end:
+            schedule(when, ready, message, when)
+
+    def ready(now: float, message: _MessageSTATE, scheduled: float):
+        worker = message.worker
+        worker.queue.append((message, scheduled))
+        if worker.message is None:
+            start_send(now, worker)
+
+    def start_send(now: float, worker: _WORKER):
+        message, worker.scheduled = worker.queue.popleft()
+        message.account.sends += 1
+        worker.message = message
+        for channel, channel_slowmode in message.channels:
+            if message.mode == "clear-send" and channel in message.sent:
+                worker.requests.append(("DELETE", channel, 0))
+
+            method = "PATCH" if message.mode == "edit" and channel in message.sent else "POST"
+            worker.requests.append((method, channel, channel_slowmode))
+
+        request(now, worker)
+
+    def request(now: float, worker: _WORKER):
+        nonlocal rate_limit_delay
+        message = worker.message
+        account = message.account
+        while worker.requests:
+            method, channel, channel_slowmode = worker.requests[0]
+            if method == "POST" and now - account.last_sends.get(channel, -channel_slowmode) < channel_slowmode:
+                account.slowmode_limits += 1
+                retry_after = account.last_sends[channel] + channel_slowmode - now
+                sim_clock.current = start + timedelta(seconds=now)
+                message.period.defer(sim_clock.current + timedelta(seconds=retry_after + C_SLOWMODE_DEFER))
+                worker.requests.popleft()
+                continue
+
+            route = account.routes.get((method, channel))
+            if route is None:
+                route = account.routes[(method, channel)] = _BUCKET(model.route_limit, model.route_window)
+
+            wait = max(account.bucket.wait(now), route.wait(now))
+            if wait > 0:
+                account.rate_limit_waits += 1
+                rate_limit_delay += wait
+                schedule(now + wait, request, worker)
+                return
+
+            account.bucket.take()
+            route.take()
+            account.requests += 1
+            worker.requests.popleft()
+            if worker.scheduled is not None:
+                lags.append(now - worker.scheduled)
+                worker.scheduled = None
+
+            if method == "POST":
+                account.last_sends[channel] = now
+                message.sent.add(channel)
+
+            schedule(now + model.latency, request if worker.requests else finish, worker)
+            return
+
+        finish(now, worker)
+
+    def finish(now: float, worker: _WORKER):
+        message = worker.message
+        worker.message = None
+        sim_clock.current = start + timedelta(seconds=now)
+        message.period.calculate()
+        schedule_period(message)
+        if worker.queue:
+            start_send(now, worker)
+
+    account_states = []
+    token = clock.GLOBALS.context_clock.set(sim_clock)
+    try:
+        for index, (name, guild_messages) in enumerate(snapshot):
+            state = _AccountSTATE(index, name, model)
+            account_states.append(state)
+            for messages in guild_messages:
+                worker = _WORKER()
+                for period, mode, channels in messages:
+                    max_slowmode = max((channel_slowmode for _, channel_slowmode in channels), default=0)
+                    if max_slowmode > 0:
+                        period.adjust(timedelta(seconds=max_slowmode + C_SLOWMODE_ADJUST))
+
+                    schedule_period(_MessageSTATE(state, worker, period, mode, channels))
+
+        while events and events[0][0] < end:
+            when, _, handler, args = heapq.heappop(events)
+            handler(when, *args)
+    finally:
+        clock.GLOBALS.context_clock.reset(token)
+
+    lags.sort()
+    global_capacity = model.global_limit / model.global_window * end
+    return {
+        "duration": end,
+        "sends": sum(state.sends for state in account_states),
+        "requests": sum(state.requests for state in account_states),
+        "rate_limit_waits": sum(state.rate_limit_waits for state in account_states),
+        "rate_limit_delay": rate_limit_delay,
+        "slowmode_limits": sum(state.slowmode_limits for state in account_states),
+        "lag": {
+            **{f"p{percent}": _percentile(lags, percent) for percent in C_LAG_PERCENTILES},
+            "max": lags[-1] if lags else 0,
+        },
+        "accounts": [
+            {
+                "index": state.index,
+                "name": state.name,
+                "sends": state.sends,
+                "requests": state.requests,
+                "rate_limit_waits": state.rate_limit_waits,
+                "slowmode_limits": state.slowmode_limits,
+                "utilization": state.requests / global_capacity,
+            }
+            for state in account_states
+        ],
+    }
+
+
+@doc.doc_category("Capacity planner")
+def plan_capacity(
+    accounts: Optional[List[client.ACCOUNT]] = None,
+    duration: timedelta = timedelta(days=1),
+    model: Optional[RateLimitMODEL] = None,
+    slowmode: Optional[Dict[int, int]] = None
+) -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Simulates sending the shilling list for ``duration`` (offline, in a fraction of the time)
+    and predicts the rate limits hit, the schedule lag and the accounts' utilization.
+
+    The messages of each guild are sent one after another, while different guilds are sent concurrently.
+    Each channel of a message makes one request per send (two in the ``clear-send`` mode).
+    Requests are delayed by the :class:`RateLimitMODEL`'s limits. As in the framework,
+    the periods are increased above the channels' slow mode, and a message
+    sent into a channel in slow mode skips the channel and defers the message.
+
+    Voice messages, and guilds of :class:`~daf.guild.AutoGUILD` that were not yet found, are not simulated.
+    The simulation runs on copies of the objects, with its own clock (the framework's clock is not changed).
+
+    This function blocks until the simulation is done and can't be called from a running event loop.
+    Use :func:`plan_capacity_async` inside the event loop, e.g., to plan the framework's running accounts.
+
+    Parameters
+    ------------
+    accounts: Optional[List[ACCOUNT]]
+        The accounts to simulate. They can be the accounts of a schema (not added to the framework),
+        whose channels are given as IDs. Defaults to the framework's (running) accounts.
+    duration: timedelta
+        The simulated duration. Defaults to one day.
+    model: Optional[RateLimitMODEL]
+        The rate limit model. Defaults to :class:`RateLimitMODEL` with the default parameters.
+    slowmode: Optional[Dict[int, int]]
+        Slow mode (in seconds) of channels given as IDs, mapped by the channel ID.
+        Channel objects of running accounts use their own slow mode.
+
+    Returns
+    ---------
+    dict
+        .. code-block:: python
+
+            {
+                "duration": float,  # Seconds simulated
+                "sends": int,  # Number of message sends
+                "requests": int,
+                # Requests delayed until a limit's reset. The model waits pre-emptively,
+                # the requests are not rejected (429) as in the framework's rate limit counters.
+                "rate_limit_waits": int,
+                "rate_limit_delay": float,  # Total seconds of the delays
+                "slowmode_limits": int,  # Channels skipped because of slow mode
+                # Seconds between the scheduled time and the first request of each send
+                "lag": {"p50": float, "p90": float, "p99": float, "max": float},
+                "accounts": [
+                    {
+                        "index": int,  # Index in the accounts
+                        "name": str | None,  # Username of running accounts
+                        "sends": int,
+                        "requests": int,
+                        "rate_limit_waits": int,
+                        "slowmode_limits": int,
+                        "utilization": float  # Fraction of the global rate limit used
+                    },
+                    ...
+                ]
+            }
+
+    Raises
+    ---------
+    ValueError
+        The duration is not positive.
+    RuntimeError
+        Called from a running event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("plan_capacity blocks the event loop, use 'plan_capacity_async' instead.")
+
+    start, snapshot = _snapshot(accounts, duration, slowmode)
+    return _simulate(start, snapshot, duration, model)
+
+
+@doc.doc_category("Capacity planner")
+async def plan_capacity_async(
+    accounts: Optional[List[client.ACCOUNT]] = None,
+    duration: timedelta = timedelta(days=1),
+    model: Optional[RateLimitMODEL] = None,
+    slowmode: Optional[Dict[int, int]] = None
+) -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Same as :func:`plan_capacity`, but the simulation runs in an executor (another thread),
+    so the event loop (and the framework) is not blocked. The objects are copied before the simulation.
+
+    Parameters and the return value are the same as in :func:`plan_capacity`.
+
+    Raises
+    ---------
+    ValueError
+        The duration is not positive.
+    """
+    start, snapshot = _snapshot(accounts, duration, slowmode)
+    return await asyncio.get_running_loop().run_in_executor(None, _simulate, start, snapshot, duration, model)
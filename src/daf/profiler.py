@@ -0,0 +1,191 @@
+"""
+Module contains a sampling profiler, which can be started and stopped while the framework is running.
+A separate thread periodically takes snapshots of the stacks (``sys._current_frames``) and counts
+identical stacks, which are exported in the collapsed stack format, used by flame graph tools.
+"""
+from typing import Dict, Optional, Tuple
+from collections import Counter
+from time import perf_counter
+from types import CodeType
+
+from .logging.tracing import TraceLEVELS, trace
+from .misc import doc
+
+import threading
+import sys
+
+
+__all__ = (
+    "start_profiler",
+    "stop_profiler",
+    "get_profiler_status",
+    "get_collapsed_stacks",
+)
+
+
+# Constants
+# ---------------------#
+C_PROFILER_INTERVAL = 0.01  # Default seconds between samples (100 Hz)
+C_PROFILER_MAX_OVERHEAD = 0.02  # Maximum fraction of time spent sampling, the interval is increased above it
+C_PROFILER_MAX_DEPTH = 128  # Deeper stacks are truncated (outermost frames are removed)
+C_PROFILER_JOIN_TIMEOUT = 1  # Seconds to wait for the profiler's thread to stop
+
+
+class GLOBALS:
+    """Storage class used for storing global variables of the module."""
+    stop_event: threading.Event = None
+    thread: threading.Thread = None
+    interval = C_PROFILER_INTERVAL
+    all_threads = False
+    stacks: Counter[Tuple[str, ...]] = Counter()
+    labels: Dict[CodeType, str] = {}
+    samples = 0
+    sampling_time = 0  # Seconds spent taking samples
+    running_time = 0  # Seconds the profiler was running
+
+
+def _get_label(code: CodeType) -> str:
+    label = GLOBALS.labels.get(code)
+    if label is None:
+        label = GLOBALS.labels[code] = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+    return label
+
+
+def _profile(thread_id: Optional[int], interval: float, stop_event: threading.Event):
+    "Profiler thread's function."
+    own_id = threading.get_ident()
+    stacks = GLOBALS.stacks
+    wait = interval
+    last = perf_counter()
+    while not stop_event.wait(wait):
+        sample_start = perf_counter()
+        frame = None
+        frames = sys._current_frames()
+        if thread_id is not None:
+            frames = {thread_id: frames[thread_id]} if thread_id in frames else {}
+
+        for id_, frame in frames.items():
+            if id_ == own_id:
+                continue
+
+            stack = []
+            while frame is not None and len(stack) < C_PROFILER_MAX_DEPTH:
+                stack.append(_get_label(frame.f_code))
+                frame = frame.f_back
+
+            stack.reverse()  # Outermost first
+            stacks[tuple(stack)] += 1
+
+        del frames, frame
+        now = perf_counter()
+        cost = now - sample_start
+        GLOBALS.samples += 1
+        GLOBALS.sampling_time += cost
+        GLOBALS.running_time += now - last
+        last = now
+        # Bound the overhead by sampling less often when taking samples is expensive
+        wait = max(interval, cost / C_PROFILER_MAX_OVERHEAD)
+
+
+@doc.doc_category("Profiler")
+def start_profiler(interval: float = C_PROFILER_INTERVAL, all_threads: bool = False, reset: bool = False):
+    """
+    .. versionadded:: 4.3.0
+
+    Starts the sampling profiler (restarts it, if it is already running).
+    The profiler takes at most 2 % of the time, the sampling interval is automatically increased otherwise.
+
+    Parameters
+    -------------
+    interval: float
+        Seconds between samples. Defaults to 0.01 (100 samples per second).
+    all_threads: bool
+        Sample all the threads instead of only the thread running the framework (event loop).
+    reset: bool
+        Remove the already taken samples.
+    """
+    stop_profiler()
+    if reset:
+        GLOBALS.stacks.clear()
+        GLOBALS.samples = 0
+        GLOBALS.sampling_time = 0
+        GLOBALS.running_time = 0
+
+    GLOBALS.interval = interval
+    GLOBALS.all_threads = all_threads
+    GLOBALS.stop_event = stop_event = threading.Event()
+    GLOBALS.thread = threading.Thread(
+        target=_profile,
+        args=(None if all_threads else threading.get_ident(), interval, stop_event),
+        name="daf-profiler",
+        daemon=True
+    )
+    GLOBALS.thread.start()
+
+
+@doc.doc_category("Profiler")
+def stop_profiler():
+    """
+    .. versionadded:: 4.3.0
+
+    Stops the sampling profiler and waits (at most 1 second) for its thread to finish. The samples are kept.
+    """
+    if GLOBALS.stop_event is not None:
+        GLOBALS.stop_event.set()
+        GLOBALS.stop_event = None
+
+    if GLOBALS.thread is not None:
+        GLOBALS.thread.join(C_PROFILER_JOIN_TIMEOUT)
+        if GLOBALS.thread.is_alive():
+            trace("Profiler's thread did not stop in time.", TraceLEVELS.WARNING)
+
+        GLOBALS.thread = None
+
+
+@doc.doc_category("Profiler")
+def get_profiler_status() -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns
+    ---------
+    dict
+        .. code-block:: python
+
+            {
+                "running": bool,
+                "interval": float,
+                "all_threads": bool,
+                "samples": int,
+                "stacks": int,  # Number of different stacks
+                "overhead": float  # Fraction of the (profiler's) running time spent taking samples
+            }
+    """
+    return {
+        "running": GLOBALS.stop_event is not None,
+        "interval": GLOBALS.interval,
+        "all_threads": GLOBALS.all_threads,
+        "samples": GLOBALS.samples,
+        "stacks": len(GLOBALS.stacks),
+        "overhead": GLOBALS.sampling_time / GLOBALS.running_time if GLOBALS.running_time else 0,
+    }
+
+
+@doc.doc_category("Profiler")
+def get_collapsed_stacks() -> str:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the samples in the collapsed stack format (``outer;inner;innermost count`` lines),
+    which can be converted into a flame graph (e. g., with ``flamegraph.pl`` or https://www.speedscope.app).
+
+    Returns
+    ---------
+    str
+        The collapsed stacks, most common first.
+    """
+    stacks = dict(GLOBALS.stacks)  # Copy, as the profiler's thread could be adding samples
+    lines = [f"{';'.join(stack)} {count}" for stack, count in sorted(stacks.items(), key=lambda x: x[1], reverse=True)]
+    lines.append("")
+    return "\n".join(lines)
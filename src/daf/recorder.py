@@ -0,0 +1,228 @@
+"""
+Module contains the recorder of the Discord API traffic.
+The recorder captures the received gateway messages (after decompression) and the HTTP requests
+(route, duration, status and the response) of all the accounts, redacts the tokens and writes them
+to a file in the JSON lines format. Recordings can be replayed with the offline fake of the Discord API (testing).
+"""
+from typing import Any, Callable, Dict, List, Optional, TextIO
+from contextvars import ContextVar
+from datetime import datetime
+from time import perf_counter
+
+from _discord.gateway import DiscordWebSocket
+from _discord.http import HTTPClient, Route
+from _discord.errors import HTTPException
+
+from .logging.tracing import trace
+from .misc import doc
+
+import _discord.http
+import weakref
+import json
+import re
+
+
+__all__ = (
+    "start_recording",
+    "stop_recording",
+    "load_recording",
+)
+
+
+# Constants
+# ---------------------#
+C_RECORDING_VERSION = 1
+C_REDACTED = "<redacted>"
+C_REDACTED_KEYS = {"token", "webhook_token", "access_token", "refresh_token", "password"}
+C_TOKEN_REGEX = re.compile(r"[\w-]{24,28}\.[\w-]{6}\.[\w-]{27,40}")
+
+
+class GLOBALS:
+    """Storage class used for storing global variables of the module."""
+    writer: Optional[TextIO] = None
+    start: float = 0
+    received_message = None  # Original functions
+    request = None
+    json_or_text = None
+    websockets: "weakref.WeakSet[DiscordWebSocket]" = weakref.WeakSet()  # Websockets with a hooked log_receive
+    response_status: ContextVar[Optional[List[int]]] = ContextVar("response_status", default=None)
+
+
+def _redact(data: Any) -> Any:
+    "Returns a copy of the ``data`` with tokens replaced."
+    if isinstance(data, dict):
+        return {k: C_REDACTED if k in C_REDACTED_KEYS and v else _redact(v) for k, v in data.items()}
+
+    if isinstance(data, list):
+        return [_redact(v) for v in data]
+
+    if isinstance(data, str):
+        return C_TOKEN_REGEX.sub(C_REDACTED, data)
+
+    return data
+
+
+def _write(record: Dict[str, Any]):
+    if GLOBALS.writer is not None:
+        GLOBALS.writer.write(json.dumps(_redact(record), default=str) + "\n")
+
+
+def _hook_log_receive(log_receive: Callable[[str], None]) -> Callable[[str], None]:
+    def _log_receive(msg: str, /):
+        # Called by DiscordWebSocket.received_message with the decompressed message
+        _write({"time": perf_counter() - GLOBALS.start, "type": "gateway", "data": json.loads(msg)})
+        log_receive(msg)
+
+    _log_receive.original = log_receive
+    return _log_receive
+
+
+async def _received_message(self: DiscordWebSocket, msg: Any, /):
+    # log_receive is hooked on the instance, as the library assigns it per instance (debug events)
+    if self not in GLOBALS.websockets:
+        self.log_receive = _hook_log_receive(self.log_receive)
+        GLOBALS.websockets.add(self)
+
+    await GLOBALS.received_message(self, msg)
+
+
+async def _json_or_text(response: Any) -> Any:
+    # Called by HTTPClient.request with each response (including the retried ones)
+    statuses = GLOBALS.response_status.get()
+    if statuses is not None:
+        statuses.append(response.status)
+
+    return await GLOBALS.json_or_text(response)
+
+
+async def _request(self: HTTPClient, route: Route, **kwargs: Any) -> Any:
+    start = perf_counter()
+    sleeps, sleep_time = self.rate_limit_sleeps, self.rate_limit_sleep_time
+    record = {
+        "time": start - GLOBALS.start,
+        "type": "http",
+        "method": route.method,
+        "route": route.path,
+        "url": route.url.removeprefix(route.base),
+    }
+    if route.webhook_token is not None:
+        record["url"] = record["url"].replace(route.webhook_token, C_REDACTED)
+
+    statuses = []
+    token = GLOBALS.response_status.set(statuses)
+    try:
+        response = await GLOBALS.request(self, route, **kwargs)
+        record["status"] = statuses[-1] if statuses else None
+        record["response"] = response
+        return response
+    except HTTPException as exc:
+        record["status"] = exc.status
+        record["code"] = exc.code
+        record["response"] = exc.text
+        raise
+    except Exception as exc:
+        record["status"] = None
+        record["response"] = repr(exc)
+        raise
+    finally:
+        GLOBALS.response_status.reset(token)
+        record["duration"] = perf_counter() - start
+        # Counters are per client (account), concurrent requests of the same account could be included
+        record["rate_limits"] = self.rate_limit_sleeps - sleeps
+        record["rate_limit_sleep"] = self.rate_limit_sleep_time - sleep_time
+        _write(record)
+
+
+@doc.doc_category("Recorder")
+def start_recording(path: str):
+    """
+    .. versionadded:: 4.3.0
+
+    Starts recording the Discord API traffic of all the accounts to a file (restarts if already recording).
+    The file contains one JSON object per line. The first line is a header, followed by the records:
+
+    .. code-block:: python
+
+        {"version": 1, "started": str}  # Header, started is in ISO format
+        {"time": float, "type": "gateway", "data": dict}  # Received gateway message
+        {
+            "time": float, "type": "http", "method": str, "route": str, "url": str,
+            "status": int | None, "code": int (only errors), "response": Any, "duration": float,
+            "rate_limits": int, "rate_limit_sleep": float
+        }
+
+    ``time`` is the number of seconds since the recording was started.
+    Tokens are replaced with ``<redacted>``.
+
+    Parameters
+    -------------
+    path: str
+        Path to the file. An existing file is overwritten.
+    """
+    stop_recording()
+    GLOBALS.writer = open(path, "w", encoding="utf-8")
+    GLOBALS.start = perf_counter()
+    GLOBALS.writer.write(json.dumps({"version": C_RECORDING_VERSION, "started": datetime.now().isoformat()}) + "\n")
+    GLOBALS.received_message = DiscordWebSocket.received_message
+    GLOBALS.request = HTTPClient.request
+    GLOBALS.json_or_text = _discord.http.json_or_text
+    DiscordWebSocket.received_message = _received_message
+    HTTPClient.request = _request
+    _discord.http.json_or_text = _json_or_text
+    trace(f"Recording Discord API traffic to {path}")
+
+
+@doc.doc_category("Recorder")
+def stop_recording():
+    """
+    .. versionadded:: 4.3.0
+
+    Stops recording the Discord API traffic and closes the file.
+    """
+    if GLOBALS.writer is None:
+        return
+
+    DiscordWebSocket.received_message = GLOBALS.received_message
+    HTTPClient.request = GLOBALS.request
+    _discord.http.json_or_text = GLOBALS.json_or_text
+    for websocket in list(GLOBALS.websockets):
+        websocket.log_receive = websocket.log_receive.original
+
+    GLOBALS.websockets.clear()
+    GLOBALS.writer.close()
+    GLOBALS.writer = None
+    trace("Recording of Discord API traffic stopped.")
+
+
+@doc.doc_category("Recorder")
+def load_recording(path: str) -> List[dict]:
+    """
+    .. versionadded:: 4.3.0
+
+    Reads a recording made with :func:`start_recording`.
+
+    Parameters
+    -------------
+    path: str
+        Path to the file.
+
+    Returns
+    ---------
+    List[dict]
+        The records (without the header), ordered by time.
+
+    Raises
+    ---------
+    ValueError
+        The file is not a recording or was made by an unsupported version.
+    """
+    with open(path, "r", encoding="utf-8") as reader:
+        header = json.loads(reader.readline() or "null")
+        if not isinstance(header, dict) or header.get("version") != C_RECORDING_VERSION:
+            raise ValueError(f"{path} is not a (supported) recording")
+
+        records = [json.loads(line) for line in reader if line.strip()]
+
+    # HTTP requests are written after they are complete
+    records.sort(key=lambda record: record["time"])
+    return records
@@ -4,21 +4,28 @@ Module contains definitions related to remote access from a graphical interface.
 from typing import Optional, Literal, Awaitable
 from contextlib import suppress
 from functools import update_wrapper
+from datetime import timedelta
 
 from aiohttp import BasicAuth
 from aiohttp.web import (
-    Request, RouteTableDef, Application, _run_app, json_response,
+    Request, RouteTableDef, Application, _run_app, json_response, StreamResponse, Response,
     HTTPException, HTTPInternalServerError, HTTPUnauthorized, WebSocketResponse, WSMsgType
 )
 
 from .events import *
 from .logging.tracing import *
-from .misc import doc, instance_track as it
+from .misc import doc, instance_track as it, task_registry
 from . import convert
 from . import logging
 from . import client
+from . import metrics
+from . import watchdog
+from . import spans
+from . import profiler
+from . import timeline
 
 import asyncio
+import json
 import ssl
 
 
@@ -53,7 +60,7 @@ def create_json_response(message: str = None, dict_: dict = {}, **kwargs):
     })
 
 
-def register(path: str, type: Literal["GET", "POST", "DELETE", "PATCH"]):
+def register(path: str, type: Literal["GET", "POST", "DELETE", "PATCH"], pass_request: bool = False):
     """
     Used to register a route handler.
 
@@ -63,6 +70,9 @@ def register(path: str, type: Literal["GET", "POST", "DELETE", "PATCH"]):
         The http URL path.
     type: Literal["GET", "POST", "DELETE", "PATCH"]
         Request type.
+    pass_request: bool
+        If True, the original request object is passed as the first argument,
+        even if the request contains JSON parameters. Used for streamed responses.
     """
     def decorator(fnc):
         async def request_wrapper(request: Request):
@@ -76,6 +86,9 @@ def register(path: str, type: Literal["GET", "POST", "DELETE", "PATCH"]):
 
                 if request.content_type == "application/json":
                     json_data = await request.json()
+                    if pass_request:
+                        return await fnc(request, **json_data["parameters"])
+
                     return await fnc(**json_data["parameters"])
                 
                 # In case the data is not JSON, just pass the original request object
@@ -152,8 +165,9 @@ class RemoteAccessCLIENT:
         self.web_app.add_routes(GLOBALS.routes)
 
     async def initialize(self):
-        GLOBALS.http_task = asyncio.create_task(
-            _run_app(self.web_app, host=self.host, port=self.port, print=False, ssl_context=self.ssl_ctx)
+        GLOBALS.http_task = task_registry.create_task(
+            _run_app(self.web_app, host=self.host, port=self.port, print=False, ssl_context=self.ssl_ctx),
+            self, "remote server"
         )
 
     async def _close(self):
@@ -188,6 +202,312 @@ async def http_get_logger():
     return create_json_response(logger=convert.convert_object_to_semi_dict(logging.get_logger()))
 
 
+@register("/logging/stream", "POST", pass_request=True)
+@doc.doc_category("Logging", api_type="HTTP")
+async def http_stream_logs(
+    request: Request,
+    log_type: Literal["message", "invite"] = "message",
+    **kwargs
+):
+    """
+    .. versionadded:: 4.3.0
+
+    Streams logs of the active logger in chunks, without a limit.
+    See :py:meth:`daf.logging.LoggerBASE.analytic_iter_message_log`
+    and :py:meth:`daf.logging.LoggerBASE.analytic_iter_invite_log`.
+
+    The response is newline delimited JSON, where each line contains one chunk:
+
+    .. code-block:: JSON
+
+        {
+            "logs": list, # Logs of the chunk
+            "cursor": list # Cursor of the last log in the chunk. Pass it as the "cursor" parameter to resume.
+        }
+
+    If an error occurs after streaming has started, the last line contains the "error" key instead.
+
+    Parameters
+    -------------
+    log_type: Literal["message", "invite"]
+        The type of logs to stream.
+    kwargs
+        Parameters passed to the logger's iteration method (filters, ``cursor`` and ``chunk_size``).
+    """
+    logger = logging.get_logger()
+    if log_type == "message":
+        iterator = logger.analytic_iter_message_log
+    elif log_type == "invite":
+        iterator = logger.analytic_iter_invite_log
+    else:
+        raise ValueError(f"log_type must be 'message' or 'invite'. Got '{log_type}'")
+
+    response = StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    try:
+        async for chunk in iterator(**convert.convert_from_semi_dict(kwargs)):
+            line = {
+                "logs": convert.convert_object_to_semi_dict(chunk),
+                "cursor": convert.convert_object_to_semi_dict(logger.get_log_cursor(chunk[-1]))
+            }
+            await response.write(json.dumps(line).encode("utf-8") + b"\n")
+    except Exception as exc:
+        trace("Error streaming logs.", TraceLEVELS.ERROR, exc)
+        await response.write(json.dumps({"error": str(exc)}).encode("utf-8") + b"\n")
+
+    await response.write_eof()
+    return response
+
+
+@register("/logging/counters", "GET")
+@doc.doc_category("Logging", api_type="HTTP")
+async def http_get_counters(object_id: int):
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the in-memory counters (last hour) of an account, guild or message.
+    See :func:`daf.logging.get_counters`.
+
+    Parameters
+    -------------
+    object_id: int
+        The ID of the account, guild or message.
+
+    Returns
+    ---------
+    dict
+        The counters.
+    """
+    object = it.get_by_id(object_id)
+    return create_json_response(counters=convert.convert_object_to_semi_dict(logging.get_counters(object)))
+
+
+@register("/metrics", "GET")
+@doc.doc_category("Metrics", api_type="HTTP")
+async def http_get_metrics(request: Request = None):
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the metrics of the framework in the Prometheus text exposition format
+    (not JSON), meaning the route can be scraped by Prometheus directly.
+    See :func:`daf.metrics.get_metrics`.
+    """
+    return Response(
+        text=metrics.get_metrics(),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+    )
+
+
+@register("/events/profile", "GET")
+@doc.doc_category("Events", api_type="HTTP")
+async def http_get_listener_profile():
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the event listener profiling statistics.
+    See :func:`daf.events.get_listener_profile`.
+
+    Returns
+    ---------
+    dict
+        The statistics.
+    """
+    return create_json_response(profile=get_listener_profile())
+
+
+@register("/events/profile", "POST")
+@doc.doc_category("Events", api_type="HTTP")
+async def http_set_listener_profiling(enabled: bool, reset: bool = False):
+    """
+    .. versionadded:: 4.3.0
+
+    Enables or disables the event listener profiling.
+    See :func:`daf.events.set_listener_profiling`.
+
+    Parameters
+    -------------
+    enabled: bool
+        Enable profiling.
+    reset: bool
+        Remove the already recorded statistics.
+    """
+    set_listener_profiling(enabled, reset)
+    return create_json_response(f"Listener profiling {'enabled' if enabled else 'disabled'}.")
+
+
+@register("/watchdog", "GET")
+@doc.doc_category("Watchdog", api_type="HTTP")
+async def http_get_loop_stalls():
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the recorded stalls of the event loop.
+    See :func:`daf.watchdog.get_loop_stalls`.
+
+    Returns
+    ---------
+    dict
+        The stalls.
+    """
+    return create_json_response(stalls=convert.convert_object_to_semi_dict(watchdog.get_loop_stalls()))
+
+
+@register("/watchdog", "POST")
+@doc.doc_category("Watchdog", api_type="HTTP")
+async def http_set_loop_watchdog(threshold: Optional[float]):
+    """
+    .. versionadded:: 4.3.0
+
+    Configures the event loop watchdog.
+    See :func:`daf.watchdog.set_loop_watchdog`.
+
+    Parameters
+    -------------
+    threshold: float | None
+        The lag (in seconds) above which the event loop is considered blocked. None disables the watchdog.
+    """
+    watchdog.set_loop_watchdog(threshold)
+    return create_json_response("Watchdog configured.")
+
+
+@register("/spans", "GET")
+@doc.doc_category("Spans", api_type="HTTP")
+async def http_get_chrome_trace():
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the recorded spans in the Chrome trace event format (under the ``trace`` key of the result).
+    See :func:`daf.spans.get_chrome_trace`.
+
+    Returns
+    ---------
+    dict
+        The trace.
+    """
+    return create_json_response(trace=spans.get_chrome_trace())
+
+
+@register("/spans", "POST")
+@doc.doc_category("Spans", api_type="HTTP")
+async def http_set_span_recording(enabled: bool, reset: bool = False):
+    """
+    .. versionadded:: 4.3.0
+
+    Enables or disables recording of the spans.
+    See :func:`daf.spans.set_span_recording`.
+
+    Parameters
+    -------------
+    enabled: bool
+        Enable recording.
+    reset: bool
+        Remove the already recorded spans.
+    """
+    spans.set_span_recording(enabled, reset)
+    return create_json_response(f"Span recording {'enabled' if enabled else 'disabled'}.")
+
+
+@register("/profiler", "GET")
+@doc.doc_category("Profiler", api_type="HTTP")
+async def http_get_profile():
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the sampling profiler's status and the samples in the collapsed stack format.
+    See :func:`daf.profiler.get_profiler_status` and :func:`daf.profiler.get_collapsed_stacks`.
+
+    Returns
+    ---------
+    dict
+        ``{"status": dict, "collapsed": str}``
+    """
+    return create_json_response(
+        profile={"status": profiler.get_profiler_status(), "collapsed": profiler.get_collapsed_stacks()}
+    )
+
+
+@register("/profiler", "POST")
+@doc.doc_category("Profiler", api_type="HTTP")
+async def http_set_profiler(running: bool, interval: float = profiler.C_PROFILER_INTERVAL, reset: bool = False):
+    """
+    .. versionadded:: 4.3.0
+
+    Starts or stops the sampling profiler.
+    See :func:`daf.profiler.start_profiler` and :func:`daf.profiler.stop_profiler`.
+
+    Parameters
+    -------------
+    running: bool
+        Start (True) or stop (False) the profiler.
+    interval: float
+        Seconds between samples.
+    reset: bool
+        Remove the already taken samples (when starting).
+    """
+    if running:
+        profiler.start_profiler(interval, reset=reset)
+    else:
+        profiler.stop_profiler()
+
+    return create_json_response(f"Profiler {'started' if running else 'stopped'}.")
+
+
+@register("/timeline", "GET")
+@doc.doc_category("Timeline", api_type="HTTP")
+async def http_get_upcoming_sends(
+    within: Optional[float] = None,
+    limit: int = timeline.C_TIMELINE_PAGE_SIZE,
+    cursor: Optional[list] = None
+):
+    """
+    .. versionadded:: 4.3.0
+
+    Returns a page of the upcoming sends, ordered by the send time.
+    See :func:`daf.timeline.get_upcoming_sends`.
+
+    Parameters
+    -------------
+    within: Optional[float]
+        Only sends in this number of seconds from now. Defaults to all sends.
+    limit: int
+        Maximum number of sends returned.
+    cursor: Optional[list]
+        The cursor returned with the previous page.
+
+    Returns
+    ---------
+    dict
+        The sends and the cursor of the next page.
+    """
+    sends = timeline.get_upcoming_sends(timedelta(seconds=within) if within is not None else None, limit, cursor)
+    return create_json_response(sends=convert.convert_object_to_semi_dict(sends))
+
+
+@register("/timeline/counts", "GET")
+@doc.doc_category("Timeline", api_type="HTTP")
+async def http_get_send_counts(within: float, interval: float):
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the number of sends in each interval.
+    See :func:`daf.timeline.get_send_counts`.
+
+    Parameters
+    -------------
+    within: float
+        Seconds from now.
+    interval: float
+        Seconds of each interval.
+
+    Returns
+    ---------
+    List[dict]
+        The intervals.
+    """
+    counts = timeline.get_send_counts(timedelta(seconds=within), timedelta(seconds=interval))
+    return create_json_response(counts=convert.convert_object_to_semi_dict(counts))
+
+
 @register("/object", "GET")
 @doc.doc_category("Object", api_type="HTTP")
 async def http_get_object(object_id: int):
@@ -0,0 +1,184 @@
+"""
+Module contains lightweight spans, which measure the duration of the send pipeline's stages.
+Spans are propagated through context variables (nested spans, also across awaits),
+kept in an in-memory buffer and can be exported in the Chrome trace event format.
+"""
+from typing import Any, Deque, Dict, Optional, Tuple
+from contextvars import ContextVar
+from contextlib import nullcontext
+from collections import deque
+from itertools import count
+from datetime import datetime
+from time import perf_counter_ns, time_ns
+
+from .misc import doc
+
+import json
+
+
+__all__ = (
+    "span",
+    "set_span_recording",
+    "get_chrome_trace",
+    "export_chrome_trace",
+)
+
+
+# Constants
+# ---------------------#
+C_SPAN_BUFFER_SIZE = 10_000
+
+
+class GLOBALS:
+    """Storage class used for storing global variables of the module."""
+    enabled = False
+    # (name, start (ns), duration (ns), lane, args)
+    buffer: Deque[Tuple[str, int, int, int, Dict[str, Any]]] = deque(maxlen=C_SPAN_BUFFER_SIZE)
+    lanes = count(1)
+    # Offset for converting perf_counter_ns to the wall clock
+    clock_offset = time_ns() - perf_counter_ns()
+
+
+_CURRENT: ContextVar[Optional["SpanCONTEXT"]] = ContextVar("daf_span", default=None)
+_NULL_SPAN = nullcontext()
+
+
+class SpanCONTEXT:
+    """
+    A recorded span (context manager). Use :func:`span` to create it.
+    """
+    __slots__ = ("name", "args", "start", "lane", "token")
+
+    def __init__(self, name: str, args: Dict[str, Any]) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        parent = _CURRENT.get()
+        if parent is None:  # Each root span (and its children) is displayed in a separate lane
+            self.lane = next(GLOBALS.lanes)
+        else:
+            self.lane = parent.lane
+
+        self.token = _CURRENT.set(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = perf_counter_ns() - self.start
+        _CURRENT.reset(self.token)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+
+        GLOBALS.buffer.append((self.name, self.start, duration, self.lane, self.args))
+
+
+@doc.doc_category("Spans")
+def span(name: str, **args: Any):
+    """
+    .. versionadded:: 4.3.0
+
+    Returns a context manager measuring the duration of the code inside the ``with`` block.
+    Spans made inside of another span (also in other coroutines awaited inside the span
+    or tasks created inside the span) are its children.
+    Nothing is recorded, unless span recording is enabled (:func:`set_span_recording`).
+
+    .. code-block:: python
+
+        with span("get_data", channel=channel.id):
+            data = await self._data.to_dict()
+
+    Parameters
+    ------------
+    name: str
+        Name of the span.
+    args: Any
+        Additional information about the span, displayed by the trace viewer.
+    """
+    if not GLOBALS.enabled:
+        return _NULL_SPAN
+
+    return SpanCONTEXT(name, args)
+
+
+@doc.doc_category("Spans")
+def set_span_recording(enabled: bool, reset: bool = False):
+    """
+    .. versionadded:: 4.3.0
+
+    Enables or disables recording of the spans (stages of the send pipeline).
+    The last 10 000 spans are kept in memory.
+
+    Parameters
+    ------------
+    enabled: bool
+        Enable recording.
+    reset: bool
+        Remove the already recorded spans.
+    """
+    GLOBALS.enabled = enabled
+    if reset:
+        GLOBALS.buffer.clear()
+
+
+@doc.doc_category("Spans")
+def get_chrome_trace() -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the recorded spans in the Chrome trace event format.
+    The result can be saved to a JSON file and opened with a trace viewer (e. g., https://ui.perfetto.dev or
+    chrome://tracing).
+
+    Returns
+    ---------
+    dict
+        The trace (``{"traceEvents": [...], "displayTimeUnit": "ms", "otherData": {...}}``).
+    """
+    offset = GLOBALS.clock_offset
+    events = []
+    lanes = {}  # lane: (duration, name) of the longest (root) span
+    for name, start, duration, lane, args in list(GLOBALS.buffer):
+        lanes[lane] = max(lanes.get(lane, (0, name)), (duration, name))
+        events.append({
+            "name": name,
+            "cat": "daf",
+            "ph": "X",
+            "ts": (start + offset) / 1000,  # Microseconds
+            "dur": duration / 1000,
+            "pid": 1,
+            "tid": lane,
+            "args": args
+        })
+
+    for lane, (_, name) in sorted(lanes.items()):
+        events.append({
+            "name": "thread_name",
+            "ph": "M",
+            "pid": 1,
+            "tid": lane,
+            "args": {"name": f"{name} #{lane}"}
+        })
+
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"exported": datetime.now().isoformat(), "enabled": GLOBALS.enabled}
+    }
+
+
+@doc.doc_category("Spans")
+def export_chrome_trace(path: str):
+    """
+    .. versionadded:: 4.3.0
+
+    Saves the recorded spans in the Chrome trace event format (:func:`get_chrome_trace`)
+    to a JSON file.
+
+    Parameters
+    ------------
+    path: str
+        Path to the file.
+    """
+    with open(path, "w", encoding="utf-8") as writer:
+        json.dump(get_chrome_trace(), writer, default=str)
@@ -0,0 +1,185 @@
+"""
+Module contains the index of upcoming sends, which is kept sorted by the send time
+and updated whenever a message's send timer is set.
+This allows the sends of the next hour (or any other range) to be obtained without
+iterating over all the messages of all the accounts.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right, insort
+
+from .misc import doc, clock
+
+import weakref
+
+
+__all__ = (
+    "get_upcoming_sends",
+    "get_send_counts",
+)
+
+
+# Constants
+# ---------------------#
+C_TIMELINE_PAGE_SIZE = 100
+C_TIMELINE_MAX_BUCKETS = 10_000
+
+
+class GLOBALS:
+    """Storage class used for storing global variables of the module."""
+    index: List[Tuple[float, int]] = []  # (send timestamp, message key), sorted
+    messages: Dict[int, Tuple[Tuple[float, int], weakref.ref]] = {}  # Message key: (index entry, message)
+
+
+def _update(message: Any, send_time: datetime):
+    """
+    Sets the next send time of the ``message``.
+    Called when the message's send timer is set.
+    """
+    key = id(message)
+    _remove(message)
+    entry = (send_time.timestamp(), key)
+    insort(GLOBALS.index, entry)
+    GLOBALS.messages[key] = (entry, weakref.ref(message, lambda _: _remove_key(key)))
+
+
+def _remove(message: Any):
+    """
+    Removes the ``message`` from the index.
+    Called when the message's timers are closed.
+    """
+    _remove_key(id(message))
+
+
+def _remove_key(key: int):
+    item = GLOBALS.messages.pop(key, None)
+    if item is not None:
+        index = GLOBALS.index
+        del index[bisect_left(index, item[0])]
+
+
+def _describe(timestamp: float, message: Any) -> dict:
+    guild = message.parent
+    account = getattr(guild, "parent", None)
+    account_client = getattr(account, "client", None)
+    guild_object = getattr(guild, "_apiobject", None)
+    channels = getattr(message, "channels", None)
+    return {
+        "time": datetime.fromtimestamp(timestamp).astimezone(),
+        "message_id": getattr(message, "_daf_id", None),
+        "message_type": type(message).__name__,
+        "channels": len(channels) if channels is not None else 1,  # Direct messages have one channel
+        "guild": getattr(guild, "snowflake", None),
+        "guild_name": getattr(guild_object, "name", None),
+        "account": account_client.user.name if account_client is not None and account_client.user else None,
+    }
+
+
+@doc.doc_category("Timeline")
+def get_upcoming_sends(
+    within: Optional[timedelta] = None,
+    limit: int = C_TIMELINE_PAGE_SIZE,
+    cursor: Optional[List[Any]] = None
+) -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the next sends of all the messages, ordered by the send time.
+    Messages that are currently being sent (or are late) are first.
+
+    Parameters
+    -------------
+    within: Optional[timedelta]
+        Only sends in this time from now. Defaults to all sends.
+    limit: int
+        Maximum number of sends returned. Defaults to 100.
+    cursor: Optional[List[Any]]
+        The ``cursor`` returned by the previous call, to get the next page.
+
+    Returns
+    ---------
+    dict
+        .. code-block:: python
+
+            {
+                "total": int,  # Number of sends (within) after the cursor
+                "sends": [
+                    {
+                        "time": datetime,
+                        "message_id": int,  # See :func:`daf.misc.instance_track.get_object_id`
+                        "message_type": str,
+                        "channels": int,
+                        "guild": int,  # Snowflake of the guild or the user
+                        "guild_name": str | None,
+                        "account": str | None  # Username of the account
+                    },
+                    ...
+                ],
+                "cursor": list | None  # Pass it to get the next page, None if this is the last page
+            }
+    """
+    index = GLOBALS.index
+    start = bisect_right(index, tuple(cursor)) if cursor is not None else 0
+    if within is not None:
+        end = bisect_right(index, ((clock.get_clock().now() + within).timestamp(), float("inf")))
+    else:
+        end = len(index)
+
+    page = index[start:min(start + limit, end)]
+    sends = []
+    for timestamp, key in page:
+        message = GLOBALS.messages[key][1]()
+        if message is not None:
+            sends.append(_describe(timestamp, message))
+
+    return {
+        "total": max(end - start, 0),
+        "sends": sends,
+        "cursor": list(page[-1]) if page and start + len(page) < end else None,
+    }
+
+
+@doc.doc_category("Timeline")
+def get_send_counts(within: timedelta, interval: timedelta) -> List[dict]:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the number of sends in each ``interval`` from now until ``within`` from now,
+    which shows bursts of sends.
+
+    Parameters
+    -------------
+    within: timedelta
+        The time range from now.
+    interval: timedelta
+        Length of each interval.
+
+    Returns
+    ---------
+    List[dict]
+        ``[{"start": datetime, "sends": int}, ...]``.
+        The first interval also contains the late sends.
+
+    Raises
+    ---------
+    ValueError
+        The interval is not positive or there would be more than 10 000 intervals.
+    """
+    if interval <= timedelta(0) or within / interval > C_TIMELINE_MAX_BUCKETS:
+        raise ValueError(
+            f"'interval' must be positive and split 'within' into at most {C_TIMELINE_MAX_BUCKETS} intervals."
+        )
+
+    index = GLOBALS.index
+    now = clock.get_clock().now()
+    counts = []
+    previous = 0
+    start = now
+    while start < now + within:
+        end = min(start + interval, now + within)
+        position = bisect_right(index, (end.timestamp(), float("inf")))
+        counts.append({"start": start, "sends": position - previous})
+        previous = position
+        start = end
+
+    return counts
@@ -0,0 +1,194 @@
+"""
+Module contains the event loop watchdog, which detects synchronous code blocking the event loop.
+A separate thread periodically schedules a callback into the event loop and measures how long it takes
+for the callback to be called (the lag). If the lag exceeds the threshold, the stack of the event loop's thread
+is captured, showing the code that is blocking the loop.
+"""
+from typing import Deque, List, Optional
+from collections import deque
+from datetime import datetime
+from time import perf_counter
+
+from .logging.tracing import TraceLEVELS, trace
+from .misc import doc
+from . import metrics
+
+import threading
+import traceback
+import asyncio
+import sys
+
+
+__all__ = (
+    "set_loop_watchdog",
+    "get_loop_stalls",
+)
+
+
+# Constants
+# ---------------------#
+C_WATCHDOG_THRESHOLD = 0.5  # Default lag (seconds) above which the stack is captured
+C_WATCHDOG_INTERVAL = 0.1  # Seconds between responsiveness checks
+C_STALL_BUFFER_SIZE = 100
+
+
+class LoopSTALL:
+    """
+    A recorded stall of the event loop.
+    """
+    __slots__ = ("timestamp", "lag", "stack")
+
+    def __init__(self, timestamp: datetime, lag: float, stack: List[str]) -> None:
+        self.timestamp = timestamp
+        self.lag = lag
+        self.stack = stack
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class GLOBALS:
+    """Storage class used for storing global variables of the module."""
+    threshold: Optional[float] = C_WATCHDOG_THRESHOLD
+    loop: asyncio.AbstractEventLoop = None
+    loop_thread_id: int = None
+    stop_event: threading.Event = None
+    stalls: Deque[LoopSTALL] = deque(maxlen=C_STALL_BUFFER_SIZE)
+    lag = 0  # Last measured lag
+    max_lag = 0
+
+
+def _watch(loop: asyncio.AbstractEventLoop, loop_thread_id: int, threshold: float, stop_event: threading.Event):
+    "Watchdog thread's function."
+    responded = threading.Event()
+    while not stop_event.wait(C_WATCHDOG_INTERVAL):
+        responded.clear()
+        start = perf_counter()
+        try:
+            loop.call_soon_threadsafe(responded.set)
+        except RuntimeError:  # Loop closed
+            break
+
+        if not responded.wait(threshold):
+            # The loop is blocked, capture the stack of the code blocking it
+            frame = sys._current_frames().get(loop_thread_id)
+            stack = traceback.format_stack(frame) if frame is not None else []
+            timestamp = datetime.now()
+            del frame
+            while not responded.wait(C_WATCHDOG_INTERVAL):
+                if stop_event.is_set():
+                    return
+
+            lag = perf_counter() - start
+            GLOBALS.stalls.append(LoopSTALL(timestamp, lag, stack))
+            LOOP_STALLS.inc()
+            trace(
+                lambda: f"Event loop was blocked for {lag:.3f} s by:\n{stack[-1].rstrip() if stack else '(unknown)'}",
+                TraceLEVELS.WARNING
+            )
+        else:
+            lag = perf_counter() - start
+
+        GLOBALS.lag = lag
+        GLOBALS.max_lag = max(GLOBALS.max_lag, lag)
+
+
+def _start():
+    _stop()
+    if GLOBALS.threshold is None or GLOBALS.loop is None:
+        return
+
+    GLOBALS.stop_event = stop_event = threading.Event()
+    threading.Thread(
+        target=_watch,
+        args=(GLOBALS.loop, GLOBALS.loop_thread_id, GLOBALS.threshold, stop_event),
+        name="daf-loop-watchdog",
+        daemon=True
+    ).start()
+
+
+def _stop():
+    if GLOBALS.stop_event is not None:
+        GLOBALS.stop_event.set()  # The thread exits on its own
+        GLOBALS.stop_event = None
+
+
+@doc.doc_category("Watchdog")
+def set_loop_watchdog(threshold: Optional[float] = C_WATCHDOG_THRESHOLD):
+    """
+    .. versionadded:: 4.3.0
+
+    Configures the event loop watchdog, which is started at :func:`daf.core.initialize`.
+    Can be called before or after initialization.
+
+    Parameters
+    -------------
+    threshold: Optional[float]
+        The lag (in seconds) above which the event loop is considered blocked
+        and the stack of the code blocking it is recorded (see :func:`get_loop_stalls`).
+        Defaults to 0.5 seconds. None disables the watchdog.
+    """
+    GLOBALS.threshold = threshold
+    if GLOBALS.loop is not None:
+        _start()
+
+
+@doc.doc_category("Watchdog")
+def get_loop_stalls() -> dict:
+    """
+    .. versionadded:: 4.3.0
+
+    Returns the last (up to 100) recorded stalls of the event loop, oldest first.
+
+    Returns
+    ---------
+    dict
+        .. code-block:: python
+
+            {
+                "threshold": float | None,  # None if disabled
+                "lag": float,  # Last measured lag in seconds
+                "max_lag": float,
+                "stalls": [
+                    {
+                        "timestamp": datetime,  # When the threshold was exceeded
+                        "lag": float,  # Seconds the loop was blocked for
+                        "stack": List[str]  # Stack of the blocking code, outermost frame first
+                    },
+                    ...
+                ]
+            }
+    """
+    return {
+        "threshold": GLOBALS.threshold,
+        "lag": GLOBALS.lag,
+        "max_lag": GLOBALS.max_lag,
+        "stalls": [stall.to_dict() for stall in list(GLOBALS.stalls)],
+    }
+
+
+def initialize():
+    """
+    Starts the watchdog for the running event loop.
+    """
+    GLOBALS.loop = asyncio.get_running_loop()
+    GLOBALS.loop_thread_id = threading.get_ident()
+    _start()
+
+
+def shutdown():
+    """
+    Stops the watchdog.
+    """
+    _stop()
+    GLOBALS.loop = None
+
+
+LOOP_STALLS = metrics.CounterMETRIC(
+    "daf_event_loop_stalls_total",
+    "Number of times the event loop was blocked for longer than the watchdog threshold."
+)
+metrics.CollectedMETRIC(
+    "daf_event_loop_lag_seconds", "Last measured event loop lag.",
+    "gauge", lambda: [({}, GLOBALS.lag)]
+)
@@ -310,7 +310,7 @@ class SeleniumCLIENT:
         url: str | None
             The url to check or None if error ocurred/invalid link.
         """
-        trace(f"Fetching invite link from {url}", TraceLEVELS.DEBUG)
+        trace(lambda: f"Fetching invite link from {url}", TraceLEVELS.DEBUG)
         driver = self.driver
         main_window_handle = driver.current_window_handle
 
@@ -582,7 +582,7 @@ class SeleniumCLIENT:
         await self.await_load()
 
         # Join server
-        trace(f"Joining guild {invite}", TraceLEVELS.DEBUG)
+        trace(lambda: f"Joining guild {invite}", TraceLEVELS.DEBUG)
         try:
             join_bnt = driver.find_element(
                 By.XPATH,
@@ -666,7 +666,7 @@ class SeleniumCLIENT:
 
             await self.random_sleep(2, 3)
             ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-            trace(f"Joined guild with invite: {invite}", TraceLEVELS.DEBUG)
+            trace(lambda: f"Joined guild with invite: {invite}", TraceLEVELS.DEBUG)
 
         except WebDriverException as exc:
             raise RuntimeError(
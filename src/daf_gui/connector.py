@@ -2,8 +2,9 @@
 Module contains definitions related to different connection
 clients.
 """
-from typing import List, Optional, Literal, Awaitable
+from typing import List, Optional, Literal, Awaitable, AsyncIterator
 from abc import ABC, abstractmethod
+from datetime import timedelta
 
 from daf.logging.tracing import TraceLEVELS, trace
 from daf.misc import instance_track as it
@@ -11,10 +12,11 @@ from daf.misc import instance_track as it
 from tkclasswiz.convert import *
 from tkclasswiz.utilities import *
 
-from aiohttp import ClientSession, BasicAuth, WSMsgType
+from aiohttp import ClientSession, ClientTimeout, BasicAuth, WSMsgType
 from aiohttp import web
 
 import daf
+import json
 import asyncio
 
 
@@ -95,6 +97,132 @@ class AbstractConnectionCLIENT(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_logs(self, log_type: Literal["message", "invite"], **kwargs) -> AsyncIterator[list]:
+        """
+        Iterates over logs of the logger used in DAF, in chunks.
+
+        Parameters
+        ------------
+        log_type: Literal["message", "invite"]
+            The type of logs.
+        kwargs
+            Parameters passed to :py:meth:`daf.logging.LoggerBASE.analytic_iter_message_log`
+            or :py:meth:`daf.logging.LoggerBASE.analytic_iter_invite_log`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_counters(self, object_ref: it.ObjectReference) -> dict:
+        """
+        Returns the in-memory counters (last hour) of an account, guild or message.
+        See :func:`daf.logging.get_counters`.
+
+        Parameters
+        ------------
+        object_ref
+            Reference to the account, guild or message.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_listener_profile(self) -> dict:
+        """
+        Returns the event listener profiling statistics.
+        See :func:`daf.events.get_listener_profile`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_listener_profiling(self, enabled: bool, reset: bool = False):
+        """
+        Enables or disables the event listener profiling.
+        See :func:`daf.events.set_listener_profiling`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_loop_stalls(self) -> dict:
+        """
+        Returns the recorded stalls of the event loop.
+        See :func:`daf.watchdog.get_loop_stalls`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_loop_watchdog(self, threshold: Optional[float]):
+        """
+        Configures the event loop watchdog.
+        See :func:`daf.watchdog.set_loop_watchdog`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_chrome_trace(self) -> dict:
+        """
+        Returns the recorded spans in the Chrome trace event format.
+        See :func:`daf.spans.get_chrome_trace`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_span_recording(self, enabled: bool, reset: bool = False):
+        """
+        Enables or disables recording of the spans.
+        See :func:`daf.spans.set_span_recording`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_profile(self) -> dict:
+        """
+        Returns the sampling profiler's status and the collapsed stacks.
+        See :func:`daf.profiler.get_profiler_status` and :func:`daf.profiler.get_collapsed_stacks`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_profiler(
+        self,
+        running: bool,
+        interval: float = daf.profiler.C_PROFILER_INTERVAL,
+        reset: bool = False
+    ):
+        """
+        Starts or stops the sampling profiler.
+        See :func:`daf.profiler.start_profiler` and :func:`daf.profiler.stop_profiler`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_tasks(self) -> List[dict]:
+        """
+        Returns the running tasks, grouped by owner.
+        See :func:`daf.core.get_tasks`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_upcoming_sends(
+        self,
+        within: Optional[timedelta] = None,
+        limit: int = daf.timeline.C_TIMELINE_PAGE_SIZE,
+        cursor: Optional[list] = None
+    ) -> dict:
+        """
+        Returns a page of the upcoming sends.
+        See :func:`daf.timeline.get_upcoming_sends`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_send_counts(self, within: timedelta, interval: timedelta) -> List[dict]:
+        """
+        Returns the number of sends in each interval.
+        See :func:`daf.timeline.get_send_counts`.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def refresh(self, object_ref: it.ObjectReference) -> object:
         """
@@ -165,6 +293,61 @@ class LocalConnectionCLIENT(AbstractConnectionCLIENT):
     async def get_logger(self) -> daf.logging.LoggerBASE:
         return daf.get_logger()
 
+    async def iter_logs(self, log_type: Literal["message", "invite"], **kwargs):
+        logger = daf.get_logger()
+        iterator = logger.analytic_iter_message_log if log_type == "message" else logger.analytic_iter_invite_log
+        async for chunk in iterator(**kwargs):
+            yield chunk
+
+    async def get_counters(self, object_ref: it.ObjectReference) -> dict:
+        return daf.logging.get_counters(it.get_by_id(object_ref.ref))
+
+    async def get_listener_profile(self) -> dict:
+        return daf.events.get_listener_profile()
+
+    async def set_listener_profiling(self, enabled: bool, reset: bool = False):
+        daf.events.set_listener_profiling(enabled, reset)
+
+    async def get_loop_stalls(self) -> dict:
+        return daf.watchdog.get_loop_stalls()
+
+    async def set_loop_watchdog(self, threshold: Optional[float]):
+        daf.watchdog.set_loop_watchdog(threshold)
+
+    async def get_chrome_trace(self) -> dict:
+        return daf.spans.get_chrome_trace()
+
+    async def set_span_recording(self, enabled: bool, reset: bool = False):
+        daf.spans.set_span_recording(enabled, reset)
+
+    async def get_profile(self) -> dict:
+        return {"status": daf.profiler.get_profiler_status(), "collapsed": daf.profiler.get_collapsed_stacks()}
+
+    async def set_profiler(
+        self,
+        running: bool,
+        interval: float = daf.profiler.C_PROFILER_INTERVAL,
+        reset: bool = False
+    ):
+        if running:
+            daf.profiler.start_profiler(interval, reset=reset)
+        else:
+            daf.profiler.stop_profiler()
+
+    async def get_tasks(self) -> List[dict]:
+        return daf.get_tasks()
+
+    async def get_upcoming_sends(
+        self,
+        within: Optional[timedelta] = None,
+        limit: int = daf.timeline.C_TIMELINE_PAGE_SIZE,
+        cursor: Optional[list] = None
+    ) -> dict:
+        return daf.timeline.get_upcoming_sends(within, limit, cursor)
+
+    async def get_send_counts(self, within: timedelta, interval: timedelta) -> List[dict]:
+        return daf.timeline.get_send_counts(within, interval)
+
     async def refresh(self, object_ref: it.ObjectReference):
         return it.get_by_id(object_ref.ref)  # Local connection can just use the local object
 
@@ -308,6 +491,93 @@ class RemoteConnectionCLIENT(AbstractConnectionCLIENT):
         response = await self._request("GET", "/logging")
         return daf.convert.convert_from_semi_dict(response["result"]["logger"])
 
+    async def iter_logs(self, log_type: Literal["message", "invite"], **kwargs):
+        additional_kwargs = {}
+        if not self.verify_ssl:
+            additional_kwargs["ssl"] = False
+
+        kwargs = daf.convert.convert_object_to_semi_dict(kwargs)
+        trace("Requesting /logging/stream with post.", TraceLEVELS.DEBUG)
+        async with self.session.post(
+            "/logging/stream",
+            json={"parameters": {"log_type": log_type, **kwargs}},
+            timeout=ClientTimeout(sock_read=self.TIMEOUT),  # No total limit, only between chunks
+            **additional_kwargs
+        ) as response:
+            if response.status != 200:
+                raise web.HTTPException(reason=response.reason)
+
+            # Lines (chunks) can be larger than the maximum line size of the StreamReader
+            buffer = b""
+            async for data in response.content.iter_any():
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    line = json.loads(line)
+                    if "error" in line:
+                        raise RuntimeError(line["error"])
+
+                    yield daf.convert.convert_from_semi_dict(line["logs"])
+
+    async def get_counters(self, object_ref: it.ObjectReference) -> dict:
+        response = await self._request("GET", "/logging/counters", object_id=object_ref.ref)
+        return daf.convert.convert_from_semi_dict(response["result"]["counters"])
+
+    async def get_listener_profile(self) -> dict:
+        response = await self._request("GET", "/events/profile")
+        return response["result"]["profile"]
+
+    async def set_listener_profiling(self, enabled: bool, reset: bool = False):
+        await self._request("POST", "/events/profile", enabled=enabled, reset=reset)
+
+    async def get_loop_stalls(self) -> dict:
+        response = await self._request("GET", "/watchdog")
+        return daf.convert.convert_from_semi_dict(response["result"]["stalls"])
+
+    async def set_loop_watchdog(self, threshold: Optional[float]):
+        await self._request("POST", "/watchdog", threshold=threshold)
+
+    async def get_chrome_trace(self) -> dict:
+        response = await self._request("GET", "/spans")
+        return response["result"]["trace"]
+
+    async def set_span_recording(self, enabled: bool, reset: bool = False):
+        await self._request("POST", "/spans", enabled=enabled, reset=reset)
+
+    async def get_profile(self) -> dict:
+        response = await self._request("GET", "/profiler")
+        return response["result"]["profile"]
+
+    async def set_profiler(
+        self,
+        running: bool,
+        interval: float = daf.profiler.C_PROFILER_INTERVAL,
+        reset: bool = False
+    ):
+        await self._request("POST", "/profiler", running=running, interval=interval, reset=reset)
+
+    async def get_tasks(self) -> List[dict]:
+        response = await self._request("GET", "/tasks")
+        return daf.convert.convert_from_semi_dict(response["result"]["tasks"])
+
+    async def get_upcoming_sends(
+        self,
+        within: Optional[timedelta] = None,
+        limit: int = daf.timeline.C_TIMELINE_PAGE_SIZE,
+        cursor: Optional[list] = None
+    ) -> dict:
+        response = await self._request(
+            "GET", "/timeline",
+            within=within.total_seconds() if within is not None else None, limit=limit, cursor=cursor
+        )
+        return daf.convert.convert_from_semi_dict(response["result"]["sends"])
+
+    async def get_send_counts(self, within: timedelta, interval: timedelta) -> List[dict]:
+        response = await self._request(
+            "GET", "/timeline/counts", within=within.total_seconds(), interval=interval.total_seconds()
+        )
+        return daf.convert.convert_from_semi_dict(response["result"]["counts"])
+
     async def refresh(self, object_ref: it.ObjectReference):
         response = await self._request("GET", "/object", object_id=object_ref.ref)
         return daf.convert.convert_from_semi_dict(response["result"]["object"])
@@ -95,6 +95,9 @@ class Application():
         # Analytics
         self.tabman_mf.add(AnalyticsTab(self.edit_mgr, padding=(dpi_10, dpi_10)), text="Analytics")
 
+        # Diagnostics (profiling)
+        self.tabman_mf.add(DiagnosticsTab(padding=(dpi_10, dpi_10)), text="Diagnostics")
+
         # About tab
         self.tabman_mf.add(AboutTab(), text="About")
 
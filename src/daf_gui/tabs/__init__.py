@@ -3,4 +3,5 @@ from .optional import *
 from .schema import *
 from .about import *
 from .debug import *
-from .live import *
\ No newline at end of file
+from .live import *
+from .diagnostics import *
@@ -3,17 +3,19 @@ from tkclasswiz.utilities import gui_confirm_action, gui_except
 from tkclasswiz.dpi import dpi_scaled
 from tkclasswiz.convert import *
 from tkclasswiz.storage import *
-from typing import List
+from typing import List, Optional, Literal
 
 from ..edit_window_manager import *
 from ..connector import *
 
 import ttkbootstrap.dialogs as tkdiag
 import ttkbootstrap as ttk
+import tkinter.filedialog as tkfile
 import tkinter as tk
 
 import daf.misc.instance_track as it
 import tk_async_execute as tae
+import json
 import daf
 
 __all__ = (
@@ -42,7 +44,10 @@ class AnalyticsTab(ttk.Notebook):
                 ],
                 edit_mgr,
                 master=self,
-                padding=(dpi_10, dpi_10)
+                padding=(dpi_10, dpi_10),
+                log_type="message",
+                getter_rows="analytic_get_message_rows",
+                getter_detail="analytic_get_message_log_detail",
             ),
             text="Message tracking",
         )
@@ -60,7 +65,8 @@ class AnalyticsTab(ttk.Notebook):
                 ],
                 edit_mgr,
                 master=self,
-                padding=(dpi_10, dpi_10)
+                padding=(dpi_10, dpi_10),
+                log_type="invite",
             ),
             text="Invite tracking",
         )
@@ -74,8 +80,16 @@ class AnalyticFrame(ttk.Frame):
         counts_coldata: dict,
         edit_mgr: EditWindowManager,
         *args,
+        log_type: Literal["message", "invite"] = "message",
+        getter_rows: Optional[str] = None,
+        getter_detail: Optional[str] = None,
         **kwargs
     ):
+        """
+        ``log_type`` is the type of logs exported (streamed).
+        ``getter_rows`` and ``getter_detail`` are optional logger methods, which (if the logger has them)
+        are used to list lightweight rows and to load an entire log when it is opened.
+        """
         super().__init__(*args, **kwargs)
         dpi_10 = dpi_scaled(10)
         dpi_5 = dpi_scaled(10)
@@ -88,17 +102,67 @@ class AnalyticFrame(ttk.Frame):
 
             param_object = combo_history.combo.get()
             param_object_params = convert_to_objects(param_object.data)
-            items = await connection.execute_method(
-                it.ObjectReference.from_object(logger), getter_history, **param_object_params
-            )
-            items = convert_to_object_info(items)
+            if getter_rows is not None and hasattr(logger, getter_rows):
+                rows = await connection.execute_method(
+                    it.ObjectReference.from_object(logger), getter_rows, **param_object_params
+                )
+                class_ = daf.logging.sql.MessageLOG
+                items = [
+                    ObjectInfo(
+                        class_,
+                        {
+                            "id": id_,
+                            "timestamp": timestamp,
+                            "message_type": message_type,
+                            "success_rate": success_rate,
+                            "guild": f"{guild_name} ({guild_snow})",
+                            "author": f"{author_name} ({author_snow})",
+                        }
+                    )
+                    for id_, timestamp, message_type, success_rate, guild_snow, guild_name, author_snow, author_name
+                    in rows
+                ]
+            else:
+                items = await connection.execute_method(
+                    it.ObjectReference.from_object(logger), getter_history, **param_object_params
+                )
+                items = convert_to_object_info(items)
+
             tae.tk_execute(lst_history.clear)
             tae.tk_execute(lst_history.insert, tk.END, *items)
 
+        async def load_log_detail(listbox: ListBoxScrolled, object_: ObjectInfo):
+            connection = get_connection()
+            logger = await connection.get_logger()
+            log = await connection.execute_method(
+                it.ObjectReference.from_object(logger), getter_detail, log_id=object_.data["id"]
+            )
+            if log is None:
+                raise ValueError("The log no longer exists.")
+
+            object_ = convert_to_object_info(log)
+            tae.tk_execute(
+                self.edit_mgr.open_object_edit_window,
+                object_.class_,
+                listbox,
+                old_data=object_,
+                check_parameters=False,
+                allow_save=False
+            )
+
         def show_log(listbox: ListBoxScrolled):
             selection = listbox.curselection()
             if len(selection) == 1:
                 object_: ObjectInfo = listbox.get()[selection[0]]
+                # Lightweight rows (see getter_rows) don't contain the channels
+                if (
+                    getter_detail is not None and
+                    not issubclass(object_.class_, dict) and
+                    "channels" not in object_.data
+                ):
+                    tae.async_execute(load_log_detail(listbox, object_), wait=False, pop_up=True, master=self)
+                    return
+
                 self.edit_mgr.open_object_edit_window(
                     object_.class_,
                     listbox,
@@ -137,6 +201,36 @@ class AnalyticFrame(ttk.Frame):
             else:
                 tkdiag.Messagebox.show_error("Select atlest one item!", "Selection error.")
 
+        async def export_logs_async(filename: str):
+            connection = get_connection()
+            param_object = combo_history.combo.get()
+            parameters = convert_to_objects(param_object.data)
+            # Logs are streamed in timestamp order, without a limit
+            parameters.pop("sort_by", None)
+            parameters.pop("limit", None)
+
+            count = 0
+            with open(filename, "w", encoding="utf-8") as file:
+                async for chunk in connection.iter_logs(log_type, **parameters):
+                    for log in chunk:
+                        file.write(json.dumps(daf.convert.convert_object_to_semi_dict(log), ensure_ascii=False))
+                        file.write("\n")
+
+                    count += len(chunk)
+
+            tae.tk_execute(tkdiag.Messagebox.show_info, f"Exported {count} logs to {filename}", "Finished", self)
+
+        @gui_except()
+        def export_logs():
+            filename = tkfile.asksaveasfilename(filetypes=[("JSON lines", "*.jsonl")])
+            if filename == "":
+                return
+
+            if not filename.endswith(".jsonl"):
+                filename += ".jsonl"
+
+            tae.async_execute(export_logs_async(filename), wait=False, pop_up=True, master=self)
+
         frame_msg_history = ttk.Labelframe(self, padding=(dpi_10, dpi_10), text="Logs", bootstyle="primary")
         frame_msg_history.pack(fill=tk.BOTH, expand=True)
 
@@ -164,6 +258,11 @@ class AnalyticFrame(ttk.Frame):
             command=lambda: delete_logs(lst_history),
             text="Delete selected"
         ).pack(side="left", fill=tk.X)
+        ttk.Button(
+            frame_msg_history_bnts,
+            command=export_logs,
+            text="Export all"
+        ).pack(side="left", fill=tk.X)
         lst_history = ListBoxScrolled(frame_msg_history)
         lst_history.listbox.unbind_all("<Delete>")
         lst_history.listbox.unbind_all("<BackSpace>")
@@ -0,0 +1,500 @@
+from ttkbootstrap.tableview import Tableview
+from tkclasswiz.utilities import gui_except
+from tkclasswiz.storage import ListBoxScrolled
+from tkclasswiz.dpi import dpi_scaled
+
+from ..connector import *
+
+import ttkbootstrap.dialogs as tkdiag
+import ttkbootstrap as ttk
+import tkinter.filedialog as tkfile
+import tkinter as tk
+
+import tk_async_execute as tae
+import json
+
+from datetime import timedelta
+
+
+__all__ = (
+    "DiagnosticsTab",
+)
+
+
+def _ms(value):
+    return round(value * 1000, 3) if value is not None else ""
+
+
+class DiagnosticsTab(ttk.Notebook):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_10 = dpi_scaled(10)
+        self.add(ListenerProfileFrame(self, padding=(dpi_10, dpi_10)), text="Event listeners")
+        self.add(LoopStallsFrame(self, padding=(dpi_10, dpi_10)), text="Event loop stalls")
+        self.add(TasksFrame(self, padding=(dpi_10, dpi_10)), text="Tasks")
+        self.add(SpansFrame(self, padding=(dpi_10, dpi_10)), text="Spans")
+        self.add(ProfilerFrame(self, padding=(dpi_10, dpi_10)), text="Profiler")
+        self.add(TimelineFrame(self, padding=(dpi_10, dpi_10)), text="Timeline")
+
+
+class ListenerProfileFrame(ttk.Frame):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_5 = dpi_scaled(5)
+
+        frame_buttons = ttk.Frame(self)
+        frame_buttons.pack(fill=tk.X, pady=dpi_5)
+        ttk.Button(frame_buttons, text="Refresh", command=self.load_profile).pack(side="left")
+        ttk.Button(frame_buttons, text="Enable", command=lambda: self.set_profiling(True)).pack(side="left")
+        ttk.Button(frame_buttons, text="Disable", command=lambda: self.set_profiling(False)).pack(side="left")
+        ttk.Button(frame_buttons, text="Reset", command=lambda: self.set_profiling(None)).pack(side="left")
+        self.label_status = ttk.Label(frame_buttons)
+        self.label_status.pack(side="left", padx=dpi_5)
+
+        self.tw_listeners = Tableview(
+            self,
+            bootstyle="primary",
+            coldata=[
+                {"text": "Event", "stretch": True},
+                {"text": "Listener", "stretch": True},
+                {"text": "Calls", "stretch": True},
+                {"text": "Rejected", "stretch": True},
+                {"text": "Rejection rate", "stretch": True},
+                {"text": "Total (ms)", "stretch": True},
+                {"text": "Mean (ms)", "stretch": True},
+                {"text": "p50 (ms)", "stretch": True},
+                {"text": "p95 (ms)", "stretch": True},
+                {"text": "p99 (ms)", "stretch": True},
+                {"text": "Predicate (ms)", "stretch": True},
+            ],
+            searchable=True,
+            paginated=True,
+            autofit=True
+        )
+        self.tw_listeners.pack(expand=True, fill=tk.BOTH)
+
+    @gui_except()
+    def set_profiling(self, enabled):
+        connection = get_connection()
+
+        async def _set_profiling():
+            if enabled is None:  # Reset only
+                profile = await connection.get_listener_profile()
+                await connection.set_listener_profiling(profile["enabled"], reset=True)
+            else:
+                await connection.set_listener_profiling(enabled)
+
+            await _load_profile(connection, self)
+
+        tae.async_execute(_set_profiling(), wait=False, pop_up=True, master=self)
+
+    @gui_except()
+    def load_profile(self):
+        tae.async_execute(_load_profile(get_connection(), self), wait=False, pop_up=True, master=self)
+
+
+async def _load_profile(connection: AbstractConnectionCLIENT, frame: ListenerProfileFrame):
+    profile = await connection.get_listener_profile()
+    rows = [
+        (
+            listener["event"],
+            listener["listener"],
+            listener["calls"],
+            listener["rejections"],
+            f"{listener['rejection_rate'] * 100:.1f} %",
+            _ms(listener["total_time"]),
+            _ms(listener["mean"]),
+            _ms(listener["p50"]),
+            _ms(listener["p95"]),
+            _ms(listener["p99"]),
+            _ms(listener["predicate_time"]),
+        )
+        for listener in profile["listeners"]
+    ]
+    frame.label_status.configure(text="Profiling enabled" if profile["enabled"] else "Profiling disabled")
+    frame.tw_listeners.delete_rows()
+    frame.tw_listeners.insert_rows(0, rows)
+    frame.tw_listeners.goto_first_page()
+
+
+class LoopStallsFrame(ttk.Frame):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_5 = dpi_scaled(5)
+        self.stalls = []
+
+        frame_buttons = ttk.Frame(self)
+        frame_buttons.pack(fill=tk.X, pady=dpi_5)
+        ttk.Button(frame_buttons, text="Refresh", command=self.load_stalls).pack(side="left")
+        ttk.Label(frame_buttons, text="Threshold (s)").pack(side="left", padx=dpi_5)
+        self.spin_threshold = ttk.Spinbox(frame_buttons, from_=0.05, to=60, increment=0.05, width=6)
+        self.spin_threshold.pack(side="left")
+        ttk.Button(
+            frame_buttons, text="Apply", command=lambda: self.set_threshold(float(self.spin_threshold.get()))
+        ).pack(side="left")
+        ttk.Button(frame_buttons, text="Disable", command=lambda: self.set_threshold(None)).pack(side="left")
+        self.label_status = ttk.Label(frame_buttons)
+        self.label_status.pack(side="left", padx=dpi_5)
+
+        self.lb_stalls = ListBoxScrolled(self)
+        self.lb_stalls.pack(expand=True, fill=tk.BOTH, pady=dpi_5)
+        self.lb_stalls.listbox.bind("<<ListboxSelect>>", lambda e: self.show_stack())
+        ttk.Label(self, text="Stack of the blocking code").pack(anchor=tk.W)
+        self.lb_stack = ListBoxScrolled(self)
+        self.lb_stack.pack(expand=True, fill=tk.BOTH)
+
+    def show_stack(self):
+        selection = self.lb_stalls.curselection()
+        if not selection:
+            return
+
+        self.lb_stack.clear()
+        self.lb_stack.insert(tk.END, *self.stalls[selection[0]]["stack"])
+
+    @gui_except()
+    def set_threshold(self, threshold):
+        connection = get_connection()
+
+        async def _set_threshold():
+            await connection.set_loop_watchdog(threshold)
+            await _load_stalls(connection, self)
+
+        tae.async_execute(_set_threshold(), wait=False, pop_up=True, master=self)
+
+    @gui_except()
+    def load_stalls(self):
+        tae.async_execute(_load_stalls(get_connection(), self), wait=False, pop_up=True, master=self)
+
+
+async def _load_stalls(connection: AbstractConnectionCLIENT, frame: LoopStallsFrame):
+    stalls = await connection.get_loop_stalls()
+    threshold = stalls["threshold"]
+    if threshold is None:
+        status = "Watchdog disabled"
+    else:
+        frame.spin_threshold.set(threshold)
+        status = f"Last lag: {_ms(stalls['lag'])} ms, max lag: {_ms(stalls['max_lag'])} ms"
+
+    frame.label_status.configure(text=status)
+    frame.stalls = stalls["stalls"][::-1]  # Newest first
+    frame.lb_stalls.clear()
+    frame.lb_stalls.insert(
+        tk.END,
+        *[
+            f"{stall['timestamp']:%Y-%m-%d %H:%M:%S} | {_ms(stall['lag'])} ms | "
+            f"{stall['stack'][-1].splitlines()[0].strip() if stall['stack'] else '(unknown)'}"
+            for stall in frame.stalls
+        ]
+    )
+    frame.lb_stack.clear()
+
+
+class TasksFrame(ttk.Frame):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_5 = dpi_scaled(5)
+
+        frame_buttons = ttk.Frame(self)
+        frame_buttons.pack(fill=tk.X, pady=dpi_5)
+        ttk.Button(frame_buttons, text="Refresh", command=self.load_tasks).pack(side="left")
+        self.label_status = ttk.Label(frame_buttons)
+        self.label_status.pack(side="left", padx=dpi_5)
+
+        self.tw_tasks = Tableview(
+            self,
+            bootstyle="primary",
+            coldata=[
+                {"text": "Owner", "stretch": True},
+                {"text": "Owner ID", "stretch": True},
+                {"text": "Orphaned", "stretch": True},
+                {"text": "Purpose", "stretch": True},
+                {"text": "Created", "stretch": True},
+                {"text": "Name", "stretch": True},
+            ],
+            searchable=True,
+            paginated=True,
+            autofit=True
+        )
+        self.tw_tasks.pack(expand=True, fill=tk.BOTH)
+
+    @gui_except()
+    def load_tasks(self):
+        tae.async_execute(_load_tasks(get_connection(), self), wait=False, pop_up=True, master=self)
+
+
+async def _load_tasks(connection: AbstractConnectionCLIENT, frame: TasksFrame):
+    groups = await connection.get_tasks()
+    rows = [
+        (
+            group["owner_type"] or "",
+            group["owner_id"] if group["owner_id"] is not None else "",
+            "Yes" if group["orphaned"] else "",
+            task["purpose"],
+            f"{task['created']:%Y-%m-%d %H:%M:%S}",
+            task["name"],
+        )
+        for group in sorted(groups, key=lambda group: not group["orphaned"])  # Orphaned first
+        for task in group["tasks"]
+    ]
+    orphaned = sum(len(group["tasks"]) for group in groups if group["orphaned"])
+    frame.label_status.configure(text=f"{len(rows)} tasks, {orphaned} orphaned")
+    frame.tw_tasks.delete_rows()
+    frame.tw_tasks.insert_rows(0, rows)
+    frame.tw_tasks.goto_first_page()
+
+
+class SpansFrame(ttk.Frame):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_5 = dpi_scaled(5)
+
+        frame_buttons = ttk.Frame(self)
+        frame_buttons.pack(fill=tk.X, pady=dpi_5)
+        ttk.Button(frame_buttons, text="Enable", command=lambda: self.set_recording(True)).pack(side="left")
+        ttk.Button(frame_buttons, text="Disable", command=lambda: self.set_recording(False)).pack(side="left")
+        ttk.Button(frame_buttons, text="Reset", command=lambda: self.set_recording(None)).pack(side="left")
+        ttk.Button(frame_buttons, text="Export", command=self.export_trace).pack(side="left")
+        ttk.Label(
+            self,
+            text="Exports the recorded stages of the send pipeline in the Chrome trace event format,\n"
+                 "which can be opened with a trace viewer (e. g., https://ui.perfetto.dev)."
+        ).pack(anchor=tk.W)
+
+    @gui_except()
+    def set_recording(self, enabled):
+        connection = get_connection()
+
+        async def _set_recording():
+            if enabled is None:  # Reset only
+                trace = await connection.get_chrome_trace()
+                await connection.set_span_recording(trace["otherData"]["enabled"], reset=True)
+            else:
+                await connection.set_span_recording(enabled)
+
+        tae.async_execute(_set_recording(), wait=False, pop_up=True, master=self)
+
+    @gui_except()
+    def export_trace(self):
+        filename = tkfile.asksaveasfilename(filetypes=[("Chrome trace", "*.json")])
+        if filename == "":
+            return
+
+        if not filename.endswith(".json"):
+            filename += ".json"
+
+        async def _export_trace():
+            trace = await get_connection().get_chrome_trace()
+            with open(filename, "w", encoding="utf-8") as file:
+                json.dump(trace, file)
+
+            spans = sum(event["ph"] == "X" for event in trace["traceEvents"])
+            tae.tk_execute(tkdiag.Messagebox.show_info, f"Exported {spans} spans to {filename}", "Finished", self)
+
+        tae.async_execute(_export_trace(), wait=False, pop_up=True, master=self)
+
+
+class ProfilerFrame(ttk.Frame):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_5 = dpi_scaled(5)
+        self.collapsed = ""
+
+        frame_buttons = ttk.Frame(self)
+        frame_buttons.pack(fill=tk.X, pady=dpi_5)
+        ttk.Button(frame_buttons, text="Refresh", command=self.load_profile).pack(side="left")
+        ttk.Button(frame_buttons, text="Start", command=lambda: self.set_profiler(True)).pack(side="left")
+        ttk.Button(frame_buttons, text="Stop", command=lambda: self.set_profiler(False)).pack(side="left")
+        ttk.Button(frame_buttons, text="Reset", command=lambda: self.set_profiler(True, reset=True)).pack(side="left")
+        ttk.Button(frame_buttons, text="Export", command=self.export_profile).pack(side="left")
+        self.label_status = ttk.Label(frame_buttons)
+        self.label_status.pack(side="left", padx=dpi_5)
+
+        self.tw_functions = Tableview(
+            self,
+            bootstyle="primary",
+            coldata=[
+                {"text": "Function", "stretch": True},
+                {"text": "Self (%)", "stretch": True},
+                {"text": "Total (%)", "stretch": True},
+            ],
+            searchable=True,
+            paginated=True,
+            autofit=True
+        )
+        self.tw_functions.pack(expand=True, fill=tk.BOTH)
+
+    @gui_except()
+    def set_profiler(self, running: bool, reset: bool = False):
+        connection = get_connection()
+
+        async def _set_profiler():
+            await connection.set_profiler(running, reset=reset)
+            await _load_profiler(connection, self)
+
+        tae.async_execute(_set_profiler(), wait=False, pop_up=True, master=self)
+
+    @gui_except()
+    def load_profile(self):
+        tae.async_execute(_load_profiler(get_connection(), self), wait=False, pop_up=True, master=self)
+
+    @gui_except()
+    def export_profile(self):
+        filename = tkfile.asksaveasfilename(filetypes=[("Collapsed stacks", "*.txt")])
+        if filename == "":
+            return
+
+        if not filename.endswith(".txt"):
+            filename += ".txt"
+
+        async def _export_profile():
+            await _load_profiler(get_connection(), self)
+            with open(filename, "w", encoding="utf-8") as file:
+                file.write(self.collapsed)
+
+            tae.tk_execute(tkdiag.Messagebox.show_info, f"Exported the profile to {filename}", "Finished", self)
+
+        tae.async_execute(_export_profile(), wait=False, pop_up=True, master=self)
+
+
+async def _load_profiler(connection: AbstractConnectionCLIENT, frame: ProfilerFrame):
+    profile = await connection.get_profile()
+    status = profile["status"]
+    frame.collapsed = profile["collapsed"]
+    frame.label_status.configure(
+        text=f"{'Running' if status['running'] else 'Stopped'}, {status['samples']} samples, "
+             f"overhead {status['overhead'] * 100:.2f} %"
+    )
+
+    # Sum the samples of each function
+    self_samples = {}
+    total_samples = {}
+    total = 0
+    for line in frame.collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        count = int(count)
+        functions = stack.split(";")
+        total += count
+        self_samples[functions[-1]] = self_samples.get(functions[-1], 0) + count
+        for function in set(functions):
+            total_samples[function] = total_samples.get(function, 0) + count
+
+    rows = [
+        (function, round(self_samples.get(function, 0) * 100 / total, 2), round(count * 100 / total, 2))
+        for function, count in sorted(total_samples.items(), key=lambda x: self_samples.get(x[0], 0), reverse=True)
+    ]
+    frame.tw_functions.delete_rows()
+    frame.tw_functions.insert_rows(0, rows)
+    frame.tw_functions.goto_first_page()
+
+
+class TimelineFrame(ttk.Frame):
+    PAGE_SIZE = 500
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        dpi_5 = dpi_scaled(5)
+        self.cursor = None
+        self.counts = []
+
+        frame_buttons = ttk.Frame(self)
+        frame_buttons.pack(fill=tk.X, pady=dpi_5)
+        ttk.Button(frame_buttons, text="Refresh", command=self.load_timeline).pack(side="left")
+        ttk.Label(frame_buttons, text="Within (h)").pack(side="left", padx=dpi_5)
+        self.spin_within = ttk.Spinbox(frame_buttons, from_=0.25, to=168, increment=0.25, width=6)
+        self.spin_within.set(1)
+        self.spin_within.pack(side="left")
+        ttk.Label(frame_buttons, text="Interval (min)").pack(side="left", padx=dpi_5)
+        self.spin_interval = ttk.Spinbox(frame_buttons, from_=1, to=1440, increment=1, width=6)
+        self.spin_interval.set(1)
+        self.spin_interval.pack(side="left")
+        self.bnt_more = ttk.Button(frame_buttons, text="Load more", command=self.load_more, state="disabled")
+        self.bnt_more.pack(side="left", padx=dpi_5)
+        self.label_status = ttk.Label(frame_buttons)
+        self.label_status.pack(side="left", padx=dpi_5)
+
+        # Number of sends in each interval, the bursts are visible as the tallest bars
+        self.canvas_counts = tk.Canvas(self, height=dpi_scaled(150), highlightthickness=0)
+        self.canvas_counts.pack(fill=tk.X, pady=dpi_5)
+        self.canvas_counts.bind("<Configure>", lambda e: self.draw_counts())
+
+        self.tw_sends = Tableview(
+            self,
+            bootstyle="primary",
+            coldata=[
+                {"text": "Time", "stretch": True},
+                {"text": "Account", "stretch": True},
+                {"text": "Guild", "stretch": True},
+                {"text": "Message", "stretch": True},
+                {"text": "Channels", "stretch": True},
+                {"text": "Message ID", "stretch": True},
+            ],
+            searchable=True,
+            paginated=True,
+            autofit=True
+        )
+        self.tw_sends.pack(expand=True, fill=tk.BOTH)
+
+    @property
+    def within(self) -> timedelta:
+        return timedelta(hours=float(self.spin_within.get()))
+
+    def draw_counts(self):
+        canvas = self.canvas_counts
+        canvas.delete("all")
+        if not self.counts:
+            return
+
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        label_height = dpi_scaled(15)
+        maximum = max(count["sends"] for count in self.counts) or 1
+        bar_width = width / len(self.counts)
+        colors = ttk.Style().colors
+        for i, count in enumerate(self.counts):
+            bar_height = (height - label_height) * count["sends"] / maximum
+            canvas.create_rectangle(
+                i * bar_width, height - bar_height, (i + 1) * bar_width, height,
+                fill=colors.danger if count["sends"] == maximum else colors.primary, width=0
+            )
+
+        canvas.create_text(
+            0, 0, anchor=tk.NW, fill=colors.fg,
+            text=f"{self.counts[0]['start']:%H:%M} - max. {maximum} sends per interval"
+        )
+
+    @gui_except()
+    def load_timeline(self):
+        tae.async_execute(_load_timeline(get_connection(), self), wait=False, pop_up=True, master=self)
+
+    @gui_except()
+    def load_more(self):
+        tae.async_execute(_load_sends(get_connection(), self, self.cursor), wait=False, pop_up=True, master=self)
+
+
+async def _load_timeline(connection: AbstractConnectionCLIENT, frame: TimelineFrame):
+    frame.counts = await connection.get_send_counts(
+        frame.within, timedelta(minutes=float(frame.spin_interval.get()))
+    )
+    frame.draw_counts()
+    frame.tw_sends.delete_rows()
+    await _load_sends(connection, frame, None)
+
+
+async def _load_sends(connection: AbstractConnectionCLIENT, frame: TimelineFrame, cursor):
+    page = await connection.get_upcoming_sends(frame.within, frame.PAGE_SIZE, cursor)
+    rows = [
+        (
+            f"{send['time']:%Y-%m-%d %H:%M:%S}",
+            send["account"] or "",
+            send["guild_name"] or send["guild"],
+            send["message_type"],
+            send["channels"],
+            send["message_id"] if send["message_id"] is not None else "",
+        )
+        for send in page["sends"]
+    ]
+    frame.cursor = page["cursor"]
+    frame.bnt_more.configure(state="normal" if frame.cursor is not None else "disabled")
+    loaded = len(frame.tw_sends.tablerows) + len(rows)
+    frame.label_status.configure(text=f"{loaded} of {loaded - len(rows) + page['total']} sends loaded")
+    frame.tw_sends.insert_rows(tk.END, rows)
+    frame.tw_sends.goto_first_page()
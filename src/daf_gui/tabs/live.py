@@ -42,6 +42,7 @@ class LiveTab(ttk.Frame):
         ttk.Button(frame_account_opts, text="Refresh", command=self.load_accounts).pack(side="left")  # TODO
         ttk.Button(frame_account_opts, text="Edit", command=self.view_live_account).pack(side="left")
         ttk.Button(frame_account_opts, text="Remove", command=self.remove_account).pack(side="left")
+        ttk.Button(frame_account_opts, text="Counters", command=self.view_counters).pack(side="left")
 
         list_live_objects = ListBoxScrolled(self)
         list_live_objects.pack(fill=tk.BOTH, expand=True)
@@ -94,6 +95,26 @@ class LiveTab(ttk.Frame):
         else:
             tkdiag.Messagebox.show_error("Select one item!", "Empty list!")
 
+    @gui_except()
+    def view_counters(self):
+        connection = get_connection()
+        selection = self.list_live_objects.curselection()
+        if len(selection) == 1:
+            object_: ObjectInfo = self.list_live_objects.get()[selection[0]]
+
+            async def _view_counters():
+                counters = await connection.get_counters(object_.real_object)
+                series = counters["series"]
+                text = "\n".join(
+                    f"{kind}: {total} (last 5 minutes: {sum(series[kind][-5:])})"
+                    for kind, total in counters["totals"].items()
+                )
+                tae.tk_execute(tkdiag.Messagebox.show_info, text, "Counters of the last hour", self)
+
+            tae.async_execute(_view_counters(), wait=False, pop_up=True, master=self)
+        else:
+            tkdiag.Messagebox.show_error("Select one item!", "Empty list!")
+
     @gui_except()
     def load_accounts(self):
         connection = get_connection()
@@ -4,6 +4,7 @@ import os
 
 pytest_plugins = [
     "fixtures.main",
+    "fixtures.benchmark",
 ]
 
 
@@ -0,0 +1,828 @@
+"""
+Offline fake of the Discord API (REST and gateway), used for running accounts end-to-end
+without a real token and guild, e.g., in tests and benchmarks.
+
+The REST API implements the routes the framework uses (users/@me, guilds, channels, messages and invites).
+The gateway (zlib-stream compressed) emits READY, GUILD_CREATE and the MESSAGE_CREATE/UPDATE/DELETE events
+of messages made through the REST API. Latency and rate limits (429) can be injected.
+
+Traffic recorded with :func:`daf.recorder.start_recording` can be replayed (:meth:`FakeDISCORD.load_recording`).
+
+.. code-block:: python
+
+    async with FakeDISCORD(latency=0.05, rate_limit_every=10) as server:
+        account = daf.ACCOUNT("any-token")
+        await daf.add_object(account)
+        guild = daf.GUILD(server.guilds[0]["id"])
+
+.. warning::
+    While running, the API base URL of all the clients in the process points to the fake server.
+"""
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+from collections import Counter, OrderedDict, deque
+from datetime import timezone
+from itertools import count
+from aiohttp import web, WSMsgType
+
+from _discord.http import Route
+from daf.misc.clock import get_clock
+
+import asyncio
+import random
+import json
+import time
+import zlib
+
+
+__all__ = (
+    "FakeDISCORD",
+)
+
+
+# Constants
+# ---------------------#
+C_API_VERSION = 10
+C_DISCORD_EPOCH = 1420070400000
+C_HEARTBEAT_INTERVAL = 41250  # ms
+C_MESSAGE_BUFFER_SIZE = 10_000  # Older messages are forgotten
+C_ALL_PERMISSIONS = str((1 << 47) - 1)
+C_RATE_LIMITED_ROUTES = {
+    ("POST", "/channels/{channel_id}/messages"),
+    ("PATCH", "/channels/{channel_id}/messages/{message_id}"),
+    ("DELETE", "/channels/{channel_id}/messages/{message_id}"),
+}
+
+
+def _now() -> str:
+    # Follows the framework's clock, which can be virtual
+    return get_clock().now().astimezone(timezone.utc).isoformat()
+
+
+def _json_response(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    # The client only parses the body if the content type is exactly application/json (without charset)
+    return web.Response(
+        body=json.dumps(data).encode("utf-8"),
+        status=status,
+        headers={**(headers or {}), "Content-Type": "application/json"}
+    )
+
+
+def _error(status: int, code: int, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return _json_response({"message": message, "code": code}, status=status, headers=headers)
+
+
+class _GatewayCONNECTION:
+    """
+    A connected gateway client.
+    """
+    def __init__(self, ws: web.WebSocketResponse, compress: bool) -> None:
+        self.ws = ws
+        self.user: Optional[dict] = None
+        self.token: Optional[str] = None  # Without the "Bot " prefix
+        self.sequence = 0
+        self._zlib = zlib.compressobj() if compress else None
+
+    async def send(self, payload: dict):
+        data = json.dumps(payload)
+        if self._zlib is None:
+            await self.ws.send_str(data)
+        else:
+            # One compression context for the entire connection, each message ends with Z_SYNC_FLUSH
+            await self.ws.send_bytes(self._zlib.compress(data.encode("utf-8")) + self._zlib.flush(zlib.Z_SYNC_FLUSH))
+
+    async def dispatch(self, event: str, data: Any):
+        self.sequence += 1
+        await self.send({"op": 0, "t": event, "s": self.sequence, "d": data})
+
+
+class FakeDISCORD:
+    """
+    Local fake of the Discord REST API and gateway.
+
+    Parameters
+    -------------
+    host: str
+        The interface to listen on.
+    port: int
+        The port to listen on. 0 picks a free port.
+    guilds: int
+        Number of guilds to create. All the users (tokens) are members of these guilds.
+        More guilds can be added with :meth:`add_guild`.
+    channels: int
+        Number of text channels to create in each guild.
+    latency: Union[float, Tuple[float, float]]
+        Seconds each REST response is delayed for. A tuple (min, max) picks a random delay in the range.
+    rate_limit_every: Optional[int]
+        Every n-th request to the message routes (send, edit, delete) is answered with 429 Too Many Requests.
+        None disables rate limiting.
+    retry_after: float
+        Seconds the client has to wait after a 429 response.
+    rate_limit_global: bool
+        Report the injected rate limits as global.
+
+    Attributes
+    -------------
+    guilds: List[dict]
+        The guilds' data (``id``, ``name``, ``channels``, ...).
+    messages: OrderedDict[int, dict]
+        Data of the messages (the last 10 000) by their ID.
+    requests: Counter[Tuple[str, str]]
+        Number of requests by (method, route).
+    rate_limited: int
+        Number of 429 responses.
+    """
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        guilds: int = 1,
+        channels: int = 3,
+        latency: Union[float, Tuple[float, float]] = 0,
+        rate_limit_every: Optional[int] = None,
+        retry_after: float = 0.1,
+        rate_limit_global: bool = False
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.rate_limit_global = rate_limit_global
+
+        self.requests: Counter[Tuple[str, str]] = Counter()
+        self.rate_limited = 0
+        self.messages: OrderedDict[int, dict] = OrderedDict()
+        self.users: Dict[int, dict] = {}
+        self.dm_channels: Dict[int, dict] = {}
+        self.invites: Dict[str, dict] = {}
+
+        self._snowflakes = count()
+        self._tokens: Dict[str, dict] = {}
+        self._connections: Set[_GatewayCONNECTION] = set()
+        self._limited_requests = 0
+        self._runner: Optional[web.AppRunner] = None
+        self._old_base: Optional[str] = None
+
+        # Replay of a recording
+        self.speed = 1.0
+        self._replay_user: Optional[dict] = None
+        self._events: List[Tuple[float, str, Any]] = []
+        self._script: Dict[Tuple[str, str], Deque[dict]] = {}
+
+        self.owner = self._make_user("fake-owner", False)
+        self.guilds: List[dict] = []
+        self._guild_index: Dict[str, dict] = {}
+        self._channel_index: Dict[str, dict] = {}
+        self._guild_tokens: Dict[str, Set[str]] = {}  # Members of guilds, that are not joined by everyone
+        for _ in range(guilds):
+            self.add_guild(channels)
+
+    # Data
+    # -----------------#
+    def _snowflake(self) -> int:
+        return ((int(time.time() * 1000) - C_DISCORD_EPOCH) << 22) | (next(self._snowflakes) & 0x3FFFFF)
+
+    def _make_user(self, name: str, bot: bool, id_: Optional[int] = None) -> dict:
+        id_ = id_ if id_ is not None else self._snowflake()
+        user = self.users[id_] = {
+            "id": str(id_),
+            "username": name,
+            "global_name": name,
+            "discriminator": "0",
+            "avatar": None,
+            "bot": bot,
+            "flags": 0,
+            "mfa_enabled": False,
+            "verified": True,
+        }
+        return user
+
+    def add_guild(self, channels: int = 3, tokens: Optional[Iterable[str]] = None) -> dict:
+        """
+        Creates a new guild with text channels and an invite.
+        Must be called before the users log in.
+
+        Parameters
+        ------------
+        channels: int
+            Number of text channels.
+        tokens: Optional[Iterable[str]]
+            Tokens of the users who are members of the guild. Defaults to everyone.
+
+        Returns
+        ---------
+        dict
+            The guild's data.
+        """
+        guild_id = self._snowflake()
+        guild = {
+            "id": str(guild_id),
+            "name": f"fake-guild-{len(self.guilds)}",
+            "icon": None,
+            "owner_id": self.owner["id"],
+            "features": [],
+            "emojis": [],
+            "stickers": [],
+            "verification_level": 0,
+            "default_message_notifications": 0,
+            "explicit_content_filter": 0,
+            "mfa_level": 0,
+            "nsfw_level": 0,
+            "premium_tier": 0,
+            "preferred_locale": "en-US",
+            "system_channel_flags": 0,
+            "roles": [{
+                "id": str(guild_id),  # @everyone
+                "name": "@everyone",
+                "permissions": C_ALL_PERMISSIONS,
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+                "flags": 0,
+            }],
+            "channels": [
+                {
+                    "id": str(self._snowflake()),
+                    "type": 0,
+                    "guild_id": str(guild_id),
+                    "name": f"fake-channel-{i}",
+                    "position": i,
+                    "permission_overwrites": [],
+                    "nsfw": False,
+                    "parent_id": None,
+                    "rate_limit_per_user": 0,
+                    "topic": None,
+                    "last_message_id": None,
+                }
+                for i in range(channels)
+            ],
+        }
+        if guild["channels"]:
+            code = f"fake{guild_id}"
+            self.invites[code] = {
+                "code": code,
+                "type": 0,
+                "guild": {k: guild[k] for k in ("id", "name", "icon", "features", "verification_level")},
+                "channel": {k: guild["channels"][0][k] for k in ("id", "name", "type")},
+                "inviter": self.owner,
+                "uses": 0,
+                "max_uses": 0,
+                "max_age": 0,
+                "temporary": False,
+                "created_at": _now(),
+            }
+
+        if tokens is not None:
+            self._guild_tokens[guild["id"]] = set(tokens)
+
+        self._add_guild(guild)
+        return guild
+
+    def _add_guild(self, guild: dict):
+        self.guilds.append(guild)
+        self._guild_index[guild["id"]] = guild
+        for channel in guild.get("channels", []):
+            channel["guild_id"] = guild["id"]
+            self._channel_index[channel["id"]] = channel
+
+    def _is_member(self, guild: dict, token: str) -> bool:
+        tokens = self._guild_tokens.get(guild["id"])
+        return tokens is None or token in tokens
+
+    def _member(self, user: dict) -> dict:
+        return {
+            "user": user,
+            "roles": [],
+            "joined_at": _now(),
+            "deaf": False,
+            "mute": False,
+            "pending": False,
+            "flags": 0,
+        }
+
+    def _guild_create(self, guild: dict) -> dict:
+        members = guild.get("members")
+        if members is None:
+            if guild["id"] in self._guild_tokens:
+                users = [self.owner] + [self._tokens[t] for t in self._guild_tokens[guild["id"]] if t in self._tokens]
+            else:
+                users = self.users.values()
+
+            members = [self._member(user) for user in users]
+
+        return {
+            **guild,
+            "members": members,
+            "member_count": len(members),
+            "threads": [],
+            "voice_states": [],
+            "presences": [],
+            "joined_at": _now(),
+            "large": False,
+            "unavailable": False,
+        }
+
+    def _find_guild(self, guild_id: str) -> Optional[dict]:
+        return self._guild_index.get(guild_id)
+
+    def _find_channel(self, channel_id: str) -> Optional[dict]:
+        channel = self._channel_index.get(channel_id)
+        if channel is None and channel_id.isnumeric():
+            channel = self.dm_channels.get(int(channel_id))
+
+        return channel
+
+    def _user_from_token(self, token: str) -> dict:
+        "Returns the user of the ``token`` (Authorization header), which is created on first use."
+        if self._replay_user is not None:
+            return self._replay_user
+
+        bot = token.startswith("Bot ")
+        token = token.removeprefix("Bot ")
+        user = self._tokens.get(token)
+        if user is None:
+            user = self._tokens[token] = self._make_user(f"fake-{'bot' if bot else 'user'}-{len(self._tokens)}", bot)
+
+        return user
+
+    # Server
+    # -----------------#
+    @property
+    def url(self) -> str:
+        "URL of the server."
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        """
+        Starts the server and points the API base URL of the clients to it.
+        """
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/gateway", self._gateway)
+        api = f"/api/v{C_API_VERSION}"
+        for method, path, handler in (
+            ("GET", "/gateway", self._get_gateway),
+            ("GET", "/gateway/bot", self._get_gateway),
+            ("GET", "/users/@me", self._get_me),
+            ("POST", "/users/@me/channels", self._create_dm),
+            ("GET", "/users/{user_id}", self._get_user),
+            ("GET", "/guilds/{guild_id}", self._get_guild),
+            ("GET", "/guilds/{guild_id}/channels", self._get_guild_channels),
+            ("GET", "/guilds/{guild_id}/members/{user_id}", self._get_member),
+            ("GET", "/guilds/{guild_id}/invites", self._get_guild_invites),
+            ("GET", "/invites/{code}", self._get_invite),
+            ("GET", "/channels/{channel_id}", self._get_channel),
+            ("GET", "/channels/{channel_id}/messages", self._get_messages),
+            ("POST", "/channels/{channel_id}/messages", self._send_message),
+            ("GET", "/channels/{channel_id}/messages/{message_id}", self._get_message),
+            ("PATCH", "/channels/{channel_id}/messages/{message_id}", self._edit_message),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}", self._delete_message),
+        ):
+            app.router.add_route(method, api + path, handler)
+
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._old_base = Route.BASE
+        Route.BASE = f"{self.url}{api}"
+
+    async def stop(self):
+        """
+        Closes the gateway connections, stops the server and restores the API base URL.
+        """
+        for connection in list(self._connections):
+            await connection.ws.close()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            Route.BASE = self._old_base
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    def load_recording(self, records: List[dict], speed: float = 1.0):
+        """
+        Replaces the fake's data with the data of a recording (:func:`daf.recorder.load_recording`).
+        The user (for all tokens) is taken from READY and the guilds from the initial GUILD_CREATE events.
+        The recorded REST outcomes (latency, rate limits and errors) are applied to the requests of each route
+        in the order they were recorded. The other received events are dispatched by :meth:`replay`.
+
+        Parameters
+        ------------
+        records: List[dict]
+            The recorded traffic.
+        speed: float
+            Speed-up of the latency, rate limits and the events. ``float("inf")`` removes all the waiting.
+        """
+        self.speed = speed
+        self.guilds = []
+        self.invites.clear()
+        self._guild_index.clear()
+        self._channel_index.clear()
+        self._guild_tokens.clear()
+        self._events.clear()
+        self._script.clear()
+        unavailable = set()  # Guilds announced in READY, that are still to be created
+        for record in records:
+            if record["type"] == "http":
+                self._script.setdefault((record["method"], record["route"]), deque()).append(dict(record))
+                continue
+
+            message = record["data"]
+            if message.get("op") != 0:
+                continue
+
+            event, data = message["t"], message["d"]
+            if event == "READY":
+                self._replay_user = self.users[int(data["user"]["id"])] = data["user"]
+                unavailable = {guild["id"] for guild in data["guilds"]}
+            elif event == "GUILD_CREATE" and data["id"] in unavailable:
+                unavailable.remove(data["id"])
+                self._add_guild(data)
+            elif event != "RESUMED":
+                self._events.append((record["time"], event, data))
+
+    async def replay(self) -> float:
+        """
+        Dispatches the recorded events (:meth:`load_recording`) with the recorded delays between them
+        (divided by the speed).
+
+        Returns
+        ---------
+        float
+            Seconds the replay took.
+        """
+        start = time.perf_counter()
+        first = self._events[0][0] if self._events else 0
+        for timestamp, event, data in self._events:
+            delay = (timestamp - first) / self.speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            await self.dispatch(event, data)
+
+        return time.perf_counter() - start
+
+    async def dispatch(self, event: str, data: Any):
+        """
+        Dispatches an event to all the identified gateway connections.
+        Guild events (data with ``guild_id``) are only dispatched to the guild's members.
+
+        Parameters
+        ------------
+        event: str
+            The event name (e.g., ``GUILD_MEMBER_ADD``).
+        data: Any
+            The event's data.
+        """
+        guild = self._guild_index.get(data.get("guild_id")) if isinstance(data, dict) else None
+        for connection in list(self._connections):
+            if connection.user is None or connection.ws.closed:
+                continue
+
+            if guild is None or self._is_member(guild, connection.token):
+                await connection.dispatch(event, data)
+
+    async def _next_latency(self, request: web.Request, route: str) -> Optional[web.Response]:
+        """
+        Waits for the configured latency or applies the next recorded outcome of the route.
+        Returns a response if the request is not to be handled.
+        """
+        script = self._script.get((request.method, route))
+        if not script:
+            latency = self.latency
+            if isinstance(latency, tuple):
+                latency = random.uniform(*latency)
+
+            if latency:
+                await asyncio.sleep(latency)
+
+            return None
+
+        record = script[0]
+        if record["rate_limits"]:  # Recorded rate limits precede the recorded response
+            retry_after = record["rate_limit_sleep"] / record["rate_limits"]
+            record["rate_limit_sleep"] -= retry_after
+            record["rate_limits"] -= 1
+            return self._rate_limit(retry_after / self.speed)
+
+        script.popleft()
+        await asyncio.sleep(max(0, record["duration"] - record["rate_limit_sleep"]) / self.speed)
+        if record["status"] is not None and record["status"] >= 300:
+            return _error(record["status"], record.get("code") or 0, str(record["response"]))
+
+        return None
+
+    def _rate_limit(self, retry_after: float) -> web.Response:
+        self.rate_limited += 1
+        headers = {
+            "Retry-After": str(max(1, round(retry_after))),
+            "X-RateLimit-Limit": "5",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": str(retry_after),
+            "X-RateLimit-Scope": "global" if self.rate_limit_global else "user",
+            "Via": "1.1 google",  # The client only retries rate limits passing through Discord's proxy
+        }
+        if self.rate_limit_global:
+            headers["X-RateLimit-Global"] = "true"
+
+        return _json_response(
+            {"message": "You are being rate limited.", "retry_after": retry_after, "global": self.rate_limit_global},
+            status=429,
+            headers=headers
+        )
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.path == "/gateway":
+            return await handler(request)
+
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        route = route.removeprefix(f"/api/v{C_API_VERSION}")
+        self.requests[(request.method, route)] += 1
+        if (response := await self._next_latency(request, route)) is not None:
+            return response
+
+        token = request.headers.get("Authorization")
+        if token is None and not route.startswith("/gateway"):
+            return _error(401, 0, "401: Unauthorized")
+
+        if self.rate_limit_every is not None and (request.method, route) in C_RATE_LIMITED_ROUTES:
+            self._limited_requests += 1
+            if self._limited_requests % self.rate_limit_every == 0:
+                return self._rate_limit(self.retry_after)
+
+        request["user"] = self._user_from_token(token) if token is not None else None
+        return await handler(request)
+
+    # Gateway
+    # -----------------#
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        connection = _GatewayCONNECTION(ws, request.query.get("compress") == "zlib-stream")
+        self._connections.add(connection)
+        heartbeat_task = asyncio.create_task(self._request_heartbeats(connection))
+        try:
+            await connection.send({"op": 10, "d": {"heartbeat_interval": C_HEARTBEAT_INTERVAL}})
+            async for message in ws:
+                if message.type not in {WSMsgType.TEXT, WSMsgType.BINARY}:
+                    break
+
+                payload = json.loads(message.data)
+                op = payload.get("op")
+                if op == 1:  # Heartbeat
+                    await connection.send({"op": 11})
+                elif op == 2:  # Identify
+                    await self._identify(connection, payload["d"])
+                elif op == 6:  # Resume
+                    connection.user = self._user_from_token(payload["d"]["token"])
+                    connection.token = payload["d"]["token"].removeprefix("Bot ")
+                    connection.sequence = payload["d"].get("seq") or 0
+                    await connection.dispatch("RESUMED", {})
+        finally:
+            heartbeat_task.cancel()
+            self._connections.discard(connection)
+
+        return ws
+
+    async def _request_heartbeats(self, connection: _GatewayCONNECTION):
+        # The clients send heartbeats from a thread, on real time. On a virtual clock (daf.misc.clock)
+        # the connection would time out, unless the heartbeats are requested on the event loop's time.
+        while True:
+            await asyncio.sleep(C_HEARTBEAT_INTERVAL / 1000)
+            try:
+                await connection.send({"op": 1, "d": None})
+            except ConnectionError:
+                return
+
+    async def _identify(self, connection: _GatewayCONNECTION, data: dict):
+        connection.user = user = self._user_from_token(data["token"])
+        connection.token = token = data["token"].removeprefix("Bot ")
+        guilds = [guild for guild in self.guilds if self._is_member(guild, token)]
+        await connection.dispatch(
+            "READY",
+            {
+                "v": C_API_VERSION,
+                "user": user,
+                "guilds": [{"id": guild["id"], "unavailable": True} for guild in guilds],
+                "session_id": f"fake-session-{self._snowflake()}",
+                "resume_gateway_url": f"ws://{self.host}:{self.port}/gateway",
+                "application": {"id": user["id"], "flags": 0},
+                "private_channels": [],
+                "relationships": [],
+            }
+        )
+        for guild in guilds:
+            await connection.dispatch("GUILD_CREATE", self._guild_create(guild))
+
+    # REST
+    # -----------------#
+    async def _get_gateway(self, request: web.Request):
+        return _json_response(
+            {
+                "url": f"ws://{self.host}:{self.port}/gateway",
+                "shards": 1,
+                "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}
+            }
+        )
+
+    async def _get_me(self, request: web.Request):
+        return _json_response(request["user"])
+
+    async def _get_user(self, request: web.Request):
+        user_id = request.match_info["user_id"]
+        if not user_id.isnumeric():
+            return _error(404, 10013, "Unknown User")
+
+        user = self.users.get(int(user_id))
+        if user is None:  # Every ID is a valid user
+            user = self._make_user(f"fake-user-{user_id}", False, int(user_id))
+
+        return _json_response(user)
+
+    async def _create_dm(self, request: web.Request):
+        recipient = (await request.json())["recipient_id"]
+        for channel in self.dm_channels.values():
+            if channel["recipients"][0]["id"] == str(recipient):
+                return _json_response(channel)
+
+        user = self.users.get(int(recipient)) or self._make_user(f"fake-user-{recipient}", False, int(recipient))
+        channel_id = self._snowflake()
+        channel = self.dm_channels[channel_id] = {
+            "id": str(channel_id),
+            "type": 1,
+            "recipients": [user],
+            "last_message_id": None,
+        }
+        return _json_response(channel)
+
+    async def _get_guild(self, request: web.Request):
+        guild = self._find_guild(request.match_info["guild_id"])
+        if guild is None:
+            return _error(404, 10004, "Unknown Guild")
+
+        return _json_response({k: v for k, v in guild.items() if k not in {"channels", "members"}})
+
+    async def _get_guild_channels(self, request: web.Request):
+        guild = self._find_guild(request.match_info["guild_id"])
+        if guild is None:
+            return _error(404, 10004, "Unknown Guild")
+
+        return _json_response(guild["channels"])
+
+    async def _get_member(self, request: web.Request):
+        user_id = request.match_info["user_id"]
+        if self._find_guild(request.match_info["guild_id"]) is None:
+            return _error(404, 10004, "Unknown Guild")
+
+        if not user_id.isnumeric() or int(user_id) not in self.users:
+            return _error(404, 10007, "Unknown Member")
+
+        return _json_response(self._member(self.users[int(user_id)]))
+
+    async def _get_guild_invites(self, request: web.Request):
+        guild_id = request.match_info["guild_id"]
+        if self._find_guild(guild_id) is None:
+            return _error(404, 10004, "Unknown Guild")
+
+        return _json_response([invite for invite in self.invites.values() if invite["guild"]["id"] == guild_id])
+
+    async def _get_invite(self, request: web.Request):
+        invite = self.invites.get(request.match_info["code"])
+        if invite is None:
+            return _error(404, 10006, "Unknown Invite")
+
+        return _json_response(invite)
+
+    async def _get_channel(self, request: web.Request):
+        channel = self._find_channel(request.match_info["channel_id"])
+        if channel is None:
+            return _error(404, 10003, "Unknown Channel")
+
+        return _json_response(channel)
+
+    async def _get_messages(self, request: web.Request):
+        channel_id = request.match_info["channel_id"]
+        if self._find_channel(channel_id) is None:
+            return _error(404, 10003, "Unknown Channel")
+
+        limit = int(request.query.get("limit", 50))
+        messages = [message for message in reversed(self.messages.values()) if message["channel_id"] == channel_id]
+        return _json_response(messages[:limit])
+
+    async def _read_message_payload(self, request: web.Request) -> Tuple[dict, List[dict]]:
+        "Returns the JSON payload and the attachments of a message request."
+        if request.content_type == "application/x-www-form-urlencoded":  # Form without files
+            return json.loads((await request.post())["payload_json"]), []
+
+        if not request.content_type.startswith("multipart/"):
+            return await request.json(), []
+
+        payload = {}
+        attachments = []
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "payload_json":
+                payload = json.loads(await part.text())
+            else:
+                size = len(await part.read())
+                attachment_id = self._snowflake()
+                attachments.append({
+                    "id": str(attachment_id),
+                    "filename": part.filename,
+                    "size": size,
+                    "url": f"{self.url}/attachments/{attachment_id}/{part.filename}",
+                    "proxy_url": f"{self.url}/attachments/{attachment_id}/{part.filename}",
+                })
+
+        return payload, attachments
+
+    async def _send_message(self, request: web.Request):
+        channel_id = request.match_info["channel_id"]
+        channel = self._find_channel(channel_id)
+        if channel is None:
+            return _error(404, 10003, "Unknown Channel")
+
+        payload, attachments = await self._read_message_payload(request)
+        message_id = self._snowflake()
+        message = {
+            "id": str(message_id),
+            "type": 0,
+            "channel_id": channel_id,
+            "author": request["user"],
+            "content": payload.get("content") or "",
+            "embeds": payload.get("embeds") or [],
+            "attachments": attachments,
+            "tts": payload.get("tts", False),
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "pinned": False,
+            "flags": 0,
+            "timestamp": _now(),
+            "edited_timestamp": None,
+        }
+        if "guild_id" in channel:
+            message["guild_id"] = channel["guild_id"]
+
+        self.messages[message_id] = message
+        if len(self.messages) > C_MESSAGE_BUFFER_SIZE:
+            self.messages.popitem(last=False)
+
+        channel["last_message_id"] = message["id"]
+        await self.dispatch("MESSAGE_CREATE", {**message, "member": self._member(request["user"])})
+        return _json_response(message)
+
+    def _find_message(self, request: web.Request) -> Optional[dict]:
+        message_id = request.match_info["message_id"]
+        message = self.messages.get(int(message_id)) if message_id.isnumeric() else None
+        if message is None or message["channel_id"] != request.match_info["channel_id"]:
+            return None
+
+        return message
+
+    async def _get_message(self, request: web.Request):
+        message = self._find_message(request)
+        if message is None:
+            return _error(404, 10008, "Unknown Message")
+
+        return _json_response(message)
+
+    async def _edit_message(self, request: web.Request):
+        message = self._find_message(request)
+        if message is None:
+            return _error(404, 10008, "Unknown Message")
+
+        payload, attachments = await self._read_message_payload(request)
+        for key in ("content", "embeds"):
+            if key in payload:
+                message[key] = payload[key] or ("" if key == "content" else [])
+
+        if attachments:
+            message["attachments"] = attachments
+
+        message["edited_timestamp"] = _now()
+        await self.dispatch("MESSAGE_UPDATE", message)
+        return _json_response(message)
+
+    async def _delete_message(self, request: web.Request):
+        message = self._find_message(request)
+        if message is None:
+            return _error(404, 10008, "Unknown Message")
+
+        del self.messages[int(message["id"])]
+        data = {"id": message["id"], "channel_id": message["channel_id"]}
+        if "guild_id" in message:
+            data["guild_id"] = message["guild_id"]
+
+        await self.dispatch("MESSAGE_DELETE", data)
+        return web.Response(status=204)
@@ -0,0 +1,171 @@
+"""
+Benchmark fixture (similar to pytest-benchmark's), used by the offline benchmarks.
+
+By default each benchmarked function is only called once (to test it works).
+With ``--bench`` the functions are measured and their minimum time (the least affected by noise)
+is compared to the baseline (``benchmark_baseline.json``).
+Benchmarks slower than the baseline by more than the tolerance fail.
+``--bench-save`` stores the measurements as the new baseline.
+
+.. code-block:: bash
+
+    pytest testing/test_benchmarks.py --bench
+"""
+from typing import Any, Callable, Dict, List, Optional
+from pathlib import Path
+from time import perf_counter
+
+import statistics
+import platform
+import pytest
+import json
+
+
+# Constants
+# ---------------------#
+C_BASELINE_PATH = Path(__file__).parent.parent / "benchmark_baseline.json"
+C_MIN_TIME = 0.5  # Seconds each benchmark is measured for (at least)
+C_MIN_ROUNDS = 5
+C_MAX_ROUNDS = 10_000
+
+
+_RESULTS_KEY = pytest.StashKey[Dict[str, "BenchmarkRESULT"]]()
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("bench", "offline benchmarks")
+    group.addoption("--bench", action="store_true", help="Measure the benchmarks and compare them to the baseline.")
+    group.addoption("--bench-save", action="store_true", help="Save the measured benchmarks as the new baseline.")
+    group.addoption(
+        "--bench-tolerance", type=float, default=0.3,
+        help="Fraction by which a benchmark can be slower than the baseline. Defaults to 0.3."
+    )
+
+
+class BenchmarkRESULT:
+    """
+    Measurements of a benchmark.
+    """
+    __slots__ = ("name", "times")
+
+    def __init__(self, name: str, times: List[float]) -> None:
+        self.name = name
+        self.times = times
+
+    def to_dict(self) -> dict:
+        return {
+            "median": statistics.median(self.times),
+            "min": min(self.times),
+            "mean": statistics.mean(self.times),
+            "stddev": statistics.stdev(self.times) if len(self.times) > 1 else 0,
+            "rounds": len(self.times),
+        }
+
+
+class BenchmarkFIXTURE:
+    """
+    Calls and (optionally) measures a function.
+    """
+    def __init__(self, name: str, measure: bool) -> None:
+        self.name = name
+        self.measure = measure
+        self.result: Optional[BenchmarkRESULT] = None
+
+    def __call__(self, func: Callable, *args, setup: Optional[Callable[[], Any]] = None, **kwargs) -> Any:
+        """
+        Benchmarks ``func`` called with ``args`` and ``kwargs``.
+        ``setup`` is called before each call (not measured).
+        Returns the result of the last call.
+        """
+        if setup is not None:
+            setup()
+
+        start = perf_counter()
+        ret = func(*args, **kwargs)
+        first = perf_counter() - start
+        if not self.measure:
+            return ret
+
+        rounds = min(max(int(C_MIN_TIME / max(first, 1e-9)), C_MIN_ROUNDS), C_MAX_ROUNDS)
+        times = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+
+            start = perf_counter()
+            ret = func(*args, **kwargs)
+            times.append(perf_counter() - start)
+
+        self.result = BenchmarkRESULT(self.name, times)
+        return ret
+
+
+def _load_baseline() -> Dict[str, dict]:
+    if not C_BASELINE_PATH.exists():
+        return {}
+
+    with open(C_BASELINE_PATH, "r", encoding="utf-8") as reader:
+        return json.load(reader)["benchmarks"]
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest):
+    config = request.config
+    fixture = BenchmarkFIXTURE(request.node.name, config.getoption("--bench"))
+    yield fixture
+    if fixture.result is None:
+        return
+
+    config.stash.setdefault(_RESULTS_KEY, {})[fixture.name] = fixture.result
+    baseline = _load_baseline().get(fixture.name)
+    if baseline is not None and not config.getoption("--bench-save"):
+        best = fixture.result.to_dict()["min"]
+        change = best / baseline["min"] - 1
+        if change > config.getoption("--bench-tolerance"):
+            pytest.fail(
+                f"Benchmark {fixture.name} regressed: {best * 1000:.3f} ms is "
+                f"{change:.0%} slower than the baseline ({baseline['min'] * 1000:.3f} ms)"
+            )
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config: pytest.Config):
+    results = config.stash.get(_RESULTS_KEY, None)
+    if not results:
+        return
+
+    baseline = {} if config.getoption("--bench-save") else _load_baseline()
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<60}{'min (ms)':>12}{'median (ms)':>14}{'baseline (ms)':>16}{'change':>10}{'rounds':>9}"
+    )
+    for name, result in sorted(results.items()):
+        stats = result.to_dict()
+        line = f"{name:<60}{stats['min'] * 1000:>12.3f}{stats['median'] * 1000:>14.3f}"
+        if name in baseline:
+            base = baseline[name]["min"]
+            line += f"{base * 1000:>16.3f}{stats['min'] / base - 1:>+10.0%}"
+        else:
+            line += f"{'-':>16}{'-':>10}"
+
+        terminalreporter.write_line(line + f"{stats['rounds']:>9}")
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus):
+    config = session.config
+    results = config.stash.get(_RESULTS_KEY, None)
+    if not results or not config.getoption("--bench-save"):
+        return
+
+    baseline = _load_baseline()  # Keep the benchmarks that were not run
+    baseline.update({name: result.to_dict() for name, result in results.items()})
+    with open(C_BASELINE_PATH, "w", encoding="utf-8") as writer:
+        json.dump(
+            {
+                "machine": f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+                "python": platform.python_version(),
+                "benchmarks": dict(sorted(baseline.items()))
+            },
+            writer,
+            indent=4
+        )
+        writer.write("\n")
@@ -7,7 +7,7 @@ import sys
 import daf
 
 
-TEST_TOKEN1, TEST_TOKEN2 = os.environ.get("DISCORD_TOKEN", None).split(';')
+TEST_TOKEN1, TEST_TOKEN2 = os.environ.get("DISCORD_TOKEN", ";").split(';')  # Not needed by the offline tests
 TEST_GUILD_ID = 863071397207212052
 TEST_CATEGORY_NAME = "RUNNING-TEST"
 TEST_TEXT_CHANNEL_NAME_FORM = "PYTEST"
@@ -37,6 +37,31 @@ def event_loop():
     asyncio.set_event_loop(None)
     loop.close()
 
+@pytest.fixture
+async def remote_client():
+    """
+    Client of the framework's remote server (started by the event_loop fixture).
+    """
+    from daf_gui.connector import RemoteConnectionCLIENT
+
+    trace_level = daf.logging.tracing.GLOBALS.set_level
+    client = RemoteConnectionCLIENT("http://127.0.0.1", 8080, "Hello", "World")
+    for _ in range(50):  # The server is started in the background
+        try:
+            await client.initialize(debug=daf.TraceLEVELS.DEPRECATED)
+            break
+        except Exception:
+            await asyncio.sleep(0.1)
+    else:
+        pytest.fail("Could not connect to the remote server.")
+
+    yield client
+    await client.shutdown()
+    # The client shares the global event controller and tracing with the framework
+    daf.events.initialize()
+    daf.logging.tracing.initialize(trace_level)
+
+
 @pytest.fixture(scope="session")
 async def accounts():
     accs = [
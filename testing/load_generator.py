@@ -0,0 +1,329 @@
+"""
+Generator of synthetic shilling lists (accounts, guilds and messages) for load testing and benchmarks.
+
+The size of the shilling list is described by a :class:`LoadPROFILE`, in which the number of guilds per account,
+messages per guild, channels per guild and channels per message are drawn from distributions.
+The guilds and channels are created in the offline fake of the Discord API (:class:`~fake_discord.FakeDISCORD`),
+so that the accounts can log in, or get synthetic IDs if no server is given (e.g., for serialization benchmarks).
+
+The generated accounts can be passed to :func:`daf.run` / :func:`daf.add_object` or saved into a schema,
+which can be loaded by the GUI.
+
+.. code-block:: bash
+
+    # (With the framework installed)
+    # Run the framework with a small generated shilling list against the fake server for 60 seconds
+    python testing/load_generator.py --preset small --seed 1 --run 60
+    # Save the schema only
+    python testing/load_generator.py --preset large --schema large.json
+    # Predict the rate limits and schedule lag of a day (daf.plan_capacity)
+    python testing/load_generator.py --preset large --plan 24
+"""
+from typing import Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from datetime import time, timedelta
+from collections import Counter
+from itertools import count
+
+from fake_discord import FakeDISCORD
+
+import argparse
+import asyncio
+import random
+import json
+import daf
+
+
+__all__ = (
+    "Distribution",
+    "ConstantDistribution",
+    "UniformDistribution",
+    "ParetoDistribution",
+    "LoadPROFILE",
+    "generate_accounts",
+    "summarize",
+    "save_schema",
+    "load_schema",
+)
+
+
+# Constants
+# ---------------------#
+C_PERIOD_KINDS = ("fixed", "randomized", "daily", "days_of_week")
+C_WEEK_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+C_WORDS = ("discord", "server", "nft", "mint", "community", "giveaway", "join", "today", "free", "limited")
+
+
+class Distribution(ABC):
+    """
+    Distribution of a (positive) integer parameter.
+    """
+    @abstractmethod
+    def sample(self, rng: random.Random) -> int:
+        "Returns a random value."
+        pass
+
+
+class ConstantDistribution(Distribution):
+    """
+    Always the same ``value``.
+    """
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def sample(self, rng: random.Random) -> int:
+        return self.value
+
+
+class UniformDistribution(Distribution):
+    """
+    Values in range [``minimum``, ``maximum``] with the same probability.
+    """
+    def __init__(self, minimum: int, maximum: int) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def sample(self, rng: random.Random) -> int:
+        return rng.randint(self.minimum, self.maximum)
+
+
+class ParetoDistribution(Distribution):
+    """
+    Heavy-tailed values in range [``minimum``, ``maximum``], e.g., most accounts are in a few guilds,
+    while some accounts are in many. Smaller ``alpha`` makes large values more common.
+    """
+    def __init__(self, alpha: float, minimum: int, maximum: int) -> None:
+        self.alpha = alpha
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def sample(self, rng: random.Random) -> int:
+        return min(int(self.minimum * rng.paretovariate(self.alpha)), self.maximum)
+
+
+class LoadPROFILE:
+    """
+    Describes a synthetic shilling list.
+
+    Parameters
+    ------------
+    accounts: int
+        Number of accounts.
+    guilds: Distribution
+        Number of guilds of each account.
+    messages: Distribution
+        Number of messages in each guild.
+    channels: Distribution
+        Number of text channels in each guild.
+    message_channels: Distribution
+        Number of channels each message is sent into (at most the guild's channels).
+    period_mix: Dict[str, float]
+        Weights of the period types (``fixed``, ``randomized``, ``daily`` and ``days_of_week``).
+    period_range: Tuple[timedelta, timedelta]
+        Range of the (fixed and randomized) periods' durations.
+    text_length: Distribution
+        Number of words of each message.
+    """
+    def __init__(
+        self,
+        accounts: int = 10,
+        guilds: Distribution = ParetoDistribution(1.5, 3, 200),
+        messages: Distribution = UniformDistribution(1, 3),
+        channels: Distribution = UniformDistribution(1, 8),
+        message_channels: Distribution = UniformDistribution(1, 5),
+        period_mix: Optional[Dict[str, float]] = None,
+        period_range: Tuple[timedelta, timedelta] = (timedelta(minutes=5), timedelta(hours=6)),
+        text_length: Distribution = ParetoDistribution(2, 10, 400),
+    ) -> None:
+        if period_mix is None:
+            period_mix = {"fixed": 0.5, "randomized": 0.3, "daily": 0.15, "days_of_week": 0.05}
+
+        if not set(period_mix).issubset(C_PERIOD_KINDS):
+            raise ValueError(f"Period kinds must be one of {C_PERIOD_KINDS}")
+
+        self.accounts = accounts
+        self.guilds = guilds
+        self.messages = messages
+        self.channels = channels
+        self.message_channels = message_channels
+        self.period_mix = period_mix
+        self.period_range = period_range
+        self.text_length = text_length
+
+    @classmethod
+    def small(cls) -> "LoadPROFILE":
+        "A few accounts with about 10 guilds each."
+        return cls(accounts=3, guilds=UniformDistribution(5, 15))
+
+    @classmethod
+    def large(cls) -> "LoadPROFILE":
+        "Thousands of accounts, tens of thousands of guilds and hundreds of thousands of channel-message pairs."
+        return cls(accounts=2000, guilds=ParetoDistribution(1.5, 5, 500), messages=UniformDistribution(1, 4))
+
+
+def _make_period(profile: LoadPROFILE, rng: random.Random) -> daf.message.messageperiod.BaseMessagePeriod:
+    kind = rng.choices(list(profile.period_mix), weights=list(profile.period_mix.values()))[0]
+    minimum, maximum = (int(limit.total_seconds()) for limit in profile.period_range)
+    duration = timedelta(seconds=rng.randint(minimum, maximum))
+    send_time = time(rng.randrange(24), rng.randrange(60))
+    # Spread the first sends over the first period, instead of sending everything at once
+    start = timedelta(seconds=rng.randint(0, int(duration.total_seconds())))
+    if kind == "fixed":
+        return daf.FixedDurationPeriod(duration, start)
+
+    if kind == "randomized":
+        max_duration = timedelta(seconds=int(duration.total_seconds() * rng.uniform(1.2, 2)))
+        return daf.RandomizedDurationPeriod(duration, max_duration, start)
+
+    if kind == "daily":
+        return daf.DailyPeriod(send_time)
+
+    return daf.DaysOfWeekPeriod(rng.sample(C_WEEK_DAYS, rng.randint(1, 3)), send_time)
+
+
+def generate_accounts(
+    profile: LoadPROFILE,
+    server: Optional[FakeDISCORD] = None,
+    seed: Optional[int] = None
+) -> List[daf.ACCOUNT]:
+    """
+    Generates a shilling list.
+
+    Parameters
+    ------------
+    profile: LoadPROFILE
+        Description of the shilling list.
+    server: Optional[FakeDISCORD]
+        The (not yet started) fake server in which the guilds and channels are created.
+        Each guild only has the account it belongs to as a member.
+        If None, the IDs are synthetic.
+    seed: Optional[int]
+        Seed of the random generator. The same seed generates the same shilling list.
+
+    Returns
+    ---------
+    List[daf.ACCOUNT]
+        The accounts (not yet added to the framework).
+    """
+    rng = random.Random(seed)
+    ids = count(10 ** 17)
+    accounts = []
+    for account_index in range(profile.accounts):
+        token = f"load-{account_index}"
+        guilds = []
+        for _ in range(profile.guilds.sample(rng)):
+            channel_num = max(profile.channels.sample(rng), 1)
+            if server is not None:
+                guild_data = server.add_guild(channel_num, [token])
+                guild_id = int(guild_data["id"])
+                channel_ids = [int(channel["id"]) for channel in guild_data["channels"]]
+            else:
+                guild_id = next(ids)
+                channel_ids = [next(ids) for _ in range(channel_num)]
+
+            messages = [
+                daf.TextMESSAGE(
+                    period=_make_period(profile, rng),
+                    data=daf.TextMessageData(" ".join(rng.choices(C_WORDS, k=profile.text_length.sample(rng)))),
+                    channels=rng.sample(channel_ids, min(profile.message_channels.sample(rng), len(channel_ids)))
+                )
+                for _ in range(profile.messages.sample(rng))
+            ]
+            guilds.append(daf.GUILD(guild_id, messages))
+
+        accounts.append(daf.ACCOUNT(token, servers=guilds))
+
+    return accounts
+
+
+def summarize(accounts: List[daf.ACCOUNT]) -> dict:
+    """
+    Returns the size of a shilling list.
+
+    Returns
+    ---------
+    dict
+        .. code-block:: python
+
+            {
+                "accounts": int,
+                "guilds": int,
+                "messages": int,
+                "channel_messages": int,  # Sum of channels of all the messages
+                "periods": {period type: int}
+            }
+    """
+    guilds = [guild for account in accounts for guild in account.servers]
+    messages = [message for guild in guilds for message in guild.messages]
+    return {
+        "accounts": len(accounts),
+        "guilds": len(guilds),
+        "messages": len(messages),
+        "channel_messages": sum(len(message.channels) for message in messages),
+        "periods": dict(Counter(type(message.period).__name__ for message in messages)),
+    }
+
+
+def save_schema(accounts: List[daf.ACCOUNT], path: str):
+    """
+    Saves the accounts into a schema file, which can be loaded by the GUI or :func:`load_schema`.
+    """
+    from tkclasswiz.convert import convert_to_dict, convert_to_object_info
+
+    with open(path, "w", encoding="utf-8") as writer:
+        json.dump({"accounts": convert_to_dict(convert_to_object_info(accounts))}, writer)
+
+
+def load_schema(path: str) -> List[daf.ACCOUNT]:
+    """
+    Loads the accounts from a schema file (saved by :func:`save_schema` or the GUI).
+    """
+    from tkclasswiz.convert import convert_from_dict, convert_to_objects
+
+    with open(path, "r", encoding="utf-8") as reader:
+        return convert_to_objects(convert_from_dict(json.load(reader)["accounts"]))
+
+
+async def _run(accounts: List[daf.ACCOUNT], server: FakeDISCORD, duration: float):
+    async with server:
+        await daf.initialize(debug=daf.TraceLEVELS.WARNING, save_to_file=False)
+        for account in accounts:
+            await daf.add_object(account)
+
+        await asyncio.sleep(duration)
+        await daf.shutdown()
+
+    print(f"Requests: {sum(server.requests.values())}, sent messages: {len(server.messages)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic shilling list.")
+    parser.add_argument("--preset", choices=("small", "large"), default="small")
+    parser.add_argument("--accounts", type=int, help="Overrides the preset's number of accounts.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--schema", help="Path of the schema file to save.")
+    parser.add_argument("--run", type=float, metavar="SECONDS", help="Run the framework against the fake server.")
+    parser.add_argument("--plan", type=float, metavar="HOURS", help="Print the capacity plan (without the accounts).")
+    args = parser.parse_args()
+
+    profile = getattr(LoadPROFILE, args.preset)()
+    if args.accounts is not None:
+        profile.accounts = args.accounts
+
+    server = FakeDISCORD(guilds=0) if args.run is not None else None
+    accounts = generate_accounts(profile, server, args.seed)
+    print(json.dumps(summarize(accounts), indent=2))
+    if args.schema is not None:
+        save_schema(accounts, args.schema)
+
+    if args.plan is not None:
+        plan = daf.plan_capacity(accounts, timedelta(hours=args.plan))
+        del plan["accounts"]
+        print(json.dumps(plan, indent=2))
+
+    if args.run is not None:
+        asyncio.run(_run(accounts, server, args.run))
+
+
+if __name__ == "__main__":
+    main()
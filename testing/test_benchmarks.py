@@ -0,0 +1,211 @@
+"""
+Offline benchmarks of serialization, message periods, text matching, message data and logging.
+Run with ``--bench`` to measure them and compare them to the baseline (see fixtures/benchmark.py).
+"""
+from datetime import datetime, timedelta
+from itertools import count
+from array import array
+from copy import deepcopy
+
+from daf.guild.autoguild import MessageDuplicator
+from daf.logging import logger_columns
+from daf.logging.sql import mgr
+from daf.logic import contains, regex, and_, or_
+from load_generator import LoadPROFILE, generate_accounts, summarize
+
+import asyncio
+import pytest
+import daf
+
+
+GUILD_NUM = 1000
+WORDS = ["discord", "advertisement", "framework", "nft", "shilling", "guild", "channel", "message", "**bold**"]
+LARGE_TEXT = " ".join(WORDS[i % len(WORDS)] + str(i % 97) for i in range(20_000))
+COLUMN_ROWS = 1_000_000
+SQL_LOGS = 100
+
+
+def run(coro):
+    "Runs a coroutine that doesn't suspend, without the overhead of an event loop."
+    try:
+        coro.send(None)
+    except StopIteration as exc:
+        return exc.value
+
+    raise RuntimeError("Coroutine suspended")
+
+
+def make_message(index: int) -> daf.TextMESSAGE:
+    return daf.TextMESSAGE(
+        period=daf.FixedDurationPeriod(timedelta(minutes=5)),
+        data=daf.TextMessageData(f"Message {index}", daf.discord.Embed(title=f"Embed {index}", description="Text")),
+        channels=[index * 10 + 1, index * 10 + 2]
+    )
+
+
+@pytest.fixture(scope="module")
+def account() -> daf.ACCOUNT:
+    return daf.ACCOUNT(
+        token="token",
+        servers=[daf.GUILD(i + 1, messages=[make_message(i)]) for i in range(GUILD_NUM)]
+    )
+
+
+def test_bench_convert_to_semi_dict(benchmark, account: daf.ACCOUNT):
+    result = benchmark(daf.convert_object_to_semi_dict, account)
+    assert len(result["data"]["_servers"]) == GUILD_NUM
+
+
+def test_bench_convert_generated(benchmark):
+    "Serialization of a generated shilling list with mixed periods and message sizes."
+    accounts = generate_accounts(LoadPROFILE(accounts=20), seed=0)
+    result = benchmark(daf.convert_object_to_semi_dict, accounts)
+    assert len(result) == summarize(accounts)["accounts"]
+
+
+def test_bench_convert_from_semi_dict(benchmark, account: daf.ACCOUNT):
+    mapping = daf.convert_object_to_semi_dict(account)
+    result = benchmark(daf.convert_from_semi_dict, mapping)
+    assert len(result.servers) == GUILD_NUM
+
+
+@pytest.mark.parametrize(
+    "period",
+    [
+        daf.FixedDurationPeriod(timedelta(minutes=1)),
+        daf.RandomizedDurationPeriod(timedelta(minutes=1), timedelta(minutes=2)),
+        daf.DailyPeriod(datetime.now().time()),
+        daf.DaysOfWeekPeriod(["Mon", "Fri"], datetime.now().time()),
+        daf.NamedDayOfMonthPeriod(datetime.now().time(), "Wed", 2),
+    ],
+    ids=lambda period: type(period).__name__
+)
+def test_bench_period_calculate(benchmark, period: daf.message.messageperiod.BaseMessagePeriod):
+    "Next send time after a gap of 30 days (e.g., the framework was not running)"
+    def setup():
+        period.next_send_time = datetime.now().astimezone() - timedelta(days=30)
+
+    result = benchmark(period.calculate, setup=setup)
+    assert result > datetime.now().astimezone() - timedelta(minutes=1)
+
+
+@pytest.mark.parametrize(
+    "logic",
+    [
+        contains("discord framework"),
+        contains("discord", case_sensitive=True),
+        regex(r"shilling\d+ missing"),
+        regex(r"missing\d+", full_match=True),
+        or_(contains("missing"), and_(contains("nft"), regex(r"bold\d+"))),
+    ],
+    ids=["contains", "contains_case", "regex", "regex_full", "nested"]
+)
+def test_bench_logic_check(benchmark, logic):
+    "Matching of a text with about 20 000 words"
+    benchmark(logic.check, LARGE_TEXT)
+
+
+def test_bench_message_duplicate(benchmark):
+    "Copying of a message by AutoGUILD for each of its guilds"
+    duplicator = MessageDuplicator(make_message(0))
+    copy = benchmark(duplicator.duplicate)
+    assert copy is not duplicator.message and copy.channels == duplicator.message.channels
+
+
+def test_bench_deepcopy_account(benchmark, account: daf.ACCOUNT):
+    copy = benchmark(deepcopy, account.servers[:100])
+    assert len(copy) == 100
+
+
+def test_bench_text_message_data(benchmark):
+    data = daf.TextMessageData(
+        "Hello World " * 100,
+        daf.discord.Embed(title="Title", description="Description " * 50, fields=[]),
+        [daf.FILE(f"file{i}.txt", b"data" * 1000) for i in range(3)]
+    )
+    result = benchmark(lambda: run(data.to_dict()))
+    assert result["content"] == data.content
+
+
+@pytest.fixture(scope="module")
+def columns_path(tmp_path_factory: pytest.TempPathFactory) -> str:
+    "Day of the columnar log store, with COLUMN_ROWS messages of 100 guilds and 3 authors"
+    day_path = tmp_path_factory.mktemp("columns")
+    path = day_path.joinpath(logger_columns.C_COLUMNS_DIR)
+    path.mkdir()
+    start = logger_columns.to_seconds(datetime(2024, 1, 1))
+    columns = {
+        "timestamp": array("q", range(start, start + COLUMN_ROWS)),
+        "guild": array("q", [i % 100 for i in range(COLUMN_ROWS)]),
+        "author": array("q", [i % 3 for i in range(COLUMN_ROWS)]),
+        "guild_type": array("b", [0]) * COLUMN_ROWS,
+        "message_type": array("b", [0]) * COLUMN_ROWS,
+        "success_rate": array("f", [100, 50]) * (COLUMN_ROWS // 2),
+    }
+    for name, column in columns.items():
+        with open(path.joinpath(name), "wb") as file:
+            column.tofile(file)
+
+    return str(day_path)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True], ids=["python", "numpy"])
+def test_bench_count_messages(benchmark, columns_path: str, use_numpy: bool, monkeypatch):
+    "Reading and counting the messages of the columnar log store"
+    if use_numpy and not logger_columns.NUMPY_INSTALLED:
+        pytest.skip("NumPy is not installed")
+
+    monkeypatch.setattr(logger_columns, "NUMPY_INSTALLED", use_numpy)
+
+    def count_rows():
+        columns = logger_columns.read_columns(columns_path)
+        return logger_columns.count_messages(columns, datetime.min, datetime.max, guild_type="GUILD")
+
+    counts = benchmark(count_rows)
+    assert len(counts) == 300
+    assert sum(successful + failed for successful, failed in counts.values()) == COLUMN_ROWS
+
+
+async def save_sql_logs(database: str) -> int:
+    "Saves SQL_LOGS logs with concurrent analytics queries and returns the number of queries made"
+    logger = daf.LoggerSQL(database=database, fallback=None)
+    await logger.initialize()
+    try:
+        saving = True
+
+        async def query():
+            queries = 0
+            while saving:
+                await logger.analytic_get_num_messages()
+                queries += 1
+
+            return queries
+
+        query_task = asyncio.create_task(query())
+        for i in range(SQL_LOGS):
+            await logger._save_log(
+                {"name": "Guild", "id": i % 50, "type": "GUILD"},
+                {
+                    "sent_data": {"text": "Hello World"},
+                    "type": "TextMESSAGE",
+                    "mode": "send",
+                    "channels": {"successful": [{"name": "ok", "id": 11}], "failed": []},
+                },
+                {"name": "Author", "id": 5678}
+            )
+
+        saving = False
+        queries = await query_task
+        assert len(await logger.analytic_get_message_log(limit=None)) == SQL_LOGS
+        return queries
+    finally:
+        await logger._stop_engine()
+
+
+@pytest.mark.parametrize("tuned", [True, False], ids=["tuned", "default"])
+def test_bench_sql_save_logs(benchmark, tmp_path, tuned: bool, monkeypatch):
+    "Saving logs into SQLite (with concurrent analytics queries) with the tuned and the default profile"
+    monkeypatch.setattr(mgr, "SQL_SQLITE_TUNED", tuned)
+    databases = count()
+    queries = benchmark(lambda: asyncio.run(save_sql_logs(str(tmp_path.joinpath(f"logs_{next(databases)}")))))
+    assert queries > 0
@@ -0,0 +1,116 @@
+"""
+Tests of the (virtual) scheduling clock.
+"""
+from datetime import datetime, time, timedelta
+
+from daf.misc import async_util, clock
+
+import subprocess
+import asyncio
+import json
+import sys
+import os
+import daf
+
+
+SIMULATED_DAYS = 3
+MAX_DRIFT = timedelta(seconds=1)
+MAX_REAL_TIME = 10
+
+
+def test_virtual_clock_periods():
+    "Tests the periods' send times over simulated days"
+    async def simulate(period: daf.message.messageperiod.BaseMessagePeriod, end: datetime):
+        times = []
+        while period.get() < end:
+            await async_util.call_at(lambda: None, period.get())
+            times.append(clock.get_clock().now())
+            period.calculate()
+
+        return times
+
+    async def main():
+        return await asyncio.gather(*(simulate(period, end) for period in periods.values()))
+
+    loop = clock.VirtualClockEventLoop(clock.VirtualCLOCK(datetime(2024, 1, 1, 9, 0)))
+    assert clock.get_clock() is loop.clock
+    start = loop.clock.now()
+    end = start + timedelta(days=SIMULATED_DAYS)
+    periods = {
+        "fixed": daf.FixedDurationPeriod(timedelta(minutes=30)),
+        "daily": daf.DailyPeriod(time(12, 0)),
+        "days_of_week": daf.DaysOfWeekPeriod(["Mon", "Wed"], time(18, 30)),
+    }
+    real_start = datetime.now()
+    try:
+        results = loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+    assert (datetime.now() - real_start).total_seconds() < MAX_REAL_TIME
+    assert isinstance(clock.get_clock(), clock.SystemCLOCK)
+    fixed, daily, days_of_week = results
+    assert len(fixed) == SIMULATED_DAYS * 48
+    for i, sent in enumerate(fixed):
+        assert abs(sent - (start + i * timedelta(minutes=30))) < MAX_DRIFT
+
+    assert [(sent.day, sent.hour) for sent in daily] == [(1, 12), (2, 12), (3, 12)]
+    sends = [(sent.strftime("%a"), sent.hour, sent.minute) for sent in days_of_week]
+    assert sends == [("Mon", 18, 30), ("Wed", 18, 30)]
+
+
+def simulate_sending(hours: int) -> dict:
+    "Runs the framework against the fake server on virtual time and returns the times messages were sent at."
+    from fake_discord import FakeDISCORD
+
+    async def main():
+        async with FakeDISCORD(guilds=0) as server:
+            guild = server.add_guild(2, ["token"])
+            channels = [int(channel["id"]) for channel in guild["channels"]]
+            messages = [
+                daf.TextMESSAGE(
+                    period=daf.FixedDurationPeriod(timedelta(minutes=minutes)),
+                    data=daf.TextMessageData(f"Every {minutes} minutes"),
+                    channels=channels[i:i + 1]
+                )
+                for i, minutes in enumerate((10, 25))
+            ]
+            account = daf.ACCOUNT("token", servers=[daf.GUILD(int(guild["id"]), messages)])
+            await daf.initialize(accounts=[account], debug=daf.TraceLEVELS.ERROR, save_to_file=False)
+            await asyncio.sleep(hours * 3600)
+            await daf.shutdown()
+            return {
+                "start": loop.clock._start.isoformat(),
+                "messages": [(message["content"], message["timestamp"]) for message in server.messages.values()]
+            }
+
+    loop = clock.VirtualClockEventLoop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+def test_virtual_clock_sending():
+    "Tests the send order and drift of the framework running on virtual time"
+    # In a new process, as the framework is already running in the tests' event loop
+    real_start = datetime.now()
+    result = subprocess.run(
+        [sys.executable, __file__],
+        capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    )
+    assert result.returncode == 0, result.stderr
+    assert (datetime.now() - real_start).total_seconds() < MAX_REAL_TIME * 2
+    result = json.loads(result.stdout.splitlines()[-1])
+    start = datetime.fromisoformat(result["start"])
+    for content, minutes in (("Every 10 minutes", 10), ("Every 25 minutes", 25)):
+        times = [datetime.fromisoformat(timestamp) for text, timestamp in result["messages"] if text == content]
+        assert len(times) == SIMULATED_DAYS * 24 * 60 // minutes + 1
+        for i, sent in enumerate(times):
+            drift = sent - (start + i * timedelta(minutes=minutes))
+            assert timedelta(0) <= drift < MAX_DRIFT * 5  # Includes the login
+
+
+if __name__ == "__main__":
+    print(json.dumps(simulate_sending(SIMULATED_DAYS * 24)))
@@ -0,0 +1,86 @@
+"""
+Tests of the in-memory live counters.
+"""
+from datetime import timedelta
+
+from daf.events import EventID
+from fake_discord import FakeDISCORD
+
+import asyncio
+import daf
+
+
+PERIOD = daf.FixedDurationPeriod(timedelta(seconds=5))
+NO_COUNTS = {"sends": 0, "failed": 0, "rate_limited": 0, "invites": 0}
+
+
+async def test_counters(remote_client):
+    "Tests the in-memory live counters (also through the remote API)"
+    account = daf.ACCOUNT("counters")
+    guild = daf.GUILD(1234)
+    message = daf.TextMESSAGE(data=daf.TextMessageData("Hello World"), channels=[11, 12], period=PERIOD)
+    direct_message = daf.DirectMESSAGE(data=daf.TextMessageData("Hello World"), period=PERIOD)
+    for obj in (account, guild, message, direct_message):
+        obj._update_tracked_id()
+
+    assert daf.logging.get_counters(guild)["totals"] == NO_COUNTS
+
+    context = {
+        "channels": {
+            "successful": [{"name": "ok", "id": 11}],
+            "failed": [
+                {"name": "limited", "id": 12, "reason": "429 Too Many Requests (error code: 0): Not retried."},
+                {"name": "forbidden", "id": 13, "reason": "403 Forbidden (error code: 50013): Missing Permissions"}
+            ]
+        }
+    }
+    daf.logging.counters.count_message(account, guild, message, context)
+    daf.logging.counters.count_message(account, guild, message, context, rate_limits=3)
+    daf.logging.counters.count_message(
+        account, guild, direct_message, {"success_info": {"success": False, "reason": "429 Too Many Requests"}}
+    )
+    daf.logging.counters.count_invite(account, guild)
+
+    counters = daf.logging.get_counters(message)
+    assert counters["totals"] == {"sends": 2, "failed": 4, "rate_limited": 5, "invites": 0}
+    assert counters["series"]["sends"][-1] == 2 and sum(counters["series"]["sends"]) == 2
+    assert len(counters["series"]["sends"]) == daf.logging.counters.C_COUNTER_MINUTES
+    assert daf.logging.get_counters(direct_message)["totals"] == {**NO_COUNTS, "failed": 1, "rate_limited": 1}
+    assert daf.logging.get_counters(account)["totals"] == {"sends": 2, "failed": 5, "rate_limited": 6, "invites": 1}
+
+    # Minutes older than an hour are overwritten
+    ring = daf.logging.counters.GLOBALS.counters[guild._daf_id]
+    minute = daf.logging.counters._get_minute()
+    ring.add(minute + daf.logging.counters.C_COUNTER_MINUTES, {"sends": 1})
+    assert ring.get(minute + daf.logging.counters.C_COUNTER_MINUTES)["totals"]["sends"] == 1
+
+    remote_counters = await remote_client.get_counters(daf.misc.instance_track.ObjectReference.from_object(account))
+    assert remote_counters == daf.logging.get_counters(account)
+
+
+async def test_counters_rate_limits():
+    "Tests that the rate limits retried by the HTTP client are counted"
+    async with FakeDISCORD(channels=3, rate_limit_every=2, retry_after=0.05) as server:
+        guild_data = server.guilds[0]
+        message = daf.TextMESSAGE(
+            data=daf.TextMessageData("Hello World"),
+            channels=[int(channel["id"]) for channel in guild_data["channels"]],
+            period=daf.FixedDurationPeriod(timedelta(hours=1), timedelta(hours=1))  # Sent by the test only
+        )
+        guild = daf.GUILD(int(guild_data["id"]), [message], logging=False)
+        account = daf.ACCOUNT("counters-token", servers=[guild])
+        await daf.add_object(account)
+        try:
+            rate_limited = server.rate_limited
+            timer = message._timer_handle
+            # Sent the way the send timer does it, the timer is replaced by the next period's timer
+            await message._event_ctrl.emit(EventID._trigger_message_ready, guild, message)
+            await asyncio.sleep(0)
+            assert timer.cancelled() and not message._timer_handle.done()
+            rate_limited = server.rate_limited - rate_limited
+            assert rate_limited > 0  # Retried by the HTTP client, the sends succeeded
+            totals = daf.logging.get_counters(message)["totals"]
+            assert totals == {**NO_COUNTS, "sends": 3, "rate_limited": rate_limited}
+            assert daf.logging.get_counters(account)["totals"] == totals
+        finally:
+            await daf.remove_object(account)
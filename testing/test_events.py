@@ -83,3 +83,57 @@ async def test_events(CONTROLLERS: Tuple[EventController, EventController], even
     master.remove_listener(event, dummy_listener)
     master.remove_listener(event, dummy_listener2)
     assert handler_called and handler_called2, "Handler was not called"
+
+
+async def test_listener_profiling(CONTROLLERS: Tuple[EventController, EventController]):
+    "Tests the per-listener profiling statistics"
+    master, _ = CONTROLLERS
+
+    def sync_listener(value: int):
+        pass
+
+    async def async_listener(value: int):
+        await asyncio.sleep(0.01)
+
+    def rejected_listener(value: int):
+        raise AssertionError("The predicate should have rejected the call")
+
+    master.add_listener("profiled_event", sync_listener)
+    master.add_listener("profiled_event", async_listener)
+    master.add_listener("profiled_event", rejected_listener, lambda value: value < 0)
+
+    await master.emit("profiled_event", 1)  # Not recorded, profiling is disabled
+    assert get_listener_profile()["listeners"] == []
+
+    set_listener_profiling(True, reset=True)
+    try:
+        for i in range(10):
+            await master.emit("profiled_event", i)
+    finally:
+        set_listener_profiling(False)
+
+    await master.emit("profiled_event", 1)
+    profile = get_listener_profile()
+    assert not profile["enabled"]
+    profiled = [listener for listener in profile["listeners"] if listener["event"] == "profiled_event"]
+    listeners = {listener["listener"].split(".")[-1]: listener for listener in profiled}
+    assert listeners["sync_listener"]["calls"] == 10
+    assert listeners["async_listener"]["calls"] == 10
+    assert listeners["async_listener"]["p50"] >= 0.01
+    assert listeners["async_listener"]["total_time"] >= 0.1
+    assert profiled[0] is listeners["async_listener"]  # Sorted by total time
+    assert listeners["rejected_listener"]["calls"] == 0
+    assert listeners["rejected_listener"]["rejections"] == 10
+    assert listeners["rejected_listener"]["rejection_rate"] == 1
+    assert [event for event in profile["events"] if event["event"] == "profiled_event"] == [
+        {
+            "event": "profiled_event",
+            "calls": 20,
+            "predicate_calls": 10,
+            "rejections": 10,
+            "total_time": sum(listener["total_time"] for listener in profiled)
+        }
+    ]
+
+    reset_listener_profile()
+    assert get_listener_profile()["listeners"] == []
@@ -0,0 +1,58 @@
+"""
+Tests running an account end-to-end against the offline fake of the Discord API.
+"""
+from datetime import timedelta
+
+from daf.events import EventID
+from fake_discord import FakeDISCORD
+
+import asyncio
+import daf
+
+
+async def test_fake_discord_send():
+    "Tests login, sending, editing and rate limit retries against the fake server"
+    async with FakeDISCORD(channels=3, latency=(0.005, 0.01), rate_limit_every=2, retry_after=0.05) as server:
+        account = daf.ACCOUNT("fake-token")
+        await daf.add_object(account)
+        try:
+            client = account.client
+            assert client.user.name.startswith("fake-bot")
+            guild_data = server.guilds[0]
+            assert client.get_guild(int(guild_data["id"])) is not None
+
+            guild = daf.GUILD(int(guild_data["id"]))
+            await account.add_server(guild)
+            guild._event_ctrl.remove_listener(EventID._trigger_message_ready, guild._advertise)
+            channel_ids = [int(channel["id"]) for channel in guild_data["channels"]]
+            message = daf.TextMESSAGE(
+                period=daf.FixedDurationPeriod(timedelta(seconds=5)),
+                data=daf.TextMessageData("Hello World"),
+                channels=list(channel_ids),
+                mode="edit"
+            )
+            await guild.add_message(message)
+
+            context = await message._send()
+            assert len(context["channels"]["successful"]) == len(channel_ids)
+            assert not context["channels"]["failed"]
+            assert server.rate_limited == 2  # Every second request was rate limited and retried
+            assert server.requests[("POST", "/channels/{channel_id}/messages")] == len(channel_ids) + 2
+            assert sorted(int(m["channel_id"]) for m in server.messages.values()) == sorted(channel_ids)
+            assert all(m["content"] == "Hello World" for m in server.messages.values())
+
+            # MESSAGE_CREATE events were received through the gateway
+            for _ in range(50):
+                if len(client.cached_messages) == len(channel_ids):
+                    break
+
+                await asyncio.sleep(0.1)
+
+            assert {m.id for m in client.cached_messages} == set(server.messages)
+
+            context = await message._send()  # Edit
+            assert len(context["channels"]["successful"]) == len(channel_ids)
+            assert len(server.messages) == len(channel_ids)
+            assert all(m["edited_timestamp"] is not None for m in server.messages.values())
+        finally:
+            await daf.remove_object(account)
@@ -0,0 +1,63 @@
+"""
+Tests of the synthetic shilling list generator.
+"""
+from datetime import timedelta
+
+from fake_discord import FakeDISCORD
+from load_generator import *
+
+import asyncio
+import daf
+
+
+async def test_generate_accounts(tmp_path):
+    "Tests the size and reproducibility of the generated shilling lists and their schema"
+    profile = LoadPROFILE(
+        accounts=4,
+        guilds=ConstantDistribution(5),
+        messages=ConstantDistribution(2),
+        channels=ConstantDistribution(3),
+        message_channels=ConstantDistribution(10),  # More than the guild's channels
+        period_mix={"fixed": 1, "daily": 1}
+    )
+    accounts = generate_accounts(profile, seed=1)
+    summary = summarize(accounts)
+    assert summary["accounts"] == 4 and summary["guilds"] == 20 and summary["messages"] == 40
+    assert summary["channel_messages"] == 120
+    assert set(summary["periods"]) == {"FixedDurationPeriod", "DailyPeriod"}
+
+    default = LoadPROFILE()
+    assert summarize(generate_accounts(default, seed=2)) == summarize(generate_accounts(default, seed=2))
+    for guild in (guild for account in generate_accounts(default, seed=2) for guild in account.servers):
+        assert 1 <= len(guild.messages) <= 3
+
+    path = str(tmp_path / "schema.json")
+    save_schema(accounts, path)
+    assert summarize(load_schema(path)) == summary
+
+
+async def test_generated_load():
+    "Tests sending of a generated shilling list through the fake server"
+    profile = LoadPROFILE(
+        accounts=2,
+        guilds=ConstantDistribution(2),
+        messages=ConstantDistribution(1),
+        channels=ConstantDistribution(2),
+        message_channels=ConstantDistribution(2),
+        period_mix={"fixed": 1},
+        period_range=(timedelta(seconds=1), timedelta(seconds=2))
+    )
+    async with FakeDISCORD(guilds=0) as server:
+        accounts = generate_accounts(profile, server, seed=3)
+        for account in accounts:
+            await daf.add_object(account)
+
+        try:
+            for account in accounts:  # Each account is only in its guilds
+                assert {guild.id for guild in account.client.guilds} == {guild.snowflake for guild in account.servers}
+
+            await asyncio.sleep(3)
+            assert len(server.messages) >= 8  # 4 messages, 2 channels each
+        finally:
+            for account in accounts:
+                await daf.remove_object(account)
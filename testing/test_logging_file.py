@@ -0,0 +1,262 @@
+"""
+Offline tests of the file loggers (logs are generated from manual contexts).
+"""
+from datetime import datetime, timedelta
+
+from daf_gui.connector import RemoteConnectionCLIENT
+from aiohttp import ClientSession
+
+import pathlib
+import shutil
+import json
+import os
+import pytest
+import daf
+
+from daf.logging import logger_columns
+
+
+GUILD_CONTEXT = {"name": "File Guild", "id": 1234, "type": "GUILD"}
+AUTHOR_CONTEXT = {"name": "File Author", "id": 5678}
+MESSAGE_CONTEXT = {
+    "sent_data": {"text": "Hello World"},
+    "type": "TextMESSAGE",
+    "mode": "send",
+    "channels": {"successful": [{"name": "ok", "id": 11}], "failed": []},
+}
+LOGS_PER_DAY = 5
+DAYS = 3
+
+
+async def create_logs(logger: daf.logging.logger_file.LoggerFileBASE):
+    """
+    Creates LOGS_PER_DAY logs for today and copies them to previous DAYS - 1 days.
+    """
+    for _ in range(LOGS_PER_DAY):
+        await logger._save_log(GUILD_CONTEXT, MESSAGE_CONTEXT.copy(), AUTHOR_CONTEXT.copy())
+
+    today = datetime.now()
+    root = pathlib.Path(logger.path)
+    today_dir = root.joinpath(f"{today.year:02d}/{today.month:02d}/{today.day:02d}")
+    for days in range(1, DAYS):
+        day = today - timedelta(days=days)
+        day_dir = root.joinpath(f"{day.year:02d}/{day.month:02d}/{day.day:02d}")
+        shutil.copytree(today_dir, day_dir)
+        for file in day_dir.glob(f"*{logger.EXTENSION}"):
+            content = file.read_text(encoding="utf-8")
+            content = content.replace(
+                f"{today.day:02d}.{today.month:02d}.{today.year:04d}", f"{day.day:02d}.{day.month:02d}.{day.year:04d}"
+            )
+            file.write_text(content, encoding="utf-8")
+
+    # Manifest and columns of the copied folders describe today's logs
+    await logger.rebuild_manifest()
+
+
+@pytest.fixture(scope="module", params=[daf.LoggerJSON, daf.LoggerCSV])
+async def file_logger(request, tmp_path_factory):
+    logger = request.param(str(tmp_path_factory.mktemp("history")))
+    await logger.initialize()
+    await create_logs(logger)
+    return logger
+
+
+async def collect(logger: daf.logging.LoggerBASE, **kwargs):
+    chunks = []
+    async for chunk in logger.analytic_iter_message_log(**kwargs):
+        chunks.append(chunk)
+
+    return chunks
+
+
+async def test_logging_file_iter(file_logger: daf.logging.logger_file.LoggerFileBASE):
+    "Tests keyset-paginated iteration over file logs"
+    all_logs = await file_logger.analytic_get_message_log(limit=None)
+    assert len(all_logs) == LOGS_PER_DAY * DAYS
+
+    for direction in ("desc", "asc"):
+        expected = sorted(all_logs, key=file_logger.get_log_cursor, reverse=direction == "desc")
+        chunks = await collect(file_logger, sort_by_direction=direction, chunk_size=4)
+        assert [len(c) for c in chunks] == [4, 4, 4, 3]
+        logs = [log for chunk in chunks for log in chunk]
+        cursors = [file_logger.get_log_cursor(log) for log in logs]
+        assert cursors == [file_logger.get_log_cursor(log) for log in expected]
+
+        # Resume from cursor
+        cursor = file_logger.get_log_cursor(chunks[0][-1])
+        resumed = await collect(file_logger, sort_by_direction=direction, chunk_size=100, cursor=cursor)
+        assert resumed[0] == logs[4:]
+
+    # Day pruning
+    yesterday = datetime.now() - timedelta(days=1)
+    chunks = await collect(
+        file_logger,
+        after=yesterday.replace(hour=0, minute=0, second=0),
+        before=yesterday.replace(hour=23, minute=59, second=59)
+    )
+    assert len(chunks) == 1 and len(chunks[0]) == LOGS_PER_DAY
+    assert all(log["timestamp"].date() == yesterday.date() for log in chunks[0])
+
+
+async def test_logging_file_stream_remote(file_logger: daf.logging.logger_file.LoggerFileBASE):
+    "Tests streaming of logs through the remote API"
+    old_logger = daf.logging.get_logger()
+    daf.logging._logging._set_logger(file_logger)
+    client = RemoteConnectionCLIENT("http://127.0.0.1", 8080, "Hello", "World")
+    # Only the HTTP session is needed (initialize would also take over the global event controller)
+    client.session = ClientSession(f"{client.host}:{client.port}", auth=client.auth)
+    try:
+        chunks = [chunk async for chunk in client.iter_logs("message", chunk_size=4, sort_by_direction="asc")]
+        assert chunks == await collect(file_logger, chunk_size=4, sort_by_direction="asc")
+    finally:
+        await client.session.close()
+        daf.logging._logging._set_logger(old_logger)
+
+
+async def test_logging_file_manifest(file_logger: daf.logging.logger_file.LoggerFileBASE, monkeypatch):
+    "Tests the day manifest and skipping of files with it"
+    today = datetime.now()
+    day_dir = pathlib.Path(file_logger.path, f"{today.year:02d}/{today.month:02d}/{today.day:02d}")
+    manifest = file_logger._read_manifest(day_dir)
+    assert len(manifest) == 1
+    entry, = manifest.values()
+    assert entry["guild_id"] == GUILD_CONTEXT["id"]
+    assert entry["guild_type"] == GUILD_CONTEXT["type"]
+    assert entry["authors"] == [AUTHOR_CONTEXT["id"]]
+    assert entry["message_types"] == [MESSAGE_CONTEXT["type"]]
+    assert entry["count"] == LOGS_PER_DAY
+
+    # Rebuilt manifest is the same as the one maintained on write
+    manifest_path = day_dir.joinpath(daf.logging.logger_file.C_MANIFEST_NAME)
+    os.remove(manifest_path)
+    await file_logger.rebuild_manifest()
+    assert file_logger._read_manifest(day_dir) == manifest
+
+    opened = []
+    process_file = file_logger._get_msg_log_process_file
+
+    def process_file_spy(*args):
+        opened.append(args[-1])
+        return process_file(*args)
+
+    monkeypatch.setattr(file_logger, "_get_msg_log_process_file", process_file_spy)
+    assert len(await file_logger.analytic_get_message_log(limit=None)) == LOGS_PER_DAY * DAYS
+    assert len(opened) == DAYS
+
+    for filters in (
+        {"guild": GUILD_CONTEXT["id"] + 1},
+        {"author": AUTHOR_CONTEXT["id"] + 1},
+        {"guild_type": "USER"},
+        {"message_type": "DirectMESSAGE"},
+        {"after": today + timedelta(hours=1)},
+    ):
+        opened.clear()
+        assert await file_logger.analytic_get_message_log(**filters) == []
+        assert opened == [], filters
+
+    # Outdated manifest entry (file modified outside of DAF) -> file is not skipped
+    entry["size"] += 1
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    opened.clear()
+    await file_logger.analytic_get_message_log(author=AUTHOR_CONTEXT["id"] + 1)
+    assert len(opened) == 1
+    await file_logger.rebuild_manifest()
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+async def test_logging_file_columns(file_logger: daf.logging.logger_file.LoggerFileBASE, monkeypatch, use_numpy: bool):
+    "Tests the columnar store and the message counts calculated from it"
+    if use_numpy and not logger_columns.NUMPY_INSTALLED:
+        pytest.skip("NumPy is not installed")
+
+    monkeypatch.setattr(logger_columns, "NUMPY_INSTALLED", use_numpy)
+    today = datetime.now()
+    day_dir = str(pathlib.Path(file_logger.path, f"{today.year:02d}/{today.month:02d}/{today.day:02d}"))
+    columns = file_logger._read_day_columns(day_dir)
+    assert columns is not None and len(columns["timestamp"]) == LOGS_PER_DAY
+    assert set(columns["guild"]) == {GUILD_CONTEXT["id"]}
+    assert set(columns["success_rate"]) == {100}
+
+    opened = []
+    process_file = file_logger._get_msg_log_process_file
+
+    def process_file_spy(*args):
+        opened.append(args[-1])
+        return process_file(*args)
+
+    monkeypatch.setattr(file_logger, "_get_msg_log_process_file", process_file_spy)
+    days = [today - timedelta(days=d) for d in range(DAYS)]
+    expected = {
+        "day": sorted(f"{day.year:02d}-{day.month:02d}-{day.day:02d}" for day in days),
+        "month": sorted({f"{day.year:02d}-{day.month:02d}" for day in days}),
+        "year": sorted({f"{day.year:02d}" for day in days}),
+    }
+    counts = {}
+    for group_by, groups in expected.items():
+        counts[group_by] = await file_logger.analytic_get_num_messages(group_by=group_by, sort_by_direction="asc")
+        assert sorted(row[0] for row in counts[group_by]) == groups
+        assert sum(row[1] for row in counts[group_by]) == LOGS_PER_DAY * DAYS
+        assert all(
+            row[2:] == [0, GUILD_CONTEXT["id"], GUILD_CONTEXT["name"], AUTHOR_CONTEXT["id"], AUTHOR_CONTEXT["name"]]
+            for row in counts[group_by]
+        )
+
+    assert opened == []  # Counted from the columns only
+    assert await file_logger.analytic_get_num_messages(author=AUTHOR_CONTEXT["id"] + 1) == []
+    assert await file_logger.analytic_get_num_messages(message_type="VoiceMESSAGE") == []
+
+    # Success rate filter skips entire days without reading the logs
+    assert await file_logger.analytic_get_message_log(success_rate=(0, 50)) == []
+    assert opened == []
+
+    # Days without (valid) columns are counted from the log files
+    shutil.rmtree(os.path.join(day_dir, logger_columns.C_COLUMNS_DIR))
+    assert file_logger._read_day_columns(day_dir) is None
+    assert await file_logger.analytic_get_num_messages(group_by="month", sort_by_direction="asc") == counts["month"]
+    assert len(opened) == 1
+
+    await file_logger.rebuild_manifest()
+    assert file_logger._read_day_columns(day_dir) is not None
+
+
+@pytest.mark.parametrize("logger_class", [daf.LoggerJSON, daf.LoggerCSV])
+async def test_logging_file_retention(logger_class, tmp_path):
+    "Tests the retention policy of file loggers (removed files keep their counts)"
+    logger = logger_class(str(tmp_path))
+    await logger.initialize()
+    await create_logs(logger)
+    today = datetime.now()
+    day_dirs = [
+        pathlib.Path(logger.path, f"{day.year:02d}/{day.month:02d}/{day.day:02d}")
+        for day in (today - timedelta(days=d) for d in range(DAYS))
+    ]
+
+    async def count_messages():
+        return sum(row[1] + row[2] for row in await logger.analytic_get_num_messages(group_by="year"))
+
+    # Oldest day is compacted, its files are removed
+    policy = daf.RetentionPolicy(aggregates_only_after=timedelta(days=DAYS - 2))
+    assert await logger.apply_retention(policy) == LOGS_PER_DAY
+    assert not list(day_dirs[-1].glob(f"*{logger.EXTENSION}"))
+    assert len(await logger.analytic_get_message_log(limit=None)) == LOGS_PER_DAY * (DAYS - 1)
+    assert await count_messages() == LOGS_PER_DAY * DAYS
+
+    # Only the newest file of each guild is kept
+    policy = daf.RetentionPolicy(max_logs_per_guild=LOGS_PER_DAY, batch_size=1)
+    assert await logger.apply_retention(policy) == LOGS_PER_DAY * (DAYS - 2)
+    logs = await logger.analytic_get_message_log(limit=None)
+    assert [log["timestamp"].date() for log in logs] == [today.date()] * LOGS_PER_DAY
+    assert await count_messages() == LOGS_PER_DAY * DAYS
+    assert await logger.apply_retention(policy) == 0
+
+    # Days older than max_age are removed entirely
+    await logger.apply_retention(daf.RetentionPolicy(max_age=timedelta(days=DAYS - 2)))
+    assert not day_dirs[-1].exists()
+    assert await count_messages() == LOGS_PER_DAY * (DAYS - 1)
+
+    # The background task is stopped with the logger
+    logger = logger_class(str(tmp_path), retention=policy)
+    await logger.initialize()
+    task = logger._retention_task
+    await logger.shutdown()
+    assert task.done() and logger._retention_task is None
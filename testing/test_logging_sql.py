@@ -0,0 +1,534 @@
+from datetime import datetime, timedelta
+import asyncio
+import json
+import os
+
+import sqlalchemy
+import pytest
+import daf
+
+
+GUILD_CONTEXT = {"name": "Rollup Guild", "id": 1234, "type": "GUILD"}
+AUTHOR_CONTEXT = {"name": "Rollup Author", "id": 5678}
+CHANNEL_OK = {"name": "ok", "id": 11}
+CHANNEL_FAIL = {"name": "fail", "id": 12, "reason": "Forbidden"}
+
+
+def read_payloads(path: str) -> list:
+    "Returns the raw payloads of a spill (quarantine) file"
+    from daf.logging.sql.spill import C_RECORD_HEADER
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    payloads = []
+    offset = 0
+    while offset < len(data):
+        length, _ = C_RECORD_HEADER.unpack_from(data, offset)
+        offset += C_RECORD_HEADER.size
+        payloads.append(data[offset:offset + length])
+        offset += length
+
+    return payloads
+
+
+def make_message_context(successful: list, failed: list):
+    return {
+        "sent_data": {"text": "Hello World"},
+        "type": "TextMESSAGE",
+        "mode": "send",
+        "channels": {"successful": successful, "failed": failed},
+    }
+
+
+@pytest.fixture(scope="module")
+async def sql_logger(tmp_path_factory):
+    path = tmp_path_factory.mktemp("sql")
+    logger = daf.LoggerSQL(database=str(path.joinpath("rollup")))
+    await logger.initialize()
+    yield logger
+    await logger._stop_engine()
+
+
+async def test_logging_sql_rollups(sql_logger: daf.LoggerSQL):
+    "Tests if the rollup tables match counts calculated from raw logs"
+    for succ, fail in [([CHANNEL_OK], []), ([CHANNEL_OK], [CHANNEL_FAIL]), ([], [CHANNEL_FAIL])] * 3:
+        await sql_logger._save_log(
+            GUILD_CONTEXT,
+            make_message_context(succ, fail),
+            AUTHOR_CONTEXT
+        )
+
+    after = datetime.now() - timedelta(days=1)
+    before = datetime.now() + timedelta(days=1)
+
+    async def get_counts(group_by: str):
+        return [
+            tuple(row[1:]) for row in
+            await sql_logger.analytic_get_num_messages(after=after, before=before, group_by=group_by)
+        ]
+
+    raw = await get_counts("day")
+    assert raw == [(6, 3, GUILD_CONTEXT["id"], GUILD_CONTEXT["name"], AUTHOR_CONTEXT["id"], AUTHOR_CONTEXT["name"])]
+    assert await get_counts("month") == raw
+    assert await get_counts("year") == raw
+
+    # Rebuilding from raw logs results in the same counts
+    await sql_logger.rebuild_rollups()
+    assert await get_counts("month") == raw
+
+    # Deleting logs updates the rollups
+    logs = await sql_logger.analytic_get_message_log(after=after, before=before, limit=3)
+    await sql_logger.delete_logs(daf.logging.tables.MessageLOG, [log.id for log in logs])
+    assert await get_counts("month") == await get_counts("day")
+
+
+async def test_logging_sql_rows(sql_logger: daf.LoggerSQL):
+    "Tests the lightweight log rows and the log detail"
+    await sql_logger._save_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], [CHANNEL_FAIL]), AUTHOR_CONTEXT)
+    rows = await sql_logger.analytic_get_message_rows(guild=GUILD_CONTEXT["id"], guild_type="GUILD", limit=1)
+    assert len(rows) == 1
+    id_, timestamp, message_type, success_rate, guild_snow, guild_name, author_snow, author_name = rows[0]
+    assert isinstance(timestamp, datetime)
+    assert (message_type, success_rate) == ("TextMESSAGE", 50)
+    assert (guild_snow, guild_name) == (GUILD_CONTEXT["id"], GUILD_CONTEXT["name"])
+    assert (author_snow, author_name) == (AUTHOR_CONTEXT["id"], AUTHOR_CONTEXT["name"])
+
+    assert not await sql_logger.analytic_get_message_rows(author=GUILD_CONTEXT["id"])
+    assert not await sql_logger.analytic_get_message_rows(guild_type="USER")
+    assert not await sql_logger.analytic_get_message_rows(message_type="DirectMESSAGE")
+
+    logs = await sql_logger.analytic_get_message_log(guild=GUILD_CONTEXT["id"], message_type="TextMESSAGE", limit=1)
+    assert [log.id for log in logs] == [id_]
+
+    log = await sql_logger.analytic_get_message_log_detail(id_)
+    assert log.id == id_
+    assert sorted(channel.channel.snowflake_id for channel in log.channels) == [CHANNEL_OK["id"], CHANNEL_FAIL["id"]]
+    assert await sql_logger.analytic_get_message_log_detail(-1) is None
+
+
+async def test_logging_sql_query_plan(sql_logger: daf.LoggerSQL):
+    "Tests if the message log queries use the composite index and joins instead of EXISTS subqueries"
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM \"MessageLOG\"" in statement:
+            statements.append((statement, parameters))
+
+    sync_engine = sql_logger.read_engine.sync_engine
+    sqlalchemy.event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        after = datetime.now() - timedelta(hours=1)
+        await sql_logger.analytic_get_message_rows(after=after, guild=GUILD_CONTEXT["id"])
+        await sql_logger.analytic_get_num_messages(after=after, author=AUTHOR_CONTEXT["id"])
+    finally:
+        sqlalchemy.event.remove(sync_engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 2
+    async with sql_logger.read_engine.connect() as conn:
+        for statement, parameters in statements:
+            assert "EXISTS" not in statement
+            plan = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            plan = "\n".join(row[-1] for row in plan.all())
+            assert "ix_MessageLOG_timestamp_guild_author" in plan, plan
+
+
+async def test_logging_sql_iter(sql_logger: daf.LoggerSQL):
+    "Tests keyset-paginated iteration over SQL logs"
+    all_logs = await sql_logger.analytic_get_message_log(limit=None)
+    for direction in ("desc", "asc"):
+        chunks = [
+            chunk async for chunk in sql_logger.analytic_iter_message_log(sort_by_direction=direction, chunk_size=2)
+        ]
+        assert all(len(chunk) == 2 for chunk in chunks[:-1])
+        ids = [log.id for chunk in chunks for log in chunk]
+        expected = sorted(all_logs, key=sql_logger.get_log_cursor, reverse=direction == "desc")
+        assert ids == [log.id for log in expected]
+
+        cursor = sql_logger.get_log_cursor(chunks[0][-1])
+        resumed = [
+            log.id async for chunk in sql_logger.analytic_iter_message_log(
+                sort_by_direction=direction, cursor=cursor, chunk_size=100
+            )
+            for log in chunk
+        ]
+        assert resumed == ids[2:]
+
+    chunks = [chunk async for chunk in sql_logger.analytic_iter_message_log(guild=GUILD_CONTEXT["id"] + 1)]
+    assert chunks == []
+
+
+async def test_logging_sql_retention(tmp_path):
+    "Tests the retention policy (batched deletes, kept rollups)"
+    logger = daf.LoggerSQL(database=str(tmp_path.joinpath("retention")), fallback=None)
+    await logger.initialize()
+    tables = daf.logging.tables
+    other_guild = {**GUILD_CONTEXT, "id": GUILD_CONTEXT["id"] + 1, "name": "Other Guild"}
+    try:
+        for guild_context, count in ((GUILD_CONTEXT, 6), (other_guild, 2)):
+            for _ in range(count):
+                await logger._save_log(guild_context, make_message_context([CHANNEL_OK], []), AUTHOR_CONTEXT)
+
+        # Move the other guild's logs into the past
+        async with logger.session_maker() as session:
+            guild_id = (
+                await session.execute(
+                    sqlalchemy.select(tables.GuildUSER.id).where(tables.GuildUSER.snowflake_id == other_guild["id"])
+                )
+            ).scalar()
+            await session.execute(
+                sqlalchemy.update(tables.MessageLOG)
+                .where(tables.MessageLOG.guild_id == guild_id)
+                .values(timestamp=datetime.now() - timedelta(days=3))
+            )
+            # A log of the max_age boundary day, which is older than max_age, but kept with its rollup
+            boundary = datetime.combine((datetime.now() - timedelta(days=1)).date(), datetime.min.time())
+            first_id = (
+                await session.execute(
+                    sqlalchemy.select(sqlalchemy.func.min(tables.MessageLOG.id))
+                    .where(tables.MessageLOG.guild_id != guild_id)
+                )
+            ).scalar()
+            await session.execute(
+                sqlalchemy.update(tables.MessageLOG)
+                .where(tables.MessageLOG.id == first_id)
+                .values(timestamp=boundary + timedelta(seconds=1))
+            )
+            await session.commit()
+
+        await logger.rebuild_rollups()
+
+        async def count_messages(group_by: str):
+            rows = await logger.analytic_get_num_messages(after=datetime.now() - timedelta(days=30), group_by=group_by)
+            return sum(row[1] + row[2] for row in rows)
+
+        assert await count_messages("year") == 8
+
+        # Logs and rollups older than max_age are deleted
+        assert await logger.apply_retention(daf.RetentionPolicy(max_age=timedelta(days=1))) == 2
+        assert await count_messages("year") == 6
+        assert len(await logger.analytic_get_message_log(limit=None)) == 6
+
+        # Logs over the limit are deleted in batches, but the rollups remain
+        assert await logger.apply_retention(daf.RetentionPolicy(max_logs_per_guild=2, batch_size=1)) == 4
+        assert len(await logger.analytic_get_message_log(limit=None)) == 2
+        assert await count_messages("day") == 2
+        assert await count_messages("year") == 6
+
+        assert await logger.apply_retention(daf.RetentionPolicy(aggregates_only_after=timedelta(0))) == 2
+        assert await logger.analytic_get_message_log(limit=None) == []
+        assert await count_messages("year") == 6
+        async with logger.session_maker() as session:
+            select_count = sqlalchemy.select(sqlalchemy.func.count(tables.DataHISTORY.id))
+            assert (await session.execute(select_count)).scalar() == 0
+
+        with pytest.raises(ValueError):
+            daf.RetentionPolicy()
+    finally:
+        await logger._stop_engine()
+
+
+async def test_logging_sql_spill(tmp_path, monkeypatch):
+    "Tests saving logs into the spill file during a database outage and replaying them after reconnecting"
+    from daf.logging.sql import mgr, spill
+
+    monkeypatch.setattr(mgr, "SQL_RECOVERY_TIME", 0)
+    monkeypatch.setattr(mgr, "SQL_RECONNECT_TIME", 0.1)
+    monkeypatch.setattr(mgr, "SQL_SPILL_REPLAY_BATCH", 1)
+    monkeypatch.setattr(daf.logging._logging.GLOBAL, "logger", None)
+
+    logger = daf.LoggerSQL(database=str(tmp_path.joinpath("spill")), fallback=None)
+    await logger.initialize()
+    outage = True
+    fail_replay = True
+    session_maker = logger.session_maker
+    save_log_message = logger._save_log_message
+
+    def outage_session_maker():
+        if outage:
+            raise sqlalchemy.exc.DBAPIError("SELECT 1", None, ConnectionError("Outage"), connection_invalidated=True)
+
+        return session_maker()
+
+    async def failing_save_log_message(session, *args):
+        nonlocal fail_replay
+        if fail_replay and len(await logger.analytic_get_message_log(limit=None)) == 2:
+            fail_replay = False  # Interrupt the replay once, after 2 logs were committed
+            raise sqlalchemy.exc.OperationalError("INSERT", None, ConnectionError("Outage"))
+
+        return await save_log_message(session, *args)
+
+    monkeypatch.setattr(logger, "session_maker", outage_session_maker)
+    monkeypatch.setattr(logger, "_save_log_message", failing_save_log_message)
+    try:
+        for _ in range(3):
+            await logger._save_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], []), AUTHOR_CONTEXT)
+
+        assert logger.reconnecting
+        await logger.spill.flush()  # Written in the background
+        records = list(logger.spill.read())
+        assert len(records) == 3
+        assert len({record["id"] for record in records}) == 3
+
+        # Database is available again, the logs are replayed (interrupted once) without duplicates
+        outage = False
+        for _ in range(100):
+            if not logger.reconnecting:
+                break
+
+            await asyncio.sleep(0.1)
+
+        assert not logger.reconnecting
+        assert not fail_replay
+        assert logger.spill.is_empty()
+        logs = await logger.analytic_get_message_log(limit=None, sort_by="timestamp", sort_by_direction="asc")
+        assert [log.timestamp for log in logs] == [datetime.fromisoformat(record["timestamp"]) for record in records]
+        async with logger.session_maker() as session:
+            select_count = sqlalchemy.select(sqlalchemy.func.count(daf.logging.tables.SpillRECORD.record_id))
+            assert (await session.execute(select_count)).scalar() == 0
+
+        # Incomplete record at the end of the file (process killed while writing) is quarantined
+        logger._spill_log(GUILD_CONTEXT, make_message_context([], [CHANNEL_FAIL]), AUTHOR_CONTEXT)
+        await logger.spill.flush()
+        incomplete = spill.C_RECORD_HEADER.pack(100, 0) + b"{"
+        with open(logger.spill.path, "ab") as file:
+            file.write(incomplete)
+
+        await logger._replay_spill()
+        assert len(await logger.analytic_get_message_log(limit=None)) == 4
+        assert logger.spill.is_empty()
+        assert read_payloads(logger.spill.quarantine_path) == [incomplete]
+        os.remove(logger.spill.quarantine_path)
+
+        # Invalid records are quarantined, the valid records of the same transaction are replayed
+        monkeypatch.setattr(mgr, "SQL_SPILL_REPLAY_BATCH", 10)
+        other_guild = {**GUILD_CONTEXT, "id": GUILD_CONTEXT["id"] + 1, "name": "Spill Guild"}
+        logger._spill_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], []), AUTHOR_CONTEXT)
+        logger.spill.append({"timestamp": "invalid"})
+        await logger.spill.flush()
+        # Always fails with a database error (the record ID is not unique)
+        duplicate = {
+            "timestamp": (datetime.now() - timedelta(seconds=1)).isoformat(), "guild": GUILD_CONTEXT,
+            "message": make_message_context([CHANNEL_OK], []), "author": AUTHOR_CONTEXT, "invite": None,
+            "id": "duplicate"
+        }
+        for _ in range(2):
+            spill.SpillFILE._write(logger.spill.path, spill.SpillFILE._encode(json.dumps(duplicate).encode()))
+
+        no_id = {
+            "timestamp": datetime.now().isoformat(), "guild": other_guild,
+            "message": make_message_context([CHANNEL_OK], []), "author": AUTHOR_CONTEXT, "invite": None
+        }
+        # Saved into the session, then fails
+        spill.SpillFILE._write(logger.spill.path, spill.SpillFILE._encode(json.dumps(no_id).encode()))
+        logger._spill_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], []), AUTHOR_CONTEXT)
+        await logger._replay_spill()
+        logs = await logger.analytic_get_message_log(limit=None)
+        assert len(logs) == 7
+        assert all(log.guild.snowflake_id == GUILD_CONTEXT["id"] for log in logs)
+        assert logger.spill.is_empty()
+        quarantined = list(spill.SpillFILE(logger.spill.quarantine_path).read())
+        assert [record["timestamp"] for record in quarantined] == [
+            "invalid", duplicate["timestamp"], no_id["timestamp"]
+        ]
+
+        # Replay errors other than database errors don't stop reconnecting
+        replay_spill = logger._replay_spill
+        replay_failures = 2
+
+        async def failing_replay_spill():
+            nonlocal replay_failures
+            if replay_failures:
+                replay_failures -= 1
+                raise OSError("Spill file not readable")
+
+            await replay_spill()
+
+        monkeypatch.setattr(logger, "_replay_spill", failing_replay_spill)
+        await logger._reconnect_after(0.1)
+        for _ in range(100):
+            if not logger.reconnecting:
+                break
+
+            await asyncio.sleep(0.1)
+
+        assert not logger.reconnecting
+        assert not replay_failures
+
+        # Corrupted record, the reading continues at the next valid record
+        spill_file = spill.SpillFILE(str(tmp_path.joinpath("corrupted.spill")))
+        spill_file.append({"value": 1})
+        await spill_file.flush()
+        spill.SpillFILE._write(spill_file.path, spill.SpillFILE._encode(b"{"))  # Not JSON
+        for value in (2, 3, 4):
+            spill_file.append({"value": value})
+
+        await spill_file.flush()
+        with open(spill_file.path, "r+b") as file:
+            checksum = file.read().index(b'{"value": 3') - 4
+            file.seek(checksum)
+            file.write(bytes(4))
+
+        assert [record["value"] for record in spill_file.read()] == [1, 2, 4]
+        payloads = read_payloads(spill_file.quarantine_path)
+        assert len(payloads) == 2
+        assert payloads[0] == b"{"
+        assert b'{"value": 3' in payloads[1]
+    finally:
+        await logger._stop_engine()
+
+
+async def test_logging_sql_cache(tmp_path):
+    "Tests the LRU table cache, its statistics and warmup at initialization"
+    from daf.logging.sql.mgr import TableCache
+
+    tables = daf.logging.tables
+    cache = TableCache(tables.CHANNEL, 2)
+    cache.insert(1, "a")
+    cache.insert(2, "b")
+    assert cache.get(1) == "a"
+    cache.insert(3, "c")  # Least recently used (2) is evicted
+    assert cache.get(2) is None
+    assert (cache.get(1), cache.get(3)) == ("a", "c")
+    assert cache.get_stats() == {"size": 2, "limit": 2, "hits": 3, "misses": 1, "evictions": 1, "hit_rate": 0.75}
+
+    cache = TableCache(tables.CHANNEL, 2, ttl=0.01)
+    cache.insert(1, "a")
+    await asyncio.sleep(0.02)
+    assert cache.get(1) is None
+    assert not cache.exists(1)
+
+    path = str(tmp_path.joinpath("cache"))
+    logger = daf.LoggerSQL(database=path, fallback=None)
+    await logger.initialize()
+    try:
+        await logger._save_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], [CHANNEL_FAIL]), AUTHOR_CONTEXT)
+    finally:
+        await logger._stop_engine()
+
+    # New logger caches the rows used by the latest logs, so the next log is saved without cache misses
+    logger = daf.LoggerSQL(database=path, fallback=None)
+    await logger.initialize()
+    try:
+        stats = logger.get_cache_stats()
+        assert stats["GuildUSER"]["size"] == 2
+        assert stats["CHANNEL"]["size"] == 2
+        assert stats["DataHISTORY"]["size"] == 1
+
+        await logger._save_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], [CHANNEL_FAIL]), AUTHOR_CONTEXT)
+        stats = logger.get_cache_stats()
+        for table in ("GuildUSER", "CHANNEL", "DataHISTORY"):
+            assert stats[table]["misses"] == 0
+            assert stats[table]["hit_rate"] == 1
+
+        assert len(await logger.analytic_get_message_log(limit=None)) == 2
+    finally:
+        await logger._stop_engine()
+
+
+async def test_logging_sql_sqlite_profile(tmp_path):
+    "Tests the tuned SQLite profile (WAL, separate read-only connections for analytics)"
+    logger = daf.LoggerSQL(database=str(tmp_path.joinpath("profile")), fallback=None)
+    await logger.initialize()
+    try:
+        await logger._save_log(GUILD_CONTEXT, make_message_context([CHANNEL_OK], []), AUTHOR_CONTEXT)
+        async with logger.engine.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+        assert logger.read_engine is not logger.engine
+        async with logger.read_session_maker() as session:
+            with pytest.raises(sqlalchemy.exc.OperationalError):
+                await session.execute(sqlalchemy.delete(daf.logging.tables.MessageLOG))
+
+        assert len(await logger.analytic_get_message_log(limit=None)) == 1
+    finally:
+        await logger._stop_engine()
+
+
+async def test_logging_migration(tmp_path, monkeypatch):
+    "Tests resumable migration of logs from JSON into SQL and back"
+    source = daf.LoggerJSON(str(tmp_path.joinpath("source")))
+    await source.initialize()
+    start = datetime.now().replace(microsecond=0) - timedelta(days=3)
+    dm_guild = {"name": "User", "id": 999, "type": "USER"}
+    for i in range(7):
+        timestamp = start + timedelta(hours=i * 7)
+        source._write_log(timestamp, GUILD_CONTEXT, make_message_context([CHANNEL_OK], [CHANNEL_FAIL]), AUTHOR_CONTEXT)
+        source._write_log(
+            timestamp + timedelta(seconds=1),
+            dm_guild,
+            {
+                "sent_data": {"text": f"DM {i}"},
+                "success_info": {"success": False, "reason": "Forbidden"} if i % 2 else {"success": True},
+                "type": "DirectMESSAGE",
+                "mode": "send"
+            },
+            AUTHOR_CONTEXT
+        )
+
+    for i in range(3):
+        source._write_log(
+            start + timedelta(hours=i * 9),
+            GUILD_CONTEXT,
+            invite_context={"id": "abcdef", "member": {"id": 100 + i, "name": f"Member {i}"}}
+        )
+
+    target = daf.LoggerSQL(database=str(tmp_path.joinpath("target")), fallback=None)
+    await target.initialize()
+    checkpoint = str(tmp_path.joinpath("checkpoint.json"))
+    try:
+        # Interrupted after saving the 3rd chunk, before the checkpoint file was written
+        save_logs = target._save_logs
+        saved_chunks = 0
+
+        async def failing_save_logs(records, checkpoint=None):
+            nonlocal saved_chunks
+            await save_logs(records, checkpoint)
+            saved_chunks += 1
+            if saved_chunks == 3:
+                raise OSError("Interrupted")
+
+        monkeypatch.setattr(target, "_save_logs", failing_save_logs)
+        with pytest.raises(OSError):
+            await daf.migrate_logs(source, target, checkpoint, chunk_size=3)
+
+        monkeypatch.setattr(target, "_save_logs", save_logs)
+        assert await daf.migrate_logs(source, target, checkpoint, chunk_size=3) == {"message": 14, "invite": 3}
+        assert await daf.migrate_logs(source, target, checkpoint, chunk_size=3) == {"message": 14, "invite": 3}
+
+        # Migrating back results in the same logs, also when interrupted in the middle of a chunk
+        source_copy = daf.LoggerJSON(str(tmp_path.joinpath("copy")))
+        await source_copy.initialize()
+        checkpoint = str(tmp_path.joinpath("checkpoint_copy.json"))
+        write_log = source_copy._write_log
+        written = 0
+
+        def failing_write_log(*args, **kwargs):
+            nonlocal written
+            if written == 5:
+                raise OSError("Interrupted")
+
+            written += 1
+            write_log(*args, **kwargs)
+
+        monkeypatch.setattr(source_copy, "_write_log", failing_write_log)
+        with pytest.raises(OSError):
+            await daf.migrate_logs(target, source_copy, checkpoint, chunk_size=3)
+
+        monkeypatch.setattr(source_copy, "_write_log", write_log)
+        assert await daf.migrate_logs(target, source_copy, checkpoint, chunk_size=3) == {"message": 14, "invite": 3}
+
+        async def get_records(logger, iter_method: str):
+            return [
+                logger._get_log_record(log)
+                async for chunk in getattr(logger, iter_method)(sort_by_direction="asc")
+                for log in chunk
+            ]
+
+        for iter_method in ("analytic_iter_message_log", "analytic_iter_invite_log"):
+            records = await get_records(source, iter_method)
+            assert records == await get_records(source_copy, iter_method)
+            assert [record[0] for record in records] == [record[0] for record in await get_records(target, iter_method)]
+    finally:
+        await target._stop_engine()
@@ -0,0 +1,117 @@
+"""
+Tests of the capacity planner.
+"""
+from datetime import timedelta
+
+from fake_discord import FakeDISCORD
+
+import pytest
+import daf
+
+
+HOUR = timedelta(hours=1)
+
+
+def make_message(channels, minutes: float = 1, mode: str = "send") -> daf.TextMESSAGE:
+    return daf.TextMESSAGE(
+        period=daf.FixedDurationPeriod(timedelta(minutes=minutes), timedelta(seconds=1)),
+        data=daf.TextMessageData("Hello"),
+        channels=list(channels),
+        mode=mode
+    )
+
+
+def test_planner_rate_limits():
+    "Tests the rate limits, utilization and that the objects are not modified"
+    message = make_message(range(1, 11))
+    next_send = message.period.get()
+    account = daf.ACCOUNT("token", servers=[daf.GUILD(1, [message])])
+    clock = daf.misc.clock.get_clock()
+    model = daf.RateLimitMODEL(global_limit=5, global_window=1, route_limit=100, latency=0.1)
+    report = daf.plan_capacity([account], HOUR, model)
+    assert daf.misc.clock.get_clock() is clock
+    assert message.period.get() == next_send
+
+    # 10 channels, the global limit is hit once each send
+    assert report["sends"] == 60
+    assert report["requests"] == 600
+    assert report["rate_limit_waits"] == 60
+    assert report["rate_limit_delay"] == pytest.approx(60 * 0.5)
+    assert report["lag"]["max"] == 0
+    assert report["accounts"] == [
+        {
+            "index": 0, "name": None, "sends": 60, "requests": 600, "rate_limit_waits": 60,
+            "slowmode_limits": 0, "utilization": pytest.approx(600 / (5 * 3600))
+        }
+    ]
+
+    # Edits are a different route than sends, the first send of each channel is a new message
+    account = daf.ACCOUNT("token", servers=[daf.GUILD(1, [make_message([1], 0.1, "edit")])])
+    report = daf.plan_capacity([account], HOUR)
+    assert report["sends"] == 600
+    assert report["rate_limit_waits"] == 0
+    account = daf.ACCOUNT("token", servers=[daf.GUILD(1, [make_message([1], 0.1, "clear-send")])])
+    report = daf.plan_capacity([account], HOUR)
+    assert report["requests"] == 2 * 600 - 1
+
+    with pytest.raises(ValueError):
+        daf.plan_capacity([account], timedelta(0))
+
+
+def test_planner_lag_slowmode():
+    "Tests the schedule lag of saturated accounts and slow mode"
+    # 50 guilds sending into 5 channels at the same time
+    account = daf.ACCOUNT(
+        "token",
+        servers=[daf.GUILD(i, [make_message(range(i * 10, i * 10 + 5), 10)]) for i in range(50)]
+    )
+    report = daf.plan_capacity([account], HOUR, daf.RateLimitMODEL(global_limit=10, global_window=1))
+    assert report["sends"] == 50 * 6
+    assert report["rate_limit_waits"] > 0
+    assert 0 < report["lag"]["p50"] <= report["lag"]["p90"] <= report["lag"]["p99"] <= report["lag"]["max"]
+    assert report["accounts"][0]["utilization"] == pytest.approx(50 * 6 * 5 / (10 * 3600))
+
+    # The period is increased above the slow mode (plus 10 seconds)
+    account = daf.ACCOUNT("token", servers=[daf.GUILD(1, [make_message([1])])])
+    report = daf.plan_capacity([account], HOUR, slowmode={1: 290})
+    assert report["sends"] == 12
+    assert report["slowmode_limits"] == 0
+
+    # Two messages in the same channel
+    account = daf.ACCOUNT("token", servers=[daf.GUILD(1, [make_message([1]), make_message([1, 2])])])
+    report = daf.plan_capacity([account], HOUR, slowmode={1: 290})
+    assert report["slowmode_limits"] > 0
+    assert report["accounts"][0]["slowmode_limits"] == report["slowmode_limits"]
+
+    # Direct messages
+    message = daf.DirectMESSAGE(
+        period=daf.FixedDurationPeriod(timedelta(minutes=1), timedelta(seconds=1)),
+        data=daf.TextMessageData("Hi")
+    )
+    report = daf.plan_capacity([daf.ACCOUNT("token", servers=[daf.USER(1, [message])])], HOUR)
+    assert report["sends"] == report["requests"] == 60
+
+
+async def test_planner_running():
+    "Tests planning the running accounts"
+    async with FakeDISCORD(guilds=0) as server:
+        guild = server.add_guild(2, ["token"])
+        channel_ids = [int(channel["id"]) for channel in guild["channels"]]
+        guild["channels"][0]["rate_limit_per_user"] = 600
+        account = daf.ACCOUNT("token", servers=[daf.GUILD(int(guild["id"]), [make_message(channel_ids, 5)])])
+        await daf.add_object(account)
+        clock = daf.misc.clock.get_clock()
+        try:
+            # The simulation would block the event loop
+            with pytest.raises(RuntimeError):
+                daf.plan_capacity(duration=HOUR)
+
+            report = await daf.plan_capacity_async(duration=HOUR)
+            assert daf.misc.clock.get_clock() is clock
+            assert report["accounts"][0]["name"] == account.client.user.name
+            # The period is increased to 610 seconds
+            assert 5 <= report["sends"] <= 6
+            assert report["requests"] == 2 * report["sends"]
+            assert report["slowmode_limits"] == 0
+        finally:
+            await daf.remove_object(account)
@@ -0,0 +1,74 @@
+"""
+Tests of the sampling profiler.
+"""
+from daf import profiler
+
+import threading
+import time
+import daf
+
+
+BUSY_TIME = 1
+MAX_SLOWDOWN = 0.1
+
+
+def busy_function(duration: float) -> int:
+    "Returns the number of iterations made in ``duration`` seconds"
+    iterations = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        iterations += 1
+
+    return iterations
+
+
+def test_profiler_overhead():
+    "Tests the samples and the overhead at the default sampling rate"
+    # Interleaved, so that both are equally affected by the machine's speed changes
+    baseline = profiled = 0
+    daf.start_profiler(reset=True)
+    for _ in range(3):
+        daf.stop_profiler()
+        baseline = max(baseline, busy_function(BUSY_TIME / 3))
+        daf.start_profiler()
+        profiled = max(profiled, busy_function(BUSY_TIME / 3))
+
+    daf.stop_profiler()
+
+    status = daf.get_profiler_status()
+    assert not status["running"]
+    assert status["overhead"] <= profiler.C_PROFILER_MAX_OVERHEAD
+    assert status["samples"] >= BUSY_TIME / profiler.C_PROFILER_INTERVAL / 2
+    assert profiled >= baseline * (1 - MAX_SLOWDOWN)
+
+    lines = daf.get_collapsed_stacks().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)  # Most common
+    assert stack.split(";")[-1].startswith("busy_function (")
+    assert int(count) >= status["samples"] * 0.8
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == status["samples"]
+
+
+def test_profiler_restart():
+    "Tests the previous thread is stopped before the restarted profiler takes samples"
+    for _ in range(10):
+        daf.start_profiler(interval=0.001)
+        daf.start_profiler(interval=0.001, reset=True)
+        assert [thread.name for thread in threading.enumerate()].count("daf-profiler") == 1
+
+    daf.stop_profiler()
+    assert "daf-profiler" not in [thread.name for thread in threading.enumerate()]
+    samples = daf.get_profiler_status()["samples"]
+    time.sleep(0.01)
+    assert daf.get_profiler_status()["samples"] == samples
+
+
+async def test_profiler_remote(remote_client):
+    "Tests starting and stopping the profiler remotely"
+    await remote_client.set_profiler(True, reset=True)
+    assert (await remote_client.get_profile())["status"]["running"]
+    busy_function(0.2)  # Blocks the event loop
+    await remote_client.set_profiler(False)
+    profile = await remote_client.get_profile()
+    assert not profile["status"]["running"]
+    assert "busy_function (" in profile["collapsed"]
+    assert profile["collapsed"] == daf.get_collapsed_stacks()
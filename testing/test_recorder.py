@@ -0,0 +1,98 @@
+"""
+Tests recording the Discord API traffic and replaying it with the offline fake of the Discord API.
+"""
+from datetime import timedelta
+from functools import partialmethod
+
+from daf.events import EventID
+from daf import recorder
+from fake_discord import FakeDISCORD
+
+import _discord
+import asyncio
+import daf
+
+
+TOKEN = "A" * 24 + "." + "B" * 6 + "." + "C" * 27
+
+
+async def send(server: FakeDISCORD) -> daf.ACCOUNT:
+    "Logs in and sends a message into each channel of the first guild"
+    account = daf.ACCOUNT(TOKEN)
+    await daf.add_object(account)
+    guild_data = server.guilds[0]
+    guild = daf.GUILD(int(guild_data["id"]))
+    await account.add_server(guild)
+    guild._event_ctrl.remove_listener(EventID._trigger_message_ready, guild._advertise)
+    message = daf.TextMESSAGE(
+        period=daf.FixedDurationPeriod(timedelta(seconds=5)),
+        data=daf.TextMessageData("Hello World"),
+        channels=[int(channel["id"]) for channel in guild_data["channels"]]
+    )
+    await guild.add_message(message)
+    context = await message._send()
+    assert len(context["channels"]["successful"]) == len(guild_data["channels"])
+    return account
+
+
+async def test_record_replay(tmp_path, monkeypatch):
+    "Tests the recorder's format and redaction and the replay of the recording"
+    # The library assigns the websockets' log_receive per instance with debug events enabled
+    monkeypatch.setattr(
+        _discord.Client, "__init__", partialmethod(_discord.Client.__init__, enable_debug_events=True)
+    )
+    assert recorder._redact({"token": "secret", "content": f"Token {TOKEN}"}) == {
+        "token": "<redacted>", "content": "Token <redacted>"
+    }
+
+    path = str(tmp_path / "recording.jsonl")
+    async with FakeDISCORD(channels=2, latency=0.02, rate_limit_every=2, retry_after=0.05) as server:
+        daf.start_recording(path)
+        try:
+            account = await send(server)
+            other = server._make_user("other", False)
+            channel = server.guilds[0]["channels"][0]
+            external = {
+                "id": str(server._snowflake()), "type": 0, "channel_id": channel["id"], "guild_id": channel["guild_id"],
+                "author": other, "content": "External", "embeds": [], "attachments": [], "tts": False,
+                "mention_everyone": False, "mentions": [], "mention_roles": [], "pinned": False,
+                "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None
+            }
+            await asyncio.sleep(0.5)
+            await server.dispatch("MESSAGE_CREATE", external)
+            await asyncio.sleep(0.1)
+            sent = next(iter(server.messages.values()))
+            await account.client.http.delete_message(int(sent["channel_id"]), int(sent["id"]))
+            await daf.remove_object(account)
+        finally:
+            daf.stop_recording()
+
+    with open(path, encoding="utf-8") as reader:
+        assert TOKEN not in reader.read()
+
+    records = daf.load_recording(path)
+    http = [r for r in records if r["type"] == "http"]
+    gateway = [r["data"].get("t") for r in records if r["type"] == "gateway"]
+    assert "READY" in gateway and "GUILD_CREATE" in gateway and "MESSAGE_CREATE" in gateway
+    sends = [r for r in http if r["route"] == "/channels/{channel_id}/messages"]
+    assert len(sends) == 2 and all(r["status"] == 200 for r in sends)
+    assert sum(r["rate_limits"] for r in sends) == 1
+    assert [r["status"] for r in http if r["method"] == "DELETE"] == [204]
+    assert all(r["duration"] >= 0.02 for r in http)
+    assert [r["time"] for r in records] == sorted(r["time"] for r in records)
+
+    # Replay
+    replay_server = FakeDISCORD()
+    replay_server.load_recording(records, speed=4)
+    assert replay_server.guilds[0]["id"] == server.guilds[0]["id"]
+    async with replay_server:
+        account = await send(replay_server)
+        try:
+            assert account.client.user.id == int(server._tokens[TOKEN]["id"])
+            assert replay_server.rate_limited == 1  # Recorded rate limit
+            duration = await replay_server.replay()
+            assert 0.1 < duration < 0.5  # The external message was received about 0.5 seconds after the sends
+            await asyncio.sleep(0.1)
+            assert int(external["id"]) in {m.id for m in account.client.cached_messages}
+        finally:
+            await daf.remove_object(account)
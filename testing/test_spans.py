@@ -0,0 +1,69 @@
+"""
+Tests of the spans and their Chrome trace export.
+"""
+from daf import spans
+
+import asyncio
+import json
+import daf
+
+
+async def stage(name: str, delay: float):
+    with spans.span(name, delay=delay):
+        await asyncio.sleep(delay)
+
+
+async def pipeline(index: int):
+    with spans.span("pipeline", index=index):
+        await stage("first", 0.01)
+        await asyncio.gather(asyncio.create_task(stage("second", 0.02)))
+
+
+async def test_spans(tmp_path, remote_client):
+    "Tests nesting of spans, their lanes and the Chrome trace event format"
+    daf.set_span_recording(False, reset=True)
+    await pipeline(-1)
+    assert daf.get_chrome_trace()["traceEvents"] == []  # Disabled
+
+    daf.set_span_recording(True)
+    try:
+        await asyncio.gather(pipeline(0), pipeline(1))  # Concurrent pipelines
+        try:
+            with spans.span("failed"):
+                raise ValueError()
+        except ValueError:
+            pass
+    finally:
+        daf.set_span_recording(False)
+
+    trace = daf.get_chrome_trace()
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(events) == 7
+    lanes = {}
+    for event in events:
+        lanes.setdefault(event["tid"], []).append(event)
+
+    assert len(lanes) == 3  # Each root span has its own lane
+    for lane_events in lanes.values():
+        if lane_events[0]["name"] == "failed":
+            assert lane_events[0]["args"] == {"error": "ValueError"}
+            continue
+
+        first, second, root = lane_events  # Ordered by end time
+        assert (first["name"], second["name"], root["name"]) == ("first", "second", "pipeline")
+        assert root["ts"] <= first["ts"] and first["ts"] + first["dur"] <= second["ts"]
+        assert second["ts"] + second["dur"] <= root["ts"] + root["dur"]
+        assert first["dur"] >= 10_000 and second["dur"] >= 20_000  # Microseconds
+
+    names = {event["tid"]: event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    assert sorted(names.values()) == sorted(f"{lane_events[-1]['name']} #{lane}" for lane, lane_events in lanes.items())
+
+    path = tmp_path.joinpath("trace.json")
+    daf.export_chrome_trace(str(path))
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["traceEvents"] == trace["traceEvents"]
+
+    # Remote
+    assert (await remote_client.get_chrome_trace())["traceEvents"] == trace["traceEvents"]
+    await remote_client.set_span_recording(False, reset=True)
+    assert daf.get_chrome_trace()["traceEvents"] == []
@@ -0,0 +1,74 @@
+"""
+Tests of the task registry and the task leak check.
+"""
+from datetime import timedelta
+from daf.misc import task_registry
+
+import asyncio
+import daf
+import gc
+
+
+class Owner:
+    pass
+
+
+def group_of(groups: list, task: asyncio.Task) -> dict:
+    "Returns the group containing the ``task`` (groups of other tests are ignored)"
+    return next((group for group in groups if task.get_name() in [t["name"] for t in group["tasks"]]), None)
+
+
+async def test_task_registry(remote_client):
+    "Tests grouping of the tasks by owner and detection of orphaned tasks"
+    message = daf.TextMESSAGE(
+        period=daf.FixedDurationPeriod(timedelta(seconds=5)),
+        data=daf.TextMessageData("Hello World"),
+        channels=[123]
+    )
+    deleted_owner = Owner()
+    tasks = [
+        task_registry.create_task(asyncio.sleep(60), message, "removed message timer"),
+        task_registry.create_task(asyncio.sleep(60), message, "removed message timer 2"),
+        task_registry.create_task(asyncio.sleep(60), deleted_owner, "deleted owner"),
+        task_registry.create_task(asyncio.sleep(60), purpose="global"),
+    ]
+    del deleted_owner
+    gc.collect()
+    try:
+        groups = daf.get_tasks()
+        purposes = {task["purpose"] for group in groups for task in group["tasks"]}
+        assert "task leak check" in purposes
+
+        message_group = group_of(groups, tasks[0])
+        assert message_group["owner_type"] == "TextMESSAGE"
+        assert message_group["orphaned"]  # Not in the shilling list
+        purposes = [task["purpose"] for task in message_group["tasks"]]
+        assert purposes == ["removed message timer", "removed message timer 2"]
+
+        deleted_group = group_of(groups, tasks[2])
+        assert deleted_group["owner_type"] == "Owner"
+        assert deleted_group["owner_deleted"] and deleted_group["orphaned"]
+
+        global_group = group_of(groups, tasks[3])
+        assert global_group["owner_type"] is None
+        assert not global_group["orphaned"]
+        assert "global" in [task["purpose"] for task in global_group["tasks"]]
+
+        leaks = daf.check_task_leaks()
+        assert group_of(leaks, tasks[0]) == message_group
+        assert group_of(leaks, tasks[2]) == deleted_group
+        assert group_of(leaks, tasks[3]) is None
+
+        # Remote
+        remote_groups = await remote_client.get_tasks()
+        assert group_of(remote_groups, tasks[0]) == message_group
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Done tasks are removed from the registry
+    assert not any(task in task_registry.GLOBALS.tasks for task in tasks)
+    leaks = daf.check_task_leaks()
+    assert all(group_of(leaks, task) is None for task in tasks)
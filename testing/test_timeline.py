@@ -0,0 +1,105 @@
+"""
+Tests of the index of upcoming sends.
+"""
+from datetime import timedelta
+
+from daf import timeline
+from fake_discord import FakeDISCORD
+
+import pytest
+import daf
+
+
+class Message:
+    "Object tracked by the index, instead of a message"
+    parent = None
+
+
+def test_timeline_index(monkeypatch):
+    "Tests ordering, pagination, send counts and removal"
+    monkeypatch.setattr(timeline.GLOBALS, "index", [])
+    monkeypatch.setattr(timeline.GLOBALS, "messages", {})
+    now = daf.misc.clock.get_clock().now()
+    messages = [Message() for _ in range(10)]
+    for i, message in enumerate(messages):
+        timeline._update(message, now + timedelta(minutes=10 - i))
+
+    timeline._update(messages[0], now + timedelta(minutes=30, seconds=30))  # Rescheduled
+    assert len(timeline.GLOBALS.index) == 10
+
+    # Pages
+    sends = []
+    cursor = None
+    for _ in range(4):
+        page = daf.get_upcoming_sends(limit=3, cursor=cursor)
+        assert page["total"] == 10 - len(sends)
+        sends.extend(page["sends"])
+        cursor = page["cursor"]
+
+    assert cursor is None
+    assert len(sends) == 10
+    assert [send["time"] for send in sends] == sorted(send["time"] for send in sends)
+    assert sends[-1]["time"] == now + timedelta(minutes=30, seconds=30)
+    assert sends[0]["message_type"] == "Message"
+
+    page = daf.get_upcoming_sends(timedelta(minutes=5, seconds=30))
+    assert page["total"] == 5
+    assert len(page["sends"]) == 5
+    assert page["cursor"] is None
+
+    counts = daf.get_send_counts(timedelta(minutes=10), timedelta(minutes=2))
+    assert [count["sends"] for count in counts] == [2, 2, 2, 2, 1]
+    assert counts[1]["start"] - counts[0]["start"] == timedelta(minutes=2)
+    with pytest.raises(ValueError):
+        daf.get_send_counts(timedelta(minutes=10), timedelta(0))
+
+    with pytest.raises(ValueError):
+        daf.get_send_counts(timedelta(days=1), timedelta(seconds=1))
+
+    timeline._remove(messages[1])
+    del messages[2]  # Garbage collected
+    assert len(timeline.GLOBALS.index) == len(timeline.GLOBALS.messages) == 8
+    assert daf.get_upcoming_sends()["total"] == 8
+
+
+async def test_timeline_messages(remote_client):
+    "Tests the index is updated by the messages' timers and the remote access"
+    async with FakeDISCORD(channels=3) as server:
+        guild_data = server.guilds[0]
+        guild_id = int(guild_data["id"])
+
+        def guild_sends(sends: list) -> list:
+            return [send for send in sends if send["guild"] == guild_id]
+
+        channel_ids = [int(channel["id"]) for channel in guild_data["channels"]]
+        messages = [
+            daf.TextMESSAGE(
+                period=daf.FixedDurationPeriod(timedelta(hours=1), timedelta(minutes=minutes)),
+                data=daf.TextMessageData("Hello"),
+                channels=channel_ids[:minutes]
+            )
+            for minutes in (3, 1, 2)
+        ]
+        account = daf.ACCOUNT("timeline-token", servers=[daf.GUILD(guild_id, messages)])
+        await daf.add_object(account)
+        try:
+            sends = guild_sends(daf.get_upcoming_sends(timedelta(minutes=5))["sends"])
+            assert [send["channels"] for send in sends] == [1, 2, 3]
+            assert sends[0]["message_id"] == messages[1]._daf_id
+            assert sends[0]["guild_name"] == guild_data["name"]
+            assert sends[0]["account"] == account.client.user.name
+            assert sends[0]["message_type"] == "TextMESSAGE"
+
+            # Remote
+            page = await remote_client.get_upcoming_sends(timedelta(minutes=5), 100)
+            assert guild_sends(page["sends"]) == sends
+            counts = await remote_client.get_send_counts(timedelta(minutes=5), timedelta(minutes=1))
+            assert len(counts) == 5
+            assert sum(count["sends"] for count in counts) == page["total"]
+
+            await account.servers[0].remove_message(messages[0])
+            assert len(guild_sends(daf.get_upcoming_sends()["sends"])) == 2
+        finally:
+            await daf.remove_object(account)
+
+        assert not guild_sends(daf.get_upcoming_sends()["sends"])
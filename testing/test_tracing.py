@@ -0,0 +1,72 @@
+"""
+Tests of the trace buffer, lazy messages and batched publishing.
+"""
+from daf.logging import tracing
+
+import asyncio
+import daf
+
+
+async def test_tracing_lazy_collapse():
+    "Tests lazy trace messages and collapsing of repeated traces"
+    called = []
+
+    def message():
+        called.append(True)
+        return "Lazy message"
+
+    old_level = tracing.GLOBALS.set_level
+    tracing.GLOBALS.set_level = daf.TraceLEVELS.WARNING
+    try:
+        daf.trace(message, daf.TraceLEVELS.DEBUG)
+        assert not called
+
+        for _ in range(42):
+            daf.trace(message, daf.TraceLEVELS.WARNING)
+
+        assert len(called) == 42
+        last = daf.logging.get_traces()[-1]
+        assert last["message"] == "Lazy message"
+        assert last["count"] == 42
+        assert last["module"] == __name__
+
+        daf.trace("Other message", daf.TraceLEVELS.WARNING)
+        traces = daf.logging.get_traces()
+        assert traces[-1]["message"] == "Other message" and traces[-1]["count"] == 1
+        assert traces[-2]["count"] == 42
+    finally:
+        tracing.GLOBALS.set_level = old_level
+
+
+async def test_tracing_publish():
+    "Tests that traces are published to g_trace listeners in batches"
+    published = []
+    expected = [
+        *(f"Publish {i}" for i in range(5)),
+        tracing.C_TRACE_REPEAT_FORMAT.format(count=2),
+        "Publish end"
+    ]
+
+    def listener(level, message):
+        published.append(message)
+
+    # Traces of previous tests would otherwise be collapsed with or published before the test's traces
+    tracing.GLOBALS.buffer.clear()
+    tracing.GLOBALS.pending.clear()
+    tracing.GLOBALS.dropped = 0
+    evt = daf.get_global_event_ctrl()
+    evt.add_listener(daf.EventID.g_trace, listener)
+    try:
+        for i in range(5):
+            daf.trace(f"Publish {i}", daf.TraceLEVELS.NORMAL)
+
+        daf.trace("Publish 4", daf.TraceLEVELS.NORMAL)  # Collapsed
+        daf.trace("Publish end", daf.TraceLEVELS.NORMAL)
+        await asyncio.sleep(0)
+        assert "Publish 0" not in published  # Published by a separate task after a delay
+
+        await asyncio.sleep(tracing.C_TRACE_PUBLISH_PERIOD * 4)
+        start = published.index("Publish 0")
+        assert published[start:start + len(expected)] == expected  # Other tasks can trace before or after
+    finally:
+        evt.remove_listener(daf.EventID.g_trace, listener)
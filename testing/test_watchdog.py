@@ -0,0 +1,50 @@
+"""
+Tests of the event loop watchdog.
+"""
+from daf import watchdog
+
+import asyncio
+import time
+import daf
+
+
+BLOCK_TIME = 0.5
+
+
+def blocking_callback():
+    time.sleep(BLOCK_TIME)
+
+
+async def test_watchdog_stall(remote_client):
+    "Tests that the stack of a blocking callback is recorded"
+    daf.set_loop_watchdog(0.1)
+    try:
+        watchdog.GLOBALS.stalls.clear()
+        await asyncio.sleep(0.3)  # Let the watchdog start measuring
+        asyncio.get_running_loop().call_soon(blocking_callback)
+        await asyncio.sleep(0)  # The callback blocks the loop
+        await asyncio.sleep(0.3)  # Let the watchdog record the stall
+
+        stalls = daf.get_loop_stalls()
+        assert stalls["threshold"] == 0.1
+        assert stalls["max_lag"] >= BLOCK_TIME - 0.1
+        assert len(stalls["stalls"]) == 1
+        stall = stalls["stalls"][0]
+        assert BLOCK_TIME - 0.1 <= stall["lag"] < BLOCK_TIME + 0.5
+        assert "blocking_callback" in stall["stack"][-1]
+        assert "time.sleep(BLOCK_TIME)" in stall["stack"][-1]
+
+        # Remote
+        remote_stalls = await remote_client.get_loop_stalls()
+
+        assert remote_stalls["stalls"][0]["stack"] == stall["stack"]
+        assert remote_stalls["stalls"][0]["timestamp"] == stall["timestamp"]
+
+        await remote_client.set_loop_watchdog(None)
+        assert daf.get_loop_stalls()["threshold"] is None
+        asyncio.get_running_loop().call_soon(blocking_callback)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0.3)
+        assert len(daf.get_loop_stalls()["stalls"]) == 1  # Disabled
+    finally:
+        daf.set_loop_watchdog()